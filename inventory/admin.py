@@ -2,6 +2,7 @@ import os
 import re
 import subprocess
 
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
@@ -9,28 +10,32 @@ from django.http import HttpResponseRedirect
 from django.template.response import TemplateResponse
 from django.urls import path
 from django.utils.html import format_html
+from django.utils.timezone import now
 from polymorphic.admin import PolymorphicChildModelAdmin, PolymorphicParentModelAdmin
 from simple_history.admin import SimpleHistoryAdmin
 from unfold.admin import ModelAdmin as UnfoldModelAdmin
 from unfold.admin import TabularInline as UnfoldTabularInline
 
-from . import items
+from . import items, sql_profile
 from .forms import InventoryItemForm
 from .models import (
     AMS,
     AMSChannelState,
     AMSUnitState,
     AuditUnknownScan,
+    ConsumptionForecast,
     Dryer,
     Filament,
     FilamentColor,
     Hardware,
     InventoryItem,
+    ItemChangeEvent,
     Location,
     MaintenanceEvent,
     Material,
     NozzleConfig,
     Printer,
+    PrinterDailyStats,
     PrinterDevice,
     PrinterState,
     PrintJob,
@@ -40,6 +45,9 @@ from .models import (
     PurchaseOrderLine,
     PurchaseReceipt,
     PurchaseReceiptLine,
+    SpendLedgerEntry,
+    SpendRollup,
+    SpoolSyncFinding,
     Supplier,
     TelemetrySample,
 )
@@ -184,6 +192,10 @@ class FilamentAdmin(ProductChildAdmin):
             try:
                 material = Material.objects.get(pk=material_id)
                 queryset.update(material=material)
+                # update() skips auto_now; move the stamp the API ETags read.
+                Product.objects.filter(pk__in=selected_filaments).update(
+                    last_modified=now()
+                )
                 self.message_user(
                     request, f"Successfully updated {queryset.count()} filaments."
                 )
@@ -429,6 +441,11 @@ class InventoryItemAdmin(SimpleHistoryAdmin, UnfoldModelAdmin):
                 self.admin_site.admin_view(self.view_log),
                 name="inventory-log",
             ),
+            path(
+                "sql-profile/",
+                self.admin_site.admin_view(self.view_sql_profile),
+                name="inventory-sql-profile",
+            ),
         ]
         return custom_urls + urls
 
@@ -473,6 +490,21 @@ class InventoryItemAdmin(SimpleHistoryAdmin, UnfoldModelAdmin):
             request, "admin/inventory/inventoryitem/log_view.html", context
         )
 
+    def view_sql_profile(self, request):
+        """Per-view p50/p95/p99 from the sampled SQL profile log."""
+        records = sql_profile.read_records()
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "SQL Profile",
+            "rows": sql_profile.summarize(records),
+            "samples": len(records),
+            "enabled": settings.SQL_PROFILE,
+            "sample_rate": settings.SQL_PROFILE_SAMPLE_RATE,
+        }
+        return TemplateResponse(
+            request, "admin/inventory/inventoryitem/sql_profile.html", context
+        )
+
     @admin.action(description="Mark selected items as Depleted")
     def mark_depleted(self, request, queryset):
         count = 0
@@ -686,6 +718,21 @@ class PrintJobFilamentInline(UnfoldTabularInline):
     extra = 1
     autocomplete_fields = ["item", "ams_slot"]
 
+    # A completed job's lines are already posted to the spools and the daily
+    # stats; editing them here would leave both stale.
+    def has_add_permission(self, request, obj=None):
+        return not (obj and obj.completed) and super().has_add_permission(request, obj)
+
+    def has_change_permission(self, request, obj=None):
+        return not (obj and obj.completed) and super().has_change_permission(
+            request, obj
+        )
+
+    def has_delete_permission(self, request, obj=None):
+        return not (obj and obj.completed) and super().has_delete_permission(
+            request, obj
+        )
+
 
 @admin.register(PrintJob)
 class PrintJobAdmin(UnfoldModelAdmin):
@@ -699,16 +746,74 @@ class PrintJobAdmin(UnfoldModelAdmin):
         "completed",
     )
     list_filter = ("result", "source", "completed")
-    search_fields = ("name", "telemetry_task_id", "printer__serial_number")
+    search_fields = (
+        "name",
+        "telemetry_task_id",
+        "source_hash",
+        "printer__serial_number",
+    )
     list_select_related = ("printer",)
     autocomplete_fields = ["printer"]
     inlines = [PrintJobFilamentInline]
-    readonly_fields = ("created_at",)
+    # Jobs are completed through inventory.printjobs, which posts the spool
+    # decrements and daily stats; once completed they are read-only here.
+    readonly_fields = ("created_at", "source_hash", "completed")
+
+    def has_change_permission(self, request, obj=None):
+        return not (obj and obj.completed) and super().has_change_permission(
+            request, obj
+        )
+
+    def has_delete_permission(self, request, obj=None):
+        return not (obj and obj.completed) and super().has_delete_permission(
+            request, obj
+        )
 
 
 # ----- Procurement (Phase 14) -----
 
 
+@admin.register(PrinterDailyStats)
+class PrinterDailyStatsAdmin(UnfoldModelAdmin):
+    """Derived from completed jobs (inventory.printjobs); rebuild, don't edit."""
+
+    list_display = ("day", "printer", "jobs", "success", "seconds", "grams")
+    list_filter = ("printer",)
+    list_select_related = ("printer__product",)
+    date_hierarchy = "day"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ConsumptionForecast)
+class ConsumptionForecastAdmin(UnfoldModelAdmin):
+    """Recomputed daily by inventory.forecast; read-only."""
+
+    list_display = (
+        "product",
+        "burn_g_per_day",
+        "on_hand_g",
+        "on_hand_count",
+        "days_of_cover",
+        "reorder_point_g",
+        "needs_reorder",
+        "computed_at",
+    )
+    list_filter = ("needs_reorder",)
+    search_fields = ("product__name", "product__sku")
+    list_select_related = ("product",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Supplier)
 class SupplierAdmin(UnfoldModelAdmin):
     list_display = ("name", "website", "account_ref")
@@ -767,6 +872,78 @@ class PurchaseReceiptAdmin(UnfoldModelAdmin):
     fields = ("order", "received_at", "received_by", "attachment", "notes")
 
 
+@admin.register(SpendLedgerEntry)
+class SpendLedgerEntryAdmin(UnfoldModelAdmin):
+    """Append-only spend postings (inventory.spend_ledger); rebuild, don't edit."""
+
+    list_display = (
+        "occurred_at",
+        "month",
+        "supplier",
+        "category",
+        "item",
+        "order_line",
+        "tracked_spend",
+        "consumable_spend",
+        "received_value",
+    )
+    list_filter = ("month", "supplier", "category")
+    list_select_related = ("supplier", "category", "item", "order_line")
+    date_hierarchy = "occurred_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ItemChangeEvent)
+class ItemChangeEventAdmin(UnfoldModelAdmin):
+    """Location/status changes (inventory.item_events); rebuild, don't edit."""
+
+    list_display = (
+        "changed_at",
+        "item",
+        "location_from",
+        "location_to",
+        "status_from",
+        "status_to",
+    )
+    list_filter = ("location_changed", "status_changed")
+    list_select_related = ("item__product", "location_from", "location_to")
+    date_hierarchy = "changed_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SpendRollup)
+class SpendRollupAdmin(UnfoldModelAdmin):
+    list_display = (
+        "month",
+        "supplier",
+        "category",
+        "tracked_spend",
+        "tracked_count",
+        "on_hand_value",
+        "consumable_spend",
+        "ordered_value",
+        "received_value",
+    )
+    list_filter = ("month", "supplier", "category")
+    list_select_related = ("supplier", "category")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # ----- Bambu MQTT telemetry mirror (Phase 16.1) -----
 # The state tables are read-only mirrors written by the telemetry consumer;
 # only PrinterDevice (registry/config) is editable.
@@ -815,7 +992,15 @@ class PrinterStateAdmin(UnfoldModelAdmin):
 
 @admin.register(AMSUnitState)
 class AMSUnitStateAdmin(UnfoldModelAdmin):
-    list_display = ("device", "ams_index", "humidity", "temp", "dry_time", "updated_at")
+    list_display = (
+        "device",
+        "ams_index",
+        "serial",
+        "humidity",
+        "temp",
+        "dry_time",
+        "updated_at",
+    )
 
     def has_add_permission(self, request):
         return False
@@ -855,6 +1040,62 @@ class TelemetrySampleAdmin(UnfoldModelAdmin):
         return False
 
 
+class FindingReviewFilter(admin.SimpleListFilter):
+    """Defaults to the review queue: clean (``OK``) trays are hidden until asked for."""
+
+    title = "Review"
+    parameter_name = "review"
+
+    def lookups(self, request, model_admin):
+        return [("ok", "Clean trays (OK)"), ("all", "All trays")]
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.value() is None,
+            "query_string": changelist.get_query_string(remove=[self.parameter_name]),
+            "display": "Needs review",
+        }
+        for value, label in self.lookup_choices:
+            yield {
+                "selected": self.value() == value,
+                "query_string": changelist.get_query_string(
+                    {self.parameter_name: value}
+                ),
+                "display": label,
+            }
+
+    def queryset(self, request, queryset):
+        if self.value() == "all":
+            return queryset
+        if self.value() == "ok":
+            return queryset.filter(category=SpoolSyncFinding.OK)
+        return queryset.exclude(category=SpoolSyncFinding.OK)
+
+
+@admin.register(SpoolSyncFinding)
+class SpoolSyncFindingAdmin(UnfoldModelAdmin):
+    """The live spool reconciler's per-tray verdicts (inventory.spool_autosync).
+
+    Lists the review queue (everything but ``OK``) unless a filter says otherwise.
+    """
+
+    list_display = (
+        "device",
+        "ams_index",
+        "tray_index",
+        "category",
+        "item",
+        "detail",
+        "updated_at",
+        "applied_at",
+    )
+    list_filter = (FindingReviewFilter, "category", "device")
+    list_select_related = ("device", "item__product")
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(FilamentColor)
 class FilamentColorAdmin(UnfoldModelAdmin):
     list_display = (
@@ -10,9 +10,8 @@ from __future__ import annotations
 
 from decimal import Decimal
 
-from django.db.models import Sum
-
-from .models import InventoryItem, MaintenanceEvent, PrinterState
+from . import spend_ledger
+from .models import MaintenanceEvent, PrinterState
 
 
 def _spend_on_hand() -> Decimal:
@@ -21,12 +20,10 @@ def _spend_on_hand() -> Decimal:
     On-hand == active == not DEPLETED and not SOLD (matches the "active" set used
     by the low-stock alerts). UNKNOWN/NEW/IN_USE/DRYING/STORED items are all
     physically present, so their cost counts. ``unit_cost`` is nullable (only
-    stamped for procurement-received items); NULLs are ignored by ``Sum``.
+    stamped for procurement-received items); NULLs count as zero. Read from the
+    spend-ledger rollups (:mod:`inventory.spend_ledger`).
     """
-    total = InventoryItem.objects.exclude(
-        status__in=[InventoryItem.Status.DEPLETED, InventoryItem.Status.SOLD]
-    ).aggregate(total=Sum("unit_cost"))["total"] or Decimal("0")
-    return total
+    return spend_ledger.on_hand_value()
 
 
 def _low_stock_count() -> int:
@@ -0,0 +1,441 @@
+"""Read-only JSON API over inventory, locations, products and telemetry.
+
+For scripts (Home Assistant, phone shortcuts, exports) that today scrape pages
+or open the SQLite file directly. Every resource is a flat ``values()`` query
+described by a :class:`Resource`:
+
+- ``?fields=id,name`` picks a sparse fieldset. Only those columns are selected.
+- ``?limit=`` / ``?cursor=`` give keyset pagination on ``id``. The response's
+  ``next`` URL carries an opaque cursor and stays stable under inserts.
+- Every response has an ``ETag`` built from a cheap version stamp of the
+  resource's table (row count, max id, max modification time), of each table
+  its rows embed columns from (product, location, material, printer device),
+  and the request's query string. A matching ``If-None-Match`` gets a ``304``
+  after those aggregates, before the list query runs.
+
+Auth is the normal session login, or ``Authorization: Bearer <API_TOKEN>`` when
+``API_TOKEN`` is set. Failures are JSON ``401``s, never a login redirect.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified, JsonResponse
+from django.views import View
+
+from . import forecast
+from .models import (
+    AMSChannelState,
+    ConsumptionForecast,
+    InventoryItem,
+    Location,
+    Material,
+    PrinterDevice,
+    PrinterState,
+    Product,
+)
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+_STATUS_LABELS = dict(InventoryItem.Status.choices)
+
+
+@dataclass(frozen=True)
+class Resource:
+    """How one model is exposed.
+
+    ``fields`` maps API name to a ``values()`` path, or to ``(path, transform)``
+    for a derived value. ``stamp_field`` is the auto-updated timestamp folded
+    into the ETag. ``joined`` lists the related models whose columns the rows
+    embed; their row count and ``last_modified`` join the ETag too, so renaming
+    a product or location invalidates the rows showing its name. ``filters``
+    maps query params to lookups. ``refresh``, if set, is called before the
+    ETag is computed to bring a derived table current.
+    """
+
+    model: type
+    fields: dict
+    default_fields: tuple
+    stamp_field: str
+    joined: tuple = ()
+    filters: dict = field(default_factory=dict)
+    base_queryset: object = None
+    refresh: object = None
+
+    def queryset(self):
+        if self.base_queryset is not None:
+            return self.base_queryset()
+        return self.model.objects.all()
+
+
+RESOURCES = {
+    "items": Resource(
+        model=InventoryItem,
+        fields={
+            "id": "id",
+            "serial_number": "serial_number",
+            "status": "status",
+            "status_label": ("status", lambda v: _STATUS_LABELS.get(v, "")),
+            "product_id": "product_id",
+            "product_name": "product__name",
+            "upc": "product__upc",
+            "sku": "product__sku",
+            "location_id": "location_id",
+            "location_name": "location__name",
+            "percent_remaining": "percent_remaining",
+            "unit_cost": "unit_cost",
+            "date_added": "date_added",
+            "date_depleted": "date_depleted",
+            "last_modified": "last_modified",
+        },
+        default_fields=(
+            "id",
+            "serial_number",
+            "status_label",
+            "product_name",
+            "location_name",
+            "percent_remaining",
+        ),
+        stamp_field="last_modified",
+        joined=(Product, Location),
+        filters={
+            "status": "status__in",
+            "location": "location_id",
+            "product": "product_id",
+            "upc": "product__upc",
+        },
+    ),
+    "locations": Resource(
+        model=Location,
+        fields={
+            "id": "id",
+            "name": "name",
+            "kind": "kind",
+            "parent_id": "parent_id",
+            "unit_id": "unit_id",
+            "slot_index": "slot_index",
+            "default_status": "default_status",
+            "capacity": "capacity",
+            "last_modified": "last_modified",
+        },
+        default_fields=("id", "name", "kind", "parent_id"),
+        stamp_field="last_modified",
+        filters={"kind": "kind__in", "parent": "parent_id"},
+    ),
+    "products": Resource(
+        model=Product,
+        fields={
+            "id": "id",
+            "type": "polymorphic_ctype__model",
+            "name": "name",
+            "upc": "upc",
+            "sku": "sku",
+            "price": "price",
+            # Filament-only columns; null for other product types.
+            "material": "filament__material__name",
+            "material_type": "filament__material__material_type",
+            "manufacturer": "filament__manufacturer",
+            "color": "filament__color",
+            "hex_code": "filament__hex_code",
+            "last_modified": "last_modified",
+        },
+        default_fields=("id", "type", "name", "upc", "sku"),
+        stamp_field="last_modified",
+        joined=(Material,),
+        filters={"type": "polymorphic_ctype__model__in", "upc": "upc"},
+        # Flat rows only — skip polymorphic's per-subclass instance fetches.
+        base_queryset=lambda: Product.objects.non_polymorphic(),
+    ),
+    "printer-states": Resource(
+        model=PrinterState,
+        fields={
+            "id": "id",
+            "device_id": "device_id",
+            "device_name": "device__name",
+            "device_serial": "device__serial",
+            "gcode_state": "gcode_state",
+            "mc_percent": "mc_percent",
+            "layer_num": "layer_num",
+            "total_layers": "total_layers",
+            "nozzle_temp": "nozzle_temp",
+            "bed_temp": "bed_temp",
+            "remaining_min": "remaining_min",
+            "subtask_name": "subtask_name",
+            "hms_codes": "hms_codes",
+            "updated_at": "updated_at",
+        },
+        default_fields=(
+            "id",
+            "device_name",
+            "gcode_state",
+            "mc_percent",
+            "remaining_min",
+            "updated_at",
+        ),
+        stamp_field="updated_at",
+        joined=(PrinterDevice,),
+        filters={"device": "device_id"},
+    ),
+    "ams-channels": Resource(
+        model=AMSChannelState,
+        fields={
+            "id": "id",
+            "device_id": "device_id",
+            "device_name": "device__name",
+            "ams_index": "ams_index",
+            "tray_index": "tray_index",
+            "tray_uuid": "tray_uuid",
+            "tray_type": "tray_type",
+            "color_hex": "color_hex",
+            "remain_pct": "remain_pct",
+            "updated_at": "updated_at",
+        },
+        default_fields=(
+            "id",
+            "device_name",
+            "ams_index",
+            "tray_index",
+            "tray_type",
+            "color_hex",
+            "remain_pct",
+        ),
+        stamp_field="updated_at",
+        joined=(PrinterDevice,),
+        filters={"device": "device_id"},
+    ),
+    "forecasts": Resource(
+        model=ConsumptionForecast,
+        fields={
+            "id": "id",
+            "product_id": "product_id",
+            "product_name": "product__name",
+            "sku": "product__sku",
+            "upc": "product__upc",
+            "burn_g_per_day": "burn_g_per_day",
+            "on_hand_g": "on_hand_g",
+            "on_hand_count": "on_hand_count",
+            "days_of_cover": "days_of_cover",
+            "reorder_point_g": "reorder_point_g",
+            "needs_reorder": "needs_reorder",
+            "computed_at": "computed_at",
+        },
+        default_fields=(
+            "product_id",
+            "product_name",
+            "burn_g_per_day",
+            "on_hand_g",
+            "days_of_cover",
+            "reorder_point_g",
+            "needs_reorder",
+        ),
+        stamp_field="computed_at",
+        joined=(Product,),
+        filters={"needs_reorder": "needs_reorder", "product": "product_id"},
+        refresh=forecast.current,
+    ),
+}
+
+
+class ApiError(Exception):
+    """A client error, surfaced as a JSON ``400``."""
+
+
+def encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip("=")
+
+
+def decode_cursor(value):
+    padded = value + "=" * (-len(value) % 4)
+    try:
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, binascii.Error) as exc:
+        raise ApiError("Invalid cursor.") from exc
+
+
+def version_stamp(resource):
+    """One aggregate over the resource's table (plus one per joined table):
+    changes on insert/delete/save.
+
+    Writes through ``QuerySet.update()`` skip ``auto_now``; such callers must set
+    the stamp field themselves to keep ETags honest.
+    """
+    agg = resource.model.objects.aggregate(
+        n=Count("pk"), top=Max("pk"), ts=Max(resource.stamp_field)
+    )
+    ts = agg["ts"].isoformat() if agg["ts"] else ""
+    stamp = f"{agg['n']}:{agg['top']}:{ts}"
+    for model in resource.joined:
+        joined = model._base_manager.aggregate(n=Count("pk"), ts=Max("last_modified"))
+        ts = joined["ts"].isoformat() if joined["ts"] else ""
+        stamp += f"|{joined['n']}:{ts}"
+    return stamp
+
+
+def make_etag(resource_name, stamp, query_string):
+    digest = hashlib.sha1(
+        f"{resource_name}|{stamp}|{query_string}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _selected_fields(resource, params):
+    raw = params.get("fields")
+    if not raw:
+        return list(resource.default_fields)
+    names = [n.strip() for n in raw.split(",") if n.strip()]
+    unknown = [n for n in names if n not in resource.fields]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}.")
+    return names
+
+
+def _lookup_field(model, lookup):
+    """The model field a filter lookup ends on (``__in`` stripped)."""
+    parts = lookup.removesuffix("__in").split("__")
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(parts[-1])
+
+
+# Spellings a boolean filter accepts (case-insensitive).
+BOOLEANS = {"true": True, "1": True, "false": False, "0": False}
+
+
+def _coerce(field, param, value):
+    """``value`` as ``field`` stores it; a bad value is the client's error."""
+    if isinstance(field, models.BooleanField):
+        if value.lower() not in BOOLEANS:
+            raise ApiError(f"Invalid value for {param}: {value!r} (use true or false).")
+        return BOOLEANS[value.lower()]
+    try:
+        return field.to_python(value)
+    except (ValueError, ValidationError) as exc:
+        raise ApiError(f"Invalid value for {param}: {value!r}.") from exc
+
+
+def _apply_filters(resource, qs, params):
+    for param, lookup in resource.filters.items():
+        target = _lookup_field(resource.model, lookup)
+        if lookup.endswith("__in"):
+            values = [
+                _coerce(target, param, v)
+                for raw in params.getlist(param)
+                for v in raw.split(",")
+                if v
+            ]
+            if values:
+                qs = qs.filter(**{lookup: values})
+        elif params.get(param):
+            qs = qs.filter(**{lookup: _coerce(target, param, params[param])})
+    return qs
+
+
+def _serialize(resource, names, row):
+    out = {}
+    for name in names:
+        spec = resource.fields[name]
+        if isinstance(spec, tuple):
+            path, transform = spec
+            out[name] = transform(row[path])
+        else:
+            out[name] = row[spec]
+    return out
+
+
+def _paths(resource, names):
+    paths = []
+    for name in names:
+        spec = resource.fields[name]
+        path = spec[0] if isinstance(spec, tuple) else spec
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def _authorized(request):
+    if request.user.is_authenticated:
+        return True
+    token = getattr(settings, "API_TOKEN", "")
+    header = request.headers.get("Authorization", "")
+    if token and header.startswith("Bearer "):
+        return hmac.compare_digest(header[len("Bearer ") :], token)
+    return False
+
+
+class ApiView(View):
+    """Shared auth / ETag / error handling for the JSON endpoints."""
+
+    http_method_names = ["get", "head", "options"]
+    resource_name = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not _authorized(request):
+            return JsonResponse({"error": "Authentication required."}, status=401)
+        self.resource = RESOURCES[self.resource_name]
+        if self.resource.refresh is not None:
+            self.resource.refresh()
+        etag = make_etag(
+            self.resource_name,
+            version_stamp(self.resource),
+            f"{request.path}?{request.META.get('QUERY_STRING', '')}",
+        )
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            try:
+                response = super().dispatch(request, *args, **kwargs)
+            except ApiError as exc:
+                return JsonResponse({"error": str(exc)}, status=400)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class ApiListView(ApiView):
+    def get(self, request):
+        resource = self.resource
+        names = _selected_fields(resource, request.GET)
+        try:
+            limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+        except ValueError as exc:
+            raise ApiError("limit must be an integer.") from exc
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        qs = _apply_filters(resource, resource.queryset(), request.GET).order_by("pk")
+        if request.GET.get("cursor"):
+            qs = qs.filter(pk__gt=decode_cursor(request.GET["cursor"]))
+        paths = _paths(resource, names)
+        # "id" rides along for the cursor even when it isn't a requested field.
+        rows = list(qs.values(*paths, "pk")[: limit + 1])
+
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            params = request.GET.copy()
+            params["cursor"] = encode_cursor(rows[-1]["pk"])
+            next_url = f"{request.path}?{params.urlencode()}"
+        return JsonResponse(
+            {
+                "results": [_serialize(resource, names, row) for row in rows],
+                "next": next_url,
+            }
+        )
+
+
+class ApiDetailView(ApiView):
+    def get(self, request, pk):
+        resource = self.resource
+        names = _selected_fields(resource, request.GET)
+        row = resource.queryset().filter(pk=pk).values(*_paths(resource, names)).first()
+        if row is None:
+            return JsonResponse({"error": "Not found."}, status=404)
+        return JsonResponse(_serialize(resource, names, row))
@@ -19,10 +19,12 @@ idempotent so the explicit/auto/finalize close paths can overlap safely.
 """
 
 import logging
+from dataclasses import dataclass
 
 from django.db import transaction
+from django.db.models import Count, Q
 
-from . import items
+from . import items, scan_resolver
 from .models import (
     AMS,
     AuditEvent,
@@ -32,7 +34,6 @@ from .models import (
     InventoryItem,
     Location,
     Printer,
-    Product,
 )
 
 logger = logging.getLogger("inventory")
@@ -111,13 +112,14 @@ def resolve_serial(value):
     Note: serials are matched case-insensitively. A purely numeric scan is treated
     as a UPC by :func:`parse_code` and never reaches here, so serials must contain
     at least one non-digit (Bambu unit serials do). Raises :class:`AuditError` when
-    the serial is unknown, ambiguous, or not linked to any location.
+    the serial is unknown, ambiguous, or not linked to any location. A resolved
+    focus is remembered by :mod:`inventory.scan_resolver`, so re-scanning the same
+    unit is a single query.
     """
-    items = list(
-        InventoryItem.objects.filter(serial_number__iexact=value).exclude(
-            serial_number=""
-        )
-    )
+    cached = scan_resolver.focus_for_serial(value)
+    if cached is not None:
+        return cached
+    items = list(InventoryItem.by_serial(value).exclude(serial_number=""))
     if not items:
         raise AuditError(f"No tracked unit has serial {value!r}.")
     if len(items) > 1:
@@ -137,12 +139,15 @@ def resolve_serial(value):
         Location.objects.filter(id__in=parent_ids, kind__in=Location.CONTAINER_KINDS)
     )
     if len(parents) == 1:
-        return parents[0]
-    if len(slot_locs) == 1:
-        return slot_locs[0]
-    raise AuditError(
-        f"Serial {value!r} maps to several locations; scan the specific LOC barcode."
-    )
+        focus = parents[0]
+    elif len(slot_locs) == 1:
+        focus = slot_locs[0]
+    else:
+        raise AuditError(
+            f"Serial {value!r} maps to several locations; scan the specific LOC barcode."
+        )
+    scan_resolver.remember_focus(value, focus)
+    return focus
 
 
 def visit_location(session, location, previous_location=None):
@@ -244,7 +249,7 @@ def add_or_queue_upc(session, location, upc):
     if location.is_container:
         raise AuditError(f"{location.name} is a container, not a storage spot.")
 
-    product = Product.objects.filter(upc=upc).first()
+    product = scan_resolver.product_for_upc(upc)
     if product is None:
         scan, _ = AuditUnknownScan.objects.get_or_create(
             session=session,
@@ -271,6 +276,83 @@ def add_or_queue_upc(session, location, upc):
     return "added", item
 
 
+@dataclass
+class ScanOutcome:
+    """Result of :func:`apply_scan`.
+
+    Attributes:
+        tag: Bootstrap alert level for the console message.
+        message: User-facing text.
+        location: The active location after the scan (focus may have moved).
+        kind: What the code parsed as (``loc``/``loc_obj``/``upc``/``item``), or
+            empty when it couldn't be parsed.
+        added: The item created by an in-catalog UPC scan; the caller prints its
+            label.
+    """
+
+    tag: str
+    message: str
+    location: Location | None = None
+    kind: str = ""
+    added: InventoryItem | None = None
+
+
+_ITEM_LABELS = {
+    AuditEvent.Action.SCANNED_PRESENT: ("success", "Present"),
+    AuditEvent.Action.MOVED_IN: ("success", "Moved here"),
+    AuditEvent.Action.REVIVED: ("warning", "Revived here"),
+}
+
+
+def apply_scan(session, active, raw_code):
+    """Dispatch one raw console scan against ``active`` (the focused location).
+
+    Shared by the live console and the offline batch sync so both reconcile a
+    code identically. Never raises :class:`AuditError`; it becomes a ``danger``
+    outcome.
+    """
+    kind = ""
+    try:
+        try:
+            kind, value = parse_code(raw_code)
+        except AuditError:
+            # Fall back to a unit serial-number scan (e.g. an AMS/dryer/printer
+            # front-panel tag) before giving up on an unrecognized code.
+            value = resolve_serial(raw_code.strip())
+            kind = "loc_obj"
+        if kind in ("loc", "loc_obj"):
+            if kind == "loc_obj":
+                location = value  # already a resolved Location
+            else:
+                location = scan_resolver.location(value)
+                if location is None:
+                    raise AuditError(f"No location with id {value}.")
+            visit_location(session, location, previous_location=active)
+            return ScanOutcome("info", f"At {location.name}.", location, kind)
+        if kind == "upc":
+            outcome, obj = add_or_queue_upc(session, active, value)
+            if outcome == "added":
+                return ScanOutcome(
+                    "success",
+                    f"Added {obj.product.name} (INV-{obj.pk}).",
+                    active,
+                    kind,
+                    added=obj,
+                )
+            return ScanOutcome(
+                "warning", f"Unknown UPC {value} queued for review.", active, kind
+            )
+        item = InventoryItem.objects.filter(pk=value).first()
+        if item is None:
+            raise AuditError(f"No item with id {value}.")
+        tag, verb = _ITEM_LABELS[scan_item(session, active, item)]
+        return ScanOutcome(
+            tag, f"{verb}: {item.product.name} (INV-{item.pk}).", active, kind
+        )
+    except AuditError as exc:
+        return ScanOutcome("danger", str(exc), active, kind)
+
+
 def close_location(session, location):
     """Idempotently reconcile a focus (a leaf or a whole unit's slots).
 
@@ -295,21 +377,23 @@ def close_location(session, location):
         ).values_list("item_id", flat=True)
     )
 
-    flagged = []
     with transaction.atomic():
         unscanned = InventoryItem.objects.filter(location_id__in=leaf_ids).exclude(
             id__in=scanned_ids
         )
-        for item in unscanned:
-            # UNKNOWN is sticky and not terminal: set_status keeps the location.
-            items.set_status(item, InventoryItem.Status.UNKNOWN)
-            AuditEvent.objects.create(
-                session=session,
-                item=item,
-                location=item.location,
-                action=AuditEvent.Action.FLAGGED_UNKNOWN,
-            )
-            flagged.append(item)
+        # UNKNOWN is sticky and not terminal: the bulk setter keeps the location.
+        flagged = items.bulk_set_status(unscanned, InventoryItem.Status.UNKNOWN)
+        AuditEvent.objects.bulk_create(
+            [
+                AuditEvent(
+                    session=session,
+                    item=item,
+                    location_id=item.location_id,
+                    action=AuditEvent.Action.FLAGGED_UNKNOWN,
+                )
+                for item in flagged
+            ]
+        )
         # The CLOSED marker is keyed to the focus (leaf or container) for idempotency.
         AuditEvent.objects.create(
             session=session, location=location, action=AuditEvent.Action.CLOSED
@@ -332,15 +416,11 @@ def location_present_count(session, location):
 
 def session_added_items(session):
     """Items created via an ADDED scan this session that still exist."""
-    added_ids = list(
-        AuditEvent.objects.filter(
-            session=session, action=AuditEvent.Action.ADDED
-        ).values_list("item_id", flat=True)
-    )
-    return (
-        InventoryItem.objects.filter(id__in=added_ids)
-        .select_related("product", "location")
-        .distinct()
+    added = AuditEvent.objects.filter(
+        session=session, action=AuditEvent.Action.ADDED
+    ).values("item_id")
+    return InventoryItem.objects.filter(id__in=added).select_related(
+        "product", "location"
     )
 
 
@@ -368,17 +448,39 @@ def session_unknown_items(session):
 
     Excludes any that were later re-scanned (revived) at another location.
     """
-    flagged_ids = list(
-        AuditEvent.objects.filter(
-            session=session, action=AuditEvent.Action.FLAGGED_UNKNOWN
-        ).values_list("item_id", flat=True)
-    )
-    return (
-        InventoryItem.objects.filter(
-            id__in=flagged_ids, status=InventoryItem.Status.UNKNOWN
-        )
-        .select_related("product", "location")
-        .distinct()
+    flagged = AuditEvent.objects.filter(
+        session=session, action=AuditEvent.Action.FLAGGED_UNKNOWN
+    ).values("item_id")
+    return InventoryItem.objects.filter(
+        id__in=flagged, status=InventoryItem.Status.UNKNOWN
+    ).select_related("product", "location")
+
+
+def session_tally(session):
+    """The console's running counts for ``session`` in one aggregate query.
+
+    ``unknown`` matches ``session_unknown_items(session).count()``: distinct items
+    flagged this session that are still UNKNOWN.
+    """
+    action = AuditEvent.Action
+
+    def count(kind):
+        return Count("id", filter=Q(action=kind))
+
+    return AuditEvent.objects.filter(session=session).aggregate(
+        present=count(action.SCANNED_PRESENT),
+        moved=count(action.MOVED_IN),
+        revived=count(action.REVIVED),
+        closed=count(action.CLOSED),
+        added=count(action.ADDED),
+        unknown=Count(
+            "item",
+            filter=Q(
+                action=action.FLAGGED_UNKNOWN,
+                item__status=InventoryItem.Status.UNKNOWN,
+            ),
+            distinct=True,
+        ),
     )
 
 
@@ -394,13 +496,13 @@ def finalize(session, active_location=None, keep_unknown_ids=None):
         close_location(session, active_location)
 
     keep = {int(i) for i in (keep_unknown_ids or [])}
-    depleted = []
     with transaction.atomic():
-        for item in session_unknown_items(session):
-            if item.id in keep:
-                continue  # left UNKNOWN on purpose
-            items.deplete(item)  # status DEPLETED, clears location + date
-            depleted.append(item)
+        # Items in ``keep`` are left UNKNOWN on purpose. DEPLETED clears the
+        # location and stamps date_depleted, exactly as items.deplete would.
+        depleted = items.bulk_set_status(
+            session_unknown_items(session).exclude(id__in=keep),
+            InventoryItem.Status.DEPLETED,
+        )
         session.mark_finished(AuditSession.State.FINALIZED)
     return depleted
 
@@ -1,14 +1,23 @@
 """Live Bambu MQTT helper for the spool-sync dry-run: fetch the AMS hardware
 serials via the `get_version` command (the deterministic (device, ams_index) ->
 AMS unit bridge). Read-only; mirrors the connection params of the telemetry
-consumer (run_telemetry_consumer.py). Only `parse_ams_modules` is unit-tested.
+consumer (run_telemetry_consumer.py). Only `parse_ams_modules` and the
+concurrent fan-out in `fetch_ams_serials_all` are unit-tested.
+
+Printers are probed in parallel, one thread each, under one shared deadline. An
+offline printer used to add its full timeout to the run; now the whole run takes
+about as long as the slowest single printer.
 """
 
 import json
 import logging
 import re
 import ssl
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, field
 
 import paho.mqtt.client as mqtt
 
@@ -19,6 +28,22 @@ logger = logging.getLogger("inventory")
 _AMS_MODULE = re.compile(r"^(?:ams|n3f|n3s)/(\d+)$")
 GET_VERSION = json.dumps({"info": {"sequence_id": "0", "command": "get_version"}})
 
+# Upper bound on concurrent MQTT connections per run.
+MAX_PROBE_WORKERS = 16
+
+
+@dataclass
+class Probe:
+    """One printer's get_version round-trip, kept for the sync report.
+
+    ``outcome`` is ``"ok"``, ``"timeout"``, ``"connect_failed"`` or ``"error"``.
+    """
+
+    device: str
+    outcome: str
+    elapsed_s: float
+    serials: dict = field(default_factory=dict)
+
 
 def parse_ams_modules(modules):
     """{ams_index: sn} from a get_version `info.module` list."""
@@ -31,21 +56,36 @@ def parse_ams_modules(modules):
     return out
 
 
-def fetch_ams_serials(device, *, timeout=15):
-    """Connect to one printer, request get_version, return {ams_index: sn}.
+def probe(device, *, timeout=15, deadline=None):
+    """Connect to one printer, request get_version and return a :class:`Probe`.
 
-    Returns {} on connect failure or timeout — the caller treats absent indices
-    as UNMAPPED_AMS rather than crashing.
+    Waits on an event set by the MQTT callbacks, so it returns as soon as the
+    printer answers (or refuses the connection) rather than at the next poll.
+    ``deadline`` (a ``time.monotonic()`` value) overrides ``timeout`` when a
+    caller shares one deadline across printers. Never raises for network
+    trouble: a failed or silent printer comes back with empty ``serials`` and
+    the caller reports its indices as UNMAPPED_AMS.
     """
+    started = time.monotonic()
+    if deadline is None:
+        deadline = started + timeout
     result = {}
-    done = {"flag": False}
+    state = {"outcome": "timeout"}
+    done = threading.Event()
+
+    def finish(outcome):
+        return Probe(device.name, outcome, round(time.monotonic() - started, 2), result)
+
+    if deadline <= started:
+        return finish("timeout")
 
     def on_connect(client, userdata, flags, reason_code, properties=None):
         if reason_code != 0:
             logger.warning(
                 "get_version connect rc=%s for %s", reason_code, device.serial
             )
-            done["flag"] = True
+            state["outcome"] = "connect_failed"
+            done.set()
             return
         client.subscribe(f"device/{device.serial}/report")
         client.publish(f"device/{device.serial}/request", GET_VERSION)
@@ -57,8 +97,8 @@ def fetch_ams_serials(device, *, timeout=15):
             return
         if isinstance(info, dict) and isinstance(info.get("module"), list):
             result.update(parse_ams_modules(info["module"]))
-            done["flag"] = True
-            client.disconnect()
+            state["outcome"] = "ok"
+            done.set()
 
     client = mqtt.Client(
         mqtt.CallbackAPIVersion.VERSION2, client_id=f"inv-syncprobe-{device.serial}"
@@ -66,30 +106,72 @@ def fetch_ams_serials(device, *, timeout=15):
     client.username_pw_set("bblp", device.access_code)
     client.tls_set(cert_reqs=ssl.CERT_NONE)
     client.tls_insecure_set(True)
+    client.connect_timeout = deadline - started
     client.on_connect = on_connect
     client.on_message = on_message
     try:
         client.connect(device.ip_address, 8883, keepalive=30)
     except OSError:
         logger.warning("get_version connect failed for %s", device.serial)
-        return {}
+        return finish("connect_failed")
     client.loop_start()
-    ticks = timeout * 2
-    while ticks > 0 and not done["flag"]:
-        time.sleep(0.5)
-        ticks -= 1
-    client.loop_stop()
+    done.wait(max(0.0, deadline - time.monotonic()))
     try:
         client.disconnect()
     except Exception:  # noqa: BLE001
         pass
-    return result
+    client.loop_stop()
+    return finish(state["outcome"])
+
 
+def fetch_ams_serials(device, *, timeout=15):
+    """Connect to one printer, request get_version, return {ams_index: sn}.
 
-def fetch_ams_serials_all(devices):
-    """{(device.id, ams_index): sn} across all given devices."""
+    Returns {} on connect failure or timeout — the caller treats absent indices
+    as UNMAPPED_AMS rather than crashing.
+    """
+    return probe(device, timeout=timeout).serials
+
+
+def fetch_ams_serials_all(devices, *, timeout=15, probes=None):
+    """{(device.id, ams_index): sn} across all given devices, probed concurrently.
+
+    Every printer shares one deadline of ``timeout`` seconds from the start of
+    the call; probes queued behind :data:`MAX_PROBE_WORKERS` get what is left of
+    it. A probe still running at the deadline is recorded as a timeout and left
+    to wind down on its own (its wait is bounded by the same deadline).
+    Pass a list as ``probes`` to receive one :class:`Probe` per device, in
+    ``devices`` order, for the report.
+    """
+    devices = list(devices)
     out = {}
-    for device in devices:
-        for ams_index, sn in fetch_ams_serials(device).items():
+    if not devices:
+        return out
+    started = time.monotonic()
+    deadline = started + timeout
+    pool = ThreadPoolExecutor(
+        max_workers=min(len(devices), MAX_PROBE_WORKERS),
+        thread_name_prefix="get_version",
+    )
+    futures = [pool.submit(probe, device, deadline=deadline) for device in devices]
+    wait_futures(futures, timeout=timeout)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for device, future in zip(devices, futures, strict=True):
+        if not future.done():
+            elapsed = round(time.monotonic() - started, 2)
+            logger.warning("get_version timed out for %s", device.serial)
+            result = Probe(device.name, "timeout", elapsed)
+        elif future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                logger.warning(
+                    "get_version failed for %s: %s", device.serial, future.exception()
+                )
+            result = Probe(device.name, "error", round(time.monotonic() - started, 2))
+        else:
+            result = future.result()
+        for ams_index, sn in result.serials.items():
             out[(device.id, ams_index)] = sn
+        if probes is not None:
+            probes.append(result)
     return out
@@ -517,6 +517,33 @@ def print_label_image(
     connection within BROTHER_QL_CONNECT_TIMEOUT_S, rather than blocking on the
     OS socket timeout.
     """
+    print_label_images(
+        [img],
+        label=label,
+        rotate=rotate,
+        threshold=threshold,
+        dither=dither,
+        compress=compress,
+    )
+
+
+def print_label_images(
+    imgs: list[Image.Image],
+    label: str | None = None,
+    rotate: str = "auto",
+    threshold: float = 70.0,
+    dither: bool = False,
+    compress: bool = False,
+) -> None:
+    """
+    Print several prepared label images as one print job.
+
+    Same parameters as print_label_image(). The printer is probed once and all
+    pages go out in a single raster stream over one connection, so a batch of
+    N labels costs one reachability check instead of N.
+    """
+    if not imgs:
+        return
     if not _printer_reachable():
         host, port = _printer_host_port()
         raise PrinterUnreachableError(
@@ -534,7 +561,7 @@ def print_label_image(
 
     instructions = convert(
         qlr=qlr,
-        images=[img],
+        images=list(imgs),
         label=label,
         rotate=rotate,
         threshold=threshold,
@@ -545,7 +572,8 @@ def print_label_image(
     backend = _get_backend()
     backend.write(instructions)
     logger.info(
-        "Sent label to printer '%s' at '%s' with label type '%s'.",
+        "Sent %d label(s) to printer '%s' at '%s' with label type '%s'.",
+        len(imgs),
         BROTHER_QL_MODEL,
         BROTHER_QL_HOST,
         label,
@@ -586,6 +614,22 @@ def generate_and_print_label(
 # ---------------------------------------------------------------------------
 
 
+def _get_product_for_item(item):
+    """
+    The item's product, as its real subclass.
+
+    Uses the instance already loaded on the item when there is one; otherwise
+    loads it through the scan resolver (one query instead of the FK load plus
+    the polymorphic fan-out).
+    """
+    from .models import InventoryItem
+    from .scan_resolver import product as resolve_product
+
+    if not isinstance(item, InventoryItem) or InventoryItem.product.is_cached(item):
+        return getattr(item, "product", None)
+    return resolve_product(item.product_id)
+
+
 def _get_upc_for_item(item) -> str | None:
     """
     Extract the UPC (or equivalent) from an inventory item.
@@ -597,10 +641,11 @@ def _get_upc_for_item(item) -> str | None:
 
     Returns a string or None.
     """
+    product = _get_product_for_item(item)
     # TODO: tweak this to match your actual Product fields
     for attr in ("upc", "gtin", "barcode"):
         try:
-            value = getattr(item.product, attr, None)
+            value = getattr(product, attr, None)
         except AttributeError:
             continue
         if value:
@@ -674,60 +719,18 @@ def print_unit_label(serial: str, location_pk: int, location_name: str) -> HttpR
     )
 
 
-def generate_and_print_barcode(
-    item,
-    mode: str,
-    profile: LabelProfile | None = None,
-    **print_kwargs,
-) -> HttpResponse:
-    """
-    High-level helper used by the rest of the app.
-
-    Parameters:
-        item: InventoryItem (or similar) instance.
-        mode: "upc" or "unique" (case-insensitive).
-        profile: optional LabelProfile (defaults to DEFAULT_PROFILE).
-
-    Behavior:
-        - In "UPC" mode:
-            * Encodes the product's UPC/GTIN/etc in the barcode.
-            * Text shows "<item name> | <UPC>".
-        - In "Unique" mode:
-            * Encodes a unique item code (e.g. "INV-123").
-            * Text shows that unique code (and optionally item name).
-
-    Returns:
-        HttpResponse: HTTP response containing the barcode image.
+def _barcode_label(item, mode: str) -> tuple[str, str, str | None]:
+    """Resolve (data, text, qr_value) for an item's label in ``mode``.
 
-    Raises:
-        ValueError: if there's an error generating or printing the barcode.
+    Raises ValueError for a missing item, a missing UPC in UPC mode, or an
+    unknown mode (see generate_and_print_barcode()).
     """
-
     # Validate input parameters
     if not item:
         logger.error("Cannot generate barcode: No item provided")
         raise ValueError("Cannot generate barcode: No item provided")
 
-        # Determine barcode data based on mode
-    if mode == "upc":
-        if (
-            not hasattr(item, "product")
-            or not item.product
-            or not hasattr(item.product, "upc")
-        ):
-            logger.error("Cannot generate UPC barcode: Item has no product or UPC")
-            raise ValueError("Cannot generate UPC barcode: Item has no product or UPC")
-        data = item.product.upc
-    elif mode == "unique":
-        if not hasattr(item, "id"):
-            logger.error("Cannot generate unique barcode: Item has no ID")
-            raise ValueError("Cannot generate unique barcode: Item has no ID")
-        data = f"INV-{item.id}"
-
     mode_lower = (mode or "").lower()
-    if profile is None:
-        profile = DEFAULT_PROFILE
-
     item_name = _get_item_display_name(item)
 
     if mode_lower == "upc":
@@ -751,21 +754,88 @@ def generate_and_print_barcode(
             f"Unknown barcode mode: {mode!r} (expected 'UPC' or 'Unique')."
         )
 
+    qr_value = (
+        label_qr_url(data) if mode_lower in ("unique", "inv", "inventory") else None
+    )
+    return data, text, qr_value
+
+
+def generate_and_print_barcode(
+    item,
+    mode: str,
+    profile: LabelProfile | None = None,
+    **print_kwargs,
+) -> HttpResponse:
+    """
+    High-level helper used by the rest of the app.
+
+    Parameters:
+        item: InventoryItem (or similar) instance.
+        mode: "upc" or "unique" (case-insensitive).
+        profile: optional LabelProfile (defaults to DEFAULT_PROFILE).
+
+    Behavior:
+        - In "UPC" mode:
+            * Encodes the product's UPC/GTIN/etc in the barcode.
+            * Text shows "<item name> | <UPC>".
+        - In "Unique" mode:
+            * Encodes a unique item code (e.g. "INV-123").
+            * Text shows that unique code (and optionally item name).
+
+    Returns:
+        HttpResponse: HTTP response containing the barcode image.
+
+    Raises:
+        ValueError: if there's an error generating or printing the barcode.
+    """
+    data, text, qr_value = _barcode_label(item, mode)
+    if profile is None:
+        profile = DEFAULT_PROFILE
+
     logger.info(
         "Printing barcode for item %r in mode='%s' with data='%s'.",
         item,
         mode,
         data,
     )
-    qr_value = (
-        label_qr_url(data) if mode_lower in ("unique", "inv", "inventory") else None
-    )
     response = generate_and_print_label(
         data=data, text=text, profile=profile, qr_value=qr_value, **print_kwargs
     )
     return response
 
 
+def generate_and_print_barcodes(
+    items,
+    mode: str,
+    profile: LabelProfile | None = None,
+    **print_kwargs,
+) -> int:
+    """
+    Batch form of generate_and_print_barcode(): one print job for all items.
+
+    Renders every label first, then sends them together through
+    print_label_images(). Returns the number of labels rendered.
+
+    Raises:
+        ValueError: if any item can't be labelled (nothing is printed).
+    """
+    profile = profile or DEFAULT_PROFILE
+    imgs = []
+    for item in items:
+        data, text, qr_value = _barcode_label(item, mode)
+        imgs.append(
+            create_label_image(data=data, text=text, profile=profile, qr_value=qr_value)
+        )
+    if not imgs:
+        return 0
+    if settings.ENABLE_BARCODE_PRINTING:
+        print_kwargs.setdefault("label", profile.code)
+        print_label_images(imgs, **print_kwargs)
+    else:
+        logger.info("[TEST MODE] Skipping actual print of %d label(s)", len(imgs))
+    return len(imgs)
+
+
 __all__ = [
     "LabelProfile",
     "DEFAULT_PROFILE",
@@ -773,7 +843,9 @@ __all__ = [
     "generate_barcode_to_fit",
     "create_label_image",
     "print_label_image",
+    "print_label_images",
     "generate_and_print_label",
     "print_unit_label",
     "generate_and_print_barcode",
+    "generate_and_print_barcodes",
 ]
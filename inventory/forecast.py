@@ -0,0 +1,167 @@
+"""Filament consumption forecast: burn rate, days of cover and reorder points.
+
+The dashboard's low-stock alerts count spools against ``LOW_QUANTITY``. This
+module works in grams from actual use instead, per filament product:
+
+- **burn rate** — an EWMA of grams/day over the last ``FORECAST_LOOKBACK_DAYS``
+  complete days, read from the per-day
+  :class:`~inventory.models.PrinterDailyConsumption` rows that
+  :mod:`inventory.printjobs` keeps. Days without use count as zero;
+  ``alpha = 1 - 0.5 ** (1 / FORECAST_HALF_LIFE_DAYS)`` and the average starts
+  at the window mean, so a short history isn't dragged toward zero.
+- **on hand** — ``percent_remaining`` × catalog ``weight`` over active spools.
+- **days of cover** — on hand / burn rate (none while nothing is used).
+- **reorder point** — burn rate × (``FORECAST_LEAD_TIME_DAYS`` +
+  ``FORECAST_SAFETY_DAYS``); a product needs reordering once on hand falls to it.
+
+Only filaments with a catalog ``weight`` are forecast (on-hand grams need it).
+The inputs are two grouped queries plus the weights, and the series maths runs
+over every product in one pass. :func:`refresh` replaces the
+:class:`~inventory.models.ConsumptionForecast` rows and stamps the
+:class:`~inventory.models.ConsumptionForecastRun` marker; :func:`current`
+refreshes only when that stamp is from an earlier day (even if the last run
+stored no rows), so the dashboard and ``/api/forecasts/`` pay for it at most
+once a day.
+``manage.py forecast_consumption`` forces a refresh.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from . import items
+from .models import (
+    ConsumptionForecast,
+    ConsumptionForecastRun,
+    Filament,
+    InventoryItem,
+    PrinterDailyConsumption,
+)
+
+logger = logging.getLogger("inventory")
+
+# Below this many grams/day a product counts as unused (no cover, no reorder).
+MIN_BURN_G = 0.005
+
+
+def _daily_usage(product_ids, first_day, last_day):
+    """{product_id: [grams per day, first_day..last_day]}, zero-filled."""
+    span = (last_day - first_day).days + 1
+    series = defaultdict(lambda: [0.0] * span)
+    rows = (
+        PrinterDailyConsumption.objects.filter(
+            product_id__in=product_ids, day__gte=first_day, day__lte=last_day
+        )
+        .values("product_id", "day")
+        .annotate(grams=Sum("grams"))
+        .order_by()
+    )
+    for row in rows:
+        series[row["product_id"]][(row["day"] - first_day).days] += float(
+            row["grams"] or 0
+        )
+    return series
+
+
+def ewma(values, alpha):
+    """Exponentially weighted mean of ``values`` (oldest first), seeded at their mean."""
+    if not values:
+        return 0.0
+    level = sum(values) / len(values)
+    for value in values:
+        level = alpha * value + (1 - alpha) * level
+    return level
+
+
+def _on_hand(product_ids):
+    """{product_id: (active spool count, summed percent_remaining)}."""
+    return {
+        row["product_id"]: (row["spools"], float(row["percent"] or 0))
+        for row in InventoryItem.objects.filter(product_id__in=product_ids)
+        .exclude(status__in=items.TERMINAL_STATUSES)
+        .values("product_id")
+        .annotate(spools=Count("id"), percent=Sum("percent_remaining"))
+        .order_by()
+    }
+
+
+def compute(today=None):
+    """Unsaved :class:`ConsumptionForecast` rows for every weighted filament
+    that is in stock or was used in the lookback window."""
+    today = today or timezone.localdate()
+    last_day = today - timedelta(days=1)
+    first_day = today - timedelta(days=settings.FORECAST_LOOKBACK_DAYS)
+    alpha = 1 - 0.5 ** (1 / max(settings.FORECAST_HALF_LIFE_DAYS, 1))
+    cover_days = settings.FORECAST_LEAD_TIME_DAYS + settings.FORECAST_SAFETY_DAYS
+
+    weights = dict(Filament.objects.filter(weight__gt=0).values_list("pk", "weight"))
+    usage = _daily_usage(list(weights), first_day, last_day)
+    stock = _on_hand(list(weights))
+
+    now = timezone.now()
+    forecasts = []
+    for product_id in sorted(usage.keys() | stock.keys()):
+        burn = ewma(usage.get(product_id, []), alpha)
+        spools, percent = stock.get(product_id, (0, 0.0))
+        on_hand = percent * float(weights[product_id]) * 10  # % of kg -> g
+        reorder_point = burn * cover_days
+        forecasts.append(
+            ConsumptionForecast(
+                product_id=product_id,
+                computed_at=now,
+                burn_g_per_day=Decimal(f"{burn:.2f}"),
+                on_hand_g=Decimal(f"{on_hand:.2f}"),
+                on_hand_count=spools,
+                days_of_cover=(
+                    Decimal(f"{on_hand / burn:.1f}") if burn >= MIN_BURN_G else None
+                ),
+                reorder_point_g=Decimal(f"{reorder_point:.2f}"),
+                needs_reorder=burn >= MIN_BURN_G and on_hand <= reorder_point,
+            )
+        )
+    return forecasts
+
+
+@transaction.atomic
+def refresh(today=None):
+    """Replace the stored forecast with a fresh :func:`compute`; returns the rows."""
+    forecasts = compute(today)
+    ConsumptionForecast.objects.all().delete()
+    ConsumptionForecast.objects.bulk_create(forecasts)
+    ConsumptionForecastRun.objects.update_or_create(
+        pk=1, defaults={"computed_at": timezone.now()}
+    )
+    logger.info(
+        "Consumption forecast: %d product(s), %d to reorder",
+        len(forecasts),
+        sum(f.needs_reorder for f in forecasts),
+    )
+    return forecasts
+
+
+def current():
+    """Refresh the stored forecast if it wasn't computed today."""
+    stamp = (
+        ConsumptionForecastRun.objects.filter(pk=1)
+        .values_list("computed_at", flat=True)
+        .first()
+    )
+    if stamp is None or timezone.localdate(stamp) < timezone.localdate():
+        refresh()
+
+
+def reorder_list(limit=None):
+    """Products due for reorder, least cover first (refreshing if stale)."""
+    current()
+    qs = (
+        ConsumptionForecast.objects.filter(needs_reorder=True)
+        .select_related("product")
+        .order_by("days_of_cover", "product__name")
+    )
+    return list(qs[:limit] if limit else qs)
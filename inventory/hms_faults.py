@@ -0,0 +1,149 @@
+"""HMS faults from telemetry: open and resolve ``MaintenanceEvent`` rows.
+
+A Bambu report's ``hms`` key is the printer's full list of active Health
+Management System alerts, each ``{"attr": int, "code": int}``.
+:func:`inventory.telemetry.ingest_report` hands every such list to
+:func:`observe`, which diffs it against the unit's open HMS faults:
+
+- a code that appeared opens an unresolved ``FAULT`` event on the printer's
+  linked :class:`~inventory.models.InventoryItem` (``PrinterDevice.item``),
+  titled and keyed by its ``HMS_xxxx_xxxx_xxxx_xxxx`` code, with the severity
+  the code carries;
+- a code that cleared resolves its open event and records how long it was
+  active as ``downtime_hours``. Hand-logged faults without a full code are
+  never touched.
+
+Reports repeat the same list for as long as an alert is active, so the last
+set seen per device is kept in memory and an unchanged list costs no queries.
+A changed list costs one read of the open faults plus one batched insert
+and/or update, and the first report after a restart is diffed against the
+database rather than trusted. Nothing happens for a printer with no linked
+item, or when ``HMS_FAULT_SYNC`` is off.
+"""
+
+import logging
+import re
+import threading
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import maintenance
+from .models import MaintenanceEvent, is_machine_item
+
+logger = logging.getLogger("inventory")
+
+# The severity half-word of an HMS code (Bambu: 1 fatal .. 4 info).
+SEVERITIES = {
+    1: MaintenanceEvent.Severity.CRITICAL,
+    2: MaintenanceEvent.Severity.MAJOR,
+    3: MaintenanceEvent.Severity.MINOR,
+    4: MaintenanceEvent.Severity.INFO,
+}
+
+# Largest value MaintenanceEvent.downtime_hours holds.
+MAX_DOWNTIME_HOURS = Decimal("9999.99")
+
+# Only open faults carrying a full code are managed here; a hand-logged fault
+# with a partial or no code is left for a person to resolve.
+FULL_CODE = re.compile(r"^[0-9A-F]{4}(_[0-9A-F]{4}){3}$")
+
+_active = {}
+_lock = threading.Lock()
+
+
+def hms_code(entry):
+    """``"0300_0100_0002_0001"`` for a report entry, or None if malformed."""
+    if not isinstance(entry, dict):
+        return None
+    try:
+        attr, code = int(entry["attr"]), int(entry["code"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return "_".join(
+        f"{part:04X}" for part in (attr >> 16, attr & 0xFFFF, code >> 16, code & 0xFFFF)
+    )
+
+
+def severity(code):
+    """The :class:`MaintenanceEvent.Severity` an HMS code string carries."""
+    return SEVERITIES.get(int(code.split("_")[2], 16), MaintenanceEvent.Severity.MAJOR)
+
+
+def forget(device_id=None):
+    """Drop the remembered active set for one device, or all of them."""
+    with _lock:
+        if device_id is None:
+            _active.clear()
+        else:
+            _active.pop(device_id, None)
+
+
+def _downtime(event, now):
+    hours = Decimal((now - event.occurred_at).total_seconds()) / Decimal(3600)
+    return min(max(hours, Decimal(0)), MAX_DOWNTIME_HOURS).quantize(Decimal("0.01"))
+
+
+def observe(device, entries, *, now=None):
+    """Sync ``device``'s open HMS faults with the active ``entries``.
+
+    Returns ``(opened, resolved)`` event lists; both are empty when the set is
+    unchanged since the last call for this device.
+    """
+    unit = device.item if device.item_id else None
+    if unit is None:
+        return [], []
+    codes = frozenset(filter(None, (hms_code(e) for e in entries or [])))
+    seen = (unit.pk, codes)
+    with _lock:
+        if _active.get(device.pk) == seen:
+            return [], []
+
+    now = now or timezone.now()
+    open_events = {}
+    stale = []
+    for event in MaintenanceEvent.objects.filter(
+        unit=unit, kind=MaintenanceEvent.Kind.FAULT, resolved=False
+    ).exclude(hms_code=""):
+        if not FULL_CODE.match(event.hms_code):
+            continue
+        if event.hms_code in codes and event.hms_code not in open_events:
+            open_events[event.hms_code] = event
+        else:
+            stale.append(event)
+    new_codes = sorted(codes - open_events.keys())
+    if new_codes and not is_machine_item(unit):
+        logger.warning("HMS on %s not recorded: item is not a machine", device.name)
+        new_codes = []
+
+    opened = [
+        MaintenanceEvent(
+            unit=unit,
+            kind=MaintenanceEvent.Kind.FAULT,
+            severity=severity(code),
+            occurred_at=now,
+            title=f"HMS_{code}",
+            hms_code=code,
+            resolved=False,
+        )
+        for code in new_codes
+    ]
+    for event in stale:
+        event.resolved = True
+        event.downtime_hours = _downtime(event, now)
+    if opened or stale:
+        with transaction.atomic():
+            MaintenanceEvent.objects.bulk_create(opened)
+            MaintenanceEvent.objects.bulk_update(stale, ["resolved", "downtime_hours"])
+        # Bulk writes send no signals; drop the reliability rollup by hand.
+        maintenance.forget_reliability()
+        logger.info(
+            "HMS on %s: opened %s, resolved %s",
+            device.name,
+            ", ".join(new_codes) or "none",
+            ", ".join(event.hms_code for event in stale) or "none",
+        )
+    with _lock:
+        _active[device.pk] = seen
+    return opened, stale
@@ -0,0 +1,126 @@
+"""Precomputed location/status change events for items.
+
+The item page's timeline used to load every simple-history snapshot of the item
+and ``diff_against`` each consecutive pair on every render, and there was no
+cheap way to ask "what moved lately?" across items. This module writes one
+:class:`~inventory.models.ItemChangeEvent` per save that changes an item's
+``location`` and/or ``status`` instead, at the moment it happens:
+
+- the old values come from the rows' loaded snapshots
+  (:class:`~inventory.models.TrackedFieldsMixin`), so saves that don't touch
+  either field cost nothing and a save that does costs one insert;
+- callers are the post_save signal and the set-based paths in
+  :mod:`inventory.items`, which write a whole batch in one ``bulk_create``.
+
+Readers are :meth:`~inventory.models.InventoryItem.location_status_timeline`
+and :func:`recent_moves`, each one indexed query with the locations joined in.
+Creating an item isn't a change (the timeline never showed it). :func:`rebuild`
+re-derives everything from the history tables
+(``manage.py rebuild_item_events``).
+"""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import InventoryItem, ItemChangeEvent, Location
+
+logger = logging.getLogger("inventory")
+
+# Rows shown by the recent-moves feed.
+FEED_LIMIT = 100
+
+# Rows per INSERT when rebuilding.
+REBUILD_BATCH = 1000
+
+
+def _event(item_id, changed_at, old_location, new_location, old_status, new_status):
+    """The unsaved event for one save, or None if neither field changed."""
+    location_changed = old_location != new_location
+    status_changed = old_status != new_status
+    if not (location_changed or status_changed):
+        return None
+    return ItemChangeEvent(
+        item_id=item_id,
+        changed_at=changed_at,
+        location_changed=location_changed,
+        location_from_id=old_location,
+        location_to_id=new_location,
+        status_changed=status_changed,
+        status_from=old_status,
+        status_to=new_status,
+    )
+
+
+def record(items, *, stamp=None):
+    """Write an event for each of ``items`` whose location or status changed.
+
+    Must run before the items re-snapshot (i.e. from a post_save receiver or
+    before :meth:`~inventory.models.TrackedFieldsMixin.snapshot_tracked`).
+    Returns the events written.
+    """
+    stamp = stamp or timezone.now()
+    events = []
+    for item in items:
+        event = _event(
+            item.pk,
+            stamp,
+            item.loaded_value("location_id"),
+            item.location_id,
+            item.loaded_value("status"),
+            item.status,
+        )
+        if event is not None:
+            events.append(event)
+    if events:
+        ItemChangeEvent.objects.bulk_create(events)
+    return events
+
+
+def recent_moves(limit=FEED_LIMIT):
+    """The latest location changes across all items, newest first."""
+    return list(
+        ItemChangeEvent.objects.filter(location_changed=True).select_related(
+            "item__product", "location_from", "location_to"
+        )[:limit]
+    )
+
+
+def rebuild():
+    """Re-derive every event from the items' simple-history snapshots.
+
+    Consecutive snapshots of an item are compared the way the timeline used to
+    diff them. Events are inserted oldest first, so row order matches time
+    order. A location deleted since is recorded as None. Returns the number of
+    events written.
+    """
+    locations = set(Location.objects.values_list("pk", flat=True))
+    snapshots = (
+        InventoryItem.history.filter(id__in=InventoryItem.objects.values("pk"))
+        .exclude(history_type="-")
+        .order_by("id", "history_date", "history_id")
+        .values_list("id", "history_date", "history_id", "location_id", "status")
+    )
+    found = []
+    previous = None
+    for row in snapshots.iterator():
+        item_id, changed_at, history_id, location_id, status = row
+        if previous is not None and previous[0] == item_id:
+            event = _event(
+                item_id, changed_at, previous[3], location_id, previous[4], status
+            )
+            if event is not None:
+                for side in ("location_from_id", "location_to_id"):
+                    if getattr(event, side) not in locations:
+                        setattr(event, side, None)
+                found.append((changed_at, history_id, event))
+        previous = (item_id, changed_at, history_id, location_id, status)
+    found.sort(key=lambda entry: entry[:2])
+    with transaction.atomic():
+        ItemChangeEvent.objects.all().delete()
+        ItemChangeEvent.objects.bulk_create(
+            [event for _, _, event in found], batch_size=REBUILD_BATCH
+        )
+    logger.info("Item change events rebuilt: %d events", len(found))
+    return len(found)
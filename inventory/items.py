@@ -20,20 +20,38 @@ consistently:
   model derive status from ``location.default_status`` via the existing save path.
 - :func:`deplete` — wraps :meth:`InventoryItem.mark_depleted` + save.
 - :func:`set_status` — the single explicit-status setter (sticky-safe).
+- :func:`bulk_set_status` / :func:`bulk_move` / :func:`bulk_update_fields` —
+  set-based equivalents for large batches (bulk edit, audit close/finalize):
+  ``UPDATE`` per group, batched history rows, FTS updates, spend-ledger
+  postings and item change events, no ``save()``.
+- :func:`bulk_add` — places many *new* items at once (receiving a case):
+  one ``bulk_create``, one batch of history rows, one FTS insert batch.
 
 The move guard (container rejection + slot capacity) lives in :func:`move_to`, so
 no view/audit code re-implements it.
 """
 
+import logging
+from collections import defaultdict
 from dataclasses import dataclass
 
+from django.db import transaction
+from django.utils.timezone import now
+
+from . import item_events, occupancy, scan_resolver, search_index, spend_ledger
 from .models import InventoryItem
 
+logger = logging.getLogger("inventory")
+
 # Statuses that mean the item no longer physically occupies a location. Used to
 # decide whether an item counts against a destination's capacity. UNKNOWN is
 # *not* here: an item flagged unknown is still physically sitting in its slot.
 TERMINAL_STATUSES = (InventoryItem.Status.DEPLETED, InventoryItem.Status.SOLD)
 
+# Rows per UPDATE in the bulk paths; keeps ``pk IN (...)`` well under SQLite's
+# bound-parameter limit.
+BULK_CHUNK_SIZE = 500
+
 
 @dataclass
 class Result:
@@ -63,14 +81,10 @@ def _active_count_at(location, *, exclude_pk=None):
     """Count items currently at ``location`` with a non-terminal status.
 
     ``exclude_pk`` skips the item being moved so re-placing an item already in the
-    slot never trips its own capacity.
+    slot never trips its own capacity. Reads through :mod:`inventory.occupancy`,
+    so inside a scope repeated checks against the same slots cost no queries.
     """
-    qs = InventoryItem.objects.filter(location=location).exclude(
-        status__in=TERMINAL_STATUSES
-    )
-    if exclude_pk is not None:
-        qs = qs.exclude(pk=exclude_pk)
-    return qs.count()
+    return occupancy.current().count(location.id, exclude_pk=exclude_pk)
 
 
 def _check_move_guard(item, location, *, enforce_capacity=True):
@@ -186,3 +200,277 @@ def set_status(item, status):
     item._skip_status_from_location = True
     item.save()
     return Result(ok=True, item=item)
+
+
+@dataclass
+class BulkResult:
+    """Outcome of :func:`bulk_move`: all-or-nothing, like :class:`Result`."""
+
+    ok: bool
+    items: list
+    message: str = ""
+
+
+def _terminal_fields(status, stamp):
+    """Columns ``save()`` writes for a DEPLETED/SOLD item (the ``mark_*`` hooks)."""
+    if status == InventoryItem.Status.DEPLETED:
+        return {"location": None, "date_depleted": stamp}
+    if status == InventoryItem.Status.SOLD:
+        return {"location": None, "date_sold": stamp}
+    return {}
+
+
+def _bulk_write(groups, stamp, *, per_item=False):
+    """Apply ``[(items, fields), ...]`` set-based, then history and FTS.
+
+    One ``UPDATE`` per group per :data:`BULK_CHUNK_SIZE` rows, one batch each of
+    history rows and change events for everything, and one ``executemany`` over
+    the FTS location column per group that changes the location. The pre_save
+    logger is replaced by one summary line per group. With ``per_item`` (many
+    small groups of per-item values) every group writing the same columns goes
+    out in one ``bulk_update`` (a ``CASE`` per column) instead of an ``UPDATE``
+    each.
+    """
+    written = []
+    touched = set()
+    serials = set()
+    with transaction.atomic():
+        for group, fields in groups:
+            if not per_item:
+                pks = [item.pk for item in group]
+                for start in range(0, len(pks), BULK_CHUNK_SIZE):
+                    InventoryItem.objects.filter(
+                        pk__in=pks[start : start + BULK_CHUNK_SIZE]
+                    ).update(**fields)
+            for item in group:
+                touched.add(item.loaded_value("location_id"))
+                if "serial_number" in fields:
+                    serials.update((item.serial_number, fields["serial_number"]))
+                for name, value in fields.items():
+                    setattr(item, name, value)
+                touched.add(item.location_id)
+            written.extend(group)
+        if per_item:
+            columns = defaultdict(list)
+            for group, fields in groups:
+                columns[tuple(sorted(fields))].extend(group)
+            for names, group in columns.items():
+                InventoryItem.objects.bulk_update(
+                    group, names, batch_size=BULK_CHUNK_SIZE
+                )
+        InventoryItem.history.bulk_history_create(
+            written, update=True, default_date=stamp
+        )
+        spend_ledger.record_items(written)
+        item_events.record(written, stamp=stamp)
+    for item in written:
+        item.snapshot_tracked()
+    occupancy.forget(*touched)
+    scan_resolver.forget_serial(*serials)
+
+    for group, fields in groups:
+        pks = [item.pk for item in group]
+        if "location" in fields:
+            try:
+                search_index.reindex_location(pks, fields["location"])
+            except Exception:  # never let indexing break a write
+                logger.exception("FTS location update failed for %d items", len(pks))
+        logger.info(
+            "Bulk update %s for %d item(s): %s",
+            ", ".join(
+                f"{k}={getattr(v, 'pk', v)}"
+                for k, v in fields.items()
+                if k != "last_modified"
+            ),
+            len(pks),
+            ", ".join(str(pk) for pk in pks),
+        )
+
+
+def bulk_set_status(items, status, *, fields=None):
+    """:func:`set_status` for many items at once, without a ``save()`` per item.
+
+    Writes the same columns the per-item path would (status, ``last_modified``,
+    and for DEPLETED/SOLD the cleared location plus its date). A status-only
+    change leaves the indexed text untouched, so nothing is reindexed.
+    ``fields`` adds plain column values (e.g. ``shipment``) to the same write.
+
+    ``items`` are mutated to match the database and returned as a list.
+    """
+    items = list(items)
+    if not items:
+        return items
+    stamp = now()
+    changes = {**(fields or {}), "status": status, "last_modified": stamp}
+    changes.update(_terminal_fields(status, stamp))
+    _bulk_write([(items, changes)], stamp)
+    return items
+
+
+def _moved_status(item, location, status):
+    """The status ``move_to(item, location, status=status)`` would save."""
+    if status is not None:
+        return status
+    original = item.loaded_value("location_id", item.location_id)
+    if location is None or item.status in InventoryItem.STICKY_STATUSES:
+        return item.status
+    if original == location.id:
+        return item.status
+    if location.default_status in InventoryItem.Status.values:
+        return location.default_status
+    return item.status
+
+
+def bulk_move(items, location, *, status=None, enforce_capacity=True, fields=None):
+    """:func:`move_to` for many items into one ``location`` (or None), set-based.
+
+    Status follows the same rules as the per-item path: an explicit ``status``
+    wins; otherwise non-sticky items arriving from elsewhere take the
+    destination's ``default_status`` and sticky ones keep theirs (a DEPLETED or
+    SOLD item is re-marked by ``save()``, so it stays location-less). Items are
+    written in one group per resulting status.
+
+    The move guard runs once for the whole batch: a container is rejected, and
+    with ``enforce_capacity`` the batch is rejected if the destination would end
+    up over capacity. No drying check (the bulk form never ran one).
+    """
+    items = list(items)
+    rejection = _check_move_guard(None, location, enforce_capacity=False)
+    if rejection is not None:
+        return BulkResult(ok=False, items=items, message=rejection)
+    if not items:
+        return BulkResult(ok=True, items=items)
+
+    targets = {item.pk: _moved_status(item, location, status) for item in items}
+    capacity = location.capacity if location is not None else None
+    if enforce_capacity and capacity is not None:
+        # Active items there now, minus batch members already among them (they
+        # are counted again below), plus every batch member that ends up active.
+        already_here = sum(
+            1
+            for item in items
+            if item.location_id == location.id and item.status not in TERMINAL_STATUSES
+        )
+        arriving = sum(1 for s in targets.values() if s not in TERMINAL_STATUSES)
+        occupied = _active_count_at(location) - already_here
+        if occupied + arriving > capacity:
+            return BulkResult(
+                ok=False,
+                items=items,
+                message=(
+                    f"{location.name} would be over capacity "
+                    f"({occupied + arriving}/{capacity}) — nothing was moved."
+                ),
+            )
+
+    stamp = now()
+    by_status = {}
+    for item in items:
+        by_status.setdefault(targets[item.pk], []).append(item)
+    groups = []
+    for new_status, group in by_status.items():
+        changes = {
+            **(fields or {}),
+            "location": location,
+            "status": new_status,
+            "last_modified": stamp,
+        }
+        changes.update(_terminal_fields(new_status, stamp))
+        groups.append((group, changes))
+    _bulk_write(groups, stamp)
+    return BulkResult(ok=True, items=items)
+
+
+def bulk_add(new_items, location, *, enforce_capacity=True):
+    """:func:`move_to` for many unsaved items placed at one ``location``.
+
+    Each item's status comes from ``location.default_status`` exactly as
+    ``save()`` would derive it for a new item. The move guard runs once for
+    the batch: a container is rejected, and with ``enforce_capacity`` so is a
+    batch that would overfill the destination. No drying check.
+
+    Inserts with one ``bulk_create`` (so no per-item ``save()`` or signals),
+    then writes the history rows and FTS documents in one batch each. The
+    items come back saved, with primary keys.
+    """
+    new_items = list(new_items)
+    rejection = _check_move_guard(None, location, enforce_capacity=False)
+    if rejection is not None:
+        return BulkResult(ok=False, items=new_items, message=rejection)
+    if not new_items:
+        return BulkResult(ok=True, items=new_items)
+
+    capacity = location.capacity if location is not None else None
+    if enforce_capacity and capacity is not None:
+        occupied = _active_count_at(location)
+        if occupied + len(new_items) > capacity:
+            return BulkResult(
+                ok=False,
+                items=new_items,
+                message=(
+                    f"{location.name} would be over capacity "
+                    f"({occupied + len(new_items)}/{capacity}) — nothing was added."
+                ),
+            )
+
+    stamp = now()
+    for item in new_items:
+        item.location = location
+        if item.status not in InventoryItem.STICKY_STATUSES:
+            item.status = item.update_status() or item.status
+        item.last_modified = stamp
+    with transaction.atomic():
+        created = InventoryItem.objects.bulk_create(new_items)
+        for item in created:
+            item.snapshot_tracked()
+        InventoryItem.history.bulk_history_create(created, default_date=stamp)
+        spend_ledger.record_items(created, created=True)
+    occupancy.forget(getattr(location, "id", None))
+
+    try:
+        search_index.index_items(created)
+    except Exception:  # never let indexing break a write
+        logger.exception("FTS index failed for %d new items", len(created))
+    logger.info(
+        "Added %d item(s) at location=%s: %s",
+        len(created),
+        getattr(location, "pk", None),
+        ", ".join(str(item.pk) for item in created),
+    )
+    return BulkResult(ok=True, items=created)
+
+
+def bulk_update_fields(items, **fields):
+    """Write plain columns (no status/location semantics) to many items.
+
+    The set-based counterpart of assigning attributes and calling ``save()``:
+    stamps ``last_modified`` and records history. Returns the items as a list.
+    """
+    items = list(items)
+    if items:
+        stamp = now()
+        _bulk_write([(items, {**fields, "last_modified": stamp})], stamp)
+    return items
+
+
+def bulk_update_values(changes):
+    """:func:`bulk_update_fields` with per-item values: ``[(item, fields), ...]``.
+
+    Every item is written by one ``bulk_update`` per :data:`BULK_CHUNK_SIZE`
+    rows; history and the spend ledger are still one batch. Returns the items
+    as a list.
+    """
+    groups = defaultdict(list)
+    for item, fields in changes:
+        groups[tuple(sorted(fields.items()))].append(item)
+    if groups:
+        stamp = now()
+        _bulk_write(
+            [
+                (group, {**dict(key), "last_modified": stamp})
+                for key, group in groups.items()
+            ],
+            stamp,
+            per_item=True,
+        )
+    return [item for group in groups.values() for item in group]
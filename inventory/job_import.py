@@ -0,0 +1,211 @@
+"""Bulk import of historical print jobs from slicer files (3MF / gcode).
+
+``manage.py import_print_jobs <dir> --printer <printer>`` walks a directory of
+sliced files and records one completed ``source=IMPORT``
+:class:`~inventory.models.PrintJob` per file:
+
+- **parse** — :mod:`inventory.slicer_metadata` reads each file's slicer
+  metadata (estimated time, grams/type/colour per extruder) and hashes it,
+  in a process pool fed while the directory is still being walked.
+- **dedup** — the file's SHA-256 is stored on ``PrintJob.source_hash``; a file
+  already imported (or repeated within the run) is skipped, so re-running the
+  command over the same directory is a no-op.
+- **map** — :class:`SpoolMatcher` picks a spool in stock *now* for each
+  filament entry: the material type must match (as in
+  :func:`inventory.spool_sync.material_matches`), then the nearest catalog
+  colour wins, preferring a spool in use, then the newest. An entry with no
+  candidate is counted and dropped; the job is still recorded. The matcher
+  keeps each spool's percent left as it charges entries to it, so once a spool
+  runs out later entries (in this batch or the next) go to the next candidate.
+- **write** — :func:`import_jobs` bulk-inserts a batch of jobs and their
+  :class:`~inventory.models.PrintJobFilament` lines, adds them to the daily
+  utilization stats, and settles spool consumption in one set-based pass
+  (:func:`inventory.printjobs.apply_usage`) rather than a ``complete_job``
+  per job.
+
+A job ends at the file's modification time and starts that long before it as
+the slicer estimated; nothing older than the file can be recovered.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+
+from . import items, printjobs, spool_sync
+from .models import Filament, InventoryItem, PrintJob, PrintJobFilament
+
+logger = logging.getLogger("inventory")
+
+# Parsed files handed to import_jobs() per transaction by the command.
+IMPORT_BATCH = 200
+
+
+@dataclass
+class ImportResult:
+    """Counts for one :func:`import_jobs` call (summed by the command)."""
+
+    created: int = 0
+    duplicates: int = 0
+    lines: int = 0
+    unmatched: int = 0
+    depleted: int = 0
+
+    def add(self, other):
+        for name in ("created", "duplicates", "lines", "unmatched", "depleted"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+def _rgb(hex_code):
+    return tuple(int(hex_code[i : i + 2], 16) for i in (0, 2, 4))
+
+
+def color_distance(a, b):
+    """Squared RGB distance between two normalized hex colours (None = far)."""
+    if not a or not b:
+        return 3 * 255**2 + 1
+    return sum((x - y) ** 2 for x, y in zip(_rgb(a), _rgb(b), strict=True))
+
+
+class SpoolMatcher:
+    """Heuristic filament-entry -> spool mapping over the spools in stock.
+
+    Loads the active filament spools and their products once; :meth:`match`
+    is then pure Python, so a batch of thousands of entries costs no queries.
+    :meth:`use` charges usage against each spool's percent left and drops a
+    spool from the candidates once it runs out.
+    """
+
+    def __init__(self):
+        self.filaments = {f.pk: f for f in Filament.objects.select_related("material")}
+        self.spools = list(
+            InventoryItem.objects.filter(product_id__in=list(self.filaments))
+            .exclude(status__in=items.TERMINAL_STATUSES)
+            .only("pk", "product_id", "status", "date_added", "percent_remaining")
+        )
+        # As printjobs.apply_usage counts it: an unknown percent is empty.
+        self.left = {
+            spool.pk: Decimal(spool.percent_remaining or 0) for spool in self.spools
+        }
+        self._cache = {}
+
+    def match(self, material, color):
+        """``(spool, filament)`` for a slicer entry, or None."""
+        color = spool_sync.normalize_hex(color)
+        key = ((material or "").lower(), color)
+        if key not in self._cache:
+            self._cache[key] = self._best(material, color)
+        return self._cache[key]
+
+    def use(self, spool, percent):
+        """Charge ``percent`` to ``spool``; retire it from matching at empty."""
+        left = max(self.left[spool.pk] - percent, Decimal(0))
+        self.left[spool.pk] = left
+        if left <= printjobs.DEPLETE_AT_PERCENT and spool in self.spools:
+            self.spools.remove(spool)
+            self._cache.clear()
+
+    def _best(self, material, color):
+        if not material:
+            return None
+        candidates = [
+            (spool, self.filaments[spool.product_id])
+            for spool in self.spools
+            if spool_sync.material_matches(material, self.filaments[spool.product_id])
+        ]
+        if not candidates:
+            return None
+        return min(
+            candidates,
+            key=lambda pair: (
+                color_distance(color, spool_sync.normalize_hex(pair[1].hex_code)),
+                pair[0].status != InventoryItem.Status.IN_USE,
+                -pair[0].date_added.timestamp(),
+            ),
+        )
+
+
+def _percent(grams, filament):
+    """Percent of a spool of ``filament`` that ``grams`` is (None if unweighted)."""
+    if not filament.weight:
+        return None
+    percent = grams / (Decimal(filament.weight) * Decimal(1000)) * Decimal(100)
+    return min(percent, Decimal(100)).quantize(printjobs.CENT)
+
+
+def import_jobs(parsed, printer, *, matcher=None, decrement=True, dry_run=False):
+    """Record ``parsed`` jobs on ``printer`` in one transaction.
+
+    Files already imported are skipped. With ``decrement`` the matched spools
+    are decremented (and depleted at 0) in one pass; without it the jobs are
+    recorded as complete but the spools are left alone (their percentages are
+    already current). ``dry_run`` matches and counts but writes nothing.
+    Returns an :class:`ImportResult`.
+    """
+    result = ImportResult()
+    matcher = matcher or SpoolMatcher()
+    known = set(
+        PrintJob.objects.filter(
+            source_hash__in=[p.source_hash for p in parsed]
+        ).values_list("source_hash", flat=True)
+    )
+    jobs, lines, used = [], [], {}
+    for entry in parsed:
+        if entry.source_hash in known:
+            result.duplicates += 1
+            continue
+        known.add(entry.source_hash)
+        started = None
+        if entry.duration_s is not None:
+            started = entry.finished_at - timedelta(seconds=entry.duration_s)
+        job = PrintJob(
+            printer=printer,
+            name=entry.name,
+            started_at=started,
+            ended_at=entry.finished_at,
+            duration_s=entry.duration_s,
+            source=PrintJob.Source.IMPORT,
+            source_hash=entry.source_hash,
+            completed=True,
+        )
+        jobs.append(job)
+        for filament_entry in entry.filaments:
+            match = matcher.match(filament_entry.material, filament_entry.color)
+            if match is None:
+                result.unmatched += 1
+                continue
+            spool, filament = match
+            percent = _percent(filament_entry.grams, filament)
+            lines.append(
+                PrintJobFilament(
+                    job=job,
+                    item=spool,
+                    grams_used=filament_entry.grams.quantize(printjobs.CENT),
+                    percent_used=percent,
+                )
+            )
+            if percent is not None:
+                used[spool.pk] = used.get(spool.pk, Decimal(0)) + percent
+                if decrement:
+                    matcher.use(spool, percent)
+    result.created, result.lines = len(jobs), len(lines)
+    if dry_run or not jobs:
+        return result
+
+    with transaction.atomic():
+        PrintJob.objects.bulk_create(jobs, batch_size=items.BULK_CHUNK_SIZE)
+        PrintJobFilament.objects.bulk_create(lines, batch_size=items.BULK_CHUNK_SIZE)
+        printjobs.record_stats(jobs)
+        if decrement and used:
+            result.depleted = len(printjobs.apply_usage(used))
+    logger.info(
+        "Imported %d print job(s) on %s: %d line(s), %d unmatched, %d duplicate(s)",
+        result.created,
+        printer.pk,
+        result.lines,
+        result.unmatched,
+        result.duplicates,
+    )
+    return result
@@ -10,14 +10,22 @@ hotend swap writes *both* — the history event and the current-state update —
 mirroring the audit log-vs-state split.
 
 The reliability report (the "rebuy / refund?" headline ask) is computed with DB
-aggregations grouped by machine *model*, never a Python-side table scan.
+aggregations grouped by machine *model*, never a Python-side table scan, and
+cached per process between maintenance writes.
 """
 
+import copy
 import logging
+import threading
+import time
+from datetime import timedelta
 from decimal import Decimal
 
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Count, Q, Sum
+from django.db.models import Count, FloatField, Func, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 from django.utils.timezone import now
 
 from .models import (
@@ -135,20 +143,51 @@ def unit_summary(unit):
     }
 
 
-def _product_model_label(product):
-    """Human label for a machine product at *model* granularity.
+class JulianDay(Func):
+    """SQLite ``julianday()``: a datetime as fractional days since 4714 BC."""
 
-    Printers/AMS/Dryers each carry a ``model`` field (Printer also a ``mfr``); the
-    base :class:`Product` only has ``name``. A plain FK access to the polymorphic
-    ``product`` can return the base class, so ``get_real_instance()`` resolves the
-    concrete subclass first (the same gotcha handled in :func:`is_machine_item`).
+    function = "julianday"
+    output_field = FloatField()
+
+
+def _julian(moment):
+    """The ``julianday()`` of an aware datetime, computed in Python."""
+    return moment.timestamp() / 86400.0 + 2440587.5
+
+
+def _month_starts(moment, count):
+    """The local first-of-month of ``moment`` and the ``count - 1`` before it,
+    oldest first."""
+    start = timezone.localtime(moment).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    starts = [start]
+    for _ in range(count - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+        starts.append(start)
+    return starts[::-1]
+
+
+def _days_in_service(since_jd, until_jd):
+    """SQL: days an item was in service between two julian days (0 if none)."""
+    return Greatest(
+        Value(0.0),
+        Value(until_jd) - Greatest(JulianDay("date_added"), Value(since_jd)),
+    )
+
+
+_reliability_cache = {}
+_reliability_lock = threading.Lock()
+
+
+def forget_reliability():
+    """Drop the cached :func:`model_reliability` rollup.
+
+    :mod:`inventory.signals` calls this when a maintenance event is written or
+    a machine unit or product is saved or deleted in this process.
     """
-    real = product.get_real_instance()
-    model = getattr(real, "model", None)
-    if model:
-        mfr = getattr(real, "mfr", "")
-        return f"{mfr} {model}".strip()
-    return real.name
+    with _reliability_lock:
+        _reliability_cache.clear()
 
 
 def model_reliability():
@@ -157,78 +196,125 @@ def model_reliability():
     Groups every machine :class:`InventoryItem` (printers/AMS/dryers) by its
     specific product *model* (e.g. the *X1 Carbon* vs. the *A1 mini*, not just the
     polymorphic type) and aggregates fault count, total downtime, maintenance
-    spend, and unit fleet size — all via DB aggregations (one query for the fleet,
-    one for the maintenance rollup). Derives faults-per-unit and MTBF in days.
+    spend, and unit fleet size. Derives faults-per-unit and MTBF in days.
 
     Grouping is by ``product_id`` so a rebuy/refund call lands on the actual model
     you own; the polymorphic type is still carried as ``ctype`` for context.
 
     MTBF here = (summed operating age of the fleet in days) / (number of faults).
     Operating age uses ``InventoryItem.date_added`` as the in-service proxy. With
-    zero faults MTBF is ``None`` (infinite / not-yet-failed).
+    zero faults MTBF is ``None`` (infinite / not-yet-failed). ``trend`` repeats
+    that per calendar month for the last ``RELIABILITY_TREND_MONTHS`` months
+    (the current one so far): the fleet's in-service days within the month over
+    the faults that occurred in it.
+
+    Two queries whatever the fleet size: one over the fleet (unit count, summed
+    age via ``julianday()`` and the model label from the subclass tables), one
+    over its maintenance events. The result is cached per process for
+    ``RELIABILITY_CACHE_TTL_S`` seconds and dropped by
+    :func:`forget_reliability`; bulk writes that bypass signals are covered by
+    the TTL alone.
 
     Returns a list of dicts ordered by faults-per-unit descending (worst first),
     each: ``model_label``, ``ctype`` (printer/ams/dryer), ``units``, ``faults``,
     ``open_faults``, ``total_cost``, ``total_downtime_hours``,
-    ``faults_per_unit``, ``mtbf_days``.
+    ``faults_per_unit``, ``mtbf_days``, ``trend`` (oldest month first, each
+    ``month``, ``faults``, ``unit_days``, ``mtbf_days``).
     """
+    ttl = settings.RELIABILITY_CACHE_TTL_S
+    with _reliability_lock:
+        cached = _reliability_cache.get("rows")
+    if cached is not None and time.monotonic() < cached[1]:
+        return copy.deepcopy(cached[0])
+    rows = _model_reliability()
+    if ttl > 0:
+        with _reliability_lock:
+            _reliability_cache["rows"] = (rows, time.monotonic() + ttl)
+    return copy.deepcopy(rows)
+
+
+def _model_reliability():
     machine_models = ("printer", "ams", "dryer")
+    today = now()
+    today_jd = _julian(today)
+    starts = _month_starts(today, settings.RELIABILITY_TREND_MONTHS)
+    bounds = list(zip(starts, [*starts[1:], today], strict=True))
 
-    # Fleet: count of owned units, grouped by the specific product model.
+    # Fleet: units, summed in-service days (in total and per month) and the
+    # model label columns, grouped by the specific product model.
     fleet = (
         InventoryItem.objects.filter(
             product__polymorphic_ctype__model__in=machine_models
         )
-        .values("product_id", "product__polymorphic_ctype__model")
-        .annotate(units=Count("id"))
+        .values("product_id", "product__polymorphic_ctype__model", "product__name")
+        .annotate(
+            units=Count("id"),
+            age_days=Sum(_days_in_service(0.0, today_jd)),
+            mfr=Coalesce(
+                "product__printer__mfr", "product__ams__mfr", "product__dryer__mfr"
+            ),
+            model=Coalesce(
+                "product__printer__model",
+                "product__ams__model",
+                "product__dryer__model",
+            ),
+            **{
+                f"days_{i}": Sum(_days_in_service(_julian(lo), _julian(hi)))
+                for i, (lo, hi) in enumerate(bounds)
+            },
+        )
+        .order_by()
     )
 
     # Maintenance rollup over those same machine items, grouped by product model.
+    fault = Q(kind=MaintenanceEvent.Kind.FAULT)
     maint = (
         MaintenanceEvent.objects.filter(
             unit__product__polymorphic_ctype__model__in=machine_models
         )
         .values("unit__product_id")
         .annotate(
-            faults=Count("id", filter=Q(kind=MaintenanceEvent.Kind.FAULT)),
-            open_faults=Count(
-                "id",
-                filter=Q(kind=MaintenanceEvent.Kind.FAULT, resolved=False),
-            ),
+            faults=Count("id", filter=fault),
+            open_faults=Count("id", filter=fault & Q(resolved=False)),
             total_cost=Sum("cost"),
             total_downtime_hours=Sum("downtime_hours"),
+            **{
+                f"faults_{i}": Count(
+                    "id", filter=fault & Q(occurred_at__gte=lo, occurred_at__lt=hi)
+                )
+                for i, (lo, hi) in enumerate(bounds)
+            },
         )
+        .order_by()
     )
     maint_by_product = {row["unit__product_id"]: row for row in maint}
 
-    # Summed operating age in days, grouped by product model — used for MTBF. Done
-    # in Python over the (small) machine fleet to stay DB-portable (SQLite lacks a
-    # tidy date-diff aggregate); still O(machines), not O(events).
-    today = now()
-    age_days_by_product = {}
-    label_by_product = {}
-    for item in InventoryItem.objects.filter(
-        product__polymorphic_ctype__model__in=machine_models
-    ).select_related("product"):
-        pid = item.product_id
-        age = (today - item.date_added).total_seconds() / 86400.0
-        age_days_by_product[pid] = age_days_by_product.get(pid, 0.0) + max(age, 0.0)
-        if pid not in label_by_product:
-            label_by_product[pid] = _product_model_label(item.product)
-
     rows = []
     for f in fleet:
         pid = f["product_id"]
-        ctype = f["product__polymorphic_ctype__model"]
         units = f["units"] or 0
         m = maint_by_product.get(pid, {})
         faults = m.get("faults") or 0
-        fleet_age_days = age_days_by_product.get(pid, 0.0)
-        mtbf_days = (fleet_age_days / faults) if faults else None
+        fleet_age_days = f["age_days"] or 0.0
+        trend = []
+        for i, (lo, _) in enumerate(bounds):
+            month_faults = m.get(f"faults_{i}") or 0
+            unit_days = f[f"days_{i}"] or 0.0
+            trend.append(
+                {
+                    "month": lo.date(),
+                    "faults": month_faults,
+                    "unit_days": unit_days,
+                    "mtbf_days": unit_days / month_faults if month_faults else None,
+                }
+            )
+        model = f["model"]
         rows.append(
             {
-                "model_label": label_by_product.get(pid, ""),
-                "ctype": ctype,
+                "model_label": (
+                    f"{f['mfr'] or ''} {model}".strip() if model else f["product__name"]
+                ),
+                "ctype": f["product__polymorphic_ctype__model"],
                 "units": units,
                 "faults": faults,
                 "open_faults": m.get("open_faults") or 0,
@@ -236,7 +322,8 @@ def model_reliability():
                 "total_downtime_hours": m.get("total_downtime_hours")
                 or Decimal("0.00"),
                 "faults_per_unit": (faults / units) if units else 0.0,
-                "mtbf_days": mtbf_days,
+                "mtbf_days": (fleet_age_days / faults) if faults else None,
+                "trend": trend,
             }
         )
 
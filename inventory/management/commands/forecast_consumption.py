@@ -0,0 +1,16 @@
+"""Recompute the filament consumption forecast (run daily from cron if desired)."""
+
+from django.core.management.base import BaseCommand
+
+from inventory import forecast
+
+
+class Command(BaseCommand):
+    help = "Recompute per-product burn rate, days of cover and reorder points."
+
+    def handle(self, *args, **options):
+        rows = forecast.refresh()
+        due = sum(row.needs_reorder for row in rows)
+        self.stdout.write(
+            self.style.SUCCESS(f"Forecast {len(rows)} product(s); {due} to reorder.")
+        )
@@ -0,0 +1,93 @@
+"""Import historical print jobs from a directory of Bambu/Orca 3MF and gcode files."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from inventory import job_import, slicer_metadata
+from inventory.models import InventoryItem, PrinterDevice
+
+
+class Command(BaseCommand):
+    help = (
+        "Record one completed print job per sliced 3MF/gcode file under a "
+        "directory, matching its filament to spools and decrementing them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory to scan (recursively).")
+        parser.add_argument(
+            "--printer",
+            required=True,
+            help="Printer item id, or a PrinterDevice name/serial linked to one.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Parser processes (default: one per CPU; 1 parses in-process).",
+        )
+        parser.add_argument(
+            "--no-decrement",
+            action="store_true",
+            help="Record the jobs but leave spool percentages as they are.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Parse and match only; write nothing.",
+        )
+
+    def _printer(self, value):
+        if value.isdigit():
+            printer = InventoryItem.objects.filter(pk=int(value)).first()
+        else:
+            device = PrinterDevice.objects.filter(
+                Q(name__iexact=value) | Q(serial__iexact=value)
+            ).first()
+            printer = device.item if device else None
+        if printer is None:
+            raise CommandError(f"No printer item found for {value!r}.")
+        return printer
+
+    def handle(self, *args, **options):
+        printer = self._printer(options["printer"])
+        matcher = job_import.SpoolMatcher()
+        totals = job_import.ImportResult()
+        skipped = 0
+        batch = []
+
+        def flush():
+            totals.add(
+                job_import.import_jobs(
+                    batch,
+                    printer,
+                    matcher=matcher,
+                    decrement=not options["no_decrement"],
+                    dry_run=options["dry_run"],
+                )
+            )
+            batch.clear()
+
+        paths = slicer_metadata.iter_files(options["directory"])
+        for path, parsed in slicer_metadata.parse_files(
+            paths, workers=options["workers"]
+        ):
+            if parsed is None:
+                skipped += 1
+                self.stdout.write(f"  skipped (no slicer metadata): {path}")
+                continue
+            batch.append(parsed)
+            if len(batch) >= job_import.IMPORT_BATCH:
+                flush()
+        if batch:
+            flush()
+
+        verb = "Would import" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {totals.created} job(s) with {totals.lines} spool line(s); "
+                f"{totals.duplicates} already imported, {totals.unmatched} "
+                f"filament entr(ies) unmatched, {skipped} file(s) skipped, "
+                f"{totals.depleted} spool(s) depleted."
+            )
+        )
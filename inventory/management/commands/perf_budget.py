@@ -0,0 +1,90 @@
+"""Per-view query-count / latency budget gate.
+
+Seeds a large synthetic dataset into a throwaway test database, GETs every route
+in inventory/urls.py and compares each view's SQL query count and wall time with
+inventory/perf_budgets.json. Exits non-zero on any violation; `--report` prints
+the ranked table, `--write-budgets` re-records the budget file.
+"""
+
+import json
+import logging
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from inventory import perf
+
+
+class Command(BaseCommand):
+    help = "Check every view against its query-count / latency budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Dataset scale (1.0 = 10k items, 500 locations, 50k samples, 2k jobs).",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="GETs per view (median time)."
+        )
+        parser.add_argument(
+            "--report", action="store_true", help="Print the ranked table."
+        )
+        parser.add_argument(
+            "--no-time",
+            action="store_true",
+            help="Only gate on query counts (for noisy/shared machines).",
+        )
+        parser.add_argument(
+            "--budgets", default=str(perf.BUDGETS_PATH), help="Budget file path."
+        )
+        parser.add_argument(
+            "--write-budgets",
+            action="store_true",
+            help="Record the measured numbers (with time headroom) as the budgets.",
+        )
+
+    def handle(self, *args, **options):
+        budgets = perf.load_budgets(options["budgets"])
+
+        setup_test_environment()
+        # GETs against POST-only views log a 405 warning each; that's expected here.
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            self.stdout.write(f"Seeding dataset (scale {options['scale']})…")
+            dataset = perf.seed(options["scale"])
+            user = User.objects.create_superuser("perf", "perf@example.com", "perf")
+            client = Client()
+            client.force_login(user)
+            timings = perf.run(client, dataset, repeat=options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["write_budgets"]:
+            doc = perf.budgets_from(timings, budgets["default"])
+            with open(options["budgets"], "w") as fh:
+                json.dump(doc, fh, indent=2)
+                fh.write("\n")
+            self.stdout.write(
+                self.style.SUCCESS(f"Wrote {len(timings)} budget(s) to {fh.name}")
+            )
+            return
+
+        if options["report"]:
+            self.stdout.write(perf.format_report(timings, budgets))
+
+        violations = perf.check(timings, budgets, check_time=not options["no_time"])
+        if violations:
+            for v in violations:
+                self.stderr.write(f"  {v}")
+            raise CommandError(f"{len(violations)} budget violation(s)")
+        self.stdout.write(self.style.SUCCESS(f"{len(timings)} view(s) within budget."))
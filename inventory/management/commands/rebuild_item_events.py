@@ -0,0 +1,13 @@
+"""Rebuild the item location/status change events from simple-history."""
+
+from django.core.management.base import BaseCommand
+
+from inventory.item_events import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the item location/status change events from item history."
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} change events."))
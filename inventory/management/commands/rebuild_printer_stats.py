@@ -0,0 +1,13 @@
+"""Rebuild the per-printer daily utilization stats from completed print jobs."""
+
+from django.core.management.base import BaseCommand
+
+from inventory.printjobs import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild PrinterDailyStats / PrinterDailyConsumption from print jobs."
+
+    def handle(self, *args, **options):
+        count = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(f"Summarized {count} completed job(s)."))
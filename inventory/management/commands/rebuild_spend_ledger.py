@@ -0,0 +1,13 @@
+"""Rebuild the spend ledger and its monthly rollups from items and PO lines."""
+
+from django.core.management.base import BaseCommand
+
+from inventory.spend_ledger import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the spend ledger and monthly rollups from scratch."
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Posted {count} spend entries."))
@@ -1,5 +1,7 @@
 """Bambu MQTT telemetry consumer: one auto-reconnecting paho client per enabled
-PrinterDevice. Read-only — delegates all DB work to inventory.telemetry."""
+PrinterDevice. Read-only toward the printers — delegates all DB work to
+inventory.telemetry, and once a minute applies finished print jobs'
+consumption (inventory.print_tracker.apply_pending)."""
 
 import json
 import logging
@@ -10,6 +12,8 @@ import paho.mqtt.client as mqtt
 from django.core.management.base import BaseCommand
 from django.db.utils import OperationalError
 
+from inventory import print_tracker
+from inventory.bambu_mqtt import GET_VERSION
 from inventory.models import PrinterDevice
 from inventory.telemetry import handle_message
 
@@ -66,6 +70,7 @@ class Command(BaseCommand):
                 return
             while True:
                 time.sleep(60)
+                self._apply_print_jobs()
         except KeyboardInterrupt:
             pass
         finally:
@@ -73,6 +78,14 @@ class Command(BaseCommand):
                 client.loop_stop()
                 client.disconnect()
 
+    @staticmethod
+    def _apply_print_jobs():
+        """Batch-apply consumption for jobs the MQTT threads closed."""
+        try:
+            print_tracker.apply_pending()
+        except Exception:  # noqa: BLE001 - keep the consumer alive
+            logger.exception("applying print job consumption failed")
+
     def _wait_for_devices(self, attempts=30, delay=2):
         """Retry until the schema exists (the telemetry container may start before
         web finishes running migrations)."""
@@ -108,6 +121,8 @@ class Command(BaseCommand):
             return
         client.subscribe(f"device/{device.serial}/report")
         client.publish(f"device/{device.serial}/request", PUSHALL)
+        # The AMS serials bridge trays to inventory for the live spool reconciler.
+        client.publish(f"device/{device.serial}/request", GET_VERSION)
         logger.info("MQTT connected + subscribed: %s", device.serial)
 
     @staticmethod
@@ -38,8 +38,9 @@ class Command(BaseCommand):
         )
         devices = list(PrinterDevice.objects.filter(enabled=True))
         self.stdout.write(f"Probing get_version on {len(devices)} printer(s)…")
-        serial_map = bambu_mqtt.fetch_ams_serials_all(devices)
-        report = spool_sync.build_report(serial_map)
+        probes = []
+        serial_map = bambu_mqtt.fetch_ams_serials_all(devices, probes=probes)
+        report = spool_sync.build_report(serial_map, probes=probes)
 
         out_dir.mkdir(parents=True, exist_ok=True)
         stamp = report.generated_at.translate({ord(c): None for c in ":-"})[:15]
@@ -53,6 +54,12 @@ class Command(BaseCommand):
         self.stdout.write("\n== Spool sync (DRY-RUN — no writes) ==")
         for key, value in report.counts.items():
             self.stdout.write(f"  {key:16} {value}")
+        if report.probes:
+            self.stdout.write("\n-- get_version --")
+            for probe in report.probes:
+                self.stdout.write(
+                    f"  {probe.device:16} {probe.outcome:14} {probe.elapsed_s:.1f}s"
+                )
         if report.proposals:
             self.stdout.write("\n-- Proposed writes --")
             for p in report.proposals:
@@ -1,10 +1,46 @@
-from django.db import migrations
+from django.db import connection, migrations
 
 from inventory import search_index
 
 
 def populate(apps, schema_editor):
-    search_index.rebuild_all()
+    # Built from the historical models rather than search_index.rebuild_all():
+    # the live models select columns later migrations add (e.g. 0043's
+    # last_modified), which don't exist yet on a database migrating through here.
+    # Same document as search_index.build_document.
+    InventoryItem = apps.get_model("inventory", "InventoryItem")
+    Filament = apps.get_model("inventory", "Filament")
+    Location = apps.get_model("inventory", "Location")
+    filaments = {f.pk: f for f in Filament.objects.select_related("material")}
+    locations = {loc.pk: loc for loc in Location.objects.all()}
+
+    def path(pk):
+        names, seen = [], set()
+        while pk is not None and pk in locations and pk not in seen:
+            seen.add(pk)
+            names.append(locations[pk].name or "")
+            pk = locations[pk].parent_id
+        return " ".join(reversed(names)).strip()
+
+    rows = []
+    for item in InventoryItem.objects.select_related("product").iterator():
+        product = item.product
+        filament = filaments.get(product.pk)
+        mat = filament.material if filament else None
+        doc = {
+            "name": product.name or "",
+            "color": (filament.color if filament else "") or "",
+            "material": (f"{mat.name} {mat.material_type}".strip() if mat else ""),
+            "manufacturer": (filament.manufacturer if filament else "") or "",
+            "upc": product.upc or "",
+            "sku": product.sku or "",
+            "serial": item.serial_number or "",
+            "location": path(item.location_id),
+        }
+        rows.append([item.pk] + [doc[c] for c in search_index.COLUMNS])
+    with connection.cursor() as cur:
+        cur.execute(f"DELETE FROM {search_index.FTS_TABLE}")
+        cur.executemany(search_index._insert_sql(), rows)
 
 
 def depopulate(apps, schema_editor):
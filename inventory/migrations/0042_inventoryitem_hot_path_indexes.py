@@ -0,0 +1,37 @@
+# Generated by Django 6.1.2 on 2026-10-18 22:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0041_pla_variant_materials"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="inventoryitem",
+            index=models.Index(
+                fields=["location", "status"], name="inv_item_loc_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inventoryitem",
+            index=models.Index(
+                fields=["status", "date_depleted"], name="inv_item_status_depl_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inventoryitem",
+            index=models.Index(fields=["last_modified"], name="inv_item_last_mod_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="inventoryitem",
+            index=models.Index(
+                django.db.models.functions.text.Lower("serial_number"),
+                name="inv_item_serial_ci_idx",
+            ),
+        ),
+    ]
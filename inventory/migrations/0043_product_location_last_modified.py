@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-18 22:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0042_inventoryitem_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="last_modified",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="last_modified",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.1.2 on 2026-10-18 22:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0043_product_location_last_modified"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncedScan",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("client_id", models.CharField(max_length=64, unique=True)),
+                (
+                    "flow",
+                    models.CharField(
+                        choices=[("audit", "Audit"), ("move", "Quick move")],
+                        max_length=10,
+                    ),
+                ),
+                ("code", models.CharField(max_length=255)),
+                ("dest_code", models.CharField(blank=True, max_length=255)),
+                ("scanned_at", models.DateTimeField(blank=True, null=True)),
+                ("result", models.CharField(max_length=10)),
+                ("message", models.CharField(blank=True, max_length=255)),
+                ("synced_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="inventory.auditsession",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["synced_at", "id"],
+            },
+        ),
+    ]
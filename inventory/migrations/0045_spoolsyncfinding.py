@@ -0,0 +1,67 @@
+# Generated by Django 6.1.2 on 2026-10-18 23:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0044_syncedscan"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="amsunitstate",
+            name="serial",
+            field=models.CharField(blank=True, default="", max_length=32),
+        ),
+        migrations.CreateModel(
+            name="SpoolSyncFinding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ams_index", models.PositiveSmallIntegerField()),
+                ("tray_index", models.PositiveSmallIntegerField()),
+                ("category", models.CharField(max_length=20)),
+                ("detail", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "write_serial",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                ("write_percent_from", models.SmallIntegerField(blank=True, null=True)),
+                ("write_percent_to", models.SmallIntegerField(blank=True, null=True)),
+                ("first_seen_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("applied_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "device",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="spool_findings",
+                        to="inventory.printerdevice",
+                    ),
+                ),
+                (
+                    "item",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="inventory.inventoryitem",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["device", "ams_index", "tray_index"],
+                "unique_together": {("device", "ams_index", "tray_index")},
+            },
+        ),
+    ]
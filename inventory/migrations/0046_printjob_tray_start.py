@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0045_spoolsyncfinding"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="printjob",
+            name="tray_start",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
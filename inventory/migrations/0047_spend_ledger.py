@@ -0,0 +1,193 @@
+# Generated by Django 6.1.2 on 2026-10-19 00:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+from inventory import spend_ledger
+
+
+def backfill(apps, schema_editor):
+    # rebuild() queries the live models (see 0040); a fresh database has no
+    # spend to post, so skip it there.
+    InventoryItem = apps.get_model("inventory", "InventoryItem")
+    PurchaseOrderLine = apps.get_model("inventory", "PurchaseOrderLine")
+    if not (
+        InventoryItem.objects.filter(unit_cost__isnull=False).exists()
+        or PurchaseOrderLine.objects.exists()
+    ):
+        return
+    spend_ledger.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("inventory", "0046_printjob_tray_start"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SpendLedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tracked_spend",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("tracked_count", models.IntegerField(default=0)),
+                (
+                    "on_hand_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "consumable_spend",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("consumable_lines", models.IntegerField(default=0)),
+                (
+                    "ordered_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "received_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "month",
+                    models.DateField(
+                        help_text="First day of the month the change lands in."
+                    ),
+                ),
+                (
+                    "occurred_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The product type (Filament, Hardware, …).",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "item",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="inventory.inventoryitem",
+                    ),
+                ),
+                (
+                    "order_line",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="inventory.purchaseorderline",
+                    ),
+                ),
+                (
+                    "supplier",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="inventory.supplier",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Spend Ledger Entry",
+                "verbose_name_plural": "Spend Ledger Entries",
+                "ordering": ["-occurred_at", "-id"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SpendRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tracked_spend",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("tracked_count", models.IntegerField(default=0)),
+                (
+                    "on_hand_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "consumable_spend",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("consumable_lines", models.IntegerField(default=0)),
+                (
+                    "ordered_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "received_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "month",
+                    models.DateField(
+                        help_text="First day of the month the change lands in."
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The product type (Filament, Hardware, …).",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "supplier",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="inventory.supplier",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Spend Rollup",
+                "verbose_name_plural": "Spend Rollups",
+                "ordering": ["month"],
+                "indexes": [
+                    models.Index(fields=["month"], name="spend_rollup_month_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
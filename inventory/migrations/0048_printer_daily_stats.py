@@ -0,0 +1,121 @@
+# Generated by Django 6.1.2 on 2026-10-19 00:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from inventory import printjobs
+
+
+def backfill(apps, schema_editor):
+    # rebuild_stats() queries the live models (see 0040); skip it on a fresh
+    # database with no completed jobs.
+    if (
+        not apps.get_model("inventory", "PrintJob")
+        .objects.filter(completed=True)
+        .exists()
+    ):
+        return
+    printjobs.rebuild_stats()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0047_spend_ledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrinterDailyConsumption",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "grams",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "printer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_consumption",
+                        to="inventory.inventoryitem",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_consumption",
+                        to="inventory.product",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Printer Daily Consumption",
+                "verbose_name_plural": "Printer Daily Consumption",
+                "ordering": ["-day"],
+                "indexes": [
+                    models.Index(fields=["day"], name="printer_daily_cons_day_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("printer", "day", "product"),
+                        name="printer_daily_consumption_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PrinterDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("jobs", models.PositiveIntegerField(default=0)),
+                ("success", models.PositiveIntegerField(default=0)),
+                ("seconds", models.PositiveBigIntegerField(default=0)),
+                (
+                    "grams",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "printer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="inventory.inventoryitem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Printer Daily Stats",
+                "verbose_name_plural": "Printer Daily Stats",
+                "ordering": ["-day"],
+                "indexes": [
+                    models.Index(fields=["day"], name="printer_daily_stats_day_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("printer", "day"), name="printer_daily_stats_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 6.1.2 on 2026-10-19 00:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0048_printer_daily_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsumptionForecast",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "burn_g_per_day",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=10),
+                ),
+                (
+                    "on_hand_g",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("on_hand_count", models.PositiveIntegerField(default=0)),
+                (
+                    "days_of_cover",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=1,
+                        help_text="On-hand grams / burn rate; blank when nothing is being used.",
+                        max_digits=8,
+                        null=True,
+                    ),
+                ),
+                (
+                    "reorder_point_g",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("needs_reorder", models.BooleanField(default=False)),
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="forecast",
+                        to="inventory.product",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Consumption Forecast",
+                "verbose_name_plural": "Consumption Forecasts",
+                "ordering": ["days_of_cover"],
+            },
+        ),
+    ]
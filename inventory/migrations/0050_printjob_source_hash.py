@@ -0,0 +1,31 @@
+# Generated by Django 6.1.2 on 2026-10-19 01:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0049_consumption_forecast"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="printjob",
+            name="source_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                help_text="SHA-256 of the imported 3MF/gcode file — dedup key for imports.",
+                max_length=64,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="printjob",
+            name="source",
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, "manual"), (2, "mqtt"), (3, "import")], default=1
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-19 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0050_printjob_source_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="maintenanceevent",
+            name="hms_code",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Bambu HMS error code (set by the MQTT consumer for telemetry faults).",
+                max_length=32,
+            ),
+        ),
+    ]
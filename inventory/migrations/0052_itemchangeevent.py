@@ -0,0 +1,91 @@
+# Generated by Django 6.1.2 on 2026-10-19 01:43
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+from inventory import item_events
+
+
+def backfill(apps, schema_editor):
+    # rebuild() queries the live models (see 0040); a fresh database has no
+    # history to replay, so skip it there.
+    HistoricalInventoryItem = apps.get_model("inventory", "HistoricalInventoryItem")
+    if not HistoricalInventoryItem.objects.filter(history_type="~").exists():
+        return
+    item_events.rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0051_maintenanceevent_hms_help"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemChangeEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("changed_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("location_changed", models.BooleanField(default=False)),
+                ("status_changed", models.BooleanField(default=False)),
+                (
+                    "status_from",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                ("status_to", models.PositiveSmallIntegerField(blank=True, null=True)),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="change_events",
+                        to="inventory.inventoryitem",
+                    ),
+                ),
+                (
+                    "location_from",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="inventory.location",
+                    ),
+                ),
+                (
+                    "location_to",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="inventory.location",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Item Change Event",
+                "verbose_name_plural": "Item Change Events",
+                "ordering": ["-changed_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["item", "changed_at"], name="item_change_item_at_idx"
+                    ),
+                    models.Index(
+                        fields=["location_changed", "changed_at"],
+                        name="item_change_moves_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-19 02:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0052_itemchangeevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="material",
+            name="last_modified",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0053_material_last_modified"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="printerdevice",
+            name="last_modified",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
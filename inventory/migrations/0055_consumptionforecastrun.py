@@ -0,0 +1,31 @@
+# Generated by Django 6.1.2 on 2026-10-19 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0054_printerdevice_last_modified"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsumptionForecastRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Consumption Forecast Run",
+            },
+        ),
+    ]
@@ -5,6 +5,7 @@ from decimal import Decimal
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.timezone import now
 from polymorphic.models import PolymorphicModel
 from simple_history.models import HistoricalRecords
@@ -44,6 +45,8 @@ class Product(PolymorphicModel):
     )  # an internal code within Bambu Lab
     price = models.DecimalField(decimal_places=2, max_digits=6, null=True, blank=True)
     notes = models.TextField(blank=True, default="")
+    # Bumped on every save; the JSON API's ETag version stamp (inventory.api).
+    last_modified = models.DateTimeField(auto_now=True)
 
     class Meta:
         # abstract = True
@@ -468,8 +471,93 @@ class Hardware(Product):
         verbose_name_plural = "Hardware"
 
 
+# Placeholder for a tracked field missing from the snapshot (see save()).
+_UNLOADED = object()
+
+
+class TrackedFieldsMixin:
+    """Remembers the stored values of :attr:`TRACKED_FIELDS`.
+
+    The snapshot is taken in ``from_db``, ``refresh_from_db`` and after every
+    ``save()``, so signals and services can tell what a save changed without
+    re-reading the row. In a post_save receiver the snapshot still holds the
+    values from *before* that save. ``save(update_fields=...)`` and
+    ``refresh_from_db(fields=...)`` re-snapshot only the fields they wrote or
+    read: a field changed in memory but left out of ``update_fields`` reads as
+    unchanged to that save's receivers and stays pending for the next save.
+    """
+
+    TRACKED_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        fields = kwargs.get("update_fields")
+        loaded = getattr(self, "_loaded_values", None)
+        held = {}
+        if fields is not None and loaded is not None:
+            written = self._tracked_attnames(fields)
+            for name in self.TRACKED_FIELDS:
+                if name not in written and name in self.__dict__:
+                    held[name] = loaded.pop(name, _UNLOADED)
+                    loaded[name] = self.__dict__[name]
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            for name, value in held.items():
+                if value is _UNLOADED:
+                    loaded.pop(name, None)
+                else:
+                    loaded[name] = value
+        self.snapshot_tracked(fields)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+        self.snapshot_tracked(fields)
+
+    def _tracked_attnames(self, fields):
+        """The attnames of ``fields`` (names such as ``location`` or attnames)."""
+        return {self._meta.get_field(name).attname for name in fields}
+
+    def snapshot_tracked(self, fields=None):
+        """Record the current :attr:`TRACKED_FIELDS` values as the stored state.
+
+        With ``fields`` only those are re-recorded. Deferred fields are skipped;
+        :meth:`tracked_changed` treats them as changed.
+        """
+        names = self.TRACKED_FIELDS
+        if fields is None:
+            self._loaded_values = {}
+        else:
+            written = self._tracked_attnames(fields)
+            names = [name for name in names if name in written]
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        for name in names:
+            if name in self.__dict__:
+                loaded[name] = self.__dict__[name]
+
+    def loaded_value(self, name, default=None):
+        """The value ``name`` had when loaded/last saved, or ``default``."""
+        return getattr(self, "_loaded_values", {}).get(name, default)
+
+    def tracked_changed(self, *names):
+        """True if any of ``names`` (default: all tracked) differs from its
+        loaded value. An instance never loaded from the database has changed."""
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return True
+        return any(
+            name not in loaded or loaded[name] != getattr(self, name)
+            for name in names or self.TRACKED_FIELDS
+        )
+
+
 # InventoryItem with ForeignKey to polymorphic Product
-class InventoryItem(models.Model):
+class InventoryItem(TrackedFieldsMixin, models.Model):
     """
     Represents an inventory item.
 
@@ -584,10 +672,40 @@ class InventoryItem(models.Model):
     # (HistoryRequestMiddleware deliberately omitted).
     history = HistoricalRecords()
 
+    # Loaded values of these fields are snapshotted (TrackedFieldsMixin) so
+    # save(), the signals, the FTS hook and the spend ledger can tell what
+    # changed without re-reading the row.
+    TRACKED_FIELDS = (
+        "location_id",
+        "status",
+        "product_id",
+        "serial_number",
+        "unit_cost",
+        "source_line_id",
+    )
+
     class Meta:
         # abstract = True
         verbose_name = "Inventory Item"
         verbose_name_plural = "Inventory Items"
+        # Indexes for the hot filter paths; InventoryItemIndexPlanTests EXPLAINs
+        # each one. No partial "active items" index: SQLite only matches a partial
+        # index's WHERE against literal constants, and Django binds the
+        # ``status__in`` values as parameters, so the planner would never pick it.
+        indexes = [
+            # Occupancy: inventory.occupancy (capacity, slot maps, spool sync),
+            # build_location_tree.
+            models.Index(fields=["location", "status"], name="inv_item_loc_status_idx"),
+            # Low-stock "recently depleted" and the filament summary windows.
+            models.Index(
+                fields=["status", "date_depleted"], name="inv_item_status_depl_idx"
+            ),
+            # Dashboard "latest item".
+            models.Index(fields=["last_modified"], name="inv_item_last_mod_idx"),
+            # Case-insensitive serial lookups. Query through by_serial() —
+            # SQLite compiles ``__iexact`` to LIKE, which can't use this index.
+            models.Index(Lower("serial_number"), name="inv_item_serial_ci_idx"),
+        ]
 
     def __str__(self):
         return f"{self.product.upc} - {self.date_added.strftime('%Y-%m-%d')}"
@@ -609,8 +727,7 @@ class InventoryItem(models.Model):
                     if new_status:
                         self.status = new_status
             else:
-                original_location_id = getattr(self, "_original_location_id", None)
-                if original_location_id != self.location_id:
+                if self.loaded_value("location_id") != self.location_id:
                     new_status = self.update_status()
                     if new_status:
                         self.status = new_status
@@ -626,50 +743,34 @@ class InventoryItem(models.Model):
         super().save(*args, **kwargs)
 
     @classmethod
-    def from_db(cls, db, field_names, values):
-        instance = super().from_db(db, field_names, values)
-        instance._original_location_id = instance.location_id
-        return instance
+    def by_serial(cls, value):
+        """Items whose serial matches ``value`` case-insensitively.
+
+        Filters on ``LOWER(serial_number)`` so the lookup hits
+        ``inv_item_serial_ci_idx``; ``serial_number__iexact`` compiles to a LIKE on
+        SQLite and always scans the table.
+        """
+        return cls.objects.alias(serial_ci=Lower("serial_number")).filter(
+            serial_ci=(value or "").lower()
+        )
 
     def location_status_timeline(self):
         """
-        Derive a high-signal location + status change timeline from the full
-        simple-history snapshots.
+        The item's location + status change timeline, newest change first.
 
-        Walks consecutive historical pairs (oldest -> newest) and emits one entry
-        per save in which ``location`` and/or ``status`` actually changed. A move
-        that flips both fields in a single save is therefore one entry. The rest of
-        the captured fields stay in the DB, unsurfaced.
+        One entry per save in which ``location`` and/or ``status`` actually
+        changed, so a move that flips both fields in a single save is one entry.
+        Read from the :class:`ItemChangeEvent` rows :mod:`inventory.item_events`
+        writes as each save happens: one indexed query, with both locations
+        joined in.
 
-        Returns a list of dicts (newest change first), each with resolved
+        Returns a list of dicts, each with resolved
         ``location_from``/``location_to`` (real ``Location`` objects or ``None``),
         ``status_from``/``status_to`` (``Status`` enum members), per-field
-        ``*_changed`` booleans, and ``changed_at`` (the newer record's timestamp).
+        ``*_changed`` booleans, and ``changed_at``.
         """
-        # Oldest -> newest so diff_against(prev) reads left-to-right.
-        records = list(self.history.order_by("history_date", "history_id"))
-        timeline = []
-        for prev, curr in zip(records, records[1:], strict=False):
-            delta = curr.diff_against(
-                prev,
-                included_fields=["location", "status"],
-                foreign_keys_are_objs=True,
-            )
-            changed = {c.field for c in delta.changes}
-            if not changed:
-                continue
-            entry = {
-                "changed_at": curr.history_date,
-                "location_changed": "location" in changed,
-                "location_from": prev.location,
-                "location_to": curr.location,
-                "status_changed": "status" in changed,
-                "status_from": self.Status(prev.status) if prev.status else prev.status,
-                "status_to": self.Status(curr.status) if curr.status else curr.status,
-            }
-            timeline.append(entry)
-        timeline.reverse()  # newest change first
-        return timeline
+        events = self.change_events.select_related("location_from", "location_to")
+        return [event.as_timeline_entry() for event in events]
 
     @property
     def depleted(self):
@@ -864,6 +965,9 @@ class Location(models.Model):
         default=False
     )  # Is the location one of the printers?
 
+    # Bumped on every save; the JSON API's ETag version stamp (inventory.api).
+    last_modified = models.DateTimeField(auto_now=True)
+
     class Meta:
         verbose_name = "Location"
         verbose_name_plural = "Locations"
@@ -932,6 +1036,60 @@ class Location(models.Model):
         return ids
 
 
+class ItemChangeEvent(models.Model):
+    """One save that moved an item and/or changed its status.
+
+    Written by :mod:`inventory.item_events` as the save happens, so the item
+    timeline and the recent-moves feed are indexed reads rather than a walk
+    over simple-history. A save that changes both fields is one row; the
+    unchanged side simply has equal ``from``/``to`` values.
+    """
+
+    item = models.ForeignKey(
+        "InventoryItem", on_delete=models.CASCADE, related_name="change_events"
+    )
+    changed_at = models.DateTimeField(default=now)
+    location_changed = models.BooleanField(default=False)
+    location_from = models.ForeignKey(
+        Location, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    location_to = models.ForeignKey(
+        Location, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    status_changed = models.BooleanField(default=False)
+    status_from = models.PositiveSmallIntegerField(null=True, blank=True)
+    status_to = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-changed_at", "-id"]
+        indexes = [
+            # InventoryItem.location_status_timeline
+            models.Index(fields=["item", "changed_at"], name="item_change_item_at_idx"),
+            # The recent-moves feed.
+            models.Index(
+                fields=["location_changed", "changed_at"], name="item_change_moves_idx"
+            ),
+        ]
+        verbose_name = "Item Change Event"
+        verbose_name_plural = "Item Change Events"
+
+    def __str__(self):
+        return f"{self.item_id} @ {self.changed_at:%Y-%m-%d %H:%M}"
+
+    def as_timeline_entry(self):
+        """The dict :meth:`InventoryItem.location_status_timeline` returns."""
+        status = InventoryItem.Status
+        return {
+            "changed_at": self.changed_at,
+            "location_changed": self.location_changed,
+            "location_from": self.location_from,
+            "location_to": self.location_to,
+            "status_changed": self.status_changed,
+            "status_from": status(self.status_from) if self.status_from else None,
+            "status_to": status(self.status_to) if self.status_to else None,
+        }
+
+
 class Material(models.Model):
     """
     Represents a material for 3D printing, including its properties and characteristics.
@@ -1034,6 +1192,8 @@ class Material(models.Model):
         default=Category.EVERYDAY,
         help_text="Drives guide grouping; SUPPORT materials are excluded from the picker.",
     )
+    # Bumped on every save; folded into the JSON API products ETag (inventory.api).
+    last_modified = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = [("name", "material_type")]
@@ -1246,6 +1406,42 @@ class AuditUnknownScan(models.Model):
         return f"UPC {self.upc} @ {self.location_id} ({'open' if not (self.resolved or self.dismissed) else 'closed'})"
 
 
+class SyncedScan(models.Model):
+    """A phone-journaled scan replayed by the batch sync endpoint.
+
+    The phone records scans locally (IndexedDB) and uploads them in batches; each
+    carries a client-generated ``client_id``. Storing the outcome under that id
+    makes a re-sent batch (lost response, retry after a dead zone) return the
+    original result instead of scanning twice.
+    """
+
+    class Flow(models.TextChoices):
+        AUDIT = "audit", "Audit"
+        MOVE = "move", "Quick move"
+
+    client_id = models.CharField(max_length=64, unique=True)
+    flow = models.CharField(max_length=10, choices=Flow.choices)
+    code = models.CharField(max_length=255)
+    dest_code = models.CharField(max_length=255, blank=True)
+    scanned_at = models.DateTimeField(null=True, blank=True)
+    session = models.ForeignKey(
+        AuditSession, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    user = models.ForeignKey(
+        "auth.User", on_delete=models.SET_NULL, null=True, blank=True
+    )
+    # Bootstrap alert level of the outcome ("success"/"warning"/"danger"/"info").
+    result = models.CharField(max_length=10)
+    message = models.CharField(max_length=255, blank=True)
+    synced_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["synced_at", "id"]
+
+    def __str__(self):
+        return f"{self.flow} {self.code} -> {self.result}"
+
+
 # Polymorphic product types that represent a physical, maintainable machine.
 # Maintenance/nozzle records only attach to InventoryItems of these product types.
 MACHINE_PRODUCT_TYPES = (Printer, AMS, Dryer)
@@ -1270,10 +1466,9 @@ class MaintenanceEvent(models.Model):
 
     The machine's ``InventoryItem`` is the only stable identity for "this specific
     physical unit" (catalog ``Product`` rows describe a *model*, not the unit you
-    own), so events attach there. ``hms_code`` is reserved for the later
-    Bambu-MQTT integration, which will open ``FAULT`` events carrying the printer's
-    HMS error code — the column exists from day one so no schema change is needed
-    when that writer arrives.
+    own), so events attach there. ``hms_code`` is the Bambu HMS error code:
+    :mod:`inventory.hms_faults` opens and resolves ``FAULT`` events carrying it
+    as a linked printer's telemetry reports alerts appearing and clearing.
     """
 
     class Kind(models.IntegerChoices):
@@ -1333,7 +1528,7 @@ class MaintenanceEvent(models.Model):
         max_length=32,
         blank=True,
         default="",
-        help_text="Bambu HMS error code (populated by the MQTT consumer later).",
+        help_text="Bambu HMS error code (set by the MQTT consumer for telemetry faults).",
     )
     resolved = models.BooleanField(
         default=True, help_text="False = an open fault still needing attention."
@@ -1420,10 +1615,11 @@ class PrintJob(models.Model):
     (:func:`inventory.printjobs.complete_job`) decrements each referenced spool's
     ``percent_remaining`` and depletes it at ~0.
 
-    ``source`` distinguishes manual entry (today) from MQTT auto-population
-    (Phase 16.3); ``telemetry_task_id`` is the Bambu subtask id used as the
-    dedup key when the auto-ingest path lands. Both exist now so no schema change
-    is needed when telemetry arrives — only a new writer.
+    ``source`` distinguishes manual entry from MQTT auto-population by
+    :mod:`inventory.print_tracker` and from slicer files loaded by
+    :mod:`inventory.job_import`; ``telemetry_task_id`` is the Bambu task id
+    that tracker deduplicates on, ``source_hash`` the file digest the importer
+    deduplicates on.
     """
 
     class Result(models.IntegerChoices):
@@ -1435,6 +1631,7 @@ class PrintJob(models.Model):
     class Source(models.IntegerChoices):
         MANUAL = 1, "manual"
         MQTT = 2, "mqtt"
+        IMPORT = 3, "import"
 
     printer = models.ForeignKey(
         "InventoryItem",
@@ -1464,11 +1661,21 @@ class PrintJob(models.Model):
         default="",
         help_text="Bambu subtask id — dedup key for MQTT auto-ingest.",
     )
+    source_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="SHA-256 of the imported 3MF/gcode file — dedup key for imports.",
+    )
     completed = models.BooleanField(
         default=False,
         help_text="True once consumption has been applied to the referenced spools.",
     )
     notes = models.TextField(blank=True, default="")
+    # MQTT jobs only: each AMS tray's {"uuid", "remain"} when the print started,
+    # keyed "ams/tray"; the tracker diffs the end readings against it.
+    tray_start = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -1537,6 +1744,118 @@ class PrintJobFilament(models.Model):
         return f"{self.item_id} on job {self.job_id}"
 
 
+class PrinterDailyStats(models.Model):
+    """One printer's completed jobs for one day, summed.
+
+    Written by :func:`inventory.printjobs.record_stats` as jobs complete (the
+    day is the job's local start date, else its end date) and rebuilt by
+    ``manage.py rebuild_printer_stats``. Utilization pages sum these rows over
+    a date window instead of scanning every job.
+    """
+
+    printer = models.ForeignKey(
+        "InventoryItem", on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    day = models.DateField()
+    jobs = models.PositiveIntegerField(default=0)
+    success = models.PositiveIntegerField(default=0)
+    seconds = models.PositiveBigIntegerField(default=0)
+    grams = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["printer", "day"], name="printer_daily_stats_uniq"
+            )
+        ]
+        indexes = [models.Index(fields=["day"], name="printer_daily_stats_day_idx")]
+        verbose_name = "Printer Daily Stats"
+        verbose_name_plural = "Printer Daily Stats"
+
+    def __str__(self):
+        return f"{self.printer_id} on {self.day}"
+
+
+class PrinterDailyConsumption(models.Model):
+    """Grams of one product a printer used on one day (see :class:`PrinterDailyStats`)."""
+
+    printer = models.ForeignKey(
+        "InventoryItem", on_delete=models.CASCADE, related_name="daily_consumption"
+    )
+    day = models.DateField()
+    product = models.ForeignKey(
+        "Product", on_delete=models.CASCADE, related_name="daily_consumption"
+    )
+    grams = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["printer", "day", "product"],
+                name="printer_daily_consumption_uniq",
+            )
+        ]
+        indexes = [models.Index(fields=["day"], name="printer_daily_cons_day_idx")]
+        verbose_name = "Printer Daily Consumption"
+        verbose_name_plural = "Printer Daily Consumption"
+
+    def __str__(self):
+        return f"{self.product_id} on {self.printer_id} ({self.day})"
+
+
+class ConsumptionForecast(models.Model):
+    """One filament product's burn rate, days of cover and reorder point.
+
+    Rows are replaced wholesale once a day by
+    :func:`inventory.forecast.refresh` (see there for the maths). Grams are
+    physical filament: on hand is ``percent_remaining`` × the product's
+    ``weight`` over active spools.
+    """
+
+    product = models.OneToOneField(
+        "Product", on_delete=models.CASCADE, related_name="forecast"
+    )
+    computed_at = models.DateTimeField()
+    burn_g_per_day = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    on_hand_g = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    on_hand_count = models.PositiveIntegerField(default=0)
+    days_of_cover = models.DecimalField(
+        max_digits=8,
+        decimal_places=1,
+        null=True,
+        blank=True,
+        help_text="On-hand grams / burn rate; blank when nothing is being used.",
+    )
+    reorder_point_g = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    needs_reorder = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["days_of_cover"]
+        verbose_name = "Consumption Forecast"
+        verbose_name_plural = "Consumption Forecasts"
+
+    def __str__(self):
+        return f"{self.product_id}: {self.burn_g_per_day} g/day"
+
+
+class ConsumptionForecastRun(models.Model):
+    """When :func:`inventory.forecast.refresh` last ran (a single row).
+
+    Kept apart from the forecast rows so a refresh that stores none (nothing
+    weighted in stock or used) still counts for the day.
+    """
+
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Consumption Forecast Run"
+
+    def __str__(self):
+        return f"Forecast computed {self.computed_at:%Y-%m-%d %H:%M}"
+
+
 # ---------------------------------------------------------------------------
 # Procurement / cost layer (Phase 14)
 #
@@ -1566,9 +1885,12 @@ class Supplier(models.Model):
         return self.name
 
 
-class PurchaseOrder(models.Model):
+class PurchaseOrder(TrackedFieldsMixin, models.Model):
     """A single order placed with a supplier, grouping one or more lines."""
 
+    # The spend ledger re-files an order's spend when its supplier changes.
+    TRACKED_FIELDS = ("supplier_id",)
+
     class Status(models.IntegerChoices):
         DRAFT = 1, "Draft"
         ORDERED = 2, "Ordered"
@@ -1646,7 +1968,7 @@ class PurchaseOrder(models.Model):
         return self.status
 
 
-class PurchaseOrderLine(models.Model):
+class PurchaseOrderLine(TrackedFieldsMixin, models.Model):
     """One product line on a purchase order.
 
     ``track_individually`` distinguishes serialized/tracked goods (each received
@@ -1654,6 +1976,16 @@ class PurchaseOrderLine(models.Model):
     screws or bagged hardware, which are tracked only as a line cost.
     """
 
+    # Everything the spend ledger's line figures are computed from.
+    TRACKED_FIELDS = (
+        "order_id",
+        "product_id",
+        "qty_ordered",
+        "qty_received",
+        "unit_cost",
+        "track_individually",
+    )
+
     order = models.ForeignKey(
         PurchaseOrder, on_delete=models.CASCADE, related_name="lines"
     )
@@ -1757,6 +2089,89 @@ class PurchaseReceiptLine(models.Model):
         return f"{self.qty_received}x {self.order_line.product}"
 
 
+class SpendMeasures(models.Model):
+    """The additive spend figures shared by ledger entries and their rollups.
+
+    On a :class:`SpendLedgerEntry` each field is a signed change; on a
+    :class:`SpendRollup` it is the running total of those changes.
+    """
+
+    tracked_spend = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    tracked_count = models.IntegerField(default=0)
+    on_hand_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    consumable_spend = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    consumable_lines = models.IntegerField(default=0)
+    ordered_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    received_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    MEASURES = (
+        "tracked_spend",
+        "tracked_count",
+        "on_hand_value",
+        "consumable_spend",
+        "consumable_lines",
+        "ordered_value",
+        "received_value",
+    )
+
+    month = models.DateField(help_text="First day of the month the change lands in.")
+    supplier = models.ForeignKey(
+        Supplier, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    category = models.ForeignKey(
+        ContentType,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        help_text="The product type (Filament, Hardware, …).",
+    )
+
+    class Meta:
+        abstract = True
+
+
+class SpendLedgerEntry(SpendMeasures):
+    """One append-only change to spend, written by :mod:`inventory.spend_ledger`.
+
+    Posted when a tracked item's cost, status or origin changes, when a PO
+    line's quantities or cost change, and when an order changes supplier.
+    """
+
+    occurred_at = models.DateTimeField(default=now)
+    item = models.ForeignKey(
+        InventoryItem, null=True, blank=True, on_delete=models.SET_NULL
+    )
+    order_line = models.ForeignKey(
+        PurchaseOrderLine, null=True, blank=True, on_delete=models.SET_NULL
+    )
+
+    class Meta:
+        ordering = ["-occurred_at", "-id"]
+        verbose_name = "Spend Ledger Entry"
+        verbose_name_plural = "Spend Ledger Entries"
+
+    def __str__(self):
+        return f"{self.occurred_at:%Y-%m-%d} {self.supplier or '—'} {self.category}"
+
+
+class SpendRollup(SpendMeasures):
+    """Ledger totals per month, supplier and product category.
+
+    Readers always ``Sum`` over matching rows, so a rare duplicate row from
+    two concurrent first posts for the same key is harmless.
+    """
+
+    class Meta:
+        ordering = ["month"]
+        indexes = [models.Index(fields=["month"], name="spend_rollup_month_idx")]
+        verbose_name = "Spend Rollup"
+        verbose_name_plural = "Spend Rollups"
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.supplier or '—'} {self.category}"
+
+
 # ---------------------------------------------------------------------------
 # Bambu MQTT telemetry mirror (Phase 16.1). Read-only: populated by the
 # telemetry consumer; decoupled from InventoryItem (16.3 owns the joins). No
@@ -1782,6 +2197,8 @@ class PrinterDevice(models.Model):
     )
     enabled = models.BooleanField(default=True)
     last_seen_at = models.DateTimeField(null=True, blank=True)
+    # Bumped on every save; the JSON API's ETag version stamp (inventory.api).
+    last_modified = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.name} ({self.serial})"
@@ -1834,6 +2251,9 @@ class AMSUnitState(models.Model):
     dry_duration = models.IntegerField(null=True, blank=True)
     dry_temperature = models.IntegerField(null=True, blank=True)
     dry_filament = models.CharField(max_length=64, blank=True, default="")
+    # AMS hardware serial from get_version: the bridge to the AMS InventoryItem
+    # that the live spool reconciler (inventory.spool_autosync) relies on.
+    serial = models.CharField(max_length=32, blank=True, default="")
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -1889,3 +2309,46 @@ class TelemetrySample(models.Model):
 
     def __str__(self):
         return f"{self.device.name} @ {self.ts:%Y-%m-%d %H:%M}"
+
+
+class SpoolSyncFinding(models.Model):
+    """The live spool reconciler's current verdict for one AMS tray.
+
+    One row per tray seen: a spool-sync flag (category from
+    :class:`inventory.spool_sync.Flag`), a ``PROPOSAL`` to write a serial or
+    percent, or ``OK`` once the tray reconciles cleanly. Rows are updated in
+    place as telemetry changes, so the table holds current state, not a log.
+    A clean tray keeps its ``OK`` row because ``applied_at`` (the last automatic
+    ``percent_remaining`` write) rate-limits the next one. The review queue is
+    every row that isn't ``OK``.
+    """
+
+    OK = "OK"
+    PROPOSAL = "PROPOSAL"
+
+    device = models.ForeignKey(
+        PrinterDevice, on_delete=models.CASCADE, related_name="spool_findings"
+    )
+    ams_index = models.PositiveSmallIntegerField()
+    tray_index = models.PositiveSmallIntegerField()
+    category = models.CharField(max_length=20)
+    item = models.ForeignKey(
+        InventoryItem, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    detail = models.CharField(max_length=255, blank=True, default="")
+    write_serial = models.CharField(max_length=64, blank=True, default="")
+    write_percent_from = models.SmallIntegerField(null=True, blank=True)
+    write_percent_to = models.SmallIntegerField(null=True, blank=True)
+    first_seen_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    applied_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("device", "ams_index", "tray_index")
+        ordering = ["device", "ams_index", "tray_index"]
+
+    def __str__(self):
+        return (
+            f"{self.device.name} AMS{self.ams_index}/tray{self.tray_index}: "
+            f"{self.category}"
+        )
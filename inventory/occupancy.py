@@ -0,0 +1,112 @@
+"""Who is sitting where: active occupants per location, loaded in bulk.
+
+Capacity checks (:func:`inventory.items._active_count_at`), the quick-move
+occupant lookup, the AMS/dryer slot maps and the spool-sync report all ask the
+same question — which non-terminal items are at location X — and used to ask it
+once per location. An :class:`Occupancy` answers it for any set of locations
+with one grouped query and keeps the answer.
+
+:func:`scope` makes one map current for a block (a request handler, a sync run)
+so every caller inside shares it; :func:`current` returns that map, or a fresh
+throwaway one outside a scope (which behaves exactly like the old per-call
+query). Writes keep a scoped map honest: ``InventoryItem`` saves forget the
+old and new location in the post_save signal, and the bulk paths in
+:mod:`inventory.items` forget the locations they touch.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from . import items
+from .models import InventoryItem, Location
+
+_current = ContextVar("inventory_occupancy", default=None)
+
+
+class Occupancy:
+    """Active (non-terminal) items per location id, loaded on demand.
+
+    UNKNOWN items are included — they still physically fill a slot — so callers
+    that want in-stock rolls only (spool sync) filter those out themselves.
+    Items come with ``product`` and ``location`` joined, ordered by pk.
+    """
+
+    def __init__(self):
+        self._by_location = {}
+
+    def load(self, location_ids):
+        """Fetch every not-yet-loaded id in ``location_ids`` in one query."""
+        missing = {
+            pk for pk in location_ids if pk is not None
+        } - self._by_location.keys()
+        if not missing:
+            return self
+        for pk in missing:
+            self._by_location[pk] = []
+        ids = sorted(missing)
+        for start in range(0, len(ids), items.BULK_CHUNK_SIZE):
+            rows = (
+                InventoryItem.objects.filter(
+                    location_id__in=ids[start : start + items.BULK_CHUNK_SIZE]
+                )
+                .exclude(status__in=items.TERMINAL_STATUSES)
+                .select_related("product", "location")
+                .order_by("pk")
+            )
+            for item in rows:
+                self._by_location[item.location_id].append(item)
+        return self
+
+    def load_kind(self, *kinds):
+        """Load every location of the given kinds (e.g. all AMS slots)."""
+        return self.load(
+            Location.objects.filter(kind__in=kinds).values_list("id", flat=True)
+        )
+
+    def occupants(self, location_id):
+        """Active items at ``location_id`` (loading it if needed), oldest first."""
+        self.load([location_id])
+        return self._by_location.get(location_id, [])
+
+    def occupant(self, location_id):
+        """The first active occupant of ``location_id``, or None."""
+        found = self.occupants(location_id)
+        return found[0] if found else None
+
+    def count(self, location_id, *, exclude_pk=None):
+        """How many active items sit at ``location_id``, not counting ``exclude_pk``."""
+        return sum(1 for item in self.occupants(location_id) if item.pk != exclude_pk)
+
+    def forget(self, *location_ids):
+        """Drop cached rows so the next lookup re-reads them."""
+        for pk in location_ids:
+            self._by_location.pop(pk, None)
+
+
+def current():
+    """The map of the enclosing :func:`scope`, else a fresh unshared one."""
+    return _current.get() or Occupancy()
+
+
+def forget(*location_ids):
+    """Invalidate ``location_ids`` in the enclosing scope's map, if any."""
+    occupancy = _current.get()
+    if occupancy is not None:
+        occupancy.forget(*location_ids)
+
+
+@contextmanager
+def scope():
+    """Share one :class:`Occupancy` for the block; nested scopes reuse the outer.
+
+    Usable as a decorator too (``@occupancy.scope()``).
+    """
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+    token = _current.set(Occupancy())
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
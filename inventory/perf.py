@@ -0,0 +1,495 @@
+"""Per-view SQL query-count and latency budgets.
+
+Seeds a large synthetic dataset, GETs every named route in :mod:`inventory.urls`
+as a logged-in superuser and records the query count and wall time of each
+response. :func:`check` compares the timings against the checked-in budget file
+(``inventory/perf_budgets.json``) so an N+1 or a lost index shows up as a failed
+gate rather than a slow page months later.
+
+Driven by the ``perf_budget`` management command, which runs everything against a
+throwaway test database. Model imports are deferred into functions so importing
+this module never touches the app registry.
+"""
+
+import json
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.db import connection
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+BUDGETS_PATH = Path(__file__).resolve().parent / "perf_budgets.json"
+
+# The dataset the budgets were recorded against (``--scale 1``).
+SCALE_ITEMS = 10_000
+SCALE_LOCATIONS = 500
+SCALE_SAMPLES = 50_000
+SCALE_JOBS = 2_000
+SCALE_FILAMENTS = 200
+
+# Routes a GET must never hit from a harness: they print to the label printer or
+# end the session mid-run.
+SKIP_ROUTES = {
+    "print_barcode": "prints a label on GET",
+    "print_unit_label": "prints a label on GET",
+    "logout": "ends the harness session",
+}
+
+# Headroom applied by ``--write-budgets``: query counts are deterministic so they
+# are budgeted exactly; wall time is noisy and machine-dependent.
+MS_HEADROOM = 3.0
+MS_FLOOR = 250
+
+
+@dataclass
+class Dataset:
+    """Handles to seeded rows that parametrized routes need."""
+
+    item_id: int
+    location_id: int
+    unit_id: int
+    printer_item_id: int
+    job_id: int
+    order_id: int
+    unknown_id: int
+    color_sheet_slug: str
+    product_id: int
+    printer_state_id: int
+    ams_channel_id: int
+    forecast_id: int
+
+
+@dataclass
+class ViewTiming:
+    name: str
+    path: str
+    status: int
+    queries: int
+    ms: float
+
+
+def _n(base, scale):
+    return max(1, int(base * scale))
+
+
+def seed(scale=1.0, *, rng=None):
+    """Populate the current database with a deterministic synthetic dataset.
+
+    Bulk inserts throughout (no per-row ``save()``/signals); statuses and dates are
+    written directly, so the data mirrors what the app produces without paying the
+    history/search-index cost per row. The FTS index, the daily printer stats
+    and the consumption forecast are rebuilt once at the end.
+    """
+    from . import forecast, printjobs, search_index
+    from .color_catalog import group_slug
+    from .models import (
+        AMS,
+        AMSChannelState,
+        AuditSession,
+        AuditUnknownScan,
+        Filament,
+        FilamentColor,
+        InventoryItem,
+        Location,
+        MaintenanceEvent,
+        Material,
+        Printer,
+        PrinterDevice,
+        PrinterState,
+        PrintJob,
+        PrintJobFilament,
+        PurchaseOrder,
+        PurchaseOrderLine,
+        Supplier,
+        TelemetrySample,
+    )
+
+    rng = rng or random.Random(0)
+    Status = InventoryItem.Status
+    Kind = Location.Kind
+    now = timezone.now()
+
+    materials = [
+        Material.objects.create(name=name, material_type=sub)
+        for name, sub in (("PLA", "Basic"), ("PLA", "Matte"), ("PETG", "HF"))
+    ]
+    for mat in materials:
+        for c in range(5):
+            FilamentColor.objects.create(
+                material_name=mat.name,
+                material_type=mat.material_type,
+                color_name=f"Color {c}",
+                hex_code=f"#{c:02x}{c:02x}{c:02x}",
+                material=mat,
+            )
+    filaments = [
+        Filament.objects.create(
+            name=f"Perf Filament {i}",
+            upc=f"perf{i:08d}",
+            sku=f"P{i:05d}",
+            material=materials[i % len(materials)],
+            hex_code=f"#{i % 256:02x}{(i * 7) % 256:02x}{(i * 13) % 256:02x}",
+            weight=Decimal("1.00"),
+        )
+        for i in range(_n(SCALE_FILAMENTS, scale))
+    ]
+    printer_product = Printer.objects.create(
+        name="Perf Printer", upc="perfprinter01", num_extruders=1
+    )
+    ams_product = AMS.objects.create(name="Perf AMS", upc="perfams000001")
+
+    # Machines: one printer + one AMS per device.
+    n_devices = 4
+    printers = InventoryItem.objects.bulk_create(
+        InventoryItem(
+            product=printer_product, serial_number=f"PRN{d:04d}", status=Status.IN_USE
+        )
+        for d in range(n_devices)
+    )
+    ams_units = InventoryItem.objects.bulk_create(
+        InventoryItem(
+            product=ams_product, serial_number=f"AMS{d:04d}", status=Status.IN_USE
+        )
+        for d in range(n_devices)
+    )
+
+    # Locations: printer leaves and AMS containers with four slots each, then
+    # racks of shelves up to the target count.
+    Location.objects.bulk_create(
+        Location(
+            name=f"Printer {d}",
+            kind=Kind.PRINTER,
+            unit=printers[d],
+            is_printer=True,
+            default_status=Status.IN_USE,
+        )
+        for d in range(n_devices)
+    )
+    ams_locs = Location.objects.bulk_create(
+        Location(name=f"AMS {d}", kind=Kind.AMS, unit=ams_units[d])
+        for d in range(n_devices)
+    )
+    Location.objects.bulk_create(
+        Location(
+            name=f"AMS {d} / Slot {s}",
+            kind=Kind.AMS_SLOT,
+            parent=ams_locs[d],
+            unit=ams_units[d],
+            slot_index=s,
+            capacity=1,
+            default_status=Status.IN_USE,
+        )
+        for d in range(n_devices)
+        for s in range(1, 5)
+    )
+    n_shelves = max(2, _n(SCALE_LOCATIONS, scale) - Location.objects.count())
+    racks = Location.objects.bulk_create(
+        Location(name=f"Rack {r}", kind=Kind.RACK)
+        for r in range(max(1, n_shelves // 25))
+    )
+    shelves = Location.objects.bulk_create(
+        Location(
+            name=f"Rack {i % len(racks)} / Shelf {i}",
+            kind=Kind.SHELF if i % 3 else Kind.DRY_STORAGE,
+            parent=racks[i % len(racks)],
+            default_status=Status.STORED if i % 3 == 0 else Status.NEW,
+        )
+        for i in range(n_shelves - len(racks))
+    )
+
+    # Spools: ~70% active, the rest depleted/sold across the last year.
+    spools = []
+    for _ in range(_n(SCALE_ITEMS, scale)):
+        roll = rng.random()
+        spool = InventoryItem(
+            product=rng.choice(filaments),
+            location=rng.choice(shelves),
+            percent_remaining=Decimal(rng.randint(1, 100)),
+            unit_cost=Decimal("19.99"),
+            status=rng.choice((Status.NEW, Status.STORED, Status.IN_USE)),
+        )
+        if roll > 0.95:
+            spool.status = Status.SOLD
+            spool.date_sold = now - timedelta(days=rng.randint(0, 365))
+        elif roll > 0.7:
+            spool.status = Status.DEPLETED
+            spool.date_depleted = now - timedelta(days=rng.randint(0, 365))
+        spools.append(spool)
+    spools = InventoryItem.objects.bulk_create(spools, batch_size=1000)
+
+    devices = PrinterDevice.objects.bulk_create(
+        PrinterDevice(
+            serial=f"PERFDEV{d:04d}",
+            name=f"Perf Device {d}",
+            ip_address=f"10.0.0.{d + 1}",
+            item=printers[d],
+        )
+        for d in range(n_devices)
+    )
+    states = PrinterState.objects.bulk_create(
+        PrinterState(device=dev, gcode_state="RUNNING", mc_percent=42)
+        for dev in devices
+    )
+    channels = AMSChannelState.objects.bulk_create(
+        AMSChannelState(
+            device=dev, ams_index=0, tray_index=t, tray_type="PLA", remain_pct=50
+        )
+        for dev in devices
+        for t in range(4)
+    )
+    n_samples = _n(SCALE_SAMPLES, scale)
+    TelemetrySample.objects.bulk_create(
+        (
+            TelemetrySample(
+                device=devices[i % n_devices],
+                ts=now - timedelta(minutes=i),
+                gcode_state="RUNNING" if i % 4 else "IDLE",
+                mc_percent=i % 100,
+            )
+            for i in range(n_samples)
+        ),
+        batch_size=2000,
+    )
+
+    jobs = PrintJob.objects.bulk_create(
+        (
+            PrintJob(
+                printer=printers[i % n_devices],
+                name=f"part-{i}.3mf",
+                started_at=now - timedelta(hours=i * 3),
+                ended_at=now - timedelta(hours=i * 3 - 2),
+                duration_s=7200,
+                completed=True,
+            )
+            for i in range(_n(SCALE_JOBS, scale))
+        ),
+        batch_size=1000,
+    )
+    PrintJobFilament.objects.bulk_create(
+        (
+            PrintJobFilament(
+                job=job,
+                item=rng.choice(spools),
+                grams_used=Decimal("25.00"),
+                percent_used=Decimal("2.50"),
+            )
+            for job in jobs
+        ),
+        batch_size=1000,
+    )
+    MaintenanceEvent.objects.bulk_create(
+        MaintenanceEvent(
+            unit=printers[i % n_devices],
+            kind=(
+                MaintenanceEvent.Kind.FAULT
+                if i % 3 == 0
+                else MaintenanceEvent.Kind.CLEAN
+            ),
+            occurred_at=now - timedelta(days=i),
+            title=f"Event {i}",
+            resolved=i % 6 != 0,
+        )
+        for i in range(50)
+    )
+
+    supplier = Supplier.objects.create(name="Perf Supplier")
+    orders = PurchaseOrder.objects.bulk_create(
+        PurchaseOrder(supplier=supplier, order_ref=f"PERF-{i}") for i in range(50)
+    )
+    PurchaseOrderLine.objects.bulk_create(
+        PurchaseOrderLine(
+            order=order,
+            product=filaments[(o * 4 + k) % len(filaments)],
+            qty_ordered=10,
+            qty_received=k * 3,
+            unit_cost=Decimal("19.99"),
+        )
+        for o, order in enumerate(orders)
+        for k in range(4)
+    )
+
+    session = AuditSession.objects.create(state=AuditSession.State.FINALIZED)
+    unknown = AuditUnknownScan.objects.create(
+        session=session, location=shelves[0], upc="000000000000"
+    )
+
+    search_index.rebuild_all()
+    printjobs.rebuild_stats()
+    forecasts = forecast.refresh()
+
+    mat = materials[0]
+    return Dataset(
+        item_id=spools[0].pk,
+        location_id=shelves[0].pk,
+        unit_id=ams_units[0].pk,
+        printer_item_id=printers[0].pk,
+        job_id=jobs[0].pk,
+        order_id=orders[0].pk,
+        unknown_id=unknown.pk,
+        color_sheet_slug=group_slug("Bambu Lab", mat.name, mat.material_type),
+        product_id=filaments[0].pk,
+        printer_state_id=states[0].pk,
+        ams_channel_id=channels[0].pk,
+        forecast_id=forecasts[0].pk if forecasts else 0,
+    )
+
+
+def _route_kwargs(dataset):
+    """URL kwargs for each parametrized route name."""
+    return {
+        "inventory_edit": {"item_id": dataset.item_id},
+        "location_detail": {"location_id": dataset.location_id},
+        "barcode_redirect": {"value": f"INV-{dataset.item_id}"},
+        "filament_color_sheet": {"slug": dataset.color_sheet_slug},
+        "unit_maintenance": {"item_id": dataset.printer_item_id},
+        "maintenance_log": {"item_id": dataset.printer_item_id},
+        "audit_undo_add": {"item_id": dataset.item_id},
+        "print_job_detail": {"pk": dataset.job_id},
+        "printer_utilization_detail": {"pk": dataset.printer_item_id},
+        "po_detail": {"pk": dataset.order_id},
+        "receiving_console": {"pk": dataset.order_id},
+        "receiving_scan": {"pk": dataset.order_id},
+        "audit_unknown_resolve": {"pk": dataset.unknown_id},
+        "audit_unknown_dismiss": {"pk": dataset.unknown_id},
+        "api_item_detail": {"pk": dataset.item_id},
+        "api_location_detail": {"pk": dataset.location_id},
+        "api_product_detail": {"pk": dataset.product_id},
+        "api_printer_state_detail": {"pk": dataset.printer_state_id},
+        "api_ams_channel_detail": {"pk": dataset.ams_channel_id},
+        "api_forecast_detail": {"pk": dataset.forecast_id},
+    }
+
+
+def routes(dataset, urlpatterns=None):
+    """``(name, path)`` for every named, non-skipped route in ``urlpatterns``.
+
+    Raises ``KeyError`` for a parametrized route with no kwargs registered in
+    :func:`_route_kwargs`, so a new route can't silently escape the budget.
+    """
+    if urlpatterns is None:
+        from .urls import urlpatterns
+    kwargs_by_name = _route_kwargs(dataset)
+    out = []
+    for pattern in urlpatterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name:
+            continue
+        if pattern.name in SKIP_ROUTES:
+            continue
+        kwargs = {}
+        if pattern.pattern.converters:
+            if pattern.name not in kwargs_by_name:
+                raise KeyError(f"No perf kwargs registered for route {pattern.name!r}")
+            kwargs = kwargs_by_name[pattern.name]
+        out.append((pattern.name, reverse(pattern.name, kwargs=kwargs)))
+    return out
+
+
+class _QueryCounter:
+    """``connection.execute_wrapper`` hook counting statements.
+
+    Unlike ``CaptureQueriesContext`` this has no 9000-query ceiling (the debug
+    ``queries_log`` is a bounded deque), which a pathological N+1 easily passes.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(client, name, path, *, repeat=3):
+    """GET ``path`` ``repeat`` times; queries from the first, median wall time."""
+    timings = []
+    queries = None
+    status = None
+    for _ in range(repeat):
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            response = client.get(path)
+            timings.append((time.perf_counter() - started) * 1000)
+        if queries is None:
+            queries = counter.count
+            status = response.status_code
+    return ViewTiming(
+        name=name,
+        path=path,
+        status=status,
+        queries=queries,
+        ms=round(statistics.median(timings), 1),
+    )
+
+
+def run(client, dataset, *, repeat=3):
+    """Measure every route; returns a list of :class:`ViewTiming`."""
+    return [
+        measure(client, name, path, repeat=repeat) for name, path in routes(dataset)
+    ]
+
+
+def load_budgets(path=BUDGETS_PATH):
+    return json.loads(Path(path).read_text())
+
+
+def budget_for(budgets, name):
+    return budgets["views"].get(name, budgets["default"])
+
+
+def check(timings, budgets, *, check_time=True):
+    """Human-readable violations (empty list = within budget).
+
+    A 5xx response is always a violation: a crashing view would otherwise look
+    very cheap.
+    """
+    violations = []
+    for t in timings:
+        budget = budget_for(budgets, t.name)
+        if t.status >= 500:
+            violations.append(f"{t.name}: HTTP {t.status} at {t.path}")
+        if t.queries > budget["queries"]:
+            violations.append(
+                f"{t.name}: {t.queries} queries > budget {budget['queries']}"
+            )
+        if check_time and t.ms > budget["ms"]:
+            violations.append(f"{t.name}: {t.ms} ms > budget {budget['ms']} ms")
+    return violations
+
+
+def budgets_from(timings, default):
+    """A budget document recording ``timings`` (``--write-budgets``)."""
+    return {
+        "default": default,
+        "views": {
+            t.name: {
+                "queries": t.queries,
+                "ms": max(MS_FLOOR, int(t.ms * MS_HEADROOM)),
+            }
+            for t in sorted(timings, key=lambda t: t.name)
+        },
+    }
+
+
+def format_report(timings, budgets):
+    """Ranked table (slowest first) with each view's budget alongside."""
+    header = f"{'view':32} {'status':>6} {'queries':>9} {'ms':>9}  budget (q / ms)"
+    lines = [header, "-" * len(header)]
+    for t in sorted(timings, key=lambda t: (-t.ms, -t.queries)):
+        budget = budget_for(budgets, t.name)
+        over = (
+            " !"
+            if t.queries > budget["queries"] or t.ms > budget["ms"] or t.status >= 500
+            else ""
+        )
+        lines.append(
+            f"{t.name:32} {t.status:>6} {t.queries:>9} {t.ms:>9.1f}  "
+            f"{budget['queries']} / {budget['ms']}{over}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,239 @@
+"""Print jobs from telemetry: open on start, close on finish, consume in batches.
+
+:func:`inventory.telemetry.ingest_report` calls :func:`observe` with each
+printer's previous and new ``gcode_state``. A move into PREPARE/RUNNING/PAUSE
+opens a ``source=MQTT`` :class:`~inventory.models.PrintJob` keyed by the Bambu
+``task_id`` and snapshots every AMS tray's ``remain``. A move from one of those
+into FINISH/FAILED closes the job. Each tray whose ``remain`` fell (same RFID as
+at the start) becomes a :class:`~inventory.models.PrintJobFilament` line for the
+spool sitting in that slot. Lines are resolved through the same AMS bridge as
+the spool sync. A move into any other state (IDLE after a cancel) closes the job
+as CANCELLED, and a job still open when the next one starts (its end message was
+missed) is closed as PARTIAL first, so no job stays open forever.
+
+Closing a job doesn't touch the spools. :func:`apply_pending`, run by the
+telemetry consumer once a minute, completes every closed job in one transaction.
+When ``SPOOL_AUTOSYNC_APPLY_PERCENT`` is on, the spool reconciler already
+follows ``remain`` live, so jobs are only marked complete (and added to the
+daily utilization stats) rather than decremented a second time.
+
+Nothing happens for a printer whose ``PrinterDevice.item`` isn't linked: a
+``PrintJob`` needs the machine's :class:`~inventory.models.InventoryItem`.
+"""
+
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import occupancy, printjobs, spool_autosync, spool_sync
+from .models import AMSChannelState, PrintJob, PrintJobFilament
+
+logger = logging.getLogger("inventory")
+
+ACTIVE_STATES = ("PREPARE", "RUNNING", "PAUSE")
+END_RESULTS = {"FINISH": PrintJob.Result.SUCCESS, "FAILED": PrintJob.Result.FAILED}
+
+# Closed jobs completed per apply_pending() call.
+APPLY_BATCH = 50
+
+
+def tray_snapshot(device):
+    """{"ams/tray": {"uuid", "remain"}} for every AMS tray of ``device``."""
+    return {
+        f"{ch.ams_index}/{ch.tray_index}": {
+            "uuid": ch.tray_uuid,
+            "remain": ch.remain_pct,
+        }
+        for ch in AMSChannelState.objects.filter(device=device)
+    }
+
+
+def _task_key(state):
+    """The Bambu task id, or None for the "0"/blank id of local (SD card) prints."""
+    task = (state.task_id or "").strip()
+    return task if task and task != "0" else None
+
+
+def observe(device, state, previous, *, now=None):
+    """Open or close ``device``'s MQTT job on a ``gcode_state`` transition.
+
+    ``state`` is the just-saved :class:`~inventory.models.PrinterState`;
+    ``previous`` its ``gcode_state`` before this message. Returns the job
+    opened or closed, else None.
+    """
+    current = state.gcode_state
+    if current == previous:
+        return None
+    now = now or timezone.now()
+    if current in ACTIVE_STATES:
+        # Active to active is a pause/resume, unless a new task id shows the
+        # previous print ended unseen (start_job then closes it).
+        if previous not in ACTIVE_STATES or _task_key(state) is not None:
+            return start_job(device, state, now=now)
+        return None
+    if current in END_RESULTS and previous in ACTIVE_STATES:
+        return finish_job(device, state, now=now)
+    if previous in ACTIVE_STATES:
+        return finish_job(device, state, now=now, result=PrintJob.Result.CANCELLED)
+    return None
+
+
+def start_job(device, state, *, now):
+    """Open (or find) the MQTT job for the print ``state`` describes."""
+    printer = device.item
+    if printer is None:
+        logger.info("Print on %s not tracked: no linked printer item", device.name)
+        return None
+    key = _task_key(state) or f"local:{now:%Y%m%dT%H%M%S}"
+    _close_stale(device, printer, key, now=now)
+    job, created = PrintJob.objects.get_or_create(
+        printer=printer,
+        source=PrintJob.Source.MQTT,
+        telemetry_task_id=key,
+        defaults={
+            "name": state.subtask_name[:255],
+            "started_at": now,
+            "tray_start": tray_snapshot(device),
+        },
+    )
+    if created:
+        logger.info("Print job %s started on %s (%s)", job.pk, device.name, key)
+    return job
+
+
+def _close_stale(device, printer, key, *, now):
+    """Close ``printer``'s open MQTT jobs other than ``key`` as PARTIAL.
+
+    Their end was never seen; the trays as they are now (before the new print
+    draws on them) stand in for the end snapshot.
+    """
+    stale = PrintJob.objects.filter(
+        printer=printer, source=PrintJob.Source.MQTT, ended_at__isnull=True
+    ).exclude(telemetry_task_id=key)
+    for job in stale:
+        _close(device, job, PrintJob.Result.PARTIAL, now=now)
+        logger.info(
+            "Print job %s on %s closed: a new print started", job.pk, device.name
+        )
+
+
+def _close(device, job, result, *, now):
+    job.ended_at = now
+    job.result = result
+    if job.started_at is not None:
+        job.duration_s = max(0, int((now - job.started_at).total_seconds()))
+    with transaction.atomic():
+        job.save()
+        PrintJobFilament.objects.bulk_create(_consumption_lines(device, job))
+
+
+def finish_job(device, state, *, now, result=None):
+    """Close the open MQTT job for ``device`` and record its filament lines.
+
+    ``result`` defaults to the one the end state implies. A repeated end
+    message for an already-closed task is ignored. An end with no open job (the
+    consumer missed the start) still records the job, just without lines, since
+    there is no start snapshot to diff; a cancel with no open job records
+    nothing.
+    """
+    printer = device.item
+    if printer is None:
+        return None
+    task = _task_key(state)
+    jobs = PrintJob.objects.filter(printer=printer, source=PrintJob.Source.MQTT)
+    if task is not None:
+        jobs = jobs.filter(telemetry_task_id=task)
+    job = jobs.filter(ended_at__isnull=True).order_by("-started_at").first()
+    if job is None:
+        if result is not None or (task is not None and jobs.exists()):
+            return None
+        job = PrintJob(
+            printer=printer,
+            source=PrintJob.Source.MQTT,
+            telemetry_task_id=task or f"local:{now:%Y%m%dT%H%M%S}",
+            name=state.subtask_name[:255],
+        )
+    _close(device, job, result or END_RESULTS[state.gcode_state], now=now)
+    logger.info("Print job %s %s on %s", job.pk, state.gcode_state.lower(), device.name)
+    return job
+
+
+def _consumption_lines(device, job):
+    """One unsaved line per tray whose ``remain`` fell during ``job``."""
+    end = tray_snapshot(device)
+    used = {}
+    for key, start in (job.tray_start or {}).items():
+        finish = end.get(key)
+        if not finish or finish["uuid"] != start.get("uuid"):
+            continue  # tray gone, or the spool was swapped mid-print
+        before, after = start.get("remain"), finish["remain"]
+        if before is None or after is None or after < 0 or after >= before:
+            continue
+        ams_index, tray_index = (int(part) for part in key.split("/"))
+        used[(ams_index, tray_index)] = before - after
+    if not used:
+        return []
+
+    serials = spool_autosync.serial_map(device)
+    lines = []
+    with occupancy.scope():
+        lookups = spool_sync._Lookups(
+            serials.get((device.id, ams_index)) for ams_index, _ in used
+        )
+        for (ams_index, tray_index), percent in sorted(used.items()):
+            unit = lookups.ams_item(serials.get((device.id, ams_index)))
+            slot = lookups.slot(unit, tray_index) if unit else None
+            spools = lookups.spools(slot) if slot else []
+            if len(spools) != 1:
+                logger.warning(
+                    "Job %s: AMS%s/tray%s used %s%% but its slot has %d spools",
+                    job.pk,
+                    ams_index,
+                    tray_index,
+                    percent,
+                    len(spools),
+                )
+                continue
+            spool = spools[0]
+            filament = lookups.filament(spool)
+            grams = None
+            if filament is not None and filament.weight:
+                grams = Decimal(percent) * Decimal(filament.weight) * Decimal(10)
+            lines.append(
+                PrintJobFilament(
+                    job=job,
+                    item=spool,
+                    ams_slot=slot,
+                    percent_used=Decimal(percent),
+                    grams_used=grams,
+                )
+            )
+    return lines
+
+
+def apply_pending(*, limit=APPLY_BATCH):
+    """Complete closed, not-yet-applied MQTT jobs in one transaction.
+
+    Returns the jobs handled. See the module docstring for why jobs are only
+    marked complete when the live spool reconciler applies percentages.
+    """
+    jobs = list(
+        PrintJob.objects.filter(
+            source=PrintJob.Source.MQTT, completed=False, ended_at__isnull=False
+        ).order_by("ended_at")[:limit]
+    )
+    if not jobs:
+        return jobs
+    with transaction.atomic():
+        if settings.SPOOL_AUTOSYNC_APPLY_PERCENT:
+            PrintJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                completed=True
+            )
+            printjobs.record_stats(jobs)
+        else:
+            printjobs.complete_jobs(jobs)
+    logger.info("Applied consumption for %d print job(s)", len(jobs))
+    return jobs
@@ -3,33 +3,49 @@
 Mirrors :mod:`inventory.audit` / :mod:`inventory.items`: the logic lives here,
 views stay thin. This module owns two responsibilities:
 
-- :func:`complete_job` — apply a :class:`~inventory.models.PrintJob`'s filament
-  consumption to the referenced spools. For each
-  :class:`~inventory.models.PrintJobFilament` line it computes a percentage of the
-  spool used, decrements ``InventoryItem.percent_remaining`` (floored at 0), and
-  when a spool reaches the depletion threshold it is retired through the
+- :func:`complete_job` / :func:`complete_jobs` — apply one or many
+  :class:`~inventory.models.PrintJob`'s filament consumption to the referenced
+  spools. Each :class:`~inventory.models.PrintJobFilament` line is turned into a
+  percentage of its spool, summed per spool across the jobs, and
+  ``InventoryItem.percent_remaining`` is decremented (floored at 0) in one bulk
+  write. A spool reaching the depletion threshold is retired through the
   Phase-11.3 :func:`inventory.items.deplete` primitive (which owns the
   sticky-status flag dance). It never sets DEPLETED by hand.
-- :func:`printer_utilization` / :func:`utilization_summary` — DB-aggregated
-  utilization (hours, job count, success %, kg by material/color). No Python-side
-  table scans.
+- :func:`printer_utilization` / :func:`utilization_summary` /
+  :func:`consumption_by_material` — utilization (hours, job count, success %, kg
+  by material/color) over an optional ``since``/``until`` date window.
+
+Utilization reads the per-printer, per-day
+:class:`~inventory.models.PrinterDailyStats` and
+:class:`~inventory.models.PrinterDailyConsumption` rows rather than every job
+and filament line. :func:`record_stats` adds a job to them when it completes;
+:func:`rebuild_stats` (``manage.py rebuild_printer_stats``) re-derives them from
+the completed jobs. A window costs a few hundred daily rows however many jobs
+there are.
 
 **Depletion threshold:** a spool is depleted when its post-decrement
-``percent_remaining`` is ``<= DEPLETE_AT_PERCENT`` (0). A line that doesn't fully
-consume a spool only decrements it; ``items.deplete`` is called *only* on the line
-that drives the spool to zero, so a single spool spread across two jobs depletes
-exactly once.
+``percent_remaining`` is ``<= DEPLETE_AT_PERCENT`` (0). Usage is summed per
+spool before anything is written, so a spool that isn't fully consumed is only
+decremented and ``items.deplete`` runs once for a spool spread across several
+lines or jobs.
 """
 
 from collections import defaultdict
 from decimal import Decimal
 
 from django.db import transaction
-from django.db.models import Count, Q, Sum
-from django.utils.timezone import now
+from django.db.models import F, Sum
+from django.utils import timezone
 
 from . import items
-from .models import Filament, InventoryItem, PrintJob, PrintJobFilament
+from .models import (
+    Filament,
+    InventoryItem,
+    PrinterDailyConsumption,
+    PrinterDailyStats,
+    PrintJob,
+    PrintJobFilament,
+)
 
 # A spool at or below this remaining percentage is considered consumed.
 DEPLETE_AT_PERCENT = Decimal("0")
@@ -37,123 +53,311 @@ DEPLETE_AT_PERCENT = Decimal("0")
 # Statuses for which a spool is already gone — never re-deplete or re-decrement.
 _TERMINAL = (InventoryItem.Status.DEPLETED, InventoryItem.Status.SOLD)
 
+CENT = Decimal("0.01")
 
-def line_percent_used(line):
-    """Percentage of the spool consumed by ``line``.
 
-    Prefers ``grams_used`` when the spool's catalog ``Filament.weight`` (kg) is
-    known: ``grams / (weight_kg * 1000) * 100``. Falls back to the explicit
+def percent_used(grams_used, percent_used, weight_kg):
+    """Percentage of a spool consumed, from a line's figures and the spool's weight.
+
+    Prefers ``grams_used`` when the catalog ``Filament.weight`` (kg) is known:
+    ``grams / (weight_kg * 1000) * 100``. Falls back to the explicit
     ``percent_used``. Returns a :class:`~decimal.Decimal` (0 if neither is usable).
     """
+    if grams_used is not None and weight_kg:
+        grams_total = Decimal(weight_kg) * Decimal(1000)
+        if grams_total > 0:
+            return Decimal(grams_used) / grams_total * Decimal(100)
+    if percent_used is not None:
+        return Decimal(percent_used)
+    return Decimal(0)
+
+
+def line_percent_used(line):
+    """Percentage of the spool consumed by ``line`` (see :func:`percent_used`)."""
+    weight_kg = None
     if line.grams_used is not None:
         product = line.item.product.get_real_instance()
         weight_kg = getattr(product, "weight", None)
-        if weight_kg:
-            grams_total = Decimal(weight_kg) * Decimal(1000)
-            if grams_total > 0:
-                return Decimal(line.grams_used) / grams_total * Decimal(100)
-    if line.percent_used is not None:
-        return Decimal(line.percent_used)
-    return Decimal(0)
+    return percent_used(line.grams_used, line.percent_used, weight_kg)
 
 
-@transaction.atomic
 def complete_job(job):
     """Apply ``job``'s filament consumption to its spools; idempotent.
 
-    For each :class:`PrintJobFilament` line: decrement the spool's
-    ``percent_remaining`` by :func:`line_percent_used` (floored at 0) and, if the
-    spool reaches the depletion threshold, retire it via :func:`items.deplete`.
-    Already-terminal spools are skipped. Marks the job ``completed`` and stamps
-    ``ended_at`` if unset; a second call is a no-op (so the same POST can't
-    double-decrement).
+    :func:`complete_jobs` for one job: each spool's ``percent_remaining`` drops
+    by its lines' :func:`percent_used` (floored at 0) and a spool reaching the
+    depletion threshold is retired via :func:`items.deplete`. Already-terminal
+    spools are skipped. Marks the job ``completed`` and stamps ``ended_at`` if
+    unset; a second call is a no-op (so the same POST can't double-decrement).
 
     Returns the list of :class:`InventoryItem` spools depleted by this call.
     """
-    if job.completed:
+    return complete_jobs([job])
+
+
+@transaction.atomic
+def complete_jobs(jobs):
+    """Apply many jobs' consumption at once; the batch form of :func:`complete_job`.
+
+    Each job is first claimed by a conditional ``UPDATE ... SET completed``
+    (see :func:`_claim`) and only the jobs this call flipped are applied, so
+    repeating a call (or racing another) never double-decrements. The cost
+    doesn't grow with lines or jobs: one query reads every line, one reads each
+    spool's catalog weight, usage is summed per spool across all the jobs, and
+    :func:`apply_usage` writes the survivors together. The jobs are marked
+    ``completed`` (``ended_at`` stamped if unset) and added to the daily stats.
+
+    Returns the spools depleted by this call.
+    """
+    pending = {job.pk: job for job in jobs if not job.completed}
+    claimed = _claim(pending)
+    jobs = [job for pk, job in pending.items() if pk in claimed]
+    if not jobs:
         return []
 
-    depleted = []
-    for line in job.filaments.select_related("item"):
-        item = line.item
-        if item.status in _TERMINAL:
-            continue
+    lines = list(
+        PrintJobFilament.objects.filter(job_id__in=claimed).values_list(
+            "item_id", "grams_used", "percent_used"
+        )
+    )
+    weights = dict(
+        InventoryItem.objects.filter(pk__in={line[0] for line in lines}).values_list(
+            "pk", "product__filament__weight"
+        )
+    )
+    used = defaultdict(Decimal)
+    for item_id, grams, percent in lines:
+        used[item_id] += percent_used(grams, percent, weights.get(item_id))
+    reason = ", ".join(f"print job {pk}" for pk in sorted(claimed))
+    depleted = apply_usage(used, reason=reason)
+
+    stamp = timezone.now()
+    PrintJob.objects.filter(pk__in=claimed, ended_at__isnull=True).update(
+        ended_at=stamp
+    )
+    for job in jobs:
+        job.completed = True
+        job.ended_at = job.ended_at or stamp
+    record_stats(jobs)
+    return depleted
 
-        delta = line_percent_used(line)
-        current = Decimal(item.percent_remaining or 0)
-        remaining = current - delta
-        if remaining < 0:
-            remaining = Decimal(0)
 
+def _claim(pks):
+    """Mark the still-incomplete jobs among ``pks`` completed; return their pks.
+
+    One ``UPDATE ... WHERE completed = false`` claims the whole batch. If it
+    matched fewer rows than asked, some job was completed elsewhere and the
+    count can't say which, so the batch update is rolled back and each job is
+    claimed on its own. Must run inside the caller's transaction.
+    """
+    if not pks:
+        return set()
+    incomplete = PrintJob.objects.filter(completed=False)
+    savepoint = transaction.savepoint()
+    if incomplete.filter(pk__in=list(pks)).update(completed=True) == len(pks):
+        transaction.savepoint_commit(savepoint)
+        return set(pks)
+    transaction.savepoint_rollback(savepoint)
+    return {pk for pk in pks if incomplete.filter(pk=pk).update(completed=True)}
+
+
+def apply_usage(used, *, reason=""):
+    """Decrement many spools at once from ``{item_id: percent used}``.
+
+    The write half of :func:`complete_jobs` (also used by
+    :mod:`inventory.job_import`): terminal spools are skipped, survivors get
+    their new ``percent_remaining`` (floored at 0) in one
+    :func:`items.bulk_update_values`, and only spools reaching the threshold go
+    through :func:`items.deplete`. Returns the depleted spools.
+    """
+    decrements, depleted = [], []
+    for item in InventoryItem.objects.filter(pk__in=list(used)).exclude(
+        status__in=_TERMINAL
+    ):
+        current = Decimal(item.percent_remaining or 0)
+        remaining = max(current - used[item.pk], Decimal(0)).quantize(CENT)
         if remaining <= DEPLETE_AT_PERCENT:
+            depleted.append(item)
+        else:
+            decrements.append((item, {"percent_remaining": remaining}))
+    with transaction.atomic():
+        items.bulk_update_values(decrements)
+        for item in depleted:
             # Drive the spool to zero, then retire it through the one sanctioned
             # primitive (it sets the sticky flag + clears the location).
             item.percent_remaining = Decimal(0)
-            items.deplete(item, reason=f"print job {job.pk}")
-            depleted.append(item)
-        else:
-            item.percent_remaining = remaining
-            item.save(update_fields=["percent_remaining", "last_modified"])
-
-    job.completed = True
-    if job.ended_at is None:
-        job.ended_at = now()
-    job.save(update_fields=["completed", "ended_at"])
+            items.deplete(item, reason=reason)
     return depleted
 
 
-def printer_utilization(printer, *, since=None):
-    """Utilization stats for a single printer :class:`InventoryItem`.
+def job_day(job):
+    """The local date a job counts toward: its start, else its end (or creation)."""
+    moment = job.started_at or job.ended_at or job.created_at
+    return timezone.localdate(moment) if moment else timezone.localdate()
+
 
-    Returns a dict: ``jobs``, ``hours`` (Sum of duration), ``success`` count,
-    ``success_rate`` (0-100 or None), and ``grams`` consumed — all via DB
-    aggregation. ``since`` filters on ``started_at`` (None = all-time).
+def _add_job(stats, consumption, job, day, lines):
+    """Fold one job and its ``(product_id, grams)`` lines into the sums."""
+    key = (job.printer_id, day)
+    row = stats[key]
+    row["jobs"] += 1
+    row["seconds"] += job.duration_s or 0
+    row["success"] += job.result == PrintJob.Result.SUCCESS
+    for product_id, grams in lines:
+        row["grams"] += grams
+        consumption[(*key, product_id)] += grams
+
+
+def _job_lines(job_ids):
+    """{job_id: [(product_id, grams_used)]} for lines with a gram figure."""
+    lines = defaultdict(list)
+    for job_id, product_id, grams in PrintJobFilament.objects.filter(
+        job_id__in=job_ids, grams_used__isnull=False
+    ).values_list("job_id", "item__product_id", "grams_used"):
+        lines[job_id].append((product_id, grams))
+    return lines
+
+
+def record_stats(jobs):
+    """Add just-completed ``jobs`` to the daily per-printer stats.
+
+    One query reads the jobs' filament lines; each touched (printer, day) row
+    and (printer, day, product) row is then bumped in place or created.
     """
-    job_qs = PrintJob.objects.filter(printer=printer)
-    if since is not None:
-        job_qs = job_qs.filter(started_at__gte=since)
+    jobs = list(jobs)
+    if not jobs:
+        return
+    lines = _job_lines([job.pk for job in jobs])
+    stats = defaultdict(lambda: defaultdict(Decimal))
+    consumption = defaultdict(Decimal)
+    for job in jobs:
+        _add_job(stats, consumption, job, job_day(job), lines.get(job.pk, []))
+
+    with transaction.atomic():
+        for (printer_id, day), sums in stats.items():
+            row = PrinterDailyStats.objects.filter(printer_id=printer_id, day=day)
+            if not row.update(**{k: F(k) + v for k, v in sums.items()}):
+                PrinterDailyStats.objects.create(printer_id=printer_id, day=day, **sums)
+        for (printer_id, day, product_id), grams in consumption.items():
+            row = PrinterDailyConsumption.objects.filter(
+                printer_id=printer_id, day=day, product_id=product_id
+            )
+            if not row.update(grams=F("grams") + grams):
+                PrinterDailyConsumption.objects.create(
+                    printer_id=printer_id, day=day, product_id=product_id, grams=grams
+                )
 
-    agg = job_qs.aggregate(
-        jobs=Count("id"),
-        seconds=Sum("duration_s"),
-        success=Count("id", filter=Q(result=PrintJob.Result.SUCCESS)),
+
+@transaction.atomic
+def rebuild_stats():
+    """Re-derive the daily stats from every completed job. Returns the job count."""
+    jobs = list(
+        PrintJob.objects.filter(completed=True).only(
+            "printer_id",
+            "started_at",
+            "ended_at",
+            "created_at",
+            "duration_s",
+            "result",
+        )
+    )
+    lines = _job_lines([job.pk for job in jobs])
+    stats = defaultdict(lambda: defaultdict(Decimal))
+    consumption = defaultdict(Decimal)
+    for job in jobs:
+        _add_job(stats, consumption, job, job_day(job), lines.get(job.pk, []))
+
+    PrinterDailyStats.objects.all().delete()
+    PrinterDailyConsumption.objects.all().delete()
+    PrinterDailyStats.objects.bulk_create(
+        (
+            PrinterDailyStats(printer_id=printer_id, day=day, **sums)
+            for (printer_id, day), sums in stats.items()
+        ),
+        batch_size=items.BULK_CHUNK_SIZE,
     )
-    grams = (
-        PrintJobFilament.objects.filter(job__in=job_qs).aggregate(g=Sum("grams_used"))[
-            "g"
-        ]
-        or 0
+    PrinterDailyConsumption.objects.bulk_create(
+        (
+            PrinterDailyConsumption(
+                printer_id=printer_id, day=day, product_id=product_id, grams=grams
+            )
+            for (printer_id, day, product_id), grams in consumption.items()
+        ),
+        batch_size=items.BULK_CHUNK_SIZE,
     )
-    jobs = agg["jobs"] or 0
-    success = agg["success"] or 0
-    seconds = agg["seconds"] or 0
+    return len(jobs)
+
+
+def _as_day(value):
+    """A date from a date or (aware) datetime."""
+    if hasattr(value, "hour"):
+        return timezone.localdate(value)
+    return value
+
+
+def _in_window(qs, since, until):
+    """``qs`` (daily rows) limited to ``since <= day <= until``; None is open."""
+    if since is not None:
+        qs = qs.filter(day__gte=_as_day(since))
+    if until is not None:
+        qs = qs.filter(day__lte=_as_day(until))
+    return qs
+
+
+def _stat_fields(jobs, success, seconds, grams):
+    jobs = jobs or 0
+    success = success or 0
+    seconds = seconds or 0
+    grams = float(grams or 0)
     return {
         "jobs": jobs,
         "hours": round(seconds / 3600, 1) if seconds else 0.0,
         "success": success,
         "success_rate": round(success / jobs * 100, 1) if jobs else None,
-        "grams": float(grams),
-        "kg": round(float(grams) / 1000, 2),
+        "grams": round(grams, 1),
+        "kg": round(grams / 1000, 2),
     }
 
 
-def consumption_by_material():
-    """Total grams consumed grouped by (material, color), via DB aggregation.
+def printer_utilization(printer, *, since=None, until=None):
+    """Utilization stats for a single printer :class:`InventoryItem`.
+
+    Returns a dict: ``jobs``, ``hours``, ``success`` count, ``success_rate``
+    (0-100 or None), ``grams`` and ``kg`` consumed. ``since``/``until`` are
+    inclusive dates (or datetimes, taken as their local date); None = open.
+    """
+    agg = _in_window(
+        PrinterDailyStats.objects.filter(printer=printer), since, until
+    ).aggregate(
+        jobs=Sum("jobs"),
+        success=Sum("success"),
+        seconds=Sum("seconds"),
+        grams=Sum("grams"),
+    )
+    return _stat_fields(agg["jobs"], agg["success"], agg["seconds"], agg["grams"])
+
 
-    Joins ``PrintJobFilament -> item.product -> Filament.material`` so only
-    filament spools contribute. Returns a list of dicts sorted by grams desc.
+def consumption_by_material(*, since=None, until=None, printer=None):
+    """Total grams consumed grouped by (material, color) over the window.
+
+    Only filament products contribute. Returns a list of dicts sorted by grams
+    desc.
     """
     filament_ids = Filament.objects.values_list("id", flat=True)
+    qs = _in_window(
+        PrinterDailyConsumption.objects.filter(product_id__in=filament_ids),
+        since,
+        until,
+    )
+    if printer is not None:
+        qs = qs.filter(printer=printer)
     rows = (
-        PrintJobFilament.objects.filter(
-            item__product_id__in=filament_ids, grams_used__isnull=False
+        qs.values(
+            "product__filament__material__name",
+            "product__filament__color",
+            "product__filament__color_family",
         )
-        .values(
-            "item__product__filament__material__name",
-            "item__product__filament__color",
-            "item__product__filament__color_family",
-        )
-        .annotate(grams=Sum("grams_used"))
+        .annotate(grams=Sum("grams"))
         .order_by("-grams")
     )
     out = []
@@ -161,9 +365,9 @@ def consumption_by_material():
         grams = float(r["grams"] or 0)
         out.append(
             {
-                "material": r["item__product__filament__material__name"] or "—",
-                "color": r["item__product__filament__color"] or "",
-                "color_family": r["item__product__filament__color_family"] or "",
+                "material": r["product__filament__material__name"] or "—",
+                "color": r["product__filament__color"] or "",
+                "color_family": r["product__filament__color_family"] or "",
                 "grams": round(grams, 1),
                 "kg": round(grams / 1000, 3),
             }
@@ -171,50 +375,35 @@ def consumption_by_material():
     return out
 
 
-def utilization_summary(*, since=None):
+def utilization_summary(*, since=None, until=None):
     """Per-printer utilization rows for the fleet-wide utilization view.
 
-    One row per printer :class:`InventoryItem` that has at least one job, each row
-    being :func:`printer_utilization` plus identity fields. Built from a single
-    grouped query (no per-printer N+1).
+    One row per printer :class:`InventoryItem` with a completed job in the
+    window, each row being :func:`printer_utilization` plus identity fields.
+    One grouped query over the daily rows, one for the printers.
     """
-    job_qs = PrintJob.objects.all()
-    if since is not None:
-        job_qs = job_qs.filter(started_at__gte=since)
-
     base = (
-        job_qs.values("printer_id")
+        _in_window(PrinterDailyStats.objects.all(), since, until)
+        .values("printer_id")
         .annotate(
-            jobs=Count("id"),
-            seconds=Sum("duration_s"),
-            success=Count("id", filter=Q(result=PrintJob.Result.SUCCESS)),
+            jobs=Sum("jobs"),
+            success=Sum("success"),
+            seconds=Sum("seconds"),
+            grams=Sum("grams"),
         )
         .order_by()
     )
-    # Grams per printer in one query, summed across the printer's job filaments.
-    grams_map = defaultdict(float)
-    for row in (
-        PrintJobFilament.objects.filter(job__in=job_qs)
-        .values("job__printer_id")
-        .annotate(g=Sum("grams_used"))
-    ):
-        grams_map[row["job__printer_id"]] = float(row["g"] or 0)
-
-    printer_ids = [r["printer_id"] for r in base]
+    base = list(base)
     printers = {
         p.id: p
-        for p in InventoryItem.objects.filter(id__in=printer_ids).select_related(
-            "product"
-        )
+        for p in InventoryItem.objects.filter(
+            id__in=[r["printer_id"] for r in base]
+        ).select_related("product")
     }
 
     rows = []
     for r in base:
         pid = r["printer_id"]
-        jobs = r["jobs"] or 0
-        success = r["success"] or 0
-        seconds = r["seconds"] or 0
-        grams = grams_map.get(pid, 0.0)
         printer = printers.get(pid)
         rows.append(
             {
@@ -224,12 +413,7 @@ def utilization_summary(*, since=None):
                     str(printer.product.get_real_instance()) if printer else f"#{pid}"
                 ),
                 "serial_number": printer.serial_number if printer else "",
-                "jobs": jobs,
-                "hours": round(seconds / 3600, 1) if seconds else 0.0,
-                "success": success,
-                "success_rate": round(success / jobs * 100, 1) if jobs else None,
-                "grams": round(grams, 1),
-                "kg": round(grams / 1000, 2),
+                **_stat_fields(r["jobs"], r["success"], r["seconds"], r["grams"]),
             }
         )
     rows.sort(key=lambda x: (-x["hours"], -x["jobs"]))
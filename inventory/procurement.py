@@ -17,22 +17,25 @@ Receiving flow (mirrors the audit ``add_or_queue_upc`` gesture, bound to a PO):
 4. Else (cost-only consumable): bump ``qty_received`` only — no item is minted.
 5. Recompute the PO status (all lines full -> RECEIVED, some -> PARTIAL).
 
+:func:`receive_line_units` is the same flow for a whole case at once: N items in
+one :func:`items.bulk_add`, one ``qty_received`` bump, one receipt line, one
+status recompute (the view then prints the N labels as one batch).
+
 Spend reporting unions tracked items' ``unit_cost`` with cost-only lines' totals;
-see :func:`spend_summary`.
+see :func:`spend_summary`. The figures come from the :mod:`inventory.spend_ledger`
+rollups rather than a scan of every item and line.
 """
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 
 from django.db import transaction
-from django.db.models import F, Sum
+from django.db.models import F
 
-from . import items
+from . import items, scan_resolver, spend_ledger
 from .models import (
     InventoryItem,
-    Product,
-    PurchaseOrder,
     PurchaseOrderLine,
     PurchaseReceiptLine,
 )
@@ -53,12 +56,15 @@ class ReceiveResult:
         item: The minted :class:`InventoryItem` for tracked goods, else None.
         tracked: True if an item was minted (``line.track_individually``).
         message: A user-facing summary of what happened.
+        items: Every item minted (more than one for
+            :func:`receive_line_units`); empty for cost-only lines.
     """
 
     line: PurchaseOrderLine
     item: InventoryItem | None
     tracked: bool
     message: str
+    items: list[InventoryItem] = field(default_factory=list)
 
 
 def open_lines_for(order, product=None):
@@ -119,35 +125,104 @@ def receive_line_unit(receipt, line, *, location):
             raise ProcurementError(result.message)
         item = result.item
 
-    line.qty_received = F("qty_received") + 1
+    _record_received(receipt, line, 1)
+
+    if item is not None:
+        msg = f"Received {line.product.name} (INV-{item.pk}) at {location.name}."
+    else:
+        msg = f"Received 1x {line.product.name} (cost-only)."
+    return ReceiveResult(
+        line=line,
+        item=item,
+        tracked=item is not None,
+        message=msg,
+        items=[item] if item is not None else [],
+    )
+
+
+def _record_received(receipt, line, qty):
+    """Bump ``line.qty_received`` by ``qty``, log it on ``receipt``, and
+    recompute the PO status."""
+    line.qty_received = F("qty_received") + qty
     line.save(update_fields=["qty_received"])
     line.refresh_from_db(fields=["qty_received"])
 
-    PurchaseReceiptLine.objects.create(receipt=receipt, order_line=line, qty_received=1)
+    PurchaseReceiptLine.objects.create(
+        receipt=receipt, order_line=line, qty_received=qty
+    )
     line.order.recompute_status()
 
-    if item is not None:
-        msg = f"Received {line.product.name} (INV-{item.pk}) at {location.name}."
+
+@transaction.atomic
+def receive_line_units(receipt, line, qty, *, location):
+    """Receive ``qty`` units against ``line`` in one go (a case of spools).
+
+    The batch form of :func:`receive_line_unit`: a tracked line mints ``qty``
+    items at ``location`` with one :func:`items.bulk_add` (the capacity check
+    covers the whole batch), then ``qty_received``, the receipt line and the PO
+    status are each written once. Raises :class:`ProcurementError` for a
+    quantity below one or above what is still outstanding on the line.
+
+    The caller (view) owns label printing; ``result.items`` holds every new item.
+    """
+    if qty < 1:
+        raise ProcurementError("Quantity must be at least 1.")
+    if qty > line.qty_outstanding:
+        raise ProcurementError(
+            f"Only {line.qty_outstanding} of {line.product.name} left to receive "
+            f"on this line, not {qty}."
+        )
+    minted = []
+    if line.track_individually:
+        result = items.bulk_add(
+            [
+                InventoryItem(
+                    product=line.product, unit_cost=line.unit_cost, source_line=line
+                )
+                for _ in range(qty)
+            ],
+            location,
+        )
+        if not result.ok:
+            raise ProcurementError(result.message)
+        minted = result.items
+
+    _record_received(receipt, line, qty)
+
+    if minted:
+        msg = (
+            f"Received {qty}x {line.product.name} "
+            f"(INV-{minted[0].pk}–INV-{minted[-1].pk}) at {location.name}."
+        )
     else:
-        msg = f"Received 1x {line.product.name} (cost-only)."
-    return ReceiveResult(line=line, item=item, tracked=item is not None, message=msg)
+        msg = f"Received {qty}x {line.product.name} (cost-only)."
+    return ReceiveResult(
+        line=line,
+        item=minted[0] if minted else None,
+        tracked=bool(minted),
+        message=msg,
+        items=minted,
+    )
 
 
-def receive_scan(receipt, upc, location):
-    """Resolve ``upc`` to an open line on the receipt's order and receive one unit.
+def receive_scan(receipt, upc, location, *, qty=1):
+    """Resolve ``upc`` to an open line on the receipt's order and receive
+    ``qty`` units (one by default, the plain scan).
 
     Mirrors the audit UPC gesture. Raises :class:`ProcurementError` when the UPC
     is unknown or matches no/ambiguous open line.
     """
     if location is None:
         raise ProcurementError("Set a receiving location first.")
-    product = Product.objects.filter(upc=upc).first()
+    product = scan_resolver.product_for_upc(upc)
     if product is None:
         raise ProcurementError(
             f"No catalog product has UPC {upc}. Add the product first."
         )
     line = _match_open_line(receipt.order, product)
-    return receive_line_unit(receipt, line, location=location)
+    if qty == 1:
+        return receive_line_unit(receipt, line, location=location)
+    return receive_line_units(receipt, line, qty, location=location)
 
 
 def reconcile(order):
@@ -206,27 +281,16 @@ def spend_summary():
         {"tracked_spend", "consumable_spend", "total_spend",
          "tracked_count", "consumable_lines"}
 
-    All sums are DB aggregations.
+    Read from the :mod:`inventory.spend_ledger` rollups, which are kept current
+    as items and lines change.
     """
-    tracked = InventoryItem.objects.exclude(unit_cost__isnull=True).aggregate(
-        total=Sum("unit_cost"), count=Sum(1)
-    )
-    tracked_spend = tracked["total"] or Decimal("0")
-    tracked_count = tracked["count"] or 0
-
-    consumable_lines = PurchaseOrderLine.objects.filter(
-        track_individually=False, qty_received__gt=0
-    )
-    consumable_spend = consumable_lines.aggregate(
-        total=Sum(F("qty_received") * F("unit_cost"))
-    )["total"] or Decimal("0")
-
+    totals = spend_ledger.totals()
     return {
-        "tracked_spend": tracked_spend,
-        "consumable_spend": consumable_spend,
-        "total_spend": tracked_spend + consumable_spend,
-        "tracked_count": tracked_count,
-        "consumable_lines": consumable_lines.count(),
+        "tracked_spend": totals["tracked_spend"],
+        "consumable_spend": totals["consumable_spend"],
+        "total_spend": totals["tracked_spend"] + totals["consumable_spend"],
+        "tracked_count": totals["tracked_count"],
+        "consumable_lines": totals["consumable_lines"],
     }
 
 
@@ -235,13 +299,7 @@ def spend_by_supplier():
 
     Received value = sum over the supplier's lines of ``qty_received *
     unit_cost`` (tracked and cost-only alike — both have a per-line unit_cost),
-    so it matches what was actually delivered. DB aggregation grouped by supplier.
+    so it matches what was actually delivered. Summed from the
+    :mod:`inventory.spend_ledger` rollups.
     """
-    return (
-        PurchaseOrder.objects.values("supplier__id", "supplier__name")
-        .annotate(
-            ordered_value=Sum(F("lines__qty_ordered") * F("lines__unit_cost")),
-            received_value=Sum(F("lines__qty_received") * F("lines__unit_cost")),
-        )
-        .order_by("supplier__name")
-    )
+    return spend_ledger.by_supplier()
@@ -12,8 +12,8 @@ from urllib.parse import urlparse
 
 from django.db import transaction
 
-from . import audit, items
-from .models import InventoryItem, Location
+from . import audit, items, occupancy, scan_resolver
+from .models import InventoryItem, Location, Product
 
 
 class QuickMoveError(Exception):
@@ -46,13 +46,13 @@ def _item_by_serial(value):
     if not value or value.isdigit():
         return None
     matches = list(
-        InventoryItem.objects.filter(serial_number__iexact=value)
+        InventoryItem.by_serial(value)
         .exclude(serial_number="")
         .select_related("location")
     )
     if len(matches) != 1:
         return None
-    item = matches[0]
+    item = _ensure_real_product(matches[0])
     return None if audit._is_unit_item(item) else item
 
 
@@ -61,14 +61,16 @@ def _ensure_real_product(item):
 
     Mirrors the edit view (which fetches the item without ``select_related`` and
     so resolves ``item.product`` polymorphically). Defensive: if anything upstream
-    left a base ``Product`` on the instance, swap in ``get_real_instance()`` so the
-    drying check's ``isinstance(self.product, Filament)`` guard can fire.
+    left a base ``Product`` on the instance (or none at all), load the real one
+    through :func:`scan_resolver.product` so the drying check's
+    ``isinstance(self.product, Filament)`` guard can fire. That is one query,
+    where the descriptor plus ``get_real_instance()`` took two.
     """
-    product = getattr(item, "product", None)
-    if product is not None and hasattr(product, "get_real_instance"):
-        real = product.get_real_instance()
-        if real is not product:
-            item.product = real
+    if InventoryItem.product.is_cached(item) and type(item.product) is not Product:
+        return item
+    real = scan_resolver.product(item.product_id)
+    if real is not None:
+        item.product = real
     return item
 
 
@@ -105,7 +107,7 @@ def resolve_active_item(raw):
                 f"Unrecognized code {raw!r}. Scan an item (INV-…/QR)."
             ) from None
         _reject_if_terminal(item)
-        return _ensure_real_product(item)
+        return item
     if kind == "loc":
         raise QuickMoveError("That's a location — scan an item first.")
     if kind == "upc":
@@ -113,12 +115,13 @@ def resolve_active_item(raw):
     item = InventoryItem.objects.filter(pk=value).select_related("location").first()
     if item is None:
         raise QuickMoveError(f"No item with id {value}.")
+    _ensure_real_product(item)
     if audit._is_unit_item(item):
         raise QuickMoveError(
             f"{item.product.name} is a machine unit, not movable contents."
         )
     _reject_if_terminal(item)
-    return _ensure_real_product(item)
+    return item
 
 
 @dataclass
@@ -146,20 +149,19 @@ def resolve_destination(raw):
         raise QuickMoveError("That's an item — scan a destination location (LOC-…).")
     if kind == "upc":
         raise QuickMoveError("That's a UPC — scan a destination location (LOC-…).")
-    location = Location.objects.filter(pk=value).first()
+    location = scan_resolver.location(value)
     if location is None:
         raise QuickMoveError(f"No location with id {value}.")
     return Destination(location, needs_slot_pick=location.is_container)
 
 
 def occupant_at(location):
-    """The single active (non-terminal) occupant of a leaf location, or None."""
-    return (
-        InventoryItem.objects.filter(location=location)
-        .exclude(status__in=items.TERMINAL_STATUSES)
-        .select_related("product")
-        .first()
-    )
+    """The single active (non-terminal) occupant of a leaf location, or None.
+
+    Read through :mod:`inventory.occupancy`, so after a capacity rejection in
+    the same scope this costs no query.
+    """
+    return occupancy.current().occupant(location.id)
 
 
 @dataclass
@@ -211,3 +213,38 @@ def evict_and_place(occupant, incoming, dest, *, deplete_old):
             evicted = occupant
         result = items.move_to(incoming, dest, enforce_capacity=True)
     return result, evicted
+
+
+def replay_move(item_code, dest_code):
+    """Apply a journaled ``item → destination`` scan pair without prompting.
+
+    The offline sync path can't ask which slot or whether to evict, so anything
+    that would prompt in the live flow (a whole-unit destination, a full slot, an
+    error-level drying warning) raises :class:`QuickMoveError` and is left for the
+    auditor to redo online. Returns ``(tag, message)`` on success.
+    """
+    item = resolve_active_item(item_code)
+    dest = resolve_destination(dest_code)
+    if dest.needs_slot_pick:
+        raise QuickMoveError(
+            f"{dest.location.name} is a whole unit — move INV-{item.pk} into a slot "
+            "online."
+        )
+    warning = item.filament_drying_warning(dest.location)
+    if warning and warning[0] == "error":
+        raise QuickMoveError(warning[1])
+    outcome = attempt_move(item, dest.location)
+    if outcome.kind == "full":
+        raise QuickMoveError(
+            f"{dest.location.name} is full ({outcome.occupant.product.name}) — "
+            f"swap INV-{item.pk} in online."
+        )
+    if outcome.kind != "ok":
+        raise QuickMoveError(outcome.message)
+    tag, msg = "success", f"Moved {item.product.name} to {dest.location.name}."
+    if outcome.result.drying_warning:
+        level, wmsg, _ = outcome.result.drying_warning
+        msg = f"{msg} — {wmsg}"
+        if level in ("warning", "error"):
+            tag = "warning"
+    return tag, msg
@@ -0,0 +1,174 @@
+"""Scanned-code resolution shared by every scan path, with an in-process LRU.
+
+The audit console, quick-move, receiving, the ``/barcode/<code>/`` redirect and
+label printing all turn a scanned value into a row. Done naively each scan pays
+for polymorphic fan-out (``Product.objects.filter(upc=...)`` is one query for the
+base row plus one for the real subclass) or, for a unit serial, three queries to
+walk item -> slots -> parent container. This module remembers the *answer*
+(ids plus the concrete product model) so a repeat scan is one query:
+
+- UPC -> (product id, concrete model): a hit re-reads the row from the subclass
+  table, filtered on the UPC too, so a stale entry just falls through to a fresh
+  lookup.
+- product id -> concrete model, for callers that hold an item and need its real
+  product (quick-move's drying check, label text).
+- unit serial -> focus location id (see :func:`inventory.audit.resolve_serial`).
+- location id -> :class:`~inventory.models.Location`. Callers get a copy, so
+  mutating it never leaks into the cache.
+
+Entries expire after ``SCAN_CACHE_TTL_S`` (bounding staleness across worker
+processes; 0 disables the cache) and are dropped by the signals in
+:mod:`inventory.signals` when the underlying rows are saved or deleted here.
+Misses are never cached: a UPC added a moment ago resolves on the next scan.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .models import Location, Product
+
+# Entries per map; a scanning session touches a few hundred codes at most.
+MAX_ENTRIES = 1024
+
+
+class _LRU:
+    """A small thread-safe LRU map with a per-entry time-to-live."""
+
+    def __init__(self, maxsize=MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if time.monotonic() >= expires:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        ttl = settings.SCAN_CACHE_TTL_S
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_values(self, predicate):
+        """Drop every entry whose value satisfies ``predicate``."""
+        with self._lock:
+            for key in [k for k, (v, _) in self._data.items() if predicate(v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_upcs = _LRU()
+_product_models = _LRU()
+_serial_focus = _LRU()
+_locations = _LRU()
+
+
+def _remember_product(product):
+    model = type(product)
+    _product_models.put(product.pk, model)
+    _upcs.put(product.upc, (product.pk, model))
+    return product
+
+
+def product_for_upc(upc):
+    """The real-subclass :class:`Product` with ``upc``, or None."""
+    upc = (upc or "").strip()
+    if not upc:
+        return None
+    hit = _upcs.get(upc)
+    if hit is not None:
+        pk, model = hit
+        product = model.objects.filter(pk=pk, upc=upc).first()
+        if product is not None:
+            return product
+        _upcs.pop(upc)
+    product = Product.objects.filter(upc=upc).first()
+    return _remember_product(product) if product is not None else None
+
+
+def product(pk):
+    """The real-subclass :class:`Product` with primary key ``pk``, or None."""
+    model = _product_models.get(pk)
+    if model is not None:
+        found = model.objects.filter(pk=pk).first()
+        if found is not None:
+            return found
+        _product_models.pop(pk)
+    found = Product.objects.filter(pk=pk).first()
+    return _remember_product(found) if found is not None else None
+
+
+def location(pk):
+    """The :class:`Location` with primary key ``pk`` (a copy), or None."""
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    cached = _locations.get(pk)
+    if cached is None:
+        cached = Location.objects.filter(pk=pk).first()
+        if cached is None:
+            return None
+        _locations.put(pk, cached)
+    return copy.copy(cached)
+
+
+def focus_for_serial(serial):
+    """The cached focus :class:`Location` for a unit ``serial``, or None."""
+    pk = _serial_focus.get((serial or "").lower())
+    return location(pk) if pk is not None else None
+
+
+def remember_focus(serial, loc):
+    """Record that scanning unit ``serial`` focuses ``loc``."""
+    _serial_focus.put((serial or "").lower(), loc.pk)
+    _locations.put(loc.pk, copy.copy(loc))
+
+
+def forget_product(instance):
+    """Drop every entry for ``instance`` (its UPC may have just changed)."""
+    _product_models.pop(instance.pk)
+    _upcs.pop(instance.upc)
+    _upcs.pop_values(lambda value: value[0] == instance.pk)
+
+
+def forget_location(pk):
+    """Drop location ``pk`` and every serial focus (slot links may have moved)."""
+    _locations.pop(pk)
+    _serial_focus.clear()
+
+
+def forget_serial(*serials):
+    """Drop the focus cached for each of ``serials``."""
+    for serial in serials:
+        if serial:
+            _serial_focus.pop(serial.lower())
+
+
+def clear():
+    """Empty every map."""
+    for lru in (_upcs, _product_models, _serial_focus, _locations):
+        lru.clear()
@@ -0,0 +1,152 @@
+"""Batch replay of scans journaled offline on the phone.
+
+The audit console and quick-move page keep a scan journal in IndexedDB
+(``static/inventory/js/scan_journal.js``) and upload it in batches when the
+network is back (or continuously in batch mode, so scanning never waits on a
+round-trip). :func:`ingest` replays a batch **in order** through the same
+services the live views use — :func:`inventory.audit.apply_scan` and
+:func:`inventory.quickmove.replay_move` — and records each outcome as a
+:class:`SyncedScan` keyed by the client's id, so a re-sent batch is idempotent.
+
+Each scan runs in its own savepoint: one bad scan is reported, not fatal to the
+rest of the batch.
+"""
+
+from dataclasses import dataclass
+
+from django.db import IntegrityError, transaction
+from django.utils.dateparse import parse_datetime
+
+from . import audit, quickmove
+from .models import AuditSession, SyncedScan
+
+MAX_BATCH = 200
+
+
+class ScanSyncError(Exception):
+    """The batch itself is malformed (not a single bad scan)."""
+
+
+@dataclass
+class SyncResult:
+    """Per-scan outcome returned to the phone.
+
+    ``added`` is the item an audit UPC scan created (the view prints its label);
+    ``duplicate`` marks a scan already replayed by an earlier upload.
+    """
+
+    client_id: str
+    tag: str
+    message: str
+    duplicate: bool = False
+    added: object = None
+
+    def as_dict(self):
+        return {
+            "id": self.client_id,
+            "tag": self.tag,
+            "message": self.message,
+            "duplicate": self.duplicate,
+        }
+
+
+def _clean(raw):
+    if not isinstance(raw, dict):
+        raise ScanSyncError("Each scan must be an object.")
+    client_id = str(raw.get("id") or "").strip()
+    flow = raw.get("flow")
+    code = str(raw.get("code") or "").strip()
+    if not client_id or len(client_id) > 64:
+        raise ScanSyncError("Each scan needs an id of at most 64 characters.")
+    if flow not in SyncedScan.Flow.values:
+        raise ScanSyncError(f"Unknown flow {flow!r}.")
+    scanned_at = raw.get("scanned_at")
+    if scanned_at:
+        try:
+            scanned_at = parse_datetime(scanned_at)
+        except (TypeError, ValueError):
+            scanned_at = None
+        if scanned_at is None:
+            raise ScanSyncError(
+                f"Scan {client_id}: scanned_at must be an ISO datetime."
+            )
+    return {
+        "client_id": client_id,
+        "flow": flow,
+        "code": code[:255],
+        "dest_code": str(raw.get("dest") or "").strip()[:255],
+        "scanned_at": scanned_at or None,
+    }
+
+
+def _replay_audit(session, active, scan):
+    if session is None:
+        return audit.ScanOutcome("danger", "No audit in progress.", active)
+    return audit.apply_scan(session, active, scan["code"])
+
+
+def _replay_move(scan):
+    try:
+        return quickmove.replay_move(scan["code"], scan["dest_code"])
+    except quickmove.QuickMoveError as exc:
+        return "danger", str(exc)
+
+
+def ingest(user, scans, *, active_location=None):
+    """Replay ``scans`` in order; returns ``(results, active_location)``.
+
+    ``active_location`` is the audit focus before the batch; the returned one is
+    the focus after it, for the caller to store back in the request session.
+    Raises :class:`ScanSyncError` for a malformed or oversized batch before
+    anything is applied.
+    """
+    if not isinstance(scans, list):
+        raise ScanSyncError("scans must be a list.")
+    if len(scans) > MAX_BATCH:
+        raise ScanSyncError(f"At most {MAX_BATCH} scans per batch.")
+    cleaned = [_clean(raw) for raw in scans]
+
+    seen = {
+        row.client_id: row
+        for row in SyncedScan.objects.filter(
+            client_id__in=[scan["client_id"] for scan in cleaned]
+        )
+    }
+    session = AuditSession.active()
+    active = active_location
+    results = []
+    for scan in cleaned:
+        prior = seen.get(scan["client_id"])
+        if prior is not None:
+            results.append(
+                SyncResult(prior.client_id, prior.result, prior.message, True)
+            )
+            continue
+        added, focus = None, active
+        try:
+            with transaction.atomic():
+                if scan["flow"] == SyncedScan.Flow.AUDIT:
+                    outcome = _replay_audit(session, active, scan)
+                    focus = outcome.location
+                    tag, message, added = outcome.tag, outcome.message, outcome.added
+                else:
+                    tag, message = _replay_move(scan)
+                row = SyncedScan.objects.create(
+                    **scan,
+                    session=session,
+                    user=user,
+                    result=tag,
+                    message=message[:255],
+                )
+        except IntegrityError:
+            # A concurrent upload of the same id got there first; its savepoint
+            # won, ours rolled back.
+            row = SyncedScan.objects.filter(client_id=scan["client_id"]).first()
+            if row is None:
+                raise
+            results.append(SyncResult(row.client_id, row.result, row.message, True))
+            continue
+        active = focus
+        seen[row.client_id] = row
+        results.append(SyncResult(row.client_id, tag, message, added=added))
+    return results, active
@@ -28,6 +28,10 @@ FTS_CREATE_SQL = (
 )
 FTS_DROP_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
 
+# InventoryItem columns the document is built from; a save that changes none of
+# them leaves the FTS row as it was (see signals.index_inventory_item).
+INDEXED_ITEM_FIELDS = ("location_id", "product_id", "serial_number")
+
 
 def _location_path(loc):
     """Root→leaf location names joined, so a parent (rack) name matches child items."""
@@ -39,9 +43,8 @@ def _location_path(loc):
     return " ".join(reversed(names)).strip()
 
 
-def build_document(item):
-    """Searchable text for one InventoryItem, from its real product subclass."""
-    product = item.product
+def _product_document(product):
+    """The product half of a document, from its real (polymorphic) subclass."""
     real = (
         product.get_real_instance()
         if hasattr(product, "get_real_instance")
@@ -53,23 +56,57 @@ def build_document(item):
         "color": getattr(real, "color", "") or "",
         "material": (f"{mat.name} {mat.material_type}".strip() if mat else ""),
         "manufacturer": getattr(real, "manufacturer", "") or "",
-        "serial": item.serial_number or "",
         "upc": getattr(product, "upc", "") or "",
         "sku": getattr(product, "sku", "") or "",
+    }
+
+
+def build_document(item):
+    """Searchable text for one InventoryItem, from its real product subclass."""
+    return {
+        **_product_document(item.product),
+        "serial": item.serial_number or "",
         "location": _location_path(item.location),
     }
 
 
+def _insert_sql():
+    placeholders = ", ".join(["%s"] * len(COLUMNS))
+    return (
+        f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) "
+        f"VALUES (%s, {placeholders})"
+    )
+
+
 def index_item(item):
     doc = build_document(item)
-    placeholders = ", ".join(["%s"] * len(COLUMNS))
     with connection.cursor() as cur:
         cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [item.pk])
-        cur.execute(
-            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) "
-            f"VALUES (%s, {placeholders})",
-            [item.pk] + [doc[c] for c in COLUMNS],
+        cur.execute(_insert_sql(), [item.pk] + [doc[c] for c in COLUMNS])
+
+
+def index_items(items):
+    """:func:`index_item` for many rows: product and location text are built
+    once per distinct product/location, then two ``executemany`` calls."""
+    products, paths, rows = {}, {}, []
+    for item in items:
+        if item.product_id not in products:
+            products[item.product_id] = _product_document(item.product)
+        if item.location_id not in paths:
+            paths[item.location_id] = _location_path(item.location)
+        doc = {
+            **products[item.product_id],
+            "serial": item.serial_number or "",
+            "location": paths[item.location_id],
+        }
+        rows.append([item.pk] + [doc[c] for c in COLUMNS])
+    if not rows:
+        return
+    with connection.cursor() as cur:
+        cur.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[row[0]] for row in rows]
         )
+        cur.executemany(_insert_sql(), rows)
 
 
 def unindex_item(pk):
@@ -77,6 +114,20 @@ def unindex_item(pk):
         cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
 
 
+def reindex_location(pks, location):
+    """Rewrite only the ``location`` column for many rows moved to ``location``.
+
+    Bulk moves/depletes change nothing else that is indexed. Items without an
+    FTS row are left alone; ``rebuild_all`` backfills those.
+    """
+    text = _location_path(location)
+    with connection.cursor() as cur:
+        cur.executemany(
+            f"UPDATE {FTS_TABLE} SET location = %s WHERE rowid = %s",
+            [(text, pk) for pk in pks],
+        )
+
+
 def rebuild_all():
     from inventory.models import InventoryItem
 
@@ -3,43 +3,66 @@ import logging
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import InventoryItem
+from .models import (
+    MACHINE_PRODUCT_TYPES,
+    InventoryItem,
+    Location,
+    MaintenanceEvent,
+    Product,
+    PurchaseOrder,
+    PurchaseOrderLine,
+)
 
 logger = logging.getLogger("inventory")
 
 
+def _product_label(instance):
+    # Name the product only if it is already loaded; a log line isn't worth a query.
+    if InventoryItem.product.is_cached(instance):
+        return instance.product.name
+    return f"product {instance.product_id}"
+
+
 @receiver(pre_save, sender=InventoryItem)
 def log_inventory_events(sender, instance, **kwargs):
     if instance.pk is None:
-        logger.info(f"Adding {instance.product.name} to inventory")
-        return
-
-    try:
-        old = InventoryItem.objects.get(pk=instance.pk)
-    except InventoryItem.DoesNotExist:
+        logger.info(f"Adding {_product_label(instance)} to inventory")
         return
 
-    logger.info(f"Updated inventory for {instance.product.name} (ID: {instance.pk})")
+    logger.info(f"Updated inventory for {_product_label(instance)} (ID: {instance.pk})")
 
+    # The loaded snapshot (InventoryItem.from_db) stands in for re-reading the row.
     if (
-        old.status != instance.status
-        and instance.status == InventoryItem.Status.DEPLETED
+        instance.status == InventoryItem.Status.DEPLETED
+        and instance.loaded_value("status") != InventoryItem.Status.DEPLETED
     ):
         logger.info(
-            f"InventoryItem {instance.pk} DEPLETED at location '{old.location}'"
+            f"InventoryItem {instance.pk} DEPLETED "
+            f"(was at location {instance.loaded_value('location_id')})"
         )
 
 
 @receiver(post_save, sender=InventoryItem)
-def index_inventory_item(sender, instance, **kwargs):
+def index_inventory_item(sender, instance, created, **kwargs):
     from . import search_index
 
+    if not created and not instance.tracked_changed(*search_index.INDEXED_ITEM_FIELDS):
+        return
     try:
         search_index.index_item(instance)
     except Exception:  # never let indexing break a save
         logger.exception("FTS index failed for InventoryItem %s", instance.pk)
 
 
+@receiver([post_save, post_delete], sender=InventoryItem)
+def forget_occupancy(sender, instance, **kwargs):
+    from . import occupancy
+
+    # Runs before save() re-snapshots, so loaded_value is still the old slot.
+    # Only matters inside an occupancy.scope(); otherwise a no-op.
+    occupancy.forget(instance.loaded_value("location_id"), instance.location_id)
+
+
 @receiver(post_delete, sender=InventoryItem)
 def unindex_inventory_item(sender, instance, **kwargs):
     from . import search_index
@@ -48,3 +71,101 @@ def unindex_inventory_item(sender, instance, **kwargs):
         search_index.unindex_item(instance.pk)
     except Exception:
         logger.exception("FTS unindex failed for InventoryItem %s", instance.pk)
+
+
+@receiver([post_save, post_delete])
+def forget_scan_product(sender, instance, **kwargs):
+    # No sender filter: a polymorphic subclass save is sent by the subclass.
+    if isinstance(instance, Product):
+        from . import scan_resolver
+
+        scan_resolver.forget_product(instance)
+
+
+@receiver([post_save, post_delete], sender=Location)
+def forget_scan_location(sender, instance, **kwargs):
+    from . import scan_resolver
+
+    scan_resolver.forget_location(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=InventoryItem)
+def forget_scan_serial(sender, instance, **kwargs):
+    from . import scan_resolver
+
+    # A unit's serial decides which location a serial scan focuses.
+    if kwargs.get("created") is False and not instance.tracked_changed("serial_number"):
+        return
+    scan_resolver.forget_serial(
+        instance.loaded_value("serial_number"), instance.serial_number
+    )
+
+
+@receiver([post_save, post_delete], sender=MaintenanceEvent)
+def forget_reliability_event(sender, instance, **kwargs):
+    from . import maintenance
+
+    maintenance.forget_reliability()
+
+
+@receiver([post_save, post_delete])
+def forget_reliability_machine(sender, instance, **kwargs):
+    # No sender filter, as above: machine products save as their subclass.
+    if isinstance(instance, MACHINE_PRODUCT_TYPES):
+        from . import maintenance
+
+        maintenance.forget_reliability()
+
+
+@receiver([post_save, post_delete], sender=InventoryItem)
+def forget_reliability_unit(sender, instance, **kwargs):
+    from . import maintenance
+
+    # A unit joins or leaves a model's fleet; status/location moves don't count.
+    if kwargs.get("created") is False and not instance.tracked_changed("product_id"):
+        return
+    maintenance.forget_reliability()
+
+
+@receiver(post_save, sender=InventoryItem)
+def record_item_change(sender, instance, created, **kwargs):
+    from . import item_events
+
+    # Runs before save() re-snapshots, so the snapshot is the old state.
+    if not created:
+        item_events.record([instance])
+
+
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_save, sender=PurchaseOrderLine)
+def post_spend_change(sender, instance, created, **kwargs):
+    from . import spend_ledger
+
+    record = (
+        spend_ledger.record_items
+        if sender is InventoryItem
+        else spend_ledger.record_lines
+    )
+    # Runs before save() re-snapshots, so the snapshot is the old state.
+    record([instance], created=created)
+
+
+@receiver(post_delete, sender=InventoryItem)
+@receiver(post_delete, sender=PurchaseOrderLine)
+def post_spend_removal(sender, instance, **kwargs):
+    from . import spend_ledger
+
+    record = (
+        spend_ledger.record_items
+        if sender is InventoryItem
+        else spend_ledger.record_lines
+    )
+    record([instance], deleted=True)
+
+
+@receiver(post_save, sender=PurchaseOrder)
+def refile_order_spend(sender, instance, created, **kwargs):
+    from . import spend_ledger
+
+    if not created:
+        spend_ledger.record_supplier_change(instance)
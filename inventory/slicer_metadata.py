@@ -0,0 +1,257 @@
+"""Slicer metadata from Bambu Studio / Orca / PrusaSlicer 3MF and gcode files.
+
+Pure Python with no Django imports, so :func:`parse_files` can hand
+:func:`parse_file` to a process pool whatever the start method.
+:mod:`inventory.job_import` turns the results into print jobs.
+
+Only the metadata is read: a 3MF's ``Metadata/slice_info.config`` (per-plate
+``prediction`` seconds and one ``<filament type color used_g>`` per extruder,
+plates summed into one job), else the header of its embedded gcode; for a
+``.gcode`` file, the comment lines in its first :data:`GCODE_HEAD_LINES` lines
+(Bambu Studio) and last :data:`GCODE_TAIL_BYTES` (Orca/PrusaSlicer config
+block). The toolpath in between is never parsed.
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from decimal import Decimal, InvalidOperation
+from hashlib import sha256
+from pathlib import Path
+
+SUFFIXES = (".3mf", ".gcode")
+
+GCODE_HEAD_LINES = 2000
+GCODE_TAIL_BYTES = 64 * 1024
+
+# Files submitted to the pool per worker before the oldest result is awaited.
+QUEUE_PER_WORKER = 4
+
+_DURATION = re.compile(r"(\d+)\s*([dhms])")
+_GCODE_TIME = (
+    re.compile(r"total estimated time:\s*([\ddhms ]+)"),
+    re.compile(r"estimated printing time \(normal mode\)\s*=\s*([\ddhms ]+)"),
+)
+_GCODE_KEYS = {
+    "grams": re.compile(
+        r"^;\s*(?:total filament weight \[g\]\s*:|filament used \[g\]\s*=)\s*(.+)$"
+    ),
+    "types": re.compile(r"^;\s*filament_type\s*=\s*(.+)$"),
+    "colors": re.compile(r"^;\s*filament_colou?r\s*=\s*(.+)$"),
+}
+
+
+@dataclass(frozen=True)
+class ParsedFilament:
+    """One extruder's use in a sliced file; ``color`` is as the slicer wrote it."""
+
+    index: int
+    material: str
+    color: str | None
+    grams: Decimal
+
+
+@dataclass
+class ParsedJob:
+    """What a slicer file says about its print (picklable, for the pool)."""
+
+    path: str
+    name: str
+    source_hash: str
+    finished_at: datetime
+    duration_s: int | None = None
+    filaments: list = field(default_factory=list)
+
+
+def parse_duration(text):
+    """Seconds in a slicer duration such as ``"1d 2h 3m 4s"``, or None."""
+    units = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+    parts = _DURATION.findall(text or "")
+    return sum(int(n) * units[u] for n, u in parts) if parts else None
+
+
+def _decimal(value):
+    try:
+        return Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _split(value):
+    return [part.strip() for part in re.split(r"[;,]", value)]
+
+
+def iter_files(root):
+    """Every 3MF/gcode file under ``root``, yielded as the walk finds them."""
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(SUFFIXES):
+                yield os.path.join(directory, name)
+
+
+def file_hash(path):
+    """Hex SHA-256 of the file at ``path``."""
+    digest = sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def job_name(path):
+    """The file name without its ``.gcode``/``.3mf`` suffixes."""
+    name = Path(path).name
+    for suffix in (".3mf", ".gcode"):
+        if name.lower().endswith(suffix):
+            name = name[: -len(suffix)]
+    return name
+
+
+def parse_slice_info(data):
+    """``(duration_s, filaments)`` from a 3MF's ``slice_info.config`` XML.
+
+    Plates are summed into one job; filaments are merged by extruder id.
+    """
+    root = ET.fromstring(data)
+    seconds = None
+    used = {}
+    for plate in root.iter("plate"):
+        for meta in plate.iter("metadata"):
+            if meta.get("key") == "prediction":
+                value = _decimal(meta.get("value"))
+                if value is not None:
+                    seconds = (seconds or 0) + int(value)
+        for entry in plate.iter("filament"):
+            grams = _decimal(entry.get("used_g"))
+            if not grams:
+                continue
+            index = int(entry.get("id") or 0)
+            previous = used.get(index)
+            used[index] = ParsedFilament(
+                index=index,
+                material=(entry.get("type") or "").strip(),
+                color=(entry.get("color") or "").strip() or None,
+                grams=grams + (previous.grams if previous else 0),
+            )
+    return seconds, [used[index] for index in sorted(used)]
+
+
+def parse_gcode_lines(lines):
+    """``(duration_s, filaments)`` from gcode comment lines."""
+    seconds = None
+    found = {}
+    for raw in lines:
+        line = raw.strip()
+        if not line.startswith(";"):
+            continue
+        if seconds is None:
+            for pattern in _GCODE_TIME:
+                match = pattern.search(line)
+                if match:
+                    seconds = parse_duration(match.group(1))
+                    break
+        for key, pattern in _GCODE_KEYS.items():
+            match = pattern.match(line)
+            if match and key not in found:
+                found[key] = _split(match.group(1))
+    types, colors = found.get("types", []), found.get("colors", [])
+    filaments = []
+    for index, value in enumerate(found.get("grams", [])):
+        grams = _decimal(value)
+        if not grams:
+            continue
+        filaments.append(
+            ParsedFilament(
+                index=index + 1,
+                material=types[index] if index < len(types) else "",
+                color=(colors[index] if index < len(colors) else "") or None,
+                grams=grams,
+            )
+        )
+    return seconds, filaments
+
+
+def _gcode_lines(fh):
+    """The head and tail lines of an open binary gcode file."""
+    head = []
+    for count, raw in enumerate(fh):
+        if count >= GCODE_HEAD_LINES:
+            break
+        head.append(raw)
+    fh.seek(0, os.SEEK_END)
+    fh.seek(max(fh.tell() - GCODE_TAIL_BYTES, 0))
+    tail = fh.read().splitlines()
+    return [line.decode("utf-8", "replace") for line in head + tail]
+
+
+def _parse_3mf(path):
+    with zipfile.ZipFile(path) as archive:
+        names = set(archive.namelist())
+        if "Metadata/slice_info.config" in names:
+            return parse_slice_info(archive.read("Metadata/slice_info.config"))
+        gcode = sorted(n for n in names if n.lower().endswith(".gcode"))
+        if gcode:
+            with archive.open(gcode[0]) as fh:
+                head = [
+                    raw.decode("utf-8", "replace")
+                    for _, raw in zip(range(GCODE_HEAD_LINES), fh, strict=False)
+                ]
+            return parse_gcode_lines(head)
+    return None, []
+
+
+def parse_file(path):
+    """A :class:`ParsedJob` for the slicer file at ``path``, or None.
+
+    None means the file is unreadable or carries no usable metadata (an
+    unsliced project 3MF, say). ``finished_at`` is the file's modification
+    time.
+    """
+    try:
+        if path.lower().endswith(".3mf"):
+            seconds, filaments = _parse_3mf(path)
+        else:
+            with open(path, "rb") as fh:
+                seconds, filaments = parse_gcode_lines(_gcode_lines(fh))
+        if seconds is None and not filaments:
+            return None
+        return ParsedJob(
+            path=path,
+            name=job_name(path)[:255],
+            source_hash=file_hash(path),
+            finished_at=datetime.fromtimestamp(os.path.getmtime(path), tz=UTC),
+            duration_s=seconds,
+            filaments=filaments,
+        )
+    except (OSError, zipfile.BadZipFile, ET.ParseError, ValueError):
+        return None
+
+
+def parse_files(paths, *, workers=None):
+    """``(path, ParsedJob | None)`` for each of ``paths``, in order.
+
+    ``workers=1`` parses in-process; otherwise a process pool (``None`` = one
+    worker per CPU) reads files while ``paths`` is still being produced, with
+    at most :data:`QUEUE_PER_WORKER` files per worker in flight.
+    """
+    if workers == 1:
+        for path in paths:
+            yield path, parse_file(path)
+        return
+    limit = (workers or os.cpu_count() or 1) * QUEUE_PER_WORKER
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            pending.append((path, pool.submit(parse_file, path)))
+            while pending and (len(pending) >= limit or pending[0][1].done()):
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
@@ -0,0 +1,432 @@
+"""Append-only spend ledger with monthly per-supplier/per-category rollups.
+
+The spend report and the admin "Spend on hand" KPI used to aggregate over every
+:class:`~inventory.models.InventoryItem` and every PO line on each render. This
+module keeps the answer up to date instead. Whenever a change moves a spend
+figure it appends one :class:`~inventory.models.SpendLedgerEntry` per
+(month, supplier, category) key it touches, and folds the same change into the
+matching :class:`~inventory.models.SpendRollup` row. Readers ``Sum`` the
+rollups, so a report costs O(months × suppliers × categories), however many
+items exist.
+
+What each source contributes (see :class:`~inventory.models.SpendMeasures`):
+
+- a tracked item with a ``unit_cost``: ``tracked_spend``/``tracked_count``,
+  plus ``on_hand_value`` while it isn't DEPLETED/SOLD;
+- a PO line: ``ordered_value`` and ``received_value``, plus
+  ``consumable_spend``/``consumable_lines`` for cost-only lines.
+
+A change is posted as "remove the old state, add the new one". The old state
+comes from the rows' loaded snapshots (:class:`~inventory.models.TrackedFieldsMixin`),
+so saves that don't touch a spend input cost nothing. Callers are the
+post_save/post_delete signals and the set-based paths in :mod:`inventory.items`.
+:func:`rebuild` re-derives everything from the tables
+(``manage.py rebuild_spend_ledger``).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import (
+    InventoryItem,
+    Product,
+    PurchaseOrder,
+    PurchaseOrderLine,
+    PurchaseReceiptLine,
+    SpendLedgerEntry,
+    SpendMeasures,
+    SpendRollup,
+)
+
+logger = logging.getLogger("inventory")
+
+MEASURES = SpendMeasures.MEASURES
+
+# Statuses whose cost no longer counts as on hand (items.TERMINAL_STATUSES;
+# not imported from there because inventory.items imports this module).
+_GONE = (InventoryItem.Status.DEPLETED, InventoryItem.Status.SOLD)
+
+
+def month_of(moment):
+    """First day of ``moment``'s month (local time for datetimes)."""
+    if hasattr(moment, "hour"):
+        moment = timezone.localtime(moment)
+    return date(moment.year, moment.month, 1)
+
+
+def _value(obj, name, loaded):
+    """``obj.name`` as stored (``loaded``; fields missing from the snapshot
+    count as unchanged) or as it is now."""
+    snapshot = getattr(obj, "_loaded_values", None) or {}
+    if loaded and name in snapshot:
+        return snapshot[name]
+    return getattr(obj, name)
+
+
+def _item_inputs(item, *, loaded):
+    """(unit_cost, on_hand, source_line_id, product_id) for ``item``, as stored
+    (``loaded``) or as it is now."""
+
+    def value(name):
+        return _value(item, name, loaded)
+
+    cost = value("unit_cost")
+    return (
+        cost,
+        cost is not None and value("status") not in _GONE,
+        value("source_line_id"),
+        value("product_id"),
+    )
+
+
+def _item_figures(inputs):
+    cost, on_hand, _, _ = inputs
+    if cost is None:
+        return {}
+    cost = Decimal(cost)
+    return {
+        "tracked_spend": cost,
+        "tracked_count": 1,
+        "on_hand_value": cost if on_hand else Decimal("0"),
+    }
+
+
+def _line_inputs(line, *, loaded):
+    """The line's spend inputs (:attr:`PurchaseOrderLine.TRACKED_FIELDS`)."""
+    return tuple(_value(line, name, loaded) for name in line.TRACKED_FIELDS)
+
+
+def _line_figures(inputs):
+    _, _, ordered, received, cost, tracked = inputs
+    if cost is None:
+        return {}
+    cost = Decimal(cost)
+    received_value = cost * (received or 0)
+    figures = {
+        "ordered_value": cost * (ordered or 0),
+        "received_value": received_value,
+    }
+    if not tracked:
+        figures["consumable_spend"] = received_value
+        figures["consumable_lines"] = 1 if received else 0
+    return figures
+
+
+def _categories(product_ids):
+    """{product_id: polymorphic ContentType id} in one query."""
+    return dict(
+        Product.objects.non_polymorphic()
+        .filter(pk__in=product_ids)
+        .values_list("pk", "polymorphic_ctype_id")
+    )
+
+
+def _changes(old_key, old, new_key, new):
+    """[(key, signed figures)] turning ``old`` at ``old_key`` into ``new``."""
+    deltas = defaultdict(lambda: defaultdict(Decimal))
+    for name, amount in old.items():
+        deltas[old_key][name] -= amount
+    for name, amount in new.items():
+        deltas[new_key][name] += amount
+    return [
+        (key, {name: amount for name, amount in figures.items() if amount})
+        for key, figures in deltas.items()
+        if any(figures.values())
+    ]
+
+
+def record_items(items, *, created=False, deleted=False):
+    """Post the spend change of saved (or deleted) ``items``.
+
+    Call before the items are re-snapshotted: the snapshot is the old state.
+    ``created`` treats the old state as empty; ``deleted`` the new one.
+    """
+    empty = (None, False, None, None)
+    pending = []
+    for item in items:
+        old = empty if created else _item_inputs(item, loaded=True)
+        new = empty if deleted else _item_inputs(item, loaded=False)
+        if old != new and (old[0] is not None or new[0] is not None):
+            pending.append((item, old, new))
+    if not pending:
+        return []
+
+    line_ids = {s[2] for _, old, new in pending for s in (old, new) if s[2]}
+    suppliers = dict(
+        PurchaseOrderLine.objects.filter(pk__in=line_ids).values_list(
+            "pk", "order__supplier_id"
+        )
+    )
+    categories = _categories(
+        {s[3] for _, old, new in pending for s in (old, new) if s[3]}
+    )
+
+    def key(inputs):
+        return suppliers.get(inputs[2]), categories.get(inputs[3])
+
+    entries = []
+    for item, old, new in pending:
+        for (supplier_id, category_id), figures in _changes(
+            key(old), _item_figures(old), key(new), _item_figures(new)
+        ):
+            entries.append(
+                SpendLedgerEntry(
+                    item_id=None if deleted else item.pk,
+                    supplier_id=supplier_id,
+                    category_id=category_id,
+                    **figures,
+                )
+            )
+    return post(entries)
+
+
+def record_lines(lines, *, created=False, deleted=False):
+    """:func:`record_items` for PO lines."""
+    empty = (None,) * len(PurchaseOrderLine.TRACKED_FIELDS)
+    pending = []
+    for line in lines:
+        old = empty if created else _line_inputs(line, loaded=True)
+        new = empty if deleted else _line_inputs(line, loaded=False)
+        if old != new:
+            pending.append((line, old, new))
+    if not pending:
+        return []
+
+    order_ids = {s[0] for _, old, new in pending for s in (old, new) if s[0]}
+    suppliers = dict(
+        PurchaseOrder.objects.filter(pk__in=order_ids).values_list("pk", "supplier_id")
+    )
+    categories = _categories(
+        {s[1] for _, old, new in pending for s in (old, new) if s[1]}
+    )
+
+    def key(inputs):
+        return suppliers.get(inputs[0]), categories.get(inputs[1])
+
+    entries = []
+    for line, old, new in pending:
+        for (supplier_id, category_id), figures in _changes(
+            key(old), _line_figures(old), key(new), _line_figures(new)
+        ):
+            entries.append(
+                SpendLedgerEntry(
+                    order_line_id=None if deleted else line.pk,
+                    supplier_id=supplier_id,
+                    category_id=category_id,
+                    **figures,
+                )
+            )
+    return post(entries)
+
+
+def record_supplier_change(order):
+    """Re-file ``order``'s lines and received items under its new supplier."""
+    old_supplier = order.loaded_value("supplier_id")
+    if old_supplier is None or old_supplier == order.supplier_id:
+        return []
+    lines = list(order.lines.all())
+    categories = _categories({line.product_id for line in lines})
+    entries = []
+    for line in lines:
+        figures = _line_figures(_line_inputs(line, loaded=False))
+        category_id = categories.get(line.product_id)
+        for (supplier_id, _), change in _changes(
+            (old_supplier, category_id),
+            figures,
+            (order.supplier_id, category_id),
+            figures,
+        ):
+            entries.append(
+                SpendLedgerEntry(
+                    order_line_id=line.pk,
+                    supplier_id=supplier_id,
+                    category_id=category_id,
+                    **change,
+                )
+            )
+    received = InventoryItem.objects.filter(
+        source_line__order=order, unit_cost__isnull=False
+    ).values_list("pk", "unit_cost", "status", "product__polymorphic_ctype_id")
+    for pk, cost, status, category_id in received:
+        figures = _item_figures((cost, status not in _GONE, None, None))
+        for (supplier_id, _), change in _changes(
+            (old_supplier, category_id),
+            figures,
+            (order.supplier_id, category_id),
+            figures,
+        ):
+            entries.append(
+                SpendLedgerEntry(
+                    item_id=pk,
+                    supplier_id=supplier_id,
+                    category_id=category_id,
+                    **change,
+                )
+            )
+    return post(entries)
+
+
+def post(entries, *, month=None):
+    """Append ``entries`` and fold them into the rollups, in one transaction.
+
+    Entries without a ``month`` land in ``month`` (default: the current one).
+    """
+    if not entries:
+        return entries
+    month = month or month_of(timezone.now())
+    folded = defaultdict(lambda: defaultdict(Decimal))
+    for entry in entries:
+        entry.month = entry.month or month
+        key = (entry.month, entry.supplier_id, entry.category_id)
+        for name in MEASURES:
+            folded[key][name] += getattr(entry, name) or 0
+    with transaction.atomic():
+        SpendLedgerEntry.objects.bulk_create(entries)
+        for (month_key, supplier_id, category_id), figures in folded.items():
+            figures = {k: v for k, v in figures.items() if v}
+            if not figures:
+                continue
+            rollup = SpendRollup.objects.filter(
+                month=month_key, supplier_id=supplier_id, category_id=category_id
+            )
+            if not rollup.update(**{k: F(k) + v for k, v in figures.items()}):
+                SpendRollup.objects.create(
+                    month=month_key,
+                    supplier_id=supplier_id,
+                    category_id=category_id,
+                    **figures,
+                )
+    return entries
+
+
+def rebuild():
+    """Re-derive the ledger and rollups from items and PO lines.
+
+    Each item is filed in the month it was added. A line's ordered value is
+    filed in the month its order was placed (or created) and its received value
+    in the month of each receipt, as live posting files them when the units
+    arrive; received units with no receipt on record fall back to the order's
+    month. Returns the number of entries written.
+    """
+    entries = []
+    items = InventoryItem.objects.filter(unit_cost__isnull=False).values_list(
+        "pk",
+        "unit_cost",
+        "status",
+        "date_added",
+        "source_line__order__supplier_id",
+        "product__polymorphic_ctype_id",
+    )
+    for pk, cost, status, added, supplier_id, category_id in items.iterator():
+        entries.append(
+            SpendLedgerEntry(
+                item_id=pk,
+                month=month_of(added),
+                supplier_id=supplier_id,
+                category_id=category_id,
+                **_item_figures((cost, status not in _GONE, None, None)),
+            )
+        )
+    receipts = defaultdict(list)
+    for line_id, qty, received_at in (
+        PurchaseReceiptLine.objects.order_by("receipt__received_at", "pk")
+        .values_list("order_line_id", "qty_received", "receipt__received_at")
+        .iterator()
+    ):
+        receipts[line_id].append((qty, month_of(received_at)))
+    lines = PurchaseOrderLine.objects.select_related("order").annotate(
+        category_id=F("product__polymorphic_ctype_id")
+    )
+    for line in lines.iterator():
+        ordered_month = month_of(line.order.ordered_at or line.order.created_at)
+        for month, figures in _line_months(
+            _line_inputs(line, loaded=False), receipts[line.pk], ordered_month
+        ):
+            entries.append(
+                SpendLedgerEntry(
+                    order_line_id=line.pk,
+                    month=month,
+                    supplier_id=line.order.supplier_id,
+                    category_id=line.category_id,
+                    **figures,
+                )
+            )
+    with transaction.atomic():
+        SpendLedgerEntry.objects.all().delete()
+        SpendRollup.objects.all().delete()
+        post(entries)
+    logger.info("Spend ledger rebuilt: %d entries", len(entries))
+    return len(entries)
+
+
+def _line_months(inputs, receipts, ordered_month):
+    """[(month, figures)] for a line: nothing received in ``ordered_month``,
+    then each of ``receipts`` (``(qty, month)``, oldest first) as the change it
+    made, up to the line's ``qty_received``."""
+    received = inputs[3] or 0
+
+    def at(qty):
+        return _line_figures(inputs[:3] + (qty,) + inputs[4:])
+
+    found = [(ordered_month, {k: v for k, v in at(0).items() if v})]
+    done = 0
+    for qty, month in [*receipts, (received, ordered_month)]:
+        upto = min(done + qty, received)
+        found.extend(_changes(month, at(done), month, at(upto)))
+        done = upto
+    return found
+
+
+def totals(**filters):
+    """Summed measures over the rollups matching ``filters`` (zeros if none)."""
+    sums = SpendRollup.objects.filter(**filters).aggregate(
+        **{name: Sum(name) for name in MEASURES}
+    )
+    return {name: sums[name] or 0 for name in MEASURES}
+
+
+def on_hand_value():
+    """Unit cost of every item not DEPLETED/SOLD."""
+    return totals()["on_hand_value"] or Decimal("0")
+
+
+def by_supplier():
+    """Ordered and received value per supplier, by supplier name."""
+    return (
+        SpendRollup.objects.filter(supplier__isnull=False)
+        .values("supplier__id", "supplier__name")
+        .annotate(
+            ordered_value=Sum("ordered_value"), received_value=Sum("received_value")
+        )
+        .order_by("supplier__name")
+    )
+
+
+def monthly():
+    """Per-month spend for the trend chart, oldest first.
+
+    ``[{"month", "tracked_spend", "consumable_spend", "total_spend"}, ...]``;
+    months with no spend (only ordered value, say) are left out.
+    """
+    rows = (
+        SpendRollup.objects.values("month")
+        .annotate(
+            tracked_spend=Sum("tracked_spend"),
+            consumable_spend=Sum("consumable_spend"),
+        )
+        .order_by("month")
+    )
+    return [
+        {
+            **row,
+            "total_spend": (row["tracked_spend"] or 0) + (row["consumable_spend"] or 0),
+        }
+        for row in rows
+        if row["tracked_spend"] or row["consumable_spend"]
+    ]
@@ -0,0 +1,180 @@
+"""Live spool reconciliation driven by AMS telemetry deltas.
+
+``sync_spools`` rebuilds the whole dry-run report on demand. The telemetry
+consumer, meanwhile, sees every tray change as it lands, so
+:func:`inventory.telemetry.ingest_report` hands just the trays whose watched
+fields changed to :func:`reconcile`. That re-runs
+:func:`inventory.spool_sync.classify_channel` for those trays only and keeps one
+:class:`~inventory.models.SpoolSyncFinding` per tray current: the flag or
+proposal the dry-run would show, or ``OK``.
+
+The only write to inventory is optional and narrow: with
+``SPOOL_AUTOSYNC_APPLY_PERCENT`` a confident Bambu match whose AMS ``remain``
+has *fallen* below ``percent_remaining`` is applied, at most once per tray every
+``SPOOL_AUTOSYNC_APPLY_INTERVAL_S`` seconds (the AMS reports every percent while
+printing), and a spool that reaches 0% is depleted. Serial writes and anything
+flagged stay in the review queue.
+
+The AMS unit bridge comes from ``AMSUnitState.serial``, which the consumer fills
+from the printer's get_version reply (:func:`inventory.telemetry.ingest_version`).
+"""
+
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import items, occupancy, printjobs, spool_sync
+from .models import AMSUnitState, InventoryItem, SpoolSyncFinding
+
+logger = logging.getLogger("inventory")
+
+# AMSChannelState fields that can change a tray's verdict.
+WATCHED_FIELDS = ("tray_uuid", "tray_type", "color_hex", "remain_pct")
+
+OK = SpoolSyncFinding.OK
+
+
+def serial_map(device):
+    """{(device.id, ams_index): serial} from the stored get_version bridge."""
+    return {
+        (device.id, ams_index): serial
+        for ams_index, serial in AMSUnitState.objects.filter(device=device)
+        .exclude(serial="")
+        .values_list("ams_index", "serial")
+    }
+
+
+def _verdict(result):
+    """The finding columns for a :class:`~inventory.spool_sync.TrayResult`."""
+    verdict = {
+        "category": OK,
+        "item_id": None,
+        "detail": result.count_key,
+        "write_serial": "",
+        "write_percent_from": None,
+        "write_percent_to": None,
+    }
+    if result.flag is not None:
+        verdict.update(
+            category=result.flag.category,
+            item_id=result.flag.item_id,
+            detail=result.flag.detail[:255],
+        )
+    elif result.proposal is not None:
+        p = result.proposal
+        bits = []
+        if p.write_serial:
+            bits.append(f"serial←{p.write_serial}")
+        if p.write_percent_to is not None:
+            bits.append(f"%←{p.write_percent_from}→{p.write_percent_to}")
+        verdict.update(
+            category=SpoolSyncFinding.PROPOSAL,
+            item_id=p.item_id,
+            detail=f"{p.item_label}: {', '.join(bits)}"[:255],
+            write_serial=p.write_serial or "",
+            write_percent_from=p.write_percent_from,
+            write_percent_to=p.write_percent_to,
+        )
+    return verdict
+
+
+def _may_apply(verdict, finding, now, interval):
+    """A falling percent on a confident match, outside the tray's rate limit.
+
+    An empty reading skips the rate limit: no later reading would follow it.
+    """
+    to, frm = verdict["write_percent_to"], verdict["write_percent_from"]
+    if to is None or frm is None or to >= frm:
+        return False
+    if to <= printjobs.DEPLETE_AT_PERCENT:
+        return True
+    return finding.applied_at is None or now - finding.applied_at >= interval
+
+
+def reconcile(device, channels, *, apply_percent=None, now=None):
+    """Re-evaluate ``device``'s changed ``channels`` and update their findings.
+
+    Returns the saved :class:`SpoolSyncFinding` rows, one per channel. A finding
+    is written only when its verdict actually changed.
+    """
+    channels = list(channels)
+    if not channels:
+        return []
+    if apply_percent is None:
+        apply_percent = settings.SPOOL_AUTOSYNC_APPLY_PERCENT
+    now = now or timezone.now()
+    interval = timedelta(seconds=settings.SPOOL_AUTOSYNC_APPLY_INTERVAL_S)
+    serials = serial_map(device)
+
+    with occupancy.scope():
+        lookups = spool_sync._Lookups(
+            serials.get((device.id, ch.ams_index)) for ch in channels
+        )
+        verdicts = [
+            _verdict(
+                spool_sync.classify_channel(
+                    device, ch, serials.get((device.id, ch.ams_index)), lookups
+                )
+            )
+            for ch in channels
+        ]
+
+    existing = {
+        (f.ams_index, f.tray_index): f
+        for f in SpoolSyncFinding.objects.filter(
+            device=device, ams_index__in={ch.ams_index for ch in channels}
+        )
+    }
+    findings = []
+    with transaction.atomic():
+        for ch, verdict in zip(channels, verdicts, strict=True):
+            finding = existing.get((ch.ams_index, ch.tray_index))
+            if finding is None:
+                finding = SpoolSyncFinding(
+                    device=device, ams_index=ch.ams_index, tray_index=ch.tray_index
+                )
+            applied = apply_percent and _may_apply(verdict, finding, now, interval)
+            if applied:
+                _apply_percent(verdict)
+                finding.applied_at = now
+            if (
+                applied
+                or finding.pk is None
+                or any(getattr(finding, k) != v for k, v in verdict.items())
+            ):
+                for k, v in verdict.items():
+                    setattr(finding, k, v)
+                finding.save()
+            findings.append(finding)
+    return findings
+
+
+def _apply_percent(verdict):
+    """Write the proposal's percent and rewrite ``verdict`` to what's left.
+
+    A spool read at 0% is retired through :func:`items.deplete`, as a completed
+    print job would retire it.
+    """
+    item = InventoryItem.objects.get(pk=verdict["item_id"])
+    percent = Decimal(verdict["write_percent_to"])
+    if percent <= printjobs.DEPLETE_AT_PERCENT:
+        item.percent_remaining = Decimal(0)
+        items.deplete(item, reason="spool autosync")
+    else:
+        items.bulk_update_fields([item], percent_remaining=percent)
+    logger.info(
+        "Spool autosync: INV-%s percent_remaining %s -> %s",
+        item.pk,
+        verdict["write_percent_from"],
+        verdict["write_percent_to"],
+    )
+    applied = f"% {verdict['write_percent_from']}→{verdict['write_percent_to']} applied"
+    if verdict["write_serial"]:
+        verdict["detail"] = f"{item}: serial←{verdict['write_serial']} ({applied})"
+    else:
+        verdict.update(category=OK, detail=f"match ({applied})")
+    verdict.update(write_percent_from=None, write_percent_to=None)
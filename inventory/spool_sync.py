@@ -8,8 +8,10 @@ docs/superpowers/specs/2026-06-21-spool-sync-dryrun-design.md.
 
 import dataclasses
 
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+from . import occupancy
 from .models import (
     AMS,
     AMSChannelState,
@@ -59,7 +61,7 @@ def resolve_ams_item(serial):
     """The AMS unit InventoryItem whose serial_number matches (case-insensitive)."""
     if not serial:
         return None
-    for item in InventoryItem.objects.filter(serial_number__iexact=serial):
+    for item in InventoryItem.by_serial(serial):
         if isinstance(item.product.get_real_instance(), AMS):
             return item
     return None
@@ -74,11 +76,11 @@ def slot_for(ams_item, tray_index):
 
 def spools_in_slot(slot):
     """In-stock InventoryItems in this slot (excludes DEPLETED/SOLD/UNKNOWN)."""
-    return list(
-        InventoryItem.objects.filter(location=slot).exclude(
-            status__in=InventoryItem.STICKY_STATUSES
-        )
-    )
+    return [
+        item
+        for item in occupancy.current().occupants(slot.id)
+        if item.status not in InventoryItem.STICKY_STATUSES
+    ]
 
 
 def filament_of(item):
@@ -121,6 +123,8 @@ class SyncReport:
     proposals: list
     flags: list
     counts: dict
+    # Per-printer get_version timing (bambu_mqtt.Probe), when the caller has it.
+    probes: list = dataclasses.field(default_factory=list)
 
 
 _COUNT_KEYS = (
@@ -137,190 +141,250 @@ _COUNT_KEYS = (
 )
 
 
-def build_report(ams_serial_map, *, generated_at=None):
+class _Lookups:
+    """Everything :func:`build_report` needs per tray, bulk-loaded up front.
+
+    One query each for the AMS units named in the serial map, their slots, the
+    slots' occupants (via :mod:`inventory.occupancy`) and those occupants'
+    filaments. The per-tray methods answer like :func:`resolve_ams_item`,
+    :func:`slot_for`, :func:`spools_in_slot` and :func:`filament_of` without
+    touching the database, so the report's cost doesn't grow with the number of
+    printers and trays.
+    """
+
+    def __init__(self, serials):
+        wanted = {s.lower() for s in serials if s}
+        self.units = {}
+        if wanted:
+            for item in (
+                InventoryItem.objects.alias(serial_ci=Lower("serial_number"))
+                .filter(serial_ci__in=wanted, product__in=AMS.objects.values("pk"))
+                .select_related("product")
+                .order_by("pk")
+            ):
+                self.units.setdefault(item.serial_number.lower(), item)
+
+        self.slots = {}
+        for slot in Location.objects.filter(
+            kind=Location.Kind.AMS_SLOT, unit__in=list(self.units.values())
+        ).order_by("name"):
+            self.slots.setdefault((slot.unit_id, slot.slot_index), slot)
+
+        self.occupancy = occupancy.current().load(s.id for s in self.slots.values())
+        product_ids = {
+            item.product_id
+            for slot in self.slots.values()
+            for item in self.occupancy.occupants(slot.id)
+        }
+        self.filaments = {
+            f.pk: f
+            for f in Filament.objects.filter(pk__in=product_ids).select_related(
+                "material"
+            )
+        }
+
+    def ams_item(self, serial):
+        return self.units.get((serial or "").lower())
+
+    def slot(self, ams_item, tray_index):
+        return self.slots.get((ams_item.id, tray_index + 1))
+
+    def spools(self, slot):
+        return spools_in_slot(slot)
+
+    def filament(self, item):
+        return self.filaments.get(item.product_id)
+
+
+@dataclasses.dataclass
+class TrayResult:
+    """How one tray classified: its ``counts`` key, plus any flag or proposal."""
+
+    count_key: str
+    ams_item: object = None
+    flag: Flag | None = None
+    proposal: Proposal | None = None
+
+
+def classify_channel(device, ch, serial, lookups):
+    """Categorize one AMS tray against inventory (see :func:`build_report`).
+
+    ``serial`` is the tray's AMS unit serial from the get_version bridge (or
+    None); ``lookups`` is a :class:`_Lookups` covering it. Shared by the full
+    dry-run report and the incremental reconciler in
+    :mod:`inventory.spool_autosync`.
+    """
+    kind = classify_tray(ch.tray_uuid, ch.tray_type, ch.color_hex)
+    ams_item = lookups.ams_item(serial) if serial else None
+
+    def flag(key, category, detail, item_id=None):
+        return TrayResult(
+            key,
+            ams_item,
+            flag=Flag(
+                category, device.name, ch.ams_index, ch.tray_index, detail, item_id
+            ),
+        )
+
+    if ams_item is None:
+        if kind == "EMPTY":
+            return TrayResult("empty_skipped")
+        why = (
+            f"serial {serial!r} not in inventory"
+            if serial
+            else "no get_version AMS module"
+        )
+        return flag("unmapped_ams", "UNMAPPED_AMS", f"ams_index {ch.ams_index}: {why}.")
+
+    slot = lookups.slot(ams_item, ch.tray_index)
+    if slot is None:
+        if kind == "EMPTY":
+            return TrayResult("empty_skipped", ams_item)
+        return flag(
+            "missing_slot",
+            "MISSING_SLOT",
+            f"No ams_slot for {ams_item} slot {ch.tray_index + 1}.",
+            ams_item.id,
+        )
+
+    spools = lookups.spools(slot)
+
+    if kind == "EMPTY":
+        if spools:
+            return flag(
+                "inventory_only",
+                "INVENTORY_ONLY",
+                f"AMS slot empty but inventory has {spools[0]}.",
+                spools[0].id,
+            )
+        return TrayResult("empty_skipped", ams_item)
+
+    if not spools:
+        return flag(
+            "missing_item",
+            "MISSING_ITEM",
+            f"AMS sees a {ch.tray_type or '?'} roll but {slot.name} is empty.",
+        )
+    if len(spools) > 1:
+        return flag(
+            "slot_overfilled",
+            "SLOT_OVERFILLED",
+            f"{len(spools)} in-stock items in {slot.name}; reconcile to 1:1.",
+            spools[0].id,
+        )
+
+    item = spools[0]
+    fil = lookups.filament(item)
+    color_t = normalize_hex(ch.color_hex)
+    color_f = normalize_hex(getattr(fil, "hex_code", None)) if fil else None
+    color_match = bool(color_t and color_f and color_t == color_f)
+    existing = (item.serial_number or "").strip()
+
+    if (
+        kind == "BAMBU"
+        and existing
+        and existing.lower() != ch.tray_uuid.strip().lower()
+    ):
+        return flag(
+            "serial_conflict",
+            "SERIAL_CONFLICT",
+            f"{item} already has serial {existing!r}; not overwriting.",
+            item.id,
+        )
+
+    if not color_match:
+        return flag(
+            "color_mismatch",
+            "COLOR_MISMATCH",
+            f"AMS #{color_t or '?'} ({ch.tray_type}) vs inventory "
+            f"#{color_f or '?'}; verify the slot's item.",
+            item.id,
+        )
+
+    if kind == "NON_BAMBU":
+        return TrayResult("non_bambu_ok", ams_item)
+
+    # BAMBU confident match -> propose writes
+    write_serial = ch.tray_uuid if not existing else None
+    cur_int = int(item.percent_remaining or 0)
+    write_pct = (
+        ch.remain_pct
+        if (
+            ch.remain_pct is not None
+            and ch.remain_pct >= 0
+            and ch.remain_pct != cur_int
+        )
+        else None
+    )
+    if write_serial is None and write_pct is None:
+        return TrayResult("match", ams_item)
+    return TrayResult(
+        "match",
+        ams_item,
+        proposal=Proposal(
+            device=device.name,
+            ams_index=ch.ams_index,
+            tray_index=ch.tray_index,
+            tray_uuid=ch.tray_uuid,
+            item_id=item.id,
+            item_label=str(item),
+            write_serial=write_serial,
+            write_percent_from=cur_int if write_pct is not None else None,
+            write_percent_to=write_pct,
+            material_match=material_matches(ch.tray_type, fil),
+            color_telemetry=color_t,
+            color_inventory=color_f,
+            color_match=color_match,
+        ),
+    )
+
+
+def build_report(ams_serial_map, *, generated_at=None, probes=None):
     """Categorize every AMS tray against inventory and return proposed writes.
 
     ``ams_serial_map``: {(device_id, ams_index): ams_serial}. Reads only; never
-    mutates inventory.
+    mutates inventory. Runs a fixed handful of queries (devices, channels and
+    the bulk loads in :class:`_Lookups`) however many trays there are.
+    ``probes`` (the get_version timings) are carried into the report as-is.
     """
+    with occupancy.scope():
+        report = _build_report(ams_serial_map, generated_at=generated_at)
+    report.probes = list(probes or [])
+    return report
+
+
+def _build_report(ams_serial_map, *, generated_at=None):
     proposals, flags = [], []
     counts = {k: 0 for k in _COUNT_KEYS}
     bridge = {}
 
-    for device in PrinterDevice.objects.filter(enabled=True).order_by("name"):
+    devices = list(PrinterDevice.objects.filter(enabled=True).order_by("name"))
+    channels_by_device = {}
+    for ch in AMSChannelState.objects.filter(device__in=devices).order_by(
+        "ams_index", "tray_index"
+    ):
+        channels_by_device.setdefault(ch.device_id, []).append(ch)
+    lookups = _Lookups(
+        serial
+        for (device_id, _), serial in ams_serial_map.items()
+        if device_id in channels_by_device
+    )
+
+    for device in devices:
         dev_bridge = bridge.setdefault(device.name, {})
-        channels = AMSChannelState.objects.filter(device=device).order_by(
-            "ams_index", "tray_index"
-        )
-        for ch in channels:
-            kind = classify_tray(ch.tray_uuid, ch.tray_type, ch.color_hex)
+        for ch in channels_by_device.get(device.id, []):
             serial = ams_serial_map.get((device.id, ch.ams_index))
-            ams_item = resolve_ams_item(serial) if serial else None
+            result = classify_channel(device, ch, serial, lookups)
             dev_bridge[ch.ams_index] = {
                 "serial": serial,
-                "item_id": ams_item.id if ams_item else None,
-                "matched": ams_item is not None,
+                "item_id": result.ams_item.id if result.ams_item else None,
+                "matched": result.ams_item is not None,
             }
-
-            if ams_item is None:
-                if kind == "EMPTY":
-                    counts["empty_skipped"] += 1
-                else:
-                    counts["unmapped_ams"] += 1
-                    why = (
-                        f"serial {serial!r} not in inventory"
-                        if serial
-                        else "no get_version AMS module"
-                    )
-                    flags.append(
-                        Flag(
-                            "UNMAPPED_AMS",
-                            device.name,
-                            ch.ams_index,
-                            ch.tray_index,
-                            f"ams_index {ch.ams_index}: {why}.",
-                        )
-                    )
-                continue
-
-            slot = slot_for(ams_item, ch.tray_index)
-            if slot is None:
-                if kind == "EMPTY":
-                    counts["empty_skipped"] += 1
-                else:
-                    counts["missing_slot"] += 1
-                    flags.append(
-                        Flag(
-                            "MISSING_SLOT",
-                            device.name,
-                            ch.ams_index,
-                            ch.tray_index,
-                            f"No ams_slot for {ams_item} slot {ch.tray_index + 1}.",
-                            item_id=ams_item.id,
-                        )
-                    )
-                continue
-
-            spools = spools_in_slot(slot)
-
-            if kind == "EMPTY":
-                if spools:
-                    counts["inventory_only"] += 1
-                    flags.append(
-                        Flag(
-                            "INVENTORY_ONLY",
-                            device.name,
-                            ch.ams_index,
-                            ch.tray_index,
-                            f"AMS slot empty but inventory has {spools[0]}.",
-                            item_id=spools[0].id,
-                        )
-                    )
-                else:
-                    counts["empty_skipped"] += 1
-                continue
-
-            if not spools:
-                counts["missing_item"] += 1
-                flags.append(
-                    Flag(
-                        "MISSING_ITEM",
-                        device.name,
-                        ch.ams_index,
-                        ch.tray_index,
-                        f"AMS sees a {ch.tray_type or '?'} roll but {slot.name} is empty.",
-                    )
-                )
-                continue
-            if len(spools) > 1:
-                counts["slot_overfilled"] += 1
-                flags.append(
-                    Flag(
-                        "SLOT_OVERFILLED",
-                        device.name,
-                        ch.ams_index,
-                        ch.tray_index,
-                        f"{len(spools)} in-stock items in {slot.name}; reconcile to 1:1.",
-                        item_id=spools[0].id,
-                    )
-                )
-                continue
-
-            item = spools[0]
-            fil = filament_of(item)
-            color_t = normalize_hex(ch.color_hex)
-            color_f = normalize_hex(getattr(fil, "hex_code", None)) if fil else None
-            color_match = bool(color_t and color_f and color_t == color_f)
-            existing = (item.serial_number or "").strip()
-
-            if (
-                kind == "BAMBU"
-                and existing
-                and existing.lower() != ch.tray_uuid.strip().lower()
-            ):
-                counts["serial_conflict"] += 1
-                flags.append(
-                    Flag(
-                        "SERIAL_CONFLICT",
-                        device.name,
-                        ch.ams_index,
-                        ch.tray_index,
-                        f"{item} already has serial {existing!r}; not overwriting.",
-                        item_id=item.id,
-                    )
-                )
-                continue
-
-            if not color_match:
-                counts["color_mismatch"] += 1
-                flags.append(
-                    Flag(
-                        "COLOR_MISMATCH",
-                        device.name,
-                        ch.ams_index,
-                        ch.tray_index,
-                        f"AMS #{color_t or '?'} ({ch.tray_type}) vs inventory "
-                        f"#{color_f or '?'}; verify the slot's item.",
-                        item_id=item.id,
-                    )
-                )
-                continue
-
-            if kind == "NON_BAMBU":
-                counts["non_bambu_ok"] += 1
-                continue
-
-            # BAMBU confident match -> propose writes
-            counts["match"] += 1
-            write_serial = ch.tray_uuid if not existing else None
-            cur_int = int(item.percent_remaining or 0)
-            write_pct = (
-                ch.remain_pct
-                if (
-                    ch.remain_pct is not None
-                    and ch.remain_pct >= 0
-                    and ch.remain_pct != cur_int
-                )
-                else None
-            )
-            if write_serial is not None or write_pct is not None:
-                proposals.append(
-                    Proposal(
-                        device=device.name,
-                        ams_index=ch.ams_index,
-                        tray_index=ch.tray_index,
-                        tray_uuid=ch.tray_uuid,
-                        item_id=item.id,
-                        item_label=str(item),
-                        write_serial=write_serial,
-                        write_percent_from=cur_int if write_pct is not None else None,
-                        write_percent_to=write_pct,
-                        material_match=material_matches(ch.tray_type, fil),
-                        color_telemetry=color_t,
-                        color_inventory=color_f,
-                        color_match=color_match,
-                    )
-                )
+            counts[result.count_key] += 1
+            if result.flag is not None:
+                flags.append(result.flag)
+            if result.proposal is not None:
+                proposals.append(result.proposal)
 
     return SyncReport(
         generated_at=generated_at or timezone.now().isoformat(),
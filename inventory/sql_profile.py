@@ -0,0 +1,217 @@
+"""Opt-in request-level SQL profiling.
+
+Production runs with ``DEBUG=0``, so debug_toolbar isn't there to say which views
+are slow under real data. :class:`SQLProfileMiddleware` samples a fraction of
+requests (``SQL_PROFILE_SAMPLE_RATE``) and, for each sampled one, counts the
+statements, sums their time and keeps the slowest ``SQL_PROFILE_TOP_N``
+(normalized, so the same query with different ids groups together). One JSON
+object per request goes to the ``inventory.sqlprofile`` logger, which settings
+route to a rotating ``sql_profile.log``; the admin "SQL profile" page reads that
+file back through :func:`summarize` as p50/p95/p99 per view.
+
+A streamed response (the inventory export) is logged when its body has been
+fully sent, so the queries run while streaming are counted too.
+
+A log file rather than a table: writing a row per request would add a write to
+every sampled request on the same SQLite file the views are reading.
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger("inventory.sqlprofile")
+
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_TOP_N = 5
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:\?|%s)\s*,)*\s*(?:\?|%s)\s*\)", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Collapse literals and IN-lists so statements group by shape.
+
+    ``WHERE id IN (%s, %s, %s)`` and ``WHERE id IN (%s)`` both become
+    ``WHERE id IN (...)``; quoted strings and bare numbers become ``?``.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+class _Collector:
+    """``connection.execute_wrapper`` hook timing every statement."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.total += elapsed
+            self.statements.append((elapsed, sql))
+
+    def slowest(self, n):
+        top = sorted(self.statements, key=lambda s: s[0], reverse=True)[:n]
+        return [
+            {"ms": round(elapsed * 1000, 2), "sql": normalize_sql(sql)}
+            for elapsed, sql in top
+        ]
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match._func_path
+
+
+class SQLProfileMiddleware:
+    """Sample requests and log their SQL profile (see module docstring).
+
+    Only installed when ``SQL_PROFILE`` is on (settings), so the unsampled cost
+    of a normal deployment is zero; when on, unsampled requests pay one
+    ``random()`` call.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(
+            settings, "SQL_PROFILE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE
+        )
+        self.top_n = getattr(settings, "SQL_PROFILE_TOP_N", DEFAULT_TOP_N)
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        collector = _Collector()
+        started = time.perf_counter()
+        with connection.execute_wrapper(collector):
+            response = self.get_response(request)
+        if response.streaming and not response.is_async:
+            # A streamed body runs its queries while the server iterates it,
+            # after this call returns; log once the stream is exhausted.
+            response.streaming_content = self._stream(
+                response.streaming_content, collector, started, request, response
+            )
+            return response
+        self._log(request, response, collector, started)
+        return response
+
+    def _stream(self, content, collector, started, request, response):
+        try:
+            with connection.execute_wrapper(collector):
+                yield from content
+        finally:
+            self._log(request, response, collector, started, streamed=True)
+
+    def _log(self, request, response, collector, started, *, streamed=False):
+        elapsed = time.perf_counter() - started
+        record = {
+            "ts": timezone.now().isoformat(timespec="seconds"),
+            "view": _view_name(request),
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "ms": round(elapsed * 1000, 2),
+            "queries": collector.count,
+            "sql_ms": round(collector.total * 1000, 2),
+            "slowest": collector.slowest(self.top_n),
+        }
+        if streamed:
+            record["streamed"] = True
+        elif response.streaming:
+            # An async stream can't be followed from here: setup only.
+            record["partial"] = True
+        logger.info(json.dumps(record))
+
+
+def read_records(path=None, *, limit=20000):
+    """The last ``limit`` profile records from the log (and its rotations).
+
+    Rotated files (``.1``, ``.2``, …) are older, so they are read first.
+    Unparseable lines (a torn write at rotation) are skipped.
+    """
+    path = Path(path or settings.SQL_PROFILE_LOG)
+    files = sorted(
+        path.parent.glob(path.name + ".*"),
+        key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    records = []
+    for f in [*files, path]:
+        if not f.exists():
+            continue
+        with f.open() as fh:
+            for line in fh:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records[-limit:]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (``pct`` in 0–100); None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+def summarize(records):
+    """Per-view latency / query percentiles, worst p95 first.
+
+    Each row carries the view's most frequent slow statement, which is usually
+    the N+1 to go after.
+    """
+    by_view = defaultdict(list)
+    for rec in records:
+        by_view[rec.get("view", "<unknown>")].append(rec)
+
+    rows = []
+    for view, recs in by_view.items():
+        ms = [r["ms"] for r in recs]
+        queries = [r["queries"] for r in recs]
+        sql_ms = [r["sql_ms"] for r in recs]
+        hot = defaultdict(lambda: [0, 0.0])
+        for r in recs:
+            for stmt in r.get("slowest", []):
+                hot[stmt["sql"]][0] += 1
+                hot[stmt["sql"]][1] += stmt["ms"]
+        top_sql = max(hot.items(), key=lambda kv: kv[1][1])[0] if hot else ""
+        rows.append(
+            {
+                "view": view,
+                "samples": len(recs),
+                "p50": percentile(ms, 50),
+                "p95": percentile(ms, 95),
+                "p99": percentile(ms, 99),
+                "queries_p50": percentile(queries, 50),
+                "queries_max": max(queries),
+                "sql_ms_p95": percentile(sql_ms, 95),
+                "top_sql": top_sql,
+            }
+        )
+    rows.sort(key=lambda r: r["p95"], reverse=True)
+    return rows
@@ -0,0 +1,285 @@
+/* Offline scan journal for the audit console and quick-move.
+
+   Scans are written to IndexedDB and uploaded in ordered batches to the bulk
+   ingest endpoint (ScanSyncView), which replays them server-side and answers
+   with one result per scan. A scan is journaled instead of posted when the
+   phone is offline, when the live POST fails at the network level, or always
+   in "batch mode" (the toggle in #scan-journal), so scanning never waits on a
+   round-trip. Each entry carries a random id; the server stores outcomes under
+   it, so re-sending a batch whose response was lost is harmless.
+
+   Markup: a form with data-journal-flow="audit" | "move" opts in, and a
+   #scan-journal element carries data-sync-url (and data-refresh-url /
+   data-refresh-target for re-rendering the page body after a sync). */
+(function (global) {
+  "use strict";
+
+  var DB_NAME = "inventory-scan-journal";
+  var STORE = "scans";
+  var BATCH_SIZE = 100;
+  var RETRY_MS = 15000;
+  var BATCH_MODE_KEY = "scanJournalBatchMode";
+
+  var dbPromise = null;
+  var flushing = false;
+
+  function openDb() {
+    if (!dbPromise) {
+      dbPromise = new Promise(function (resolve, reject) {
+        var req = global.indexedDB.open(DB_NAME, 1);
+        req.onupgradeneeded = function () {
+          // "seq" is the journal order; the server replays in that order.
+          req.result.createObjectStore(STORE, { keyPath: "seq", autoIncrement: true });
+        };
+        req.onsuccess = function () {
+          resolve(req.result);
+        };
+        req.onerror = function () {
+          reject(req.error);
+        };
+      });
+    }
+    return dbPromise;
+  }
+
+  function tx(mode, fn) {
+    return openDb().then(function (db) {
+      return new Promise(function (resolve, reject) {
+        var t = db.transaction(STORE, mode);
+        var out = fn(t.objectStore(STORE));
+        t.oncomplete = function () {
+          resolve(out && out.result !== undefined ? out.result : out);
+        };
+        t.onerror = function () {
+          reject(t.error);
+        };
+      });
+    });
+  }
+
+  function newId() {
+    if (global.crypto && global.crypto.randomUUID) return global.crypto.randomUUID();
+    return Date.now().toString(36) + "-" + Math.random().toString(36).slice(2, 12);
+  }
+
+  var Journal = {};
+
+  Journal.supported = function () {
+    return !!global.indexedDB;
+  };
+
+  Journal.batchMode = function () {
+    return global.localStorage.getItem(BATCH_MODE_KEY) === "1";
+  };
+
+  Journal.record = function (flow, code, dest) {
+    var entry = {
+      id: newId(),
+      flow: flow,
+      code: code,
+      dest: dest || "",
+      scanned_at: new Date().toISOString(),
+    };
+    return tx("readwrite", function (store) {
+      store.add(entry);
+    }).then(render);
+  };
+
+  Journal.count = function () {
+    return tx("readonly", function (store) {
+      return store.count();
+    });
+  };
+
+  function oldest(n) {
+    return tx("readonly", function (store) {
+      return store.getAll(null, n);
+    });
+  }
+
+  function remove(entries) {
+    return tx("readwrite", function (store) {
+      entries.forEach(function (e) {
+        store.delete(e.seq);
+      });
+    });
+  }
+
+  function csrfToken() {
+    var input = document.querySelector("[name=csrfmiddlewaretoken]");
+    return input ? input.value : "";
+  }
+
+  /* Upload the journal oldest-first until it is empty or a request fails.
+     Entries are deleted only after the server has answered for them. */
+  Journal.flush = function () {
+    var panel = document.getElementById("scan-journal");
+    if (!panel || flushing || !navigator.onLine) return Promise.resolve([]);
+    flushing = true;
+    var all = [];
+
+    function next() {
+      return oldest(BATCH_SIZE).then(function (entries) {
+        if (!entries.length) return all;
+        return fetch(panel.dataset.syncUrl, {
+          method: "POST",
+          credentials: "same-origin",
+          headers: { "Content-Type": "application/json", "X-CSRFToken": csrfToken() },
+          body: JSON.stringify({
+            scans: entries.map(function (e) {
+              return {
+                id: e.id,
+                flow: e.flow,
+                code: e.code,
+                dest: e.dest,
+                scanned_at: e.scanned_at,
+              };
+            }),
+          }),
+        })
+          .then(function (resp) {
+            if (!resp.ok) throw new Error("sync failed: " + resp.status);
+            return resp.json();
+          })
+          .then(function (data) {
+            all = all.concat(data.results);
+            return remove(entries).then(next);
+          });
+      });
+    }
+
+    return next()
+      .then(function (results) {
+        if (results.length) showResults(results);
+        return results;
+      })
+      .catch(function () {
+        return all; // stays journaled; retried on the next tick / "online"
+      })
+      .then(function (results) {
+        flushing = false;
+        render();
+        if (results.length) refreshBody();
+        return results;
+      });
+  };
+
+  /* --- UI -------------------------------------------------------------- */
+
+  function render() {
+    var panel = document.getElementById("scan-journal");
+    if (!panel) return Promise.resolve();
+    return Journal.count().then(function (n) {
+      var badge = panel.querySelector("[data-journal-count]");
+      if (badge) {
+        badge.textContent = n ? n + " queued" : "synced";
+        badge.className = "badge " + (n ? "bg-warning text-dark" : "bg-secondary");
+      }
+    });
+  }
+
+  function showResults(results) {
+    var list = document.querySelector("#scan-journal [data-journal-results]");
+    if (!list) return;
+    list.innerHTML = "";
+    // Only what needs attention; successes are reflected in the refreshed body.
+    results
+      .filter(function (r) {
+        return r.tag === "danger" || r.tag === "warning";
+      })
+      .forEach(function (r) {
+        var li = document.createElement("li");
+        li.className = "list-group-item list-group-item-" + r.tag + " py-1";
+        li.textContent = r.message;
+        list.appendChild(li);
+      });
+  }
+
+  function refreshBody() {
+    var panel = document.getElementById("scan-journal");
+    var target = panel && panel.dataset.refreshTarget;
+    if (!target || !global.htmx || !document.querySelector(target)) return;
+    global.htmx.ajax("GET", panel.dataset.refreshUrl, {
+      target: target,
+      select: target,
+      swap: "outerHTML",
+    });
+  }
+
+  function note(text) {
+    var panel = document.getElementById("scan-journal");
+    var el = panel && panel.querySelector("[data-journal-note]");
+    if (el) el.textContent = text;
+  }
+
+  /* Journal the form's scan. Quick-move needs an item *and* a destination, so
+     the first code of a pair is held here until the second arrives. */
+  function journalScan(form) {
+    var input = form.querySelector("input[name=code]");
+    var code = (input.value || "").trim();
+    input.value = "";
+    input.focus();
+    if (!code) return;
+    var flow = form.dataset.journalFlow;
+    if (flow === "move") {
+      var activeId = form.querySelector("input[name=active_item_id]");
+      var item = form.dataset.journalItem || (activeId && activeId.value ? "INV-" + activeId.value : "");
+      if (!item) {
+        form.dataset.journalItem = code;
+        note("Item " + code + " held — scan its destination.");
+        return;
+      }
+      delete form.dataset.journalItem;
+      if (activeId) activeId.value = "";
+      note("Queued move " + item + " → " + code + ".");
+      Journal.record("move", item, code);
+      return;
+    }
+    note("Queued " + code + ".");
+    Journal.record("audit", code);
+  }
+
+  function journalForm(evt) {
+    var elt = evt.detail && evt.detail.elt;
+    return elt && elt.closest ? elt.closest("form[data-journal-flow]") : null;
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    var panel = document.getElementById("scan-journal");
+    if (!panel) return;
+    if (!Journal.supported()) {
+      panel.hidden = true;
+      return;
+    }
+    var toggle = panel.querySelector("[data-journal-batch]");
+    if (toggle) {
+      toggle.checked = Journal.batchMode();
+      toggle.addEventListener("change", function () {
+        global.localStorage.setItem(BATCH_MODE_KEY, toggle.checked ? "1" : "0");
+        if (!toggle.checked) Journal.flush();
+      });
+    }
+    var syncBtn = panel.querySelector("[data-journal-sync]");
+    if (syncBtn) syncBtn.addEventListener("click", Journal.flush);
+
+    document.body.addEventListener("htmx:beforeRequest", function (evt) {
+      var form = journalForm(evt);
+      // Only plain scans; action buttons (evict, deplete, …) stay online-only.
+      if (!form || form.querySelector("input[name=action]")) return;
+      if (Journal.batchMode() || !navigator.onLine) {
+        evt.preventDefault();
+        journalScan(form);
+      }
+    });
+    document.body.addEventListener("htmx:sendError", function (evt) {
+      var form = journalForm(evt);
+      if (form) journalScan(form);
+    });
+
+    global.addEventListener("online", Journal.flush);
+    global.setInterval(Journal.flush, RETRY_MS);
+    render().then(Journal.flush);
+  });
+
+  global.ScanJournal = Journal;
+})(window);
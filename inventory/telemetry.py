@@ -5,15 +5,25 @@ this module turns a parsed Bambu ``print`` report object into upserts on the
 telemetry mirror tables. Bambu sends a full snapshot on ``pushall`` then partial
 deltas, so ingest updates ONLY the keys present in each message — it never
 null-clobbers a field the delta omitted.
+
+Trays whose spool-relevant fields changed are handed to the live reconciler
+(:mod:`inventory.spool_autosync`) once per message; a printer's get_version
+reply (:func:`ingest_version`) stores the AMS serial bridge it needs.
+``gcode_state`` transitions drive the print-job tracker
+(:mod:`inventory.print_tracker`), and the active ``hms`` list opens and
+resolves maintenance faults (:mod:`inventory.hms_faults`).
 """
 
 import json
 import logging
 from decimal import Decimal, InvalidOperation
 
+from django.conf import settings
 from django.db import close_old_connections
 from django.utils import timezone
 
+from . import hms_faults, print_tracker, spool_autosync
+from .bambu_mqtt import parse_ams_modules
 from .models import AMSChannelState, AMSUnitState, PrinterState, TelemetrySample
 
 logger = logging.getLogger("inventory")
@@ -95,6 +105,7 @@ def _apply(obj, fields, src):
 def ingest_report(device, report):
     """Delta-merge a parsed Bambu ``print`` object into the mirror tables."""
     state, _ = PrinterState.objects.get_or_create(device=device)
+    previous_state = state.gcode_state
     changed = _apply(state, _PRINTER_FIELDS, report)
     if "hms" in report:
         # hms arrives as the full active list; guard against a malformed non-list.
@@ -102,11 +113,24 @@ def ingest_report(device, report):
         changed = True
     if changed:
         state.save()
+    if "hms" in report and settings.HMS_FAULT_SYNC:
+        try:
+            hms_faults.observe(device, state.hms_codes)
+        except Exception:  # noqa: BLE001 - never lose telemetry over a fault
+            logger.exception("HMS fault sync failed for %s", device.serial)
 
+    changed_trays = []
     ams_root = report.get("ams")
     if isinstance(ams_root, dict) and isinstance(ams_root.get("ams"), list):
         for unit in ams_root["ams"]:
-            _ingest_ams_unit(device, unit)
+            changed_trays.extend(_ingest_ams_unit(device, unit))
+    _reconcile_spools(device, changed_trays)
+    if state.gcode_state != previous_state:
+        # After the AMS merge, so a job's tray snapshot sees this message's remain.
+        try:
+            print_tracker.observe(device, state, previous_state)
+        except Exception:  # noqa: BLE001 - never lose telemetry over a job
+            logger.exception("print job tracking failed for %s", device.serial)
 
     new_state = report.get("gcode_state")
     if new_state is not None:
@@ -124,9 +148,10 @@ def ingest_report(device, report):
 
 
 def _ingest_ams_unit(device, unit):
+    """Merge one AMS unit; returns its trays whose spool fields changed."""
     idx = _to_int(unit.get("id"))
     if idx is None:
-        return
+        return []
     u, _ = AMSUnitState.objects.get_or_create(device=device, ams_index=idx)
     changed = False
     if "humidity" in unit:
@@ -154,21 +179,61 @@ def _ingest_ams_unit(device, unit):
             changed = True
     if changed:
         u.save()
+    changed = []
     trays = unit.get("tray")
     if isinstance(trays, list):
         for tray in trays:
-            _ingest_tray(device, idx, tray)
+            ch = _ingest_tray(device, idx, tray)
+            if ch is not None:
+                changed.append(ch)
+    return changed
+
+
+def _spool_fields(ch):
+    return tuple(getattr(ch, f) for f in spool_autosync.WATCHED_FIELDS)
 
 
 def _ingest_tray(device, ams_index, tray):
+    """Merge one tray; returns the channel if a reconciler-watched field changed."""
     tidx = _to_int(tray.get("id"))
     if tidx is None:
-        return
-    ch, _ = AMSChannelState.objects.get_or_create(
+        return None
+    ch, created = AMSChannelState.objects.get_or_create(
         device=device, ams_index=ams_index, tray_index=tidx
     )
+    before = _spool_fields(ch)
     if _apply(ch, _TRAY_FIELDS, tray):
         ch.save()
+    return ch if created or _spool_fields(ch) != before else None
+
+
+def _reconcile_spools(device, channels):
+    if not channels or not settings.SPOOL_AUTOSYNC:
+        return
+    try:
+        spool_autosync.reconcile(device, channels)
+    except Exception:  # noqa: BLE001 - never lose telemetry over a reconcile
+        logger.exception("spool reconcile failed for %s", device.serial)
+
+
+def ingest_version(device, info):
+    """Store the AMS serials from a get_version ``info`` object.
+
+    A unit whose serial is new or changed (a swapped AMS) has its trays
+    re-reconciled, since the bridge decides which inventory slots they map to.
+    """
+    remapped = []
+    for ams_index, serial in parse_ams_modules(info.get("module")).items():
+        unit, _ = AMSUnitState.objects.get_or_create(device=device, ams_index=ams_index)
+        if unit.serial != serial:
+            unit.serial = serial
+            unit.save(update_fields=["serial", "updated_at"])
+            remapped.append(ams_index)
+    if remapped:
+        _reconcile_spools(
+            device,
+            AMSChannelState.objects.filter(device=device, ams_index__in=remapped),
+        )
 
 
 def handle_message(device, raw):
@@ -178,12 +243,19 @@ def handle_message(device, raw):
         payload = json.loads(raw)
     except (ValueError, TypeError):
         return False
-    report = payload.get("print") if isinstance(payload, dict) else None
-    if not isinstance(report, dict):
+    if not isinstance(payload, dict):
+        return False
+    report = payload.get("print")
+    info = payload.get("info")
+    is_version = isinstance(info, dict) and isinstance(info.get("module"), list)
+    if not isinstance(report, dict) and not is_version:
         return False
     close_old_connections()
     try:
-        ingest_report(device, report)
+        if is_version:
+            ingest_version(device, info)
+        else:
+            ingest_report(device, report)
         device.last_seen_at = timezone.now()
         device.save(update_fields=["last_seen_at"])
         return True
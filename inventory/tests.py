@@ -25,6 +25,7 @@ from .models import (
     Printer,
     PrintJob,
     PrintJobFilament,
+    SyncedScan,
 )
 
 
@@ -481,6 +482,97 @@ class ModelSaveTests(TestCase):
         self.assertEqual(item.status, InventoryItem.Status.DEPLETED)
 
 
+class InventoryItemSnapshotTests(TestCase):
+    """from_db snapshots the tracked fields, so a save needs no extra reads."""
+
+    def setUp(self):
+        from django.db import connection
+
+        from inventory import search_index
+
+        with connection.cursor() as cur:
+            cur.execute(search_index.FTS_CREATE_SQL)
+        self.product = Hardware.objects.create(name="Snap Bolt", upc="2000000000099")
+        self.shelf = Location.objects.create(
+            name="Snap Shelf", default_status=InventoryItem.Status.NEW
+        )
+        self.dry = Location.objects.create(
+            name="Snap Dry", default_status=InventoryItem.Status.STORED
+        )
+        self.pk = InventoryItem.objects.create(
+            product=self.product, location=self.shelf
+        ).pk
+
+    def test_plain_save_is_update_plus_history(self):
+        item = InventoryItem.objects.get(pk=self.pk)
+        item.percent_remaining = 40
+        with self.assertNumQueries(2):
+            item.save()
+
+    def test_move_derives_status_once(self):
+        item = InventoryItem.objects.get(pk=self.pk)
+        self.assertFalse(item.tracked_changed())
+        item.location = self.dry
+        self.assertTrue(item.tracked_changed("location_id"))
+        item.save()
+        self.assertEqual(item.status, InventoryItem.Status.STORED)
+        self.assertEqual(item.loaded_value("location_id"), self.dry.pk)
+        # A later explicit status on the same instance isn't re-derived.
+        item.status = InventoryItem.Status.IN_USE
+        item.save()
+        item.refresh_from_db()
+        self.assertEqual(item.status, InventoryItem.Status.IN_USE)
+
+    def test_partial_save_and_refresh_keep_other_changes_pending(self):
+        from inventory.models import ItemChangeEvent
+
+        item = InventoryItem.objects.get(pk=self.pk)
+        item.location = self.dry
+        item.shipment = "partial"
+        item.save(update_fields=["shipment"])
+        item.refresh_from_db(fields=["shipment"])
+        self.assertTrue(item.tracked_changed("location_id"))
+        self.assertEqual(item.loaded_value("location_id"), self.shelf.pk)
+        item.save()
+        self.assertEqual(item.loaded_value("location_id"), self.dry.pk)
+        event = ItemChangeEvent.objects.get(item_id=self.pk)
+        self.assertEqual(
+            (event.location_from_id, event.location_to_id), (self.shelf.pk, self.dry.pk)
+        )
+
+        item.location = self.shelf
+        item.save(update_fields=["location"])
+        self.assertFalse(item.tracked_changed("location_id"))
+
+    def test_reindex_only_when_indexed_fields_change(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from inventory import search_index
+
+        item = InventoryItem.objects.get(pk=self.pk)
+        item.serial_number = "SNAPSERIAL1"
+        item.save()
+        self.assertEqual(search_index.search_ids("snapserial1"), [self.pk])
+        item = InventoryItem.objects.get(pk=self.pk)
+        item.shipment = "track-1"
+        with CaptureQueriesContext(connection) as ctx:
+            item.save()
+        self.assertFalse(
+            any("inventory_item_fts" in q["sql"] for q in ctx.captured_queries)
+        )
+
+    def test_depleted_transition_logged_from_snapshot(self):
+        item = InventoryItem.objects.get(pk=self.pk)
+        item.status = InventoryItem.Status.DEPLETED
+        with self.assertLogs("inventory", level="INFO") as logs:
+            item.save()
+        self.assertIn(
+            f"InventoryItem {self.pk} DEPLETED (was at location {self.shelf.pk})",
+            "\n".join(logs.output),
+        )
+
+
 @override_settings(ENABLE_BARCODE_PRINTING=False)
 class ViewRoundTripTests(TestCase):
     """One GET per non-mutating view. Catches template/import-time regressions."""
@@ -1189,6 +1281,128 @@ class AuditUiSurfaceTests(TestCase):
         )
 
 
+class AuditIncrementalScanTests(TestCase):
+    """The tally is one aggregate; item scans return only the changed panels."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username="inc", password="pass")
+        self.client.login(username="inc", password="pass")
+        self.shelf = Location.objects.create(
+            name="INC1",
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.NEW,
+        )
+        self.other = Location.objects.create(
+            name="INC2",
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.NEW,
+        )
+        self.product = Filament.objects.create(name="PLA INC", upc="930000000099")
+
+    def _item(self, location):
+        return InventoryItem.objects.create(product=self.product, location=location)
+
+    def test_session_tally_matches_per_action_counts(self):
+        session = audit.start_session(self.user)
+        here = self._item(self.shelf)
+        elsewhere = self._item(self.other)
+        missing = self._item(self.other)
+        audit.visit_location(session, self.shelf)
+        audit.scan_item(session, self.shelf, here)
+        audit.scan_item(session, self.shelf, elsewhere)
+        audit.visit_location(session, self.other, previous_location=self.shelf)
+        audit.close_location(session, self.other)
+        missing.refresh_from_db()
+        self.assertEqual(missing.status, InventoryItem.Status.UNKNOWN)
+
+        with self.assertNumQueries(1):
+            tally = audit.session_tally(session)
+        self.assertEqual(
+            tally,
+            {
+                "present": 1,
+                "moved": 1,
+                "revived": 0,
+                "closed": 2,
+                "added": 0,
+                "unknown": audit.session_unknown_items(session).count(),
+            },
+        )
+        self.assertEqual(tally["unknown"], 1)
+
+        # Reviving the flagged item drops it from the unknown count.
+        audit.visit_location(session, self.shelf, previous_location=self.other)
+        audit.scan_item(session, self.shelf, missing)
+        tally = audit.session_tally(session)
+        self.assertEqual(tally["revived"], 1)
+        self.assertEqual(tally["unknown"], 0)
+
+    def test_item_scan_returns_delta_panels(self):
+        item = self._item(self.shelf)
+        self._item(self.shelf)
+        self.client.post(reverse("audit_start"))
+        self.client.post(reverse("audit_scan"), {"code": f"LOC-{self.shelf.pk}"})
+        resp = self.client.post(
+            reverse("audit_scan"),
+            {"code": f"INV-{item.pk}"},
+            HTTP_HX_REQUEST="true",
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["HX-Retarget"], "#audit-result")
+        self.assertEqual(resp["HX-Reswap"], "innerHTML")
+        body = resp.content.decode()
+        self.assertIn("Present: PLA INC", body)
+        self.assertIn(
+            'id="audit-tally" class="d-flex gap-3 flex-wrap mb-3" '
+            'hx-swap-oob="true"',
+            body,
+        )
+        self.assertIn('id="audit-location" hx-swap-oob="true"', body)
+        self.assertIn('id="audit-recent"', body)
+        self.assertContains(resp, "will be unknown", count=1)
+        # Panels an item scan can't change are not re-sent.
+        self.assertNotIn("Recent activity", body)
+        self.assertNotIn('id="audit-result"', body)
+
+    def test_item_scan_query_count_is_flat(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for _ in range(20):
+            self._item(self.shelf)
+        item = self._item(self.shelf)
+        self.client.post(reverse("audit_start"))
+        self.client.post(reverse("audit_scan"), {"code": f"LOC-{self.shelf.pk}"})
+        self.client.post(
+            reverse("audit_scan"), {"code": f"INV-{item.pk}"}, HTTP_HX_REQUEST="true"
+        )
+        # A repeat scan writes nothing, so this is purely the read/render cost.
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(
+                reverse("audit_scan"),
+                {"code": f"INV-{item.pk}"},
+                HTTP_HX_REQUEST="true",
+            )
+        event_counts = [
+            q["sql"] for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()
+        ]
+        self.assertEqual(len(event_counts), 1)
+        self.assertLessEqual(len(ctx.captured_queries), 12)
+
+    def test_location_scan_still_renders_full_body(self):
+        self.client.post(reverse("audit_start"))
+        resp = self.client.post(
+            reverse("audit_scan"),
+            {"code": f"LOC-{self.shelf.pk}"},
+            HTTP_HX_REQUEST="true",
+        )
+        self.assertFalse(resp.has_header("HX-Retarget"))
+        self.assertContains(resp, 'id="audit-result"')
+        self.assertContains(resp, "Recent activity")
+        self.assertContains(resp, "At INC1.")
+
+
 class AuditWholeUnitTests(TestCase):
     """Scanning a unit serial focuses the whole container; reconcile spans slots."""
 
@@ -1358,6 +1572,234 @@ class AuditFinalizeKeepUnknownTests(TestCase):
         self.assertEqual(drop.status, InventoryItem.Status.DEPLETED)
 
 
+@override_settings(ENABLE_BARCODE_PRINTING=False)
+class ScanSyncTests(TestCase):
+    """Offline-journal batches replay in order, idempotently, per-scan results."""
+
+    def setUp(self):
+        import json
+
+        self.json = json
+        self.client = Client()
+        User.objects.create_user(username="sync", password="pass")
+        self.client.login(username="sync", password="pass")
+        self.shelf = Location.objects.create(
+            name="SY1",
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.NEW,
+        )
+        self.other = Location.objects.create(
+            name="SY2",
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.STORED,
+        )
+        self.product = Hardware.objects.create(name="Hex key SY", upc="930000000111")
+
+    def _sync(self, scans):
+        return self.client.post(
+            reverse("scan_sync"),
+            self.json.dumps({"scans": scans}),
+            content_type="application/json",
+        )
+
+    def _scan(self, client_id, code, flow="audit", dest=""):
+        return {
+            "id": client_id,
+            "flow": flow,
+            "code": code,
+            "dest": dest,
+            "scanned_at": "2026-10-18T09:00:00Z",
+        }
+
+    def test_audit_batch_replays_in_order(self):
+        here = InventoryItem.objects.create(product=self.product, location=self.shelf)
+        away = InventoryItem.objects.create(product=self.product, location=self.other)
+        self.client.post(reverse("audit_start"))
+        resp = self._sync(
+            [
+                self._scan("a1", f"LOC-{self.shelf.pk}"),
+                self._scan("a2", f"INV-{here.pk}"),
+                self._scan("a3", f"INV-{away.pk}"),
+                self._scan("a4", "INV-999999"),
+            ]
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual([r["id"] for r in data["results"]], ["a1", "a2", "a3", "a4"])
+        self.assertEqual(
+            [r["tag"] for r in data["results"]],
+            ["info", "success", "success", "danger"],
+        )
+        self.assertEqual(data["active_location"], "SY1")
+        away.refresh_from_db()
+        self.assertEqual(away.location_id, self.shelf.id)
+        # The batch's focus carries on into the live console.
+        resp = self.client.post(
+            reverse("audit_scan"), {"code": f"INV-{away.pk}"}, HTTP_HX_REQUEST="true"
+        )
+        self.assertContains(resp, "Present:")
+
+    def test_resent_batch_is_idempotent(self):
+        away = InventoryItem.objects.create(product=self.product, location=self.other)
+        self.client.post(reverse("audit_start"))
+        batch = [
+            self._scan("b1", f"LOC-{self.shelf.pk}"),
+            self._scan("b2", f"INV-{away.pk}"),
+        ]
+        self._sync(batch)
+        events = AuditEvent.objects.count()
+        resp = self._sync(batch)
+        results = resp.json()["results"]
+        self.assertTrue(all(r["duplicate"] for r in results))
+        self.assertEqual(
+            results[1]["message"], f"Moved here: Hex key SY (INV-{away.pk})."
+        )
+        self.assertEqual(AuditEvent.objects.count(), events)
+        self.assertEqual(SyncedScan.objects.count(), 2)
+
+    def test_move_pairs_and_full_slot(self):
+        slot = Location.objects.create(
+            name="SY Slot",
+            kind=Location.Kind.AMS_SLOT,
+            default_status=InventoryItem.Status.STORED,
+            capacity=1,
+        )
+        first = InventoryItem.objects.create(product=self.product, location=self.shelf)
+        second = InventoryItem.objects.create(product=self.product, location=self.shelf)
+        resp = self._sync(
+            [
+                self._scan("m1", f"INV-{first.pk}", "move", f"LOC-{slot.pk}"),
+                self._scan("m2", f"INV-{second.pk}", "move", f"LOC-{slot.pk}"),
+            ]
+        )
+        ok, full = resp.json()["results"]
+        self.assertEqual(ok["tag"], "success")
+        self.assertEqual(full["tag"], "danger")
+        self.assertIn("full", full["message"])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.location_id, slot.id)
+        self.assertEqual(second.location_id, self.shelf.id)
+
+    def test_audit_scan_without_session_is_reported(self):
+        resp = self._sync([self._scan("c1", f"LOC-{self.shelf.pk}")])
+        self.assertEqual(resp.json()["results"][0]["message"], "No audit in progress.")
+
+    def test_malformed_batches_rejected_before_applying(self):
+        self.client.post(reverse("audit_start"))
+        resp = self._sync(
+            [self._scan("d1", f"LOC-{self.shelf.pk}"), {"id": "d2", "flow": "nope"}]
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(SyncedScan.objects.exists())
+        resp = self.client.post(
+            reverse("scan_sync"), "not json", content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_bad_scanned_at_is_400(self):
+        for bad in (12345, "yesterday", "2026-13-45T09:00:00Z"):
+            scan = {**self._scan("t1", f"LOC-{self.shelf.pk}"), "scanned_at": bad}
+            resp = self._sync([scan])
+            self.assertEqual(resp.status_code, 400, bad)
+            self.assertIn("scanned_at", resp.json()["error"])
+        self.assertFalse(SyncedScan.objects.exists())
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self._sync([]).status_code, 403)
+
+
+class AuditBulkCloseTests(TestCase):
+    """close_location/finalize write set-based, with per-item-identical results."""
+
+    def setUp(self):
+        from django.db import connection
+
+        from inventory import search_index
+
+        with connection.cursor() as cur:
+            cur.execute(search_index.FTS_CREATE_SQL)
+        self.user = User.objects.create_user(username="bc", password="pass")
+        self.product = Filament.objects.create(name="PLA BC", upc="9900000000002")
+
+    def _shelf(self, name, n):
+        shelf = Location.objects.create(
+            name=name,
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.NEW,
+        )
+        for _ in range(n):
+            InventoryItem.objects.create(product=self.product, location=shelf)
+        return shelf
+
+    def test_bulk_set_status_matches_per_item_path(self):
+        from inventory import search_index
+
+        shelf = self._shelf("Quokkashelf", 2)
+        one, two = InventoryItem.objects.filter(location=shelf)
+        self.assertCountEqual(search_index.search_ids("quokkashelf"), [one.pk, two.pk])
+        items.set_status(one, InventoryItem.Status.DEPLETED)
+        items.bulk_set_status([two], InventoryItem.Status.DEPLETED)
+        one.refresh_from_db()
+        two.refresh_from_db()
+        for item in (one, two):
+            self.assertEqual(item.status, InventoryItem.Status.DEPLETED)
+            self.assertIsNone(item.location_id)
+            self.assertIsNotNone(item.date_depleted)
+            self.assertEqual(item.history.count(), 2)
+            latest = item.history.latest()
+            self.assertEqual(latest.history_type, "~")
+            self.assertEqual(latest.status, InventoryItem.Status.DEPLETED)
+            self.assertIsNone(latest.location_id)
+        self.assertEqual(search_index.search_ids("quokkashelf"), [])
+        # The bulk write records a change event like any other save.
+        self.assertTrue(two.location_status_timeline()[0]["status_changed"])
+
+    def test_close_and_finalize(self):
+        shelf = self._shelf("BC1", 3)
+        session = audit.start_session(self.user)
+        present = InventoryItem.objects.filter(location=shelf).first()
+        audit.visit_location(session, shelf)
+        audit.scan_item(session, shelf, present)
+        flagged = audit.close_location(session, shelf)
+        self.assertEqual(len(flagged), 2)
+        self.assertEqual(
+            AuditEvent.objects.filter(
+                session=session,
+                location=shelf,
+                action=AuditEvent.Action.FLAGGED_UNKNOWN,
+            ).count(),
+            2,
+        )
+        for item in flagged:
+            item.refresh_from_db()
+            self.assertEqual(item.status, InventoryItem.Status.UNKNOWN)
+            self.assertEqual(item.location_id, shelf.id)
+
+        depleted = audit.finalize(session, keep_unknown_ids=[flagged[0].pk])
+        self.assertEqual([i.pk for i in depleted], [flagged[1].pk])
+        flagged[1].refresh_from_db()
+        self.assertEqual(flagged[1].status, InventoryItem.Status.DEPLETED)
+        self.assertIsNone(flagged[1].location_id)
+        present.refresh_from_db()
+        self.assertEqual(present.status, InventoryItem.Status.NEW)
+
+    def test_close_query_count_does_not_grow_with_items(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        counts = []
+        for name, n in (("BCS", 2), ("BCL", 40)):
+            shelf = self._shelf(name, n)
+            session = audit.start_session(self.user)
+            with CaptureQueriesContext(connection) as ctx:
+                audit.close_location(session, shelf)
+            counts.append(len(ctx.captured_queries))
+            session.mark_finished(AuditSession.State.ABANDONED)
+        self.assertEqual(counts[0], counts[1])
+
+
 @override_settings(ENABLE_BARCODE_PRINTING=False)
 class BulkReprintLabelsTests(TestCase):
     def setUp(self):
@@ -1925,7 +2367,7 @@ class InventorySearchFilterTests(TestCase):
             {"status": str(int(InventoryItem.Status.DEPLETED))},
         )
         self.assertEqual(resp.status_code, 200)
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         ws = wb.active
         # Header row + exactly the one depleted item.
         self.assertEqual(ws.max_row, 2)
@@ -2063,7 +2505,7 @@ class FilamentSearchFilterTests(TestCase):
 
         resp = self.client.get(reverse("inventory_export"), {"material": "PETG"})
         self.assertEqual(resp.status_code, 200)
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         ws = wb.active
         # Header row + exactly the one PETG item.
         self.assertEqual(ws.max_row, 2)
@@ -2361,6 +2803,211 @@ class MoveServiceTests(TestCase):
         self.assertIsNone(item.location_id)
 
 
+class BulkMoveServiceTests(TestCase):
+    """items.bulk_move / bulk_set_status end in the same state as the per-item
+    move_to / set_status path, with a query count independent of batch size."""
+
+    def setUp(self):
+        self.product = Hardware.objects.create(name="Bolt BM", upc="9400000000009")
+        self.shelf = Location.objects.create(
+            name="BM Shelf",
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.NEW,
+        )
+        self.dry = Location.objects.create(
+            name="BM Dry",
+            kind=Location.Kind.DRY_STORAGE,
+            default_status=InventoryItem.Status.STORED,
+        )
+
+    def _twins(self, location, status=None):
+        pair = []
+        for _ in range(2):
+            item = InventoryItem.objects.create(product=self.product, location=location)
+            if status is not None:
+                items.set_status(item, status)
+            pair.append(InventoryItem.objects.get(pk=item.pk))
+        return pair
+
+    def _state(self, item):
+        item.refresh_from_db()
+        return (
+            item.status,
+            item.location_id,
+            item.date_depleted is not None,
+            item.history.count(),
+        )
+
+    def test_bulk_move_matches_move_to(self):
+        cases = [
+            self._twins(self.shelf),  # derives dry's default
+            self._twins(self.dry),  # already there: status kept
+            self._twins(self.shelf, InventoryItem.Status.UNKNOWN),  # sticky
+            self._twins(self.shelf, InventoryItem.Status.DEPLETED),  # terminal
+        ]
+        for single, _ in cases:
+            items.move_to(single, self.dry, skip_drying_check=True)
+        result = items.bulk_move([bulk for _, bulk in cases], self.dry)
+        self.assertTrue(result.ok)
+        for single, bulk in cases:
+            self.assertEqual(self._state(bulk), self._state(single))
+
+    def test_bulk_move_explicit_status_and_fields(self):
+        single, bulk = self._twins(self.shelf)
+        items.move_to(single, self.dry, status=InventoryItem.Status.IN_USE)
+        items.bulk_move(
+            [bulk],
+            self.dry,
+            status=InventoryItem.Status.IN_USE,
+            fields={"shipment": "Z1"},
+        )
+        self.assertEqual(self._state(bulk), self._state(single))
+        self.assertEqual(bulk.shipment, "Z1")
+        self.assertEqual(bulk.history.latest().shipment, "Z1")
+
+    def test_capacity_checked_once_for_the_batch(self):
+        slot = Location.objects.create(
+            name="BM Slot",
+            kind=Location.Kind.AMS_SLOT,
+            default_status=InventoryItem.Status.STORED,
+            capacity=2,
+        )
+        batch = [
+            InventoryItem.objects.create(product=self.product, location=self.shelf)
+            for _ in range(3)
+        ]
+        result = items.bulk_move(batch, slot)
+        self.assertFalse(result.ok)
+        self.assertIn("3/2", result.message)
+        self.assertFalse(InventoryItem.objects.filter(location=slot).exists())
+        self.assertTrue(items.bulk_move(batch[:2], slot).ok)
+        # Re-placing the items already there doesn't count them twice.
+        self.assertTrue(items.bulk_move(batch[:2], slot).ok)
+        self.assertFalse(items.bulk_move(batch, slot).ok)
+
+    def test_container_rejected(self):
+        rack = Location.objects.create(name="BM Rack", kind=Location.Kind.RACK)
+        item = InventoryItem.objects.create(product=self.product, location=self.shelf)
+        result = items.bulk_move([item], rack)
+        self.assertFalse(result.ok)
+        item.refresh_from_db()
+        self.assertEqual(item.location_id, self.shelf.id)
+
+    def test_bulk_update_view_query_count_is_flat(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        client = Client()
+        User.objects.create_user(username="bm", password="pass")
+        client.login(username="bm", password="pass")
+        counts = []
+        for n in (3, 250):
+            ids = [
+                InventoryItem.objects.create(
+                    product=self.product, location=self.shelf
+                ).pk
+                for _ in range(n)
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                client.post(
+                    reverse("bulk_update"),
+                    {"item_ids": ids, "bulk_location": str(self.dry.pk)},
+                )
+            counts.append(len(ctx.captured_queries))
+            self.assertEqual(
+                InventoryItem.objects.filter(
+                    pk__in=ids, location=self.dry, status=InventoryItem.Status.STORED
+                ).count(),
+                n,
+            )
+        self.assertEqual(counts[0], counts[1])
+
+
+class OccupancyServiceTests(TestCase):
+    """inventory.occupancy loads many slots in one query and stays correct
+    across moves inside a scope."""
+
+    def setUp(self):
+        self.product = Hardware.objects.create(name="Bolt OC", upc="9410000000001")
+        self.shelf = Location.objects.create(
+            name="OC Shelf",
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.NEW,
+        )
+
+    def _unit(self, n, slots=4):
+        unit = Location.objects.create(name=f"OC AMS {n}", kind=Location.Kind.AMS)
+        for i in range(1, slots + 1):
+            slot = Location.objects.create(
+                name=f"OC AMS {n} s{i}",
+                kind=Location.Kind.AMS_SLOT,
+                parent=unit,
+                slot_index=i,
+                default_status=InventoryItem.Status.IN_USE,
+            )
+            if i % 2:
+                InventoryItem.objects.create(product=self.product, location=slot)
+        return unit
+
+    def test_one_query_for_many_locations(self):
+        from inventory import occupancy
+
+        units = [self._unit(n) for n in range(3)]
+        slot_ids = list(
+            Location.objects.filter(parent__in=units).values_list("id", flat=True)
+        )
+        with occupancy.scope() as occ:
+            with self.assertNumQueries(1):
+                occ.load(slot_ids)
+            with self.assertNumQueries(0):
+                counts = [occ.count(pk) for pk in slot_ids]
+                self.assertIsNotNone(occupancy.current().occupant(slot_ids[0]))
+        self.assertEqual(sum(counts), 6)
+
+    def test_scoped_map_follows_moves(self):
+        from inventory import occupancy
+
+        slot = Location.objects.create(
+            name="OC Slot", kind=Location.Kind.AMS_SLOT, capacity=1
+        )
+        item = InventoryItem.objects.create(product=self.product, location=self.shelf)
+        other = InventoryItem.objects.create(product=self.product, location=self.shelf)
+        with occupancy.scope() as occ:
+            self.assertEqual(occ.count(slot.id), 0)
+            self.assertTrue(items.move_to(item, slot).ok)
+            self.assertEqual(occ.count(slot.id), 1)
+            self.assertFalse(items.move_to(other, slot).ok)
+            items.bulk_move([item], self.shelf)
+            self.assertEqual(occ.count(slot.id), 0)
+            self.assertTrue(items.move_to(other, slot).ok)
+
+    def test_slot_maps_query_count_flat_in_units(self):
+        from .views import _slot_maps_for_units
+
+        few = [self._unit(0)]
+        many = few + [self._unit(n) for n in range(1, 6)]
+        with self.assertNumQueries(2):
+            maps = _slot_maps_for_units(few)
+        with self.assertNumQueries(2):
+            maps = _slot_maps_for_units(many)
+        self.assertEqual(len(maps), 6)
+        rows = maps[0]["rows"]
+        self.assertEqual([r["location"].slot_index for r in rows], [1, 2, 3, 4])
+        self.assertEqual(
+            [r["item"] is not None for r in rows], [True, False, True, False]
+        )
+
+    def test_spool_sync_skips_unknown_occupants(self):
+        from inventory import spool_sync
+
+        unit = self._unit(0, slots=1)
+        slot = unit.children.get()
+        items.set_status(
+            InventoryItem.objects.get(location=slot), InventoryItem.Status.UNKNOWN
+        )
+        self.assertEqual(spool_sync.spools_in_slot(slot), [])
+
+
 class LocationCapacityTests(TestCase):
     def test_slot_kinds_default_to_capacity_one(self):
         ams_slot = Location.objects.create(
@@ -2647,6 +3294,53 @@ class ItemHistoryTests(TestCase):
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, 200)
 
+    def test_timeline_is_one_query(self):
+        item = InventoryItem.objects.create(product=self.product, location=self.loc_a)
+        for location in (self.loc_b, self.loc_a, self.loc_b):
+            item.location = location
+            item.save()
+        item = InventoryItem.objects.get(pk=item.pk)
+        with self.assertNumQueries(1):
+            timeline = item.location_status_timeline()
+            self.assertEqual(
+                [entry["location_to"].name for entry in timeline],
+                ["Shelf 4", "Shelf 5", "Shelf 4"],
+            )
+
+    def test_bulk_move_feeds_recent_moves(self):
+        from inventory import item_events
+
+        moved = [
+            InventoryItem.objects.create(product=self.product, location=self.loc_a)
+            for _ in range(3)
+        ]
+        items.bulk_move(moved, self.loc_b)
+        moves = item_events.recent_moves()
+        self.assertCountEqual([m.item_id for m in moves], [i.pk for i in moved])
+        self.assertTrue(all(m.location_to_id == self.loc_b.pk for m in moves))
+
+        User.objects.create_user(username="moves", password="pass")
+        self.client.login(username="moves", password="pass")
+        resp = self.client.get(reverse("recent_moves"))
+        self.assertContains(resp, f"INV-{moved[0].pk}")
+
+    def test_rebuild_matches_recorded_events(self):
+        from inventory import item_events
+
+        item = InventoryItem.objects.create(product=self.product, location=self.loc_a)
+        item.location = self.loc_b
+        item.save()
+        item.serial_number = "REBUILD-1"
+        item.save()
+        items.set_status(item, InventoryItem.Status.IN_USE)
+        recorded = item.location_status_timeline()
+
+        self.assertEqual(item_events.rebuild(), 2)
+        rebuilt = item.location_status_timeline()
+        for entry in (*recorded, *rebuilt):
+            entry.pop("changed_at")
+        self.assertEqual(rebuilt, recorded)
+
 
 from . import maintenance  # noqa: E402
 
@@ -2825,6 +3519,9 @@ class MaintenanceServiceTests(TestCase):
 
 
 class MaintenanceReliabilityTests(TestCase):
+    def setUp(self):
+        maintenance.forget_reliability()
+
     def test_model_reliability_math(self):
         # Two physical units of the SAME catalog product (one product_id), one
         # 200 days old, one 100 (fleet age 300) — they roll up into one model row.
@@ -2902,6 +3599,47 @@ class MaintenanceReliabilityTests(TestCase):
     def test_empty_fleet_returns_empty(self):
         self.assertEqual(maintenance.model_reliability(), [])
 
+    def test_rollup_is_two_queries_then_cached_until_a_write(self):
+        for n in range(5):
+            _, unit = _make_printer_item(f"320000000200{n}", days_old=30)
+        ams = InventoryItem.objects.create(
+            product=AMS.objects.create(name="AMS Unit", upc="3200000002010")
+        )
+        maintenance.open_fault(unit, title="clog")
+        with self.assertNumQueries(2):
+            rows = maintenance.model_reliability()
+        self.assertEqual(
+            {r["model_label"] for r in rows}, {"Bambu Lab X1 Carbon", "Bambu Lab AMS"}
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(maintenance.model_reliability(), rows)
+        maintenance.open_fault(ams, title="jam")
+        rows = maintenance.model_reliability()
+        self.assertEqual(sum(r["faults"] for r in rows), 2)
+
+    @override_settings(RELIABILITY_TREND_MONTHS=4)
+    def test_trend_buckets_faults_by_month(self):
+        _, unit = _make_printer_item("3200000003001", days_old=400)
+        earlier = timezone.now() - timedelta(days=40)
+        maintenance.open_fault(unit, title="now")
+        maintenance.open_fault(unit, title="earlier", occurred_at=earlier)
+        trend = maintenance.model_reliability()[0]["trend"]
+        self.assertEqual(len(trend), 4)
+        this_month = timezone.localdate().replace(day=1)
+        self.assertEqual(trend[-1]["month"], this_month)
+        by_month = {bucket["month"]: bucket for bucket in trend}
+        self.assertEqual(by_month[this_month]["faults"], 1)
+        self.assertEqual(
+            by_month[timezone.localdate(earlier).replace(day=1)]["faults"], 1
+        )
+        current = by_month[this_month]
+        self.assertAlmostEqual(current["mtbf_days"], current["unit_days"])
+        # Last month is complete: one unit in service every day of it.
+        last = trend[-2]
+        self.assertAlmostEqual(
+            last["unit_days"], (this_month - last["month"]).days, delta=0.1
+        )
+
 
 class MaintenanceViewTests(TestCase):
     def setUp(self):
@@ -3374,15 +4112,97 @@ class PrintJobConsumptionTests(TestCase):
         job.refresh_from_db()
         self.assertIsNotNone(job.ended_at)
 
+    def _job(self, *uses):
+        job = PrintJob.objects.create(printer=self.printer)
+        PrintJobFilament.objects.bulk_create(
+            PrintJobFilament(job=job, item=spool, grams_used=Decimal(grams))
+            for spool, grams in uses
+        )
+        return job
+
+    def test_batch_sums_usage_per_spool_across_jobs(self):
+        shared, low = self._spool(), self._spool(percent=Decimal("50"))
+        jobs = [self._job((shared, "300"), (low, "300")) for _ in range(2)]
+        depleted = printjobs.complete_jobs(jobs)
+        shared.refresh_from_db()
+        low.refresh_from_db()
+        self.assertEqual(shared.percent_remaining, Decimal("40.00"))
+        self.assertEqual(low.status, InventoryItem.Status.DEPLETED)
+        self.assertEqual(depleted, [low])
+        self.assertTrue(all(job.completed for job in jobs))
+        self.assertEqual(PrintJob.objects.filter(completed=True).count(), 2)
+
+    def test_batch_query_count_does_not_grow_with_spools(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
 
-class PrinterUtilizationTests(TestCase):
-    """DB-aggregated utilization: hours, success %, kg by material."""
+        def cost(spools):
+            job = self._job(*((self._spool(), "10") for _ in range(spools)))
+            with CaptureQueriesContext(connection) as ctx:
+                printjobs.complete_jobs([job])
+            return len(ctx.captured_queries)
 
-    def setUp(self):
-        printer_product = Printer.objects.create(
-            name="X1C", upc="9200000000001", num_extruders=1
-        )
-        self.printer = InventoryItem.objects.create(
+        cost(1)  # creates today's daily stats rows; later jobs update them
+        self.assertEqual(cost(16), cost(2))
+
+    def test_batch_skips_jobs_completed_elsewhere(self):
+        spool = self._spool()
+        job = self._job((spool, "100"))
+        stale = PrintJob.objects.get(pk=job.pk)
+        printjobs.complete_jobs([job])
+        self.assertEqual(printjobs.complete_jobs([stale]), [])
+        spool.refresh_from_db()
+        self.assertEqual(spool.percent_remaining, Decimal("90.00"))
+
+    def test_batch_claims_only_the_jobs_still_open(self):
+        spool = self._spool()
+        done, fresh = self._job((spool, "100")), self._job((spool, "200"))
+        stale = PrintJob.objects.get(pk=done.pk)
+        printjobs.complete_jobs([done])
+        printjobs.complete_jobs([stale, fresh])
+        spool.refresh_from_db()
+        # 10% from the first call, 20% from the fresh job; the stale one skipped.
+        self.assertEqual(spool.percent_remaining, Decimal("70.00"))
+        self.assertFalse(stale.completed)
+        self.assertTrue(fresh.completed)
+        self.assertFalse(PrintJob.objects.filter(completed=False).exists())
+
+    def test_admin_keeps_completed_jobs_read_only(self):
+        spool = self._spool()
+        done = self._job((spool, "100"))
+        printjobs.complete_jobs([done])
+        open_job = self._job((spool, "100"))
+        User.objects.create_superuser("jobs", "j@x.co", "pass")
+        self.client.login(username="jobs", password="pass")
+
+        change = reverse("admin:inventory_printjob_change", args=[done.pk])
+        resp = self.client.post(change, {"name": "edited"})
+        self.assertNotEqual(resp.status_code, 302)
+        done.refresh_from_db()
+        self.assertNotEqual(done.name, "edited")
+        delete = reverse("admin:inventory_printjob_delete", args=[done.pk])
+        self.assertEqual(self.client.post(delete, {"post": "yes"}).status_code, 403)
+        resp = self.client.post(
+            reverse("admin:inventory_printjob_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": [done.pk, open_job.pk],
+                "post": "yes",
+            },
+        )
+        self.assertEqual(resp.status_code, 403)
+        self.assertEqual(PrintJob.objects.count(), 2)
+        self.assertEqual(done.filaments.count(), 1)
+
+
+class PrinterUtilizationTests(TestCase):
+    """Utilization from the daily stats: hours, success %, kg by material."""
+
+    def setUp(self):
+        printer_product = Printer.objects.create(
+            name="X1C", upc="9200000000001", num_extruders=1
+        )
+        self.printer = InventoryItem.objects.create(
             product=printer_product, serial_number="PR-3"
         )
         self.mat = Material.objects.create(name="PLA")
@@ -3405,6 +4225,7 @@ class PrinterUtilizationTests(TestCase):
             )
             spool = InventoryItem.objects.create(product=self.fil)
             PrintJobFilament.objects.create(job=j, item=spool, grams_used=grams)
+            printjobs.complete_job(j)
 
     def test_printer_utilization_aggregations(self):
         stats = printjobs.printer_utilization(self.printer)
@@ -3431,6 +4252,53 @@ class PrinterUtilizationTests(TestCase):
         self.assertEqual(row["hours"], 3.5)
         self.assertEqual(row["kg"], 0.35)
 
+    def test_incomplete_jobs_are_not_counted(self):
+        PrintJob.objects.create(printer=self.printer, duration_s=3600)
+        self.assertEqual(printjobs.printer_utilization(self.printer)["jobs"], 3)
+
+    def test_window_sums_daily_rows(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        old = timezone.now() - timedelta(days=40)
+        job = PrintJob.objects.create(
+            printer=self.printer, started_at=old, duration_s=3600
+        )
+        printjobs.complete_job(job)
+        today = timezone.localdate()
+        self.assertEqual(printjobs.printer_utilization(self.printer)["jobs"], 4)
+        recent = printjobs.printer_utilization(
+            self.printer, since=today - timedelta(days=29)
+        )
+        self.assertEqual(recent["jobs"], 3)
+        self.assertEqual(recent["hours"], 3.5)
+        (row,) = printjobs.utilization_summary(until=today - timedelta(days=30))
+        self.assertEqual(row["jobs"], 1)
+        self.assertEqual(
+            printjobs.consumption_by_material(until=today - timedelta(days=30)), []
+        )
+
+    def test_rebuild_matches_incremental_stats(self):
+        live = printjobs.utilization_summary()
+        live_consumption = printjobs.consumption_by_material()
+        self.assertEqual(printjobs.rebuild_stats(), 3)
+        self.assertEqual(printjobs.utilization_summary(), live)
+        self.assertEqual(printjobs.consumption_by_material(), live_consumption)
+
+    def test_summary_queries_do_not_scale_with_jobs(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as before:
+            printjobs.utilization_summary()
+        for _ in range(5):
+            printjobs.complete_job(
+                PrintJob.objects.create(printer=self.printer, duration_s=60)
+            )
+        with self.assertNumQueries(len(before)):
+            printjobs.utilization_summary()
+
 
 class PrintJobViewTests(TestCase):
     def setUp(self):
@@ -3495,6 +4363,34 @@ class PrintJobViewTests(TestCase):
         )
         self.assertEqual(resp.status_code, 200)
 
+    def test_utilization_windows(self):
+        url = reverse("printer_utilization")
+        resp = self.client.get(url, {"window": "7d"})
+        self.assertEqual(resp.context["window"]["window"], "7d")
+        self.assertIsNotNone(resp.context["window"]["since"])
+        resp = self.client.get(url, {"since": "2026-01-01", "until": "2026-01-31"})
+        self.assertEqual(resp.context["window"]["window"], "custom")
+        resp = self.client.get(url, {"since": "2026-02-30", "window": "bogus"})
+        self.assertEqual(resp.context["window"]["window"], "all")
+
+    def test_per_printer_job_list_is_keyset_paginated(self):
+        from inventory import views
+
+        jobs = [
+            PrintJob.objects.create(printer=self.printer, name=f"j{i}.3mf")
+            for i in range(views.PRINTER_JOBS_PAGE_SIZE + 2)
+        ]
+        url = reverse("printer_utilization_detail", args=[self.printer.pk])
+        first = self.client.get(url)
+        page = first.context["jobs"]
+        self.assertEqual(len(page), views.PRINTER_JOBS_PAGE_SIZE)
+        self.assertEqual(page[0].pk, jobs[-1].pk)
+        second = self.client.get(url, {"before": first.context["next_before"]})
+        self.assertEqual(
+            [j.pk for j in second.context["jobs"]], [jobs[1].pk, jobs[0].pk]
+        )
+        self.assertIsNone(second.context["next_before"])
+
     def test_login_required(self):
         self.client.logout()
         resp = self.client.get(reverse("print_job_list"))
@@ -3502,6 +4398,322 @@ class PrintJobViewTests(TestCase):
         self.assertIn("/login", resp.url)
 
 
+class PrintJobImportTests(TestCase):
+    """Historical jobs from slicer files: parse, match, dedup, set-based decrement."""
+
+    SLICE_INFO = (
+        '<?xml version="1.0" encoding="UTF-8"?><config><plate>'
+        '<metadata key="index" value="1"/>'
+        '<metadata key="prediction" value="3600"/>'
+        '<filament id="1" type="PLA" color="#FFFFFFFF" used_m="33" used_g="100.00"/>'
+        "</plate></config>"
+    )
+    GCODE = (
+        "; HEADER_BLOCK_START\n"
+        "; model printing time: 1h 5m; total estimated time: 1h 30m 0s\n"
+        "; total filament weight [g] : 50.00,20.00\n"
+        "; HEADER_BLOCK_END\n"
+        "; filament_type = PETG;PLA\n"
+        "; filament_colour = #000000;#FEFEFE\n"
+        "G28\nG1 X10 Y10\n"
+    )
+
+    def setUp(self):
+        import tempfile
+
+        self.printer = InventoryItem.objects.create(
+            product=Printer.objects.create(
+                name="X1C", upc="9320000000001", num_extruders=1
+            )
+        )
+        pla = Material.objects.create(name="PLA")
+        petg = Material.objects.create(name="PETG")
+
+        def spool(name, upc, material, hex_code, percent=100):
+            product = Filament.objects.create(
+                name=name,
+                upc=upc,
+                material=material,
+                hex_code=hex_code,
+                weight=Decimal("1.00"),
+            )
+            return InventoryItem.objects.create(
+                product=product, percent_remaining=percent
+            )
+
+        self.white = spool("PLA White", "9320000000002", pla, "#FFFFFF")
+        self.red = spool("PLA Red", "9320000000003", pla, "#FF0000")
+        self.black = spool("PETG Black", "9320000000004", petg, "#000000", 40)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write_files(self):
+        import os
+        import zipfile
+
+        with zipfile.ZipFile(os.path.join(self.tmp.name, "benchy.gcode.3mf"), "w") as z:
+            z.writestr("Metadata/slice_info.config", self.SLICE_INFO)
+        nested = os.path.join(self.tmp.name, "2025")
+        os.makedirs(nested)
+        with open(os.path.join(nested, "bracket.gcode"), "w") as fh:
+            fh.write(self.GCODE)
+        with open(os.path.join(nested, "notes.gcode"), "w") as fh:
+            fh.write("G28\n")
+
+    def test_parses_slice_info_and_gcode_header(self):
+        from inventory import slicer_metadata
+
+        seconds, filaments = slicer_metadata.parse_slice_info(self.SLICE_INFO)
+        self.assertEqual(seconds, 3600)
+        self.assertEqual(
+            [(f.material, f.color, f.grams) for f in filaments],
+            [("PLA", "#FFFFFFFF", Decimal("100.00"))],
+        )
+        seconds, filaments = slicer_metadata.parse_gcode_lines(self.GCODE.splitlines())
+        self.assertEqual(seconds, 5400)
+        self.assertEqual(
+            [(f.index, f.material, f.color, f.grams) for f in filaments],
+            [
+                (1, "PETG", "#000000", Decimal("50.00")),
+                (2, "PLA", "#FEFEFE", Decimal("20.00")),
+            ],
+        )
+
+    def test_process_pool_matches_in_process_parse(self):
+        from inventory import slicer_metadata
+
+        self._write_files()
+        paths = list(slicer_metadata.iter_files(self.tmp.name))
+        serial = list(slicer_metadata.parse_files(paths, workers=1))
+        pooled = list(slicer_metadata.parse_files(iter(paths), workers=2))
+        self.assertEqual(pooled, serial)
+        self.assertEqual(
+            [parsed.name if parsed else None for _, parsed in serial],
+            ["benchy", "bracket", None],
+        )
+
+    def test_command_imports_matches_and_decrements_once(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+        from django.db.models import Sum
+
+        from inventory.models import PrinterDailyStats
+
+        self._write_files()
+        args = [self.tmp.name, "--printer", str(self.printer.pk), "--workers", "1"]
+        call_command("import_print_jobs", *args, stdout=StringIO())
+
+        jobs = PrintJob.objects.filter(source=PrintJob.Source.IMPORT)
+        self.assertEqual(jobs.count(), 2)
+        self.assertTrue(all(job.completed and job.source_hash for job in jobs))
+        lines = {
+            (line.item_id, line.grams_used)
+            for line in PrintJobFilament.objects.filter(job__in=jobs)
+        }
+        # Nearest colour within the material: both PLA entries land on white.
+        self.assertEqual(
+            lines,
+            {
+                (self.white.pk, Decimal("100.00")),
+                (self.white.pk, Decimal("20.00")),
+                (self.black.pk, Decimal("50.00")),
+            },
+        )
+        for spool in (self.white, self.red, self.black):
+            spool.refresh_from_db()
+        self.assertEqual(self.white.percent_remaining, Decimal("88.00"))
+        self.assertEqual(self.red.percent_remaining, Decimal("100.00"))
+        self.assertEqual(self.black.percent_remaining, Decimal("35.00"))
+        self.assertEqual(
+            PrinterDailyStats.objects.filter(printer=self.printer).aggregate(
+                n=Sum("jobs")
+            )["n"],
+            2,
+        )
+
+        out = StringIO()
+        call_command("import_print_jobs", *args, stdout=out)
+        self.assertEqual(jobs.count(), 2)
+        self.assertIn("2 already imported", out.getvalue())
+        self.white.refresh_from_db()
+        self.assertEqual(self.white.percent_remaining, Decimal("88.00"))
+
+    def test_dry_run_and_no_decrement(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        self._write_files()
+        args = [self.tmp.name, "--printer", str(self.printer.pk), "--workers", "1"]
+        call_command("import_print_jobs", *args, "--dry-run", stdout=StringIO())
+        self.assertFalse(PrintJob.objects.exists())
+        call_command("import_print_jobs", *args, "--no-decrement", stdout=StringIO())
+        self.assertEqual(PrintJob.objects.count(), 2)
+        self.white.refresh_from_db()
+        self.assertEqual(self.white.percent_remaining, Decimal("100.00"))
+
+    def test_matcher_moves_on_when_a_spool_runs_out(self):
+        from django.utils import timezone
+
+        from inventory import job_import
+        from inventory.slicer_metadata import ParsedFilament, ParsedJob
+
+        def job(n):
+            petg = ParsedFilament(1, "PETG", "#000000", Decimal("300"))
+            return ParsedJob(f"p{n}", f"p{n}", f"hash{n}", timezone.now(), 60, [petg])
+
+        spare = InventoryItem.objects.create(
+            product=Filament.objects.create(
+                name="PETG Grey",
+                upc="9320000000005",
+                material=self.black.product.material,
+                hex_code="#404040",
+                weight=Decimal("1.00"),
+            ),
+            percent_remaining=Decimal("100"),
+        )
+        matcher = job_import.SpoolMatcher()
+        # 40% left takes 30% + 30%; the second batch must not land on it.
+        first = job_import.import_jobs([job(1), job(2)], self.printer, matcher=matcher)
+        second = job_import.import_jobs([job(3)], self.printer, matcher=matcher)
+        self.assertEqual((first.depleted, second.depleted), (1, 0))
+        self.assertEqual(
+            list(
+                PrintJobFilament.objects.order_by("job__name").values_list(
+                    "item_id", flat=True
+                )
+            ),
+            [self.black.pk, self.black.pk, spare.pk],
+        )
+        spare.refresh_from_db()
+        self.assertEqual(spare.percent_remaining, Decimal("70.00"))
+
+    def test_apply_usage_depletes_and_skips_terminal(self):
+        sold = InventoryItem.objects.create(
+            product=self.white.product, status=InventoryItem.Status.SOLD
+        )
+        depleted = printjobs.apply_usage(
+            {
+                self.white.pk: Decimal("30"),
+                self.red.pk: Decimal("30"),
+                self.black.pk: Decimal("45"),
+                sold.pk: Decimal("10"),
+            }
+        )
+        self.assertEqual([item.pk for item in depleted], [self.black.pk])
+        for spool in (self.white, self.red, self.black, sold):
+            spool.refresh_from_db()
+        self.assertEqual(self.white.percent_remaining, Decimal("70.00"))
+        self.assertEqual(self.red.percent_remaining, Decimal("70.00"))
+        self.assertEqual(self.black.status, InventoryItem.Status.DEPLETED)
+        self.assertEqual(self.black.percent_remaining, Decimal("0"))
+        self.assertIsNotNone(self.black.date_depleted)
+        self.assertEqual(sold.percent_remaining, Decimal("100.00"))
+
+
+class ConsumptionForecastTests(TestCase):
+    """Burn rate, days of cover and reorder points from daily consumption."""
+
+    def setUp(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from inventory.models import PrinterDailyConsumption
+
+        printer = InventoryItem.objects.create(
+            product=Printer.objects.create(
+                name="X1C", upc="9250000000001", num_extruders=1
+            )
+        )
+        self.busy = Filament.objects.create(
+            name="PLA Busy", upc="9250000000002", weight=Decimal("1.00")
+        )
+        self.idle = Filament.objects.create(
+            name="PLA Idle", upc="9250000000003", weight=Decimal("1.00")
+        )
+        InventoryItem.objects.create(product=self.busy, percent_remaining=50)
+        InventoryItem.objects.create(product=self.busy, percent_remaining=30)
+        InventoryItem.objects.create(product=self.idle)
+        today = timezone.localdate()
+        PrinterDailyConsumption.objects.bulk_create(
+            PrinterDailyConsumption(
+                printer=printer,
+                product=self.busy,
+                day=today - timedelta(days=n),
+                grams=Decimal("100"),
+            )
+            for n in range(0, 91)
+        )
+
+    def test_ewma_of_constant_use_is_that_use(self):
+        from inventory import forecast
+
+        self.assertAlmostEqual(forecast.ewma([5.0] * 20, 0.1), 5.0)
+        self.assertEqual(forecast.ewma([], 0.1), 0.0)
+
+    def test_busy_product_needs_reorder(self):
+        from inventory import forecast
+
+        rows = {row.product_id: row for row in forecast.refresh()}
+        busy = rows[self.busy.pk]
+        self.assertEqual(busy.burn_g_per_day, Decimal("100.00"))
+        self.assertEqual(busy.on_hand_g, Decimal("800.00"))
+        self.assertEqual(busy.on_hand_count, 2)
+        self.assertEqual(busy.days_of_cover, Decimal("8.0"))
+        # (7 days lead time + 7 safety) * 100 g/day
+        self.assertEqual(busy.reorder_point_g, Decimal("1400.00"))
+        self.assertTrue(busy.needs_reorder)
+        idle = rows[self.idle.pk]
+        self.assertEqual(idle.burn_g_per_day, 0)
+        self.assertIsNone(idle.days_of_cover)
+        self.assertFalse(idle.needs_reorder)
+
+    @override_settings(FORECAST_LEAD_TIME_DAYS=2, FORECAST_SAFETY_DAYS=1)
+    def test_short_lead_time_defers_reorder(self):
+        from inventory import forecast
+
+        rows = {row.product_id: row for row in forecast.refresh()}
+        self.assertFalse(rows[self.busy.pk].needs_reorder)
+
+    def test_forecast_is_computed_once_a_day(self):
+        from inventory import forecast
+
+        forecast.refresh()
+        with self.assertNumQueries(2):
+            rows = forecast.reorder_list()
+        self.assertEqual([row.product_id for row in rows], [self.busy.pk])
+
+    def test_empty_forecast_still_counts_for_the_day(self):
+        from inventory import forecast
+        from inventory.models import ConsumptionForecast
+
+        Filament.objects.update(weight=None)  # nothing can be forecast
+        forecast.current()
+        self.assertFalse(ConsumptionForecast.objects.exists())
+        with self.assertNumQueries(1):  # the run stamp; no recompute or writes
+            forecast.current()
+
+    def test_json_feed(self):
+        User.objects.create_user(username="fc", password="pw")
+        self.client.login(username="fc", password="pw")
+        resp = self.client.get(reverse("api_forecasts"), {"needs_reorder": "1"})
+        self.assertEqual(resp.status_code, 200)
+        (row,) = resp.json()["results"]
+        self.assertEqual(row["product_name"], "PLA Busy")
+        self.assertEqual(row["days_of_cover"], "8.0")
+        for value in ("true", "True"):
+            resp = self.client.get(reverse("api_forecasts"), {"needs_reorder": value})
+            self.assertEqual(len(resp.json()["results"]), 1)
+        resp = self.client.get(reverse("api_forecasts"), {"needs_reorder": "false"})
+        self.assertNotIn(
+            self.busy.pk, [r["product_id"] for r in resp.json()["results"]]
+        )
+        resp = self.client.get(reverse("api_forecasts"), {"needs_reorder": "maybe"})
+        self.assertEqual(resp.status_code, 400)
+
+
 # Phase 14 — Procurement & receiving
 # ---------------------------------------------------------------------------
 
@@ -3733,6 +4945,61 @@ class ProcurementReceiveTests(TestCase):
         with self.assertRaises(procurement.ProcurementError):
             procurement.receive_scan(self.receipt, "9500000000010", rack)
 
+    def test_receive_units_mints_case_in_one_batch(self):
+        from inventory import search_index
+
+        self.spool_line.qty_ordered = 24
+        self.spool_line.save()
+        # One INSERT each for items, history and receipt line; FTS is two
+        # executemany calls; the items and the line each post one spend-ledger
+        # batch. Constant in the case size.
+        with self.assertNumQueries(25):
+            result = procurement.receive_line_units(
+                self.receipt, self.spool_line, 24, location=self.rack
+            )
+        self.assertEqual(len(result.items), 24)
+        self.assertEqual(result.item, result.items[0])
+        minted = InventoryItem.objects.filter(source_line=self.spool_line)
+        self.assertEqual(minted.count(), 24)
+        self.assertEqual(
+            set(minted.values_list("status", "location_id", "unit_cost")),
+            {(InventoryItem.Status.NEW, self.rack.id, Decimal("24.50"))},
+        )
+        self.assertEqual(
+            InventoryItem.history.filter(source_line=self.spool_line).count(), 24
+        )
+        self.assertIn(result.items[-1].pk, search_index.search_ids("PETG Recv"))
+        self.spool_line.refresh_from_db()
+        self.assertEqual(self.spool_line.qty_received, 24)
+        receipt_line = PurchaseReceiptLine.objects.get(order_line=self.spool_line)
+        self.assertEqual(receipt_line.qty_received, 24)
+        self.po.refresh_from_db()
+        self.assertEqual(self.po.status, PurchaseOrder.Status.PARTIAL)
+
+    def test_receive_units_rejects_bad_quantity_and_overfull_slot(self):
+        for qty in (0, 3):
+            with self.assertRaises(procurement.ProcurementError):
+                procurement.receive_line_units(
+                    self.receipt, self.spool_line, qty, location=self.rack
+                )
+        slot = Location.objects.create(name="Recv Slot", capacity=1)
+        with self.assertRaises(procurement.ProcurementError):
+            procurement.receive_line_units(
+                self.receipt, self.spool_line, 2, location=slot
+            )
+        self.spool_line.refresh_from_db()
+        self.assertEqual(self.spool_line.qty_received, 0)
+        self.assertFalse(PurchaseReceiptLine.objects.exists())
+
+    def test_receive_scan_with_qty_on_cost_only_line(self):
+        result = procurement.receive_scan(
+            self.receipt, "9500000000020", self.rack, qty=50
+        )
+        self.assertFalse(result.tracked)
+        self.assertEqual(result.items, [])
+        self.screw_line.refresh_from_db()
+        self.assertEqual(self.screw_line.qty_received, 50)
+
 
 class ProcurementReconcileTests(TestCase):
     def setUp(self):
@@ -3806,6 +5073,115 @@ class ProcurementSpendTests(TestCase):
         self.assertEqual(summary["consumable_spend"], Decimal("5.00"))
 
 
+class SpendLedgerTests(TestCase):
+    """Spend changes post ledger entries and keep the monthly rollups current."""
+
+    def setUp(self):
+        self.supplier = Supplier.objects.create(name="Ledger Supplier")
+        self.spool = Filament.objects.create(name="PLA Ledger", upc="9500000000070")
+        self.rack = Location.objects.create(
+            name="Ledger Rack",
+            kind=Location.Kind.SHELF,
+            default_status=InventoryItem.Status.NEW,
+        )
+        self.po = PurchaseOrder.objects.create(
+            supplier=self.supplier, status=PurchaseOrder.Status.ORDERED
+        )
+        self.line = PurchaseOrderLine.objects.create(
+            order=self.po,
+            product=self.spool,
+            qty_ordered=3,
+            unit_cost=Decimal("20.00"),
+        )
+        self.receipt = PurchaseReceipt.objects.create(order=self.po)
+
+    def test_receiving_posts_spend_by_supplier(self):
+        from inventory import spend_ledger
+
+        procurement.receive_line_units(self.receipt, self.line, 2, location=self.rack)
+        summary = procurement.spend_summary()
+        self.assertEqual(summary["tracked_spend"], Decimal("40.00"))
+        self.assertEqual(summary["tracked_count"], 2)
+        self.assertEqual(spend_ledger.on_hand_value(), Decimal("40.00"))
+        (row,) = procurement.spend_by_supplier()
+        self.assertEqual(row["supplier__name"], "Ledger Supplier")
+        self.assertEqual(row["ordered_value"], Decimal("60.00"))
+        self.assertEqual(row["received_value"], Decimal("40.00"))
+
+    def test_depletion_and_cost_edits_post_deltas(self):
+        from inventory import items, spend_ledger
+
+        result = procurement.receive_line_units(
+            self.receipt, self.line, 2, location=self.rack
+        )
+        first, second = result.items
+        first.refresh_from_db()
+        first.status = InventoryItem.Status.DEPLETED
+        first.save()
+        self.assertEqual(spend_ledger.on_hand_value(), Decimal("20.00"))
+        # set-based paths post too
+        items.bulk_update_fields([second], unit_cost=Decimal("25.00"))
+        self.assertEqual(spend_ledger.on_hand_value(), Decimal("25.00"))
+        self.assertEqual(procurement.spend_summary()["tracked_spend"], Decimal("45.00"))
+
+    def test_unchanged_save_posts_nothing(self):
+        from inventory.models import SpendLedgerEntry
+
+        item = InventoryItem.objects.create(
+            product=self.spool, unit_cost=Decimal("5.00")
+        )
+        before = SpendLedgerEntry.objects.count()
+        item.save()
+        self.assertEqual(SpendLedgerEntry.objects.count(), before)
+
+    def test_supplier_change_refiles_spend(self):
+        other = Supplier.objects.create(name="Another Supplier")
+        procurement.receive_line_units(self.receipt, self.line, 1, location=self.rack)
+        self.po.supplier = other
+        self.po.save()
+        rows = {r["supplier__name"]: r for r in procurement.spend_by_supplier()}
+        self.assertEqual(rows["Ledger Supplier"]["received_value"], 0)
+        self.assertEqual(rows["Another Supplier"]["received_value"], Decimal("20.00"))
+        self.assertEqual(procurement.spend_summary()["tracked_spend"], Decimal("20.00"))
+
+    def test_rebuild_matches_live_totals(self):
+        from inventory import spend_ledger
+
+        procurement.receive_line_units(self.receipt, self.line, 2, location=self.rack)
+        InventoryItem.objects.create(product=self.spool, unit_cost=Decimal("7.25"))
+        live = procurement.spend_summary()
+        spend_ledger.rebuild()
+        self.assertEqual(procurement.spend_summary(), live)
+
+    def test_rebuild_files_received_value_in_receipt_month(self):
+        from inventory import spend_ledger
+
+        self.po.ordered_at = timezone.now() - timedelta(days=62)
+        self.po.save()
+        screws = PurchaseOrderLine.objects.create(
+            order=self.po,
+            product=self.spool,
+            qty_ordered=4,
+            unit_cost=Decimal("0.50"),
+            track_individually=False,
+        )
+        procurement.receive_line_units(self.receipt, self.line, 1, location=self.rack)
+        procurement.receive_line_units(self.receipt, screws, 4, location=self.rack)
+        live = spend_ledger.monthly()
+        self.assertEqual(len(live), 1)
+        self.assertEqual(live[0]["consumable_spend"], Decimal("2.00"))
+        spend_ledger.rebuild()
+        self.assertEqual(spend_ledger.monthly(), live)
+
+    def test_report_reads_are_constant(self):
+        for _ in range(5):
+            InventoryItem.objects.create(product=self.spool, unit_cost=Decimal("1.00"))
+        with self.assertNumQueries(1):
+            procurement.spend_summary()
+        with self.assertNumQueries(1):
+            list(procurement.spend_by_supplier())
+
+
 class ProcurementViewTests(TestCase):
     """Views render and the receiving scan endpoint works end to end."""
 
@@ -3860,6 +5236,22 @@ class ProcurementViewTests(TestCase):
         self.assertIsNotNone(item)
         self.assertEqual(item.unit_cost, Decimal("15.00"))
 
+    @override_settings(ENABLE_BARCODE_PRINTING=False)
+    def test_receiving_scan_qty_prints_one_label_batch(self):
+        from unittest.mock import patch
+
+        with patch(
+            "inventory.views.generate_and_print_barcodes", return_value=2
+        ) as batch:
+            self.client.post(
+                reverse("receiving_scan", args=[self.po.pk]),
+                {"code": "9500000000060", "location": self.rack.pk, "qty": "2"},
+            )
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.qty_received, 2)
+        batch.assert_called_once()
+        self.assertEqual(len(batch.call_args.args[0]), 2)
+
     def test_views_require_login(self):
         self.client.logout()
         for name, args in (
@@ -4051,78 +5443,460 @@ class TelemetryIngestTests(TestCase):
         from inventory.models import PrinterDevice
 
         self.dev = PrinterDevice.objects.create(
-            serial="0948CD531200537", name="H2Laser", ip_address="10.10.30.11"
+            serial="0948CD531200537", name="H2Laser", ip_address="10.10.30.11"
+        )
+
+    def test_ingest_full_report(self):
+        from decimal import Decimal
+
+        from inventory.models import AMSChannelState, AMSUnitState, PrinterState
+        from inventory.telemetry import ingest_report
+
+        ingest_report(self.dev, REAL_REPORT)
+
+        st = PrinterState.objects.get(device=self.dev)
+        self.assertEqual(st.gcode_state, "RUNNING")
+        self.assertEqual(st.mc_percent, 42)
+        self.assertEqual(st.total_layers, 200)
+        self.assertEqual(st.nozzle_temp, Decimal("220.0"))
+        self.assertEqual(st.remaining_min, 35)
+        self.assertEqual(st.task_id, "997709002")
+        self.assertEqual(st.hms_codes, [{"code": 196618, "attr": 83886592}])
+
+        unit = AMSUnitState.objects.get(device=self.dev, ams_index=0)
+        self.assertEqual(unit.humidity, 5)
+        self.assertEqual(unit.temp, Decimal("24.6"))
+        self.assertEqual(unit.dry_duration, -1)
+
+        ch0 = AMSChannelState.objects.get(device=self.dev, ams_index=0, tray_index=0)
+        self.assertEqual(ch0.tray_uuid, "31D95EE890CA468D8119FE4946EB21B2")
+        self.assertEqual(ch0.tray_type, "PETG")
+        self.assertEqual(ch0.remain_pct, 69)
+        ch1 = AMSChannelState.objects.get(device=self.dev, ams_index=0, tray_index=1)
+        self.assertEqual(ch1.remain_pct, -1)  # unknown preserved
+
+    def test_delta_does_not_clobber(self):
+        from inventory.models import PrinterState
+        from inventory.telemetry import ingest_report
+
+        ingest_report(self.dev, REAL_REPORT)
+        ingest_report(self.dev, {"mc_percent": 88})  # partial delta
+        st = PrinterState.objects.get(device=self.dev)
+        self.assertEqual(st.mc_percent, 88)  # updated
+        self.assertEqual(st.gcode_state, "RUNNING")  # NOT clobbered
+        self.assertEqual(st.subtask_name, "Paper Roll Holder_v2")  # NOT clobbered
+
+    def test_handle_message_parses_and_marks_seen(self):
+        import json
+
+        from inventory.models import PrinterState
+        from inventory.telemetry import handle_message
+
+        raw = json.dumps({"print": REAL_REPORT}).encode()
+        self.assertTrue(handle_message(self.dev, raw))
+        self.dev.refresh_from_db()
+        self.assertIsNotNone(self.dev.last_seen_at)
+        self.assertEqual(PrinterState.objects.get(device=self.dev).mc_percent, 42)
+
+    def test_handle_message_ignores_non_print(self):
+        from inventory.telemetry import handle_message
+
+        self.assertFalse(handle_message(self.dev, b'{"info": {"x": 1}}'))
+        self.assertFalse(handle_message(self.dev, b"not json"))
+
+    def test_downsample_one_sample_for_steady_state(self):
+        from inventory.models import TelemetrySample
+        from inventory.telemetry import ingest_report
+
+        ingest_report(self.dev, REAL_REPORT)  # first -> sample
+        ingest_report(
+            self.dev, {"gcode_state": "RUNNING", "mc_percent": 43}
+        )  # same state, no interval
+        self.assertEqual(TelemetrySample.objects.filter(device=self.dev).count(), 1)
+        ingest_report(self.dev, {"gcode_state": "FINISH"})  # transition -> sample
+        self.assertEqual(TelemetrySample.objects.filter(device=self.dev).count(), 2)
+
+
+@override_settings(SPOOL_AUTOSYNC=True, SPOOL_AUTOSYNC_APPLY_PERCENT=False)
+class HmsFaultSyncTests(TestCase):
+    """The active HMS list opens and resolves FAULT events on the linked printer."""
+
+    NOZZLE = {"attr": 83886592, "code": 196618}  # HMS_0500_0200_0003_000A
+    FAN = {"attr": 50331904, "code": 131073}  # HMS_0300_0100_0002_0001
+
+    def setUp(self):
+        from inventory import hms_faults
+        from inventory.models import PrinterDevice
+
+        hms_faults.forget()
+        _, self.printer = _make_printer_item("7300000000001", serial="HMS1")
+        self.dev = PrinterDevice.objects.create(
+            serial="0948CD531200999",
+            name="X1C",
+            ip_address="10.10.30.12",
+            item=self.printer,
+        )
+
+    def _faults(self, **filters):
+        return MaintenanceEvent.objects.filter(
+            unit=self.printer, kind=MaintenanceEvent.Kind.FAULT, **filters
+        )
+
+    def test_report_opens_fault_once_and_repeats_are_free(self):
+        from inventory import hms_faults
+        from inventory.telemetry import ingest_report
+
+        ingest_report(self.dev, {"hms": [self.NOZZLE]})
+        fault = self._faults().get()
+        self.assertEqual(fault.hms_code, "0500_0200_0003_000A")
+        self.assertEqual(fault.title, "HMS_0500_0200_0003_000A")
+        self.assertEqual(fault.severity, MaintenanceEvent.Severity.MINOR)
+        self.assertFalse(fault.resolved)
+        with self.assertNumQueries(0):
+            hms_faults.observe(self.dev, [self.NOZZLE])
+        hms_faults.forget()  # a restarted consumer re-diffs against the table
+        hms_faults.observe(self.dev, [self.NOZZLE])
+        self.assertEqual(self._faults().count(), 1)
+
+    def test_cleared_code_resolves_with_downtime(self):
+        from inventory import hms_faults
+
+        start = timezone.now()
+        hms_faults.observe(self.dev, [self.NOZZLE, self.FAN], now=start)
+        manual = maintenance.open_fault(self.printer, title="Clog", hms_code="0300")
+        opened, resolved = hms_faults.observe(
+            self.dev, [self.FAN], now=start + timedelta(hours=3)
+        )
+        self.assertEqual(opened, [])
+        self.assertEqual([e.hms_code for e in resolved], ["0500_0200_0003_000A"])
+        nozzle = self._faults(hms_code="0500_0200_0003_000A").get()
+        self.assertTrue(nozzle.resolved)
+        self.assertEqual(nozzle.downtime_hours, Decimal("3.00"))
+        self.assertEqual(self._faults(resolved=False).count(), 2)  # fan + manual
+        hms_faults.observe(self.dev, [])
+        manual.refresh_from_db()
+        self.assertFalse(manual.resolved)
+
+    def test_unlinked_printer_records_nothing(self):
+        from inventory import hms_faults
+
+        self.dev.item = None
+        self.dev.save()
+        self.assertEqual(hms_faults.observe(self.dev, [self.NOZZLE]), ([], []))
+        self.assertFalse(MaintenanceEvent.objects.exists())
+
+    @override_settings(HMS_FAULT_SYNC=False)
+    def test_setting_off_skips_sync(self):
+        from inventory.telemetry import ingest_report
+
+        ingest_report(self.dev, {"hms": [self.NOZZLE]})
+        self.assertFalse(self._faults().exists())
+
+
+class SpoolAutosyncTests(TestCase):
+    """Telemetry tray deltas re-reconcile just the changed trays."""
+
+    UUID = "31D95EE890CA468D8119FE4946EB21B2"
+    AMS_SN = "00600A452241166"
+
+    def setUp(self):
+        from inventory.models import AMS, Material, PrinterDevice
+
+        self.dev = PrinterDevice.objects.create(
+            serial="00M09D460801722", name="Scooby Doo", ip_address="10.10.30.14"
+        )
+        ams_item = InventoryItem.objects.create(
+            product=AMS.objects.create(name="AMS", upc="upcauto0001"),
+            serial_number=self.AMS_SN,
+        )
+        slot = Location.objects.create(
+            name="Auto slot1",
+            kind=Location.Kind.AMS_SLOT,
+            unit=ams_item,
+            slot_index=1,
+            default_status=InventoryItem.Status.IN_USE,
+        )
+        mat = Material.objects.create(name="PLA", material_type="Basic")
+        fil = Filament.objects.create(
+            name="PLA W", upc="auto0002", material=mat, hex_code="#ffffff"
+        )
+        self.spool = InventoryItem.objects.create(
+            product=fil,
+            location=slot,
+            percent_remaining=Decimal("100"),
+            serial_number=self.UUID,
+        )
+
+    def _tray(self, remain, uuid=UUID):
+        from inventory.telemetry import ingest_report
+
+        tray = {
+            "id": "0",
+            "tray_uuid": uuid,
+            "tray_type": "PLA",
+            "tray_color": "FFFFFFFF",
+            "remain": remain,
+        }
+        ingest_report(self.dev, {"ams": {"ams": [{"id": "0", "tray": [tray]}]}})
+
+    def _version(self):
+        import json
+
+        from inventory.telemetry import handle_message
+
+        info = {
+            "command": "get_version",
+            "module": [{"name": "ams/0", "sn": self.AMS_SN}],
+        }
+        self.assertTrue(handle_message(self.dev, json.dumps({"info": info}).encode()))
+
+    def _finding(self):
+        from inventory.models import SpoolSyncFinding
+
+        return SpoolSyncFinding.objects.get(device=self.dev, ams_index=0, tray_index=0)
+
+    def test_bridge_from_get_version_resolves_tray(self):
+        from inventory.models import AMSUnitState
+
+        self._tray(80)
+        self.assertEqual(self._finding().category, "UNMAPPED_AMS")
+        self._version()
+        self.assertEqual(AMSUnitState.objects.get(device=self.dev).serial, self.AMS_SN)
+        finding = self._finding()
+        self.assertEqual(finding.category, "PROPOSAL")
+        self.assertEqual(
+            (finding.write_percent_from, finding.write_percent_to), (100, 80)
+        )
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, Decimal("100"))  # proposal only
+
+    def test_unchanged_tray_is_not_reconciled(self):
+        from unittest.mock import patch
+
+        self._version()
+        self._tray(80)
+        with patch("inventory.telemetry.spool_autosync.reconcile") as reconcile:
+            self._tray(80)
+            reconcile.assert_not_called()
+            self._tray(79)
+            self.assertEqual(reconcile.call_count, 1)
+
+    @override_settings(
+        SPOOL_AUTOSYNC_APPLY_PERCENT=True, SPOOL_AUTOSYNC_APPLY_INTERVAL_S=900
+    )
+    def test_falling_percent_applied_with_rate_limit(self):
+        from inventory import spool_autosync
+        from inventory.models import AMSChannelState
+
+        self._version()
+        self._tray(80)
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, Decimal("80"))
+        first = self._finding()
+        self.assertEqual(first.category, "OK")
+        self.assertIsNotNone(first.applied_at)
+
+        self._tray(79)  # inside the interval: queued, not written
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, Decimal("80"))
+        self.assertEqual(self._finding().write_percent_to, 79)
+
+        later = first.applied_at + timedelta(minutes=16)
+        spool_autosync.reconcile(
+            self.dev, AMSChannelState.objects.filter(device=self.dev), now=later
+        )
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, Decimal("79"))
+        self.assertEqual(self._finding().applied_at, later)
+
+    @override_settings(
+        SPOOL_AUTOSYNC_APPLY_PERCENT=True, SPOOL_AUTOSYNC_APPLY_INTERVAL_S=900
+    )
+    def test_empty_reading_depletes_inside_interval(self):
+        self._version()
+        self._tray(5)
+        self._tray(0)  # inside the interval, but an empty spool is never queued
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, Decimal("0"))
+        self.assertEqual(self.spool.status, InventoryItem.Status.DEPLETED)
+
+    @override_settings(SPOOL_AUTOSYNC_APPLY_PERCENT=True)
+    def test_rising_percent_never_applied(self):
+        self.spool.percent_remaining = Decimal("50")
+        self.spool.save()
+        self._version()
+        self._tray(90)
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, Decimal("50"))
+        self.assertEqual(self._finding().category, "PROPOSAL")
+
+    def test_admin_lists_review_queue_by_default(self):
+        from inventory.models import SpoolSyncFinding
+
+        for tray, category in enumerate(("OK", "PROPOSAL")):
+            SpoolSyncFinding.objects.create(
+                device=self.dev,
+                ams_index=0,
+                tray_index=tray,
+                category=category,
+                detail=f"detail-{category.lower()}",
+            )
+        User.objects.create_superuser("findings", "f@x.co", "pass")
+        self.client.login(username="findings", password="pass")
+        url = reverse("admin:inventory_spoolsyncfinding_changelist")
+        resp = self.client.get(url)
+        self.assertContains(resp, "detail-proposal")
+        self.assertNotContains(resp, "detail-ok")
+        resp = self.client.get(url, {"review": "all"})
+        self.assertContains(resp, "detail-ok")
+
+
+@override_settings(SPOOL_AUTOSYNC=True, SPOOL_AUTOSYNC_APPLY_PERCENT=False)
+class PrintTrackerTests(TestCase):
+    """gcode_state transitions open/close MQTT PrintJobs with per-tray usage."""
+
+    AMS_SN = "00600A452241166"
+    UUID = "31D95EE890CA468D8119FE4946EB21B2"
+
+    def setUp(self):
+        from inventory.models import AMSUnitState, PrinterDevice
+
+        printer = InventoryItem.objects.create(
+            product=Printer.objects.create(
+                name="H2D",
+                upc="7200000000099",
+                num_extruders=2,
+                bed_length_mm=350,
+                bed_width_mm=320,
+                max_height_mm=325,
+            )
+        )
+        self.dev = PrinterDevice.objects.create(
+            serial="0948CD531200537",
+            name="H2D",
+            ip_address="10.10.30.11",
+            item=printer,
+        )
+        AMSUnitState.objects.create(device=self.dev, ams_index=0, serial=self.AMS_SN)
+        ams_item = InventoryItem.objects.create(
+            product=AMS.objects.create(name="AMS", upc="upctrack001"),
+            serial_number=self.AMS_SN,
+        )
+        slot = Location.objects.create(
+            name="Track slot1",
+            kind=Location.Kind.AMS_SLOT,
+            unit=ams_item,
+            slot_index=1,
+            default_status=InventoryItem.Status.IN_USE,
+        )
+        fil = Filament.objects.create(
+            name="PLA Track", upc="track0002", hex_code="#ffffff", weight=Decimal("1")
+        )
+        self.spool = InventoryItem.objects.create(
+            product=fil, location=slot, percent_remaining=Decimal("100")
         )
 
-    def test_ingest_full_report(self):
-        from decimal import Decimal
-
-        from inventory.models import AMSChannelState, AMSUnitState, PrinterState
+    def _report(self, gcode_state, remain, task_id="5501"):
         from inventory.telemetry import ingest_report
 
-        ingest_report(self.dev, REAL_REPORT)
-
-        st = PrinterState.objects.get(device=self.dev)
-        self.assertEqual(st.gcode_state, "RUNNING")
-        self.assertEqual(st.mc_percent, 42)
-        self.assertEqual(st.total_layers, 200)
-        self.assertEqual(st.nozzle_temp, Decimal("220.0"))
-        self.assertEqual(st.remaining_min, 35)
-        self.assertEqual(st.task_id, "997709002")
-        self.assertEqual(st.hms_codes, [{"code": 196618, "attr": 83886592}])
-
-        unit = AMSUnitState.objects.get(device=self.dev, ams_index=0)
-        self.assertEqual(unit.humidity, 5)
-        self.assertEqual(unit.temp, Decimal("24.6"))
-        self.assertEqual(unit.dry_duration, -1)
+        tray = {"id": "0", "tray_uuid": self.UUID, "remain": remain}
+        ingest_report(
+            self.dev,
+            {
+                "gcode_state": gcode_state,
+                "task_id": task_id,
+                "subtask_name": "Benchy",
+                "ams": {"ams": [{"id": "0", "tray": [tray]}]},
+            },
+        )
 
-        ch0 = AMSChannelState.objects.get(device=self.dev, ams_index=0, tray_index=0)
-        self.assertEqual(ch0.tray_uuid, "31D95EE890CA468D8119FE4946EB21B2")
-        self.assertEqual(ch0.tray_type, "PETG")
-        self.assertEqual(ch0.remain_pct, 69)
-        ch1 = AMSChannelState.objects.get(device=self.dev, ams_index=0, tray_index=1)
-        self.assertEqual(ch1.remain_pct, -1)  # unknown preserved
+    def test_run_to_finish_records_usage_then_applies_in_batch(self):
+        from inventory import print_tracker
 
-    def test_delta_does_not_clobber(self):
-        from inventory.models import PrinterState
-        from inventory.telemetry import ingest_report
+        self._report("RUNNING", 80)
+        job = PrintJob.objects.get(source=PrintJob.Source.MQTT)
+        self.assertEqual(job.telemetry_task_id, "5501")
+        self.assertEqual(job.tray_start["0/0"]["remain"], 80)
+        self._report("RUNNING", 75)
+        self._report("FINISH", 70)
 
-        ingest_report(self.dev, REAL_REPORT)
-        ingest_report(self.dev, {"mc_percent": 88})  # partial delta
-        st = PrinterState.objects.get(device=self.dev)
-        self.assertEqual(st.mc_percent, 88)  # updated
-        self.assertEqual(st.gcode_state, "RUNNING")  # NOT clobbered
-        self.assertEqual(st.subtask_name, "Paper Roll Holder_v2")  # NOT clobbered
+        job.refresh_from_db()
+        self.assertEqual(job.result, PrintJob.Result.SUCCESS)
+        self.assertIsNotNone(job.duration_s)
+        line = job.filaments.get()
+        self.assertEqual(line.item, self.spool)
+        self.assertEqual(line.percent_used, Decimal("10"))
+        self.assertEqual(line.grams_used, Decimal("100"))
+        self.assertFalse(job.completed)
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, Decimal("100"))
 
-    def test_handle_message_parses_and_marks_seen(self):
-        import json
+        self.assertEqual(print_tracker.apply_pending(), [job])
+        job.refresh_from_db()
+        self.spool.refresh_from_db()
+        self.assertTrue(job.completed)
+        self.assertEqual(self.spool.percent_remaining, Decimal("90"))
+        self.assertEqual(print_tracker.apply_pending(), [])
+
+    def test_task_id_deduplicates_repeated_transitions(self):
+        self._report("RUNNING", 80)
+        self._report("FAILED", 78)
+        self._report("RUNNING", 78)  # same task re-reported after a reconnect
+        self._report("FAILED", 78)
+        job = PrintJob.objects.get(source=PrintJob.Source.MQTT)
+        self.assertEqual(job.result, PrintJob.Result.FAILED)
+        self.assertEqual(job.filaments.count(), 1)
 
-        from inventory.models import PrinterState
-        from inventory.telemetry import handle_message
+    def test_swapped_spool_and_unlinked_printer_record_nothing(self):
+        from inventory.telemetry import ingest_report
 
-        raw = json.dumps({"print": REAL_REPORT}).encode()
-        self.assertTrue(handle_message(self.dev, raw))
-        self.dev.refresh_from_db()
-        self.assertIsNotNone(self.dev.last_seen_at)
-        self.assertEqual(PrinterState.objects.get(device=self.dev).mc_percent, 42)
+        self._report("RUNNING", 80)
+        tray = {"id": "0", "tray_uuid": "F" * 32, "remain": 100}
+        ingest_report(self.dev, {"ams": {"ams": [{"id": "0", "tray": [tray]}]}})
+        self._report("FINISH", 60)  # RFID changed back: treat as a swap
+        ingest_report(self.dev, {"ams": {"ams": [{"id": "0", "tray": [tray]}]}})
+        self.assertEqual(PrintJob.objects.get().filaments.count(), 1)
 
-    def test_handle_message_ignores_non_print(self):
-        from inventory.telemetry import handle_message
+        self.dev.item = None
+        self.dev.save()
+        self._report("RUNNING", 60, task_id="5502")
+        self.assertEqual(PrintJob.objects.count(), 1)
 
-        self.assertFalse(handle_message(self.dev, b'{"info": {"x": 1}}'))
-        self.assertFalse(handle_message(self.dev, b"not json"))
+    @override_settings(SPOOL_AUTOSYNC_APPLY_PERCENT=True)
+    def test_live_percent_sync_means_no_second_decrement(self):
+        from inventory import print_tracker
 
-    def test_downsample_one_sample_for_steady_state(self):
-        from inventory.models import TelemetrySample
-        from inventory.telemetry import ingest_report
+        self._report("RUNNING", 80)
+        self._report("FINISH", 70)
+        self.spool.refresh_from_db()
+        live = self.spool.percent_remaining
+        print_tracker.apply_pending()
+        self.spool.refresh_from_db()
+        self.assertEqual(self.spool.percent_remaining, live)
+        self.assertTrue(PrintJob.objects.get().completed)
+        # ...but the job still lands in the daily utilization stats.
+        self.assertEqual(printjobs.printer_utilization(self.dev.item)["jobs"], 1)
+
+    def test_cancel_to_idle_closes_job(self):
+        self._report("RUNNING", 80)
+        self._report("IDLE", 76)
+        job = PrintJob.objects.get(source=PrintJob.Source.MQTT)
+        self.assertEqual(job.result, PrintJob.Result.CANCELLED)
+        self.assertIsNotNone(job.ended_at)
+        self.assertEqual(job.filaments.get().percent_used, Decimal("4"))
+        self._report("IDLE", 76)
+        self.assertEqual(PrintJob.objects.count(), 1)
 
-        ingest_report(self.dev, REAL_REPORT)  # first -> sample
-        ingest_report(
-            self.dev, {"gcode_state": "RUNNING", "mc_percent": 43}
-        )  # same state, no interval
-        self.assertEqual(TelemetrySample.objects.filter(device=self.dev).count(), 1)
-        ingest_report(self.dev, {"gcode_state": "FINISH"})  # transition -> sample
-        self.assertEqual(TelemetrySample.objects.filter(device=self.dev).count(), 2)
+    def test_next_print_closes_job_whose_end_was_missed(self):
+        self._report("RUNNING", 80)
+        self._report("PREPARE", 70, task_id="5502")  # FINISH never arrived
+        self.assertEqual(
+            PrintJob.objects.filter(ended_at__isnull=True).get().telemetry_task_id,
+            "5502",
+        )
+        stale = PrintJob.objects.get(telemetry_task_id="5501")
+        self.assertEqual(stale.result, PrintJob.Result.PARTIAL)
+        self.assertEqual(stale.filaments.get().percent_used, Decimal("10"))
 
 
 class SeedPrinterDevicesTests(TestCase):
@@ -4192,6 +5966,7 @@ class TelemetryAdminTests(TestCase):
             AMSUnitState,
             PrinterDevice,
             PrinterState,
+            SpoolSyncFinding,
             TelemetrySample,
         )
 
@@ -4201,6 +5976,7 @@ class TelemetryAdminTests(TestCase):
             AMSUnitState,
             AMSChannelState,
             TelemetrySample,
+            SpoolSyncFinding,
         ):
             self.assertIn(model, admin.site._registry)
 
@@ -4291,7 +6067,7 @@ class InventoryExportTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         # Re-open the bytes: catches both a hard error AND silent corruption
         # (openpyxl's zip writer needs a seekable target — HttpResponse isn't).
-        wb = openpyxl.load_workbook(io.BytesIO(resp.content))
+        wb = openpyxl.load_workbook(io.BytesIO(resp.getvalue()))
         ws = wb.active
         self.assertEqual(
             [c.value for c in ws[1]],
@@ -4300,6 +6076,44 @@ class InventoryExportTests(TestCase):
         self.assertEqual(ws.max_row, 2)  # header + 1 item
         self.assertEqual(ws.cell(row=2, column=2).value, "PLA Red")  # Product col
 
+    def test_export_streams(self):
+        resp = self.client.get(reverse("inventory_export"))
+        self.assertTrue(resp.streaming)
+        self.assertIn("inventory_export.xlsx", resp["Content-Disposition"])
+
+    def test_csv_export_streams_rows(self):
+        import csv
+        import io
+
+        resp = self.client.get(reverse("inventory_export"), {"format": "csv"})
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "text/csv")
+        rows = list(csv.reader(io.StringIO(resp.getvalue().decode())))
+        self.assertEqual(rows[0][:2], ["Serial", "Product"])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1], "PLA Red")
+        self.assertEqual(rows[1][4], "new")
+        self.assertEqual(rows[1][6], "Shelf X")
+
+    def test_ndjson_export(self):
+        import json
+
+        resp = self.client.get(reverse("inventory_export"), {"format": "ndjson"})
+        lines = resp.getvalue().decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["Product"], "PLA Red")
+
+    def test_export_query_count_independent_of_rows(self):
+        product = Filament.objects.create(name="PLA Blue", upc="0000000000002")
+        loc = Location.objects.create(name="Shelf Y")
+        for _ in range(20):
+            InventoryItem.objects.create(product=product, location=loc)
+        url = reverse("inventory_export")
+        # Session + user + one row query, regardless of how many items export.
+        with self.assertNumQueries(3):
+            body = self.client.get(url, {"format": "csv"}).getvalue()
+        self.assertEqual(body.decode().count("\n"), 22)
+
 
 class FilamentHexParseTests(TestCase):
     """Phase 17.2 — text-fixture tests for the hex-table PDF parser (no pypdf)."""
@@ -4575,6 +6389,81 @@ class GenerateBarcodeQrTests(TestCase):
         )
 
 
+class ScanResolverTests(TestCase):
+    """Repeat scans resolve from the in-process cache; saves invalidate it."""
+
+    def setUp(self):
+        from inventory import scan_resolver
+
+        scan_resolver.clear()
+        self.resolver = scan_resolver
+        self.filament = Filament.objects.create(name="PLA Scan", upc="9700000000011")
+        self.container = Location.objects.create(name="AMS S", kind=Location.Kind.AMS)
+        self.slot = Location.objects.create(
+            name="AMS S / Slot 1",
+            kind=Location.Kind.AMS_SLOT,
+            parent=self.container,
+            slot_index=1,
+        )
+        self.unit = InventoryItem.objects.create(
+            product=AMS.objects.create(name="AMS Scan", upc="9700000000099"),
+            serial_number="AMSSCAN1",
+        )
+        self.slot.unit = self.unit
+        self.slot.save()
+
+    def test_repeat_upc_scan_skips_polymorphic_fan_out(self):
+        with self.assertNumQueries(2):
+            first = self.resolver.product_for_upc("9700000000011")
+        with self.assertNumQueries(1):
+            again = self.resolver.product_for_upc("9700000000011")
+        self.assertIs(type(again), Filament)
+        self.assertEqual(again.pk, first.pk)
+        self.assertIsNone(self.resolver.product_for_upc("0000000000000"))
+
+    def test_product_save_invalidates_upc(self):
+        self.resolver.product_for_upc("9700000000011")
+        self.filament.upc = "9700000000012"
+        self.filament.save()
+        self.assertIsNone(self.resolver.product_for_upc("9700000000011"))
+        self.assertEqual(
+            self.resolver.product_for_upc("9700000000012").pk, self.filament.pk
+        )
+
+    def test_location_cached_as_copy_until_saved(self):
+        self.resolver.location(self.slot.pk)
+        with self.assertNumQueries(0):
+            loc = self.resolver.location(f"{self.slot.pk}")
+        loc.name = "scribbled"
+        self.assertEqual(self.resolver.location(self.slot.pk).name, "AMS S / Slot 1")
+        self.slot.name = "Renamed"
+        self.slot.save()
+        self.assertEqual(self.resolver.location(self.slot.pk).name, "Renamed")
+        self.assertIsNone(self.resolver.location("nope"))
+
+    def test_unit_serial_focus_cached_and_invalidated(self):
+        self.assertEqual(audit.resolve_serial("AMSSCAN1").pk, self.container.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(audit.resolve_serial("amsscan1").pk, self.container.pk)
+        self.unit.serial_number = "AMSSCAN2"
+        self.unit.save()
+        with self.assertRaises(audit.AuditError):
+            audit.resolve_serial("AMSSCAN1")
+
+    @override_settings(SCAN_CACHE_TTL_S=0)
+    def test_zero_ttl_disables_cache(self):
+        self.resolver.product_for_upc("9700000000011")
+        with self.assertNumQueries(2):
+            self.resolver.product_for_upc("9700000000011")
+
+    def test_quick_move_item_gets_real_product(self):
+        from inventory import quickmove
+
+        spool = InventoryItem.objects.create(product=self.filament)
+        item = quickmove.resolve_active_item(f"INV-{spool.pk}")
+        self.assertIs(type(item.product), Filament)
+
+
 class QuickMoveServiceTests(TestCase):
     def setUp(self):
         from inventory.models import Filament, InventoryItem, Location
@@ -6894,6 +8783,37 @@ class SpoolSyncTests(TestCase):
         self.assertEqual(p.write_percent_to, 67)
         self.assertTrue(p.color_match)
 
+    def test_report_query_count_flat_in_printers_and_trays(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from inventory.models import PrinterDevice
+        from inventory.spool_sync import build_report
+
+        serial_map = {}
+
+        def add_printer(n):
+            dev = PrinterDevice.objects.create(
+                serial=f"DEV{n}", name=f"Printer {n}", ip_address=f"10.0.0.{n}"
+            )
+            serial = f"{n:09d}AMS"
+            ams, slots = self._make_ams_unit(serial)
+            for tray, slot in enumerate(slots):
+                self._spool(slot, "#ffffff", percent="100")
+                self._channel(dev, 0, tray, f"{n:08d}{tray:024d}", "PLA", "FFFFFF", 50)
+            serial_map[(dev.id, 0)] = serial
+
+        add_printer(1)
+        with CaptureQueriesContext(connection) as one:
+            build_report(serial_map)
+        for n in range(2, 5):
+            add_printer(n)
+        with CaptureQueriesContext(connection) as many:
+            rep = build_report(serial_map)
+        self.assertEqual(len(many), len(one))
+        self.assertEqual(rep.counts["match"], 16)
+        self.assertEqual(len(rep.proposals), 16)
+
     def test_non_bambu_present_proposes_nothing(self):
         from inventory.spool_sync import build_report
 
@@ -6999,6 +8919,63 @@ class BambuMqttParseTests(TestCase):
         self.assertEqual(parse_ams_modules([]), {})
 
 
+class BambuMqttProbeAllTests(TestCase):
+    """fetch_ams_serials_all probes printers concurrently under one deadline."""
+
+    def _fake_probe(self, delays):
+        import time
+
+        from inventory import bambu_mqtt
+
+        def fake(device, *, timeout=15, deadline=None):
+            time.sleep(delays[device.name])
+            return bambu_mqtt.Probe(
+                device.name, "ok", delays[device.name], {0: f"SN-{device.name}"}
+            )
+
+        return fake
+
+    def _devices(self, names):
+        from types import SimpleNamespace
+
+        return [
+            SimpleNamespace(id=i, name=name, serial=f"S{i}")
+            for i, name in enumerate(names)
+        ]
+
+    def test_wall_time_bounded_by_slowest_printer(self):
+        import time
+        from unittest.mock import patch
+
+        from inventory import bambu_mqtt
+
+        delays = {f"p{i}": 0.3 for i in range(6)}
+        probes = []
+        started = time.monotonic()
+        with patch.object(bambu_mqtt, "probe", self._fake_probe(delays)):
+            serials = bambu_mqtt.fetch_ams_serials_all(
+                self._devices(delays), timeout=5, probes=probes
+            )
+        self.assertLess(time.monotonic() - started, 1.2)
+        self.assertEqual(serials[(5, 0)], "SN-p5")
+        self.assertEqual([p.device for p in probes], list(delays))
+
+    def test_printer_past_deadline_reported_as_timeout(self):
+        from unittest.mock import patch
+
+        from inventory import bambu_mqtt
+
+        delays = {"fast": 0.0, "hung": 2.0}
+        probes = []
+        with patch.object(bambu_mqtt, "probe", self._fake_probe(delays)):
+            serials = bambu_mqtt.fetch_ams_serials_all(
+                self._devices(delays), timeout=0.5, probes=probes
+            )
+        self.assertEqual(serials, {(0, 0): "SN-fast"})
+        self.assertEqual([p.outcome for p in probes], ["ok", "timeout"])
+        self.assertLess(probes[1].elapsed_s, 1.0)
+
+
 class SyncSpoolsCommandTests(TestCase):
     def test_apply_is_blocked(self):
         from django.core.management import call_command
@@ -7077,3 +9054,427 @@ class SyncSpoolsCommandTests(TestCase):
         spool.refresh_from_db()
         self.assertEqual(spool.serial_number, "")
         self.assertEqual(int(spool.percent_remaining), 100)
+
+
+class InventoryItemIndexPlanTests(TestCase):
+    """EXPLAIN QUERY PLAN guards for the hot InventoryItem filter paths.
+
+    Each query here mirrors a production caller; if a model or query change makes
+    SQLite fall back to a full ``SCAN inventory_inventoryitem`` the test fails.
+    """
+
+    def setUp(self):
+        self.shelf = Location.objects.create(
+            name="Shelf", default_status=InventoryItem.Status.STORED
+        )
+        product = Filament.objects.create(name="PLA Plan", upc="plan0001")
+        for i in range(5):
+            InventoryItem.objects.create(
+                product=product, location=self.shelf, serial_number=f"SN{i}"
+            )
+
+    def assertUsesIndex(self, qs):
+        plan = qs.explain()
+        self.assertNotRegex(plan, r"SCAN inventory_inventoryitem(?! USING)", plan)
+
+    def test_active_count_at_location(self):
+        self.assertUsesIndex(
+            InventoryItem.objects.filter(location=self.shelf).exclude(
+                status__in=items.TERMINAL_STATUSES
+            )
+        )
+
+    def test_recently_depleted(self):
+        self.assertUsesIndex(
+            InventoryItem.objects.filter(
+                status=InventoryItem.Status.DEPLETED,
+                date_depleted__gte=timezone_now() - timedelta(days=30),
+            )
+        )
+
+    def test_latest_modified(self):
+        self.assertUsesIndex(InventoryItem.objects.order_by("-last_modified")[:1])
+
+    def test_serial_lookup(self):
+        qs = InventoryItem.by_serial("sn3")
+        self.assertEqual(qs.count(), 1)
+        self.assertUsesIndex(qs)
+
+
+class PerfBudgetTests(TestCase):
+    def _dataset(self):
+        from inventory.perf import Dataset
+
+        return Dataset(
+            item_id=1,
+            location_id=1,
+            unit_id=1,
+            printer_item_id=1,
+            job_id=1,
+            order_id=1,
+            unknown_id=1,
+            color_sheet_slug="bambu-lab-pla-basic",
+            product_id=1,
+            printer_state_id=1,
+            ams_channel_id=1,
+            forecast_id=1,
+        )
+
+    def test_every_route_is_measured_and_budgeted(self):
+        from inventory import perf
+        from inventory.urls import urlpatterns
+
+        measured = {name for name, _ in perf.routes(self._dataset())}
+        named = {p.name for p in urlpatterns if p.name}
+        self.assertEqual(measured | set(perf.SKIP_ROUTES), named)
+        self.assertEqual(set(perf.load_budgets()["views"]), measured)
+
+    def test_unregistered_parametrized_route_raises(self):
+        from django.urls import path
+        from django.views.generic import View
+
+        from inventory import perf
+
+        patterns = [path("thing/<int:pk>/", View.as_view(), name="index")]
+        with self.assertRaises(KeyError):
+            perf.routes(self._dataset(), patterns)
+
+    def test_check_flags_queries_time_and_server_errors(self):
+        from inventory.perf import ViewTiming, check
+
+        budgets = {"default": {"queries": 5, "ms": 100}, "views": {}}
+        ok = ViewTiming("a", "/a/", 200, 5, 100.0)
+        self.assertEqual(check([ok], budgets), [])
+
+        slow = ViewTiming("b", "/b/", 200, 6, 150.0)
+        self.assertEqual(len(check([slow], budgets)), 2)
+        self.assertEqual(len(check([slow], budgets, check_time=False)), 1)
+
+        broken = ViewTiming("c", "/c/", 500, 1, 1.0)
+        self.assertIn("HTTP 500", check([broken], budgets)[0])
+
+    def test_small_dataset_stays_within_query_budgets(self):
+        from inventory import perf
+
+        dataset = perf.seed(scale=0.005)
+        user = User.objects.create_superuser("perf", "perf@example.com", "perf")
+        self.client.force_login(user)
+        timings = perf.run(self.client, dataset, repeat=1)
+
+        self.assertEqual(perf.check(timings, perf.load_budgets(), check_time=False), [])
+
+
+class SQLProfileTests(TestCase):
+    PROFILED_MIDDLEWARE = [
+        "inventory.sql_profile.SQLProfileMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    ]
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("prof", "p@x.co", "pass")
+
+    def test_normalize_sql_groups_by_shape(self):
+        from inventory.sql_profile import normalize_sql
+
+        a = normalize_sql(
+            "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"
+        )
+        b = normalize_sql("SELECT * FROM t WHERE id IN (%s) AND name = 'it''s' LIMIT 5")
+        self.assertEqual(a, b)
+        self.assertEqual(a, "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?")
+
+    def test_sampled_request_logs_profile_record(self):
+        import json
+
+        with override_settings(
+            MIDDLEWARE=self.PROFILED_MIDDLEWARE, SQL_PROFILE_SAMPLE_RATE=1.0
+        ):
+            client = Client()
+            client.force_login(self.user)
+            with self.assertLogs("inventory.sqlprofile", "INFO") as logs:
+                resp = client.get(reverse("dashboard"))
+        self.assertEqual(resp.status_code, 200)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "dashboard")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["queries"], 0)
+        self.assertLessEqual(len(record["slowest"]), 5)
+        self.assertTrue(all("sql" in s and "ms" in s for s in record["slowest"]))
+
+    def test_streamed_response_logged_after_body(self):
+        import json
+
+        product = Filament.objects.create(name="PLA Stream", upc="9300000000777")
+        InventoryItem.objects.create(product=product)
+        with override_settings(
+            MIDDLEWARE=self.PROFILED_MIDDLEWARE, SQL_PROFILE_SAMPLE_RATE=1.0
+        ):
+            client = Client()
+            client.force_login(self.user)
+            # Nothing is logged until the body has been iterated.
+            with self.assertNoLogs("inventory.sqlprofile", "INFO"):
+                resp = client.get(reverse("inventory_export"), {"format": "csv"})
+            with self.assertLogs("inventory.sqlprofile", "INFO") as logs:
+                body = b"".join(resp.streaming_content)
+        self.assertIn(b"PLA Stream", body)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertTrue(record["streamed"])
+        self.assertEqual(record["view"], "inventory_export")
+        self.assertTrue(
+            any("inventory_inventoryitem" in s["sql"] for s in record["slowest"])
+        )
+
+    def test_unsampled_request_logs_nothing(self):
+        with override_settings(
+            MIDDLEWARE=self.PROFILED_MIDDLEWARE, SQL_PROFILE_SAMPLE_RATE=0.0
+        ):
+            client = Client()
+            client.force_login(self.user)
+            with self.assertNoLogs("inventory.sqlprofile", "INFO"):
+                client.get(reverse("dashboard"))
+
+    def test_summarize_percentiles_across_rotated_logs(self):
+        import json
+        import tempfile
+        from pathlib import Path
+
+        from inventory.sql_profile import read_records, summarize
+
+        def rec(view, ms):
+            return json.dumps(
+                {
+                    "view": view,
+                    "ms": ms,
+                    "queries": int(ms),
+                    "sql_ms": ms / 2,
+                    "slowest": [{"sql": f"SELECT {view}", "ms": ms / 2}],
+                }
+            )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "sql_profile.log"
+            (Path(tmp) / "sql_profile.log.1").write_text(
+                "\n".join(rec("slow", ms) for ms in range(1, 51)) + "\n"
+            )
+            log.write_text(
+                "\n".join(rec("slow", ms) for ms in range(51, 101))
+                + "\n{torn\n"
+                + rec("fast", 1.0)
+                + "\n"
+            )
+            rows = summarize(read_records(log))
+
+        self.assertEqual([r["view"] for r in rows], ["slow", "fast"])
+        slow = rows[0]
+        self.assertEqual(slow["samples"], 100)
+        self.assertEqual((slow["p50"], slow["p95"], slow["p99"]), (50, 95, 99))
+        self.assertEqual(slow["queries_max"], 100)
+        self.assertEqual(slow["top_sql"], "SELECT slow")
+
+    def test_admin_page_renders_summary(self):
+        from unittest.mock import patch
+
+        self.client.force_login(self.user)
+        fake = [{"view": "dashboard", "ms": 12.0, "queries": 9, "sql_ms": 3.0}]
+        with patch("inventory.sql_profile.read_records", return_value=fake):
+            resp = self.client.get(reverse("admin:inventory-sql-profile"))
+        self.assertContains(resp, "SQL Profile")
+        self.assertContains(resp, "dashboard")
+
+
+class JsonApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="api", password="pass")
+        self.client.force_login(self.user)
+        self.shelf = Location.objects.create(
+            name="API Shelf", default_status=InventoryItem.Status.STORED
+        )
+        self.product = Filament.objects.create(
+            name="PLA API", upc="api000000001", sku="API01"
+        )
+        self.items = [
+            InventoryItem.objects.create(
+                product=self.product, location=self.shelf, serial_number=f"S{i}"
+            )
+            for i in range(5)
+        ]
+
+    def test_list_default_fields(self):
+        resp = self.client.get(reverse("api_items"))
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(len(data["results"]), 5)
+        self.assertIsNone(data["next"])
+        first = data["results"][0]
+        self.assertEqual(first["product_name"], "PLA API")
+        self.assertEqual(first["status_label"], "stored")
+        self.assertEqual(first["location_name"], "API Shelf")
+
+    def test_sparse_fieldset(self):
+        resp = self.client.get(reverse("api_items"), {"fields": "id,upc"})
+        row = resp.json()["results"][0]
+        self.assertEqual(set(row), {"id", "upc"})
+        self.assertEqual(row["upc"], "api000000001")
+
+    def test_unknown_field_is_400(self):
+        resp = self.client.get(reverse("api_items"), {"fields": "id,password"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("password", resp.json()["error"])
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        seen = []
+        url = reverse("api_items") + "?limit=2&fields=id"
+        while url:
+            data = self.client.get(url).json()
+            seen += [r["id"] for r in data["results"]]
+            url = data["next"]
+        self.assertEqual(seen, [i.pk for i in self.items])
+
+    def test_invalid_cursor_is_400(self):
+        resp = self.client.get(reverse("api_items"), {"cursor": "!!"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_filters(self):
+        items.deplete(self.items[0])
+        resp = self.client.get(
+            reverse("api_items"),
+            {"status": str(int(InventoryItem.Status.DEPLETED)), "fields": "id"},
+        )
+        self.assertEqual([r["id"] for r in resp.json()["results"]], [self.items[0].pk])
+
+    def test_malformed_filter_is_400(self):
+        for param in ("status", "location", "product"):
+            resp = self.client.get(reverse("api_items"), {param: "abc"})
+            self.assertEqual(resp.status_code, 400, param)
+            self.assertIn(param, resp.json()["error"])
+
+    def test_etag_304_skips_the_list_query(self):
+        url = reverse("api_items")
+        etag = self.client.get(url)["ETag"]
+        # Session + user + the version stamp aggregates (items, products,
+        # locations); no list query.
+        with self.assertNumQueries(5):
+            resp = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp["ETag"], etag)
+
+    def test_etag_changes_on_write(self):
+        url = reverse("api_locations")
+        etag = self.client.get(url)["ETag"]
+        self.shelf.name = "Renamed Shelf"
+        self.shelf.save()
+        resp = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_etag_changes_when_joined_rows_change(self):
+        url = reverse("api_items")
+        etag = self.client.get(url)["ETag"]
+        self.product.name = "PLA API v2"
+        self.product.save()
+        resp = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["results"][0]["product_name"], "PLA API v2")
+
+        etag = resp["ETag"]
+        self.shelf.name = "API Shelf 2"
+        self.shelf.save()
+        resp = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(resp.json()["results"][0]["location_name"], "API Shelf 2")
+
+        url = reverse("api_products")
+        material = Material.objects.create(name="PLA", material_type="Matte")
+        Filament.objects.filter(pk=self.product.pk).update(material=material)
+        etag = self.client.get(url, {"fields": "material_type"})["ETag"]
+        material.material_type = "Silk"
+        material.save()
+        resp = self.client.get(
+            url, {"fields": "material_type"}, headers={"if-none-match": etag}
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_etag_changes_after_admin_bulk_material_update(self):
+        url = reverse("api_products")
+        material = Material.objects.create(name="PETG", material_type="Basic")
+        etag = self.client.get(url)["ETag"]
+        self.client.force_login(User.objects.create_superuser("bulk", "b@x.co", "pass"))
+        session = self.client.session
+        session["selected_filaments"] = [str(self.product.pk)]
+        session.save()
+        self.client.post(
+            reverse("admin:bulk_update_material"),
+            {"apply": "1", "new_matl": material.pk},
+        )
+        resp = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_etag_varies_with_query(self):
+        url = reverse("api_items")
+        self.assertNotEqual(
+            self.client.get(url)["ETag"],
+            self.client.get(url, {"fields": "id"})["ETag"],
+        )
+
+    def test_detail_and_404(self):
+        resp = self.client.get(
+            reverse("api_item_detail", args=[self.items[1].pk]),
+            {"fields": "serial_number"},
+        )
+        self.assertEqual(resp.json(), {"serial_number": "S1"})
+        resp = self.client.get(reverse("api_item_detail", args=[999999]))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_products_expose_type_and_filament_columns(self):
+        Hardware.objects.create(name="M3 screws", upc="api000000002")
+        resp = self.client.get(
+            reverse("api_products"), {"fields": "name,type,color", "limit": 10}
+        )
+        rows = {r["name"]: r for r in resp.json()["results"]}
+        self.assertEqual(rows["PLA API"]["type"], "filament")
+        self.assertEqual(rows["M3 screws"]["type"], "hardware")
+        self.assertIsNone(rows["M3 screws"]["color"])
+
+    def test_telemetry_resources(self):
+        from inventory.models import AMSChannelState, PrinterDevice, PrinterState
+
+        dev = PrinterDevice.objects.create(
+            serial="DEV1", name="P1S", ip_address="10.0.0.9"
+        )
+        PrinterState.objects.create(device=dev, gcode_state="RUNNING", mc_percent=12)
+        AMSChannelState.objects.create(
+            device=dev, ams_index=0, tray_index=2, tray_type="PETG", remain_pct=80
+        )
+        state = self.client.get(reverse("api_printer_states")).json()["results"][0]
+        self.assertEqual((state["device_name"], state["mc_percent"]), ("P1S", 12))
+        tray = self.client.get(reverse("api_ams_channels")).json()["results"][0]
+        self.assertEqual((tray["tray_index"], tray["remain_pct"]), (2, 80))
+
+        # Renaming the device invalidates the rows that embed its name.
+        for url in (reverse("api_printer_states"), reverse("api_ams_channels")):
+            etag = self.client.get(url)["ETag"]
+            dev.name = f"{dev.name}+"
+            dev.save()
+            resp = self.client.get(url, headers={"if-none-match": etag})
+            self.assertEqual(resp.json()["results"][0]["device_name"], dev.name)
+
+    def test_anonymous_gets_json_401(self):
+        self.client.logout()
+        resp = self.client.get(reverse("api_items"))
+        self.assertEqual(resp.status_code, 401)
+        self.assertIn("error", resp.json())
+
+    @override_settings(API_TOKEN="s3cret")
+    def test_bearer_token(self):
+        self.client.logout()
+        ok = self.client.get(
+            reverse("api_items"), headers={"authorization": "Bearer s3cret"}
+        )
+        self.assertEqual(ok.status_code, 200)
+        bad = self.client.get(
+            reverse("api_items"), headers={"authorization": "Bearer nope"}
+        )
+        self.assertEqual(bad.status_code, 401)
@@ -1,6 +1,7 @@
 from django.contrib.auth import views as auth_views
 from django.urls import path, reverse_lazy
 
+from .api import ApiDetailView, ApiListView
 from .views import (
     AboutView,
     AddAMSView,
@@ -52,6 +53,8 @@ from .views import (
     ReceivingConsoleView,
     ReceivingOverviewView,
     ReceivingScanView,
+    RecentMovesView,
+    ScanSyncView,
     SignUpView,
     SpendReportView,
     UnitMaintenanceView,
@@ -108,6 +111,8 @@ urlpatterns = [
     ),
     path("move/", QuickMoveView.as_view(), name="quick_move"),
     path("move/scan/", QuickMoveScanView.as_view(), name="quick_move_scan"),
+    path("moves/", RecentMovesView.as_view(), name="recent_moves"),
+    path("scans/sync/", ScanSyncView.as_view(), name="scan_sync"),
     path("search/export/", InventoryExportView.as_view(), name="inventory_export"),
     path(
         "print_barcode/<int:item_id>/<str:mode>/",
@@ -222,4 +227,61 @@ urlpatterns = [
         AuditUnknownDismissView.as_view(),
         name="audit_unknown_dismiss",
     ),
+    # ----- JSON API (read-only; see inventory.api) -----
+    path("api/items/", ApiListView.as_view(resource_name="items"), name="api_items"),
+    path(
+        "api/items/<int:pk>/",
+        ApiDetailView.as_view(resource_name="items"),
+        name="api_item_detail",
+    ),
+    path(
+        "api/locations/",
+        ApiListView.as_view(resource_name="locations"),
+        name="api_locations",
+    ),
+    path(
+        "api/locations/<int:pk>/",
+        ApiDetailView.as_view(resource_name="locations"),
+        name="api_location_detail",
+    ),
+    path(
+        "api/products/",
+        ApiListView.as_view(resource_name="products"),
+        name="api_products",
+    ),
+    path(
+        "api/products/<int:pk>/",
+        ApiDetailView.as_view(resource_name="products"),
+        name="api_product_detail",
+    ),
+    path(
+        "api/printer-states/",
+        ApiListView.as_view(resource_name="printer-states"),
+        name="api_printer_states",
+    ),
+    path(
+        "api/printer-states/<int:pk>/",
+        ApiDetailView.as_view(resource_name="printer-states"),
+        name="api_printer_state_detail",
+    ),
+    path(
+        "api/ams-channels/",
+        ApiListView.as_view(resource_name="ams-channels"),
+        name="api_ams_channels",
+    ),
+    path(
+        "api/ams-channels/<int:pk>/",
+        ApiDetailView.as_view(resource_name="ams-channels"),
+        name="api_ams_channel_detail",
+    ),
+    path(
+        "api/forecasts/",
+        ApiListView.as_view(resource_name="forecasts"),
+        name="api_forecasts",
+    ),
+    path(
+        "api/forecasts/<int:pk>/",
+        ApiDetailView.as_view(resource_name="forecasts"),
+        name="api_forecast_detail",
+    ),
 ]
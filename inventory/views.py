@@ -1,7 +1,11 @@
+import csv
+import json
 import logging
 import re
+import tempfile
 from datetime import timedelta
 from decimal import Decimal
+from itertools import chain
 from urllib.parse import urlencode
 
 import openpyxl
@@ -10,11 +14,28 @@ from django.contrib import messages
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db import transaction
-from django.db.models import Case, Count, IntegerField, Max, Q, Sum, When
-from django.http import Http404, HttpResponse
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    Sum,
+    When,
+)
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
+from django.utils.dateparse import parse_date
 from django.utils.html import escape
 from django.utils.timezone import localtime
 from django.utils.timezone import now as timezone_now
@@ -22,16 +43,23 @@ from django.views.generic import CreateView, TemplateView, UpdateView, View
 
 from . import (
     audit,
+    forecast,
+    item_events,
     items,
     maintenance,
+    occupancy,
     printjobs,
     procurement,
     quickmove,
+    scan_resolver,
+    scan_sync,
     search_index,
+    spend_ledger,
 )
 from .barcode_utils import (
     PrinterUnreachableError,
     generate_and_print_barcode,
+    generate_and_print_barcodes,
     print_unit_label,
 )
 from .color_catalog import group_slug
@@ -222,8 +250,7 @@ class BarcodeRedirectView(LoginRequiredMixin, View):
             item_id = value.replace("INV-", "")
             return redirect("inventory_edit", item_id=item_id)
         if value.startswith("LOC-"):
-            loc_id = value.replace("LOC-", "")
-            location = Location.objects.filter(pk=loc_id).first()
+            location = scan_resolver.location(value.replace("LOC-", ""))
             if location is None:
                 return HttpResponse("Unknown location", status=404)
             # Routing: during an active audit, a scanned LOC barcode jumps into the
@@ -705,7 +732,10 @@ class Index(TemplateView):
     template_name = "inventory/index.html"
 
 
+# Label reprints go to the printer one by one, so they stay capped low; bulk
+# edits are set-based writes (items.bulk_*) and scale to a whole search result.
 MAX_BULK = 200
+MAX_BULK_UPDATE = 5000
 
 
 def _bulk_redirect_back(request):
@@ -741,10 +771,10 @@ def _bulk_redirect_back(request):
     return redirect(url)
 
 
-def _parse_bulk_item_ids(request):
+def _parse_bulk_item_ids(request, limit=MAX_BULK):
     """Parse selected item ids from a bulk form. Returns ``(ids, redirect)`` where
     exactly one is truthy: a non-empty id list, or a redirect carrying an error
-    message for the empty/invalid/too-many cases."""
+    message for the empty/invalid/more-than-``limit`` cases."""
     raw_ids = request.POST.getlist("item_ids")
     try:
         item_ids = [int(i) for i in raw_ids if str(i).strip()]
@@ -754,8 +784,8 @@ def _parse_bulk_item_ids(request):
     if not item_ids:
         messages.warning(request, "No items selected.")
         return None, _bulk_redirect_back(request)
-    if len(item_ids) > MAX_BULK:
-        messages.error(request, f"Cannot act on more than {MAX_BULK} items at once.")
+    if len(item_ids) > limit:
+        messages.error(request, f"Cannot act on more than {limit} items at once.")
         return None, _bulk_redirect_back(request)
     return item_ids, None
 
@@ -803,7 +833,7 @@ class BulkUpdateView(LoginRequiredMixin, View):
         return redirect("inventory_search")
 
     def post(self, request):
-        item_ids, early = _parse_bulk_item_ids(request)
+        item_ids, early = _parse_bulk_item_ids(request, limit=MAX_BULK_UPDATE)
         if early:
             return early
 
@@ -850,44 +880,38 @@ class BulkUpdateView(LoginRequiredMixin, View):
             InventoryItem.Status.SOLD,
         )
 
-        count = 0
+        selected = list(InventoryItem.objects.filter(id__in=item_ids))
+        extra = {"shipment": new_shipment} if new_shipment is not None else None
+        # Set-based writes through the items service (one UPDATE per resulting
+        # status, batched history + FTS). Capacity is not enforced on the bulk
+        # path (it mirrors the prior behavior; a power-user batch shouldn't be
+        # refused over a full slot).
         with transaction.atomic():
-            for item in InventoryItem.objects.filter(id__in=item_ids):
-                if new_shipment is not None:
-                    item.shipment = new_shipment
-
-                # Delegate status/location writes to the items service so this
-                # view never touches the model's transient flags. Capacity is not
-                # enforced on the bulk path (it mirrors the prior behavior; a
-                # power-user batch shouldn't fail mid-loop on a full slot).
-                if new_status is not None and not status_clears_location:
-                    # Move (if a location was given) carrying the explicit status,
-                    # else just set the status in place.
-                    if new_location is not None:
-                        items.move_to(
-                            item,
-                            new_location,
-                            status=new_status,
-                            skip_drying_check=True,
-                            enforce_capacity=False,
-                        )
-                    else:
-                        items.set_status(item, new_status)
-                elif new_status is not None:
-                    # DEPLETED/SOLD: set the terminal status (clears location); any
-                    # requested location is intentionally ignored, as before.
-                    items.set_status(item, new_status)
-                elif new_location is not None:
-                    items.move_to(
-                        item,
+            if new_status is not None and not status_clears_location:
+                # Move (if a location was given) carrying the explicit status,
+                # else just set the status in place.
+                if new_location is not None:
+                    items.bulk_move(
+                        selected,
                         new_location,
-                        skip_drying_check=True,
+                        status=new_status,
                         enforce_capacity=False,
+                        fields=extra,
                     )
                 else:
-                    # Shipment-only change.
-                    item.save()
-                count += 1
+                    items.bulk_set_status(selected, new_status, fields=extra)
+            elif new_status is not None:
+                # DEPLETED/SOLD: set the terminal status (clears location); any
+                # requested location is intentionally ignored, as before.
+                items.bulk_set_status(selected, new_status, fields=extra)
+            elif new_location is not None:
+                items.bulk_move(
+                    selected, new_location, enforce_capacity=False, fields=extra
+                )
+            else:
+                # Shipment-only change.
+                items.bulk_update_fields(selected, shipment=new_shipment)
+        count = len(selected)
 
         messages.success(request, f"Updated {count} item{'s' if count != 1 else ''}.")
         return _bulk_redirect_back(request)
@@ -915,6 +939,11 @@ class SignUpView(View):
         return render(request, "inventory/signup.html", {"form": form})
 
 
+# Forecast rows shown in the dashboard's "Reorder soon" card (full list: the
+# /api/forecasts/ feed).
+DASHBOARD_REORDER_ROWS = 10
+
+
 def _build_low_stock_alerts():
     """Return low-stock alert rows, sorted by urgency.
 
@@ -1435,8 +1464,9 @@ class MaintenanceSummaryView(LoginRequiredMixin, TemplateView):
     """Reliability / "rebuy-or-refund" dashboard.
 
     Per machine *model*: fault count, faults-per-unit, open faults, total
-    downtime, maintenance spend, and MTBF. Computed via DB aggregations in
-    :func:`maintenance.model_reliability`.
+    downtime, maintenance spend, and MTBF with a monthly trend. Computed via DB
+    aggregations in :func:`maintenance.model_reliability` (cached), so the page
+    costs the same few queries whatever the fleet size.
     """
 
     template_name = "inventory/maintenance_summary.html"
@@ -1579,6 +1609,7 @@ class Dashboard(LoginRequiredMixin, View):
         ]
 
         low_stock_alerts = _build_low_stock_alerts()
+        reorder_forecasts = forecast.reorder_list(limit=DASHBOARD_REORDER_ROWS)
 
         grand_total = InventoryItem.objects.count()
         distinct_products = InventoryItem.objects.values("product").distinct().count()
@@ -1601,6 +1632,7 @@ class Dashboard(LoginRequiredMixin, View):
                 "inventory_by_sku": inventory_by_sku,
                 "low_stock_alerts": low_stock_alerts,
                 "low_qty_threshold": getattr(settings, "LOW_QUANTITY", 3),
+                "reorder_forecasts": reorder_forecasts,
             },
         )
 
@@ -1681,51 +1713,94 @@ class AddAMSView(BaseAddProductView):
     submit_label = "Save AMS"
 
 
+# (header, values() path) for every export column, in sheet order.
+EXPORT_COLUMNS = (
+    ("Serial", "serial_number"),
+    ("Product", "product__name"),
+    ("SKU", "product__sku"),
+    ("UPC", "product__upc"),
+    ("Status", "status"),
+    ("Date Added", "date_added"),
+    ("Location", "location__name"),
+)
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _export_rows(items):
+    """Yield one list per item, in ``EXPORT_COLUMNS`` order.
+
+    Reads flat ``values_list`` rows in chunks, so no model instance (or product /
+    location) is ever built and memory stays flat however large the export.
+    """
+    status_labels = dict(InventoryItem.Status.choices)
+    paths = [path for _, path in EXPORT_COLUMNS]
+    rows = items.values_list(*paths).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for serial, name, sku, upc, status, added, location in rows:
+        yield [
+            serial,
+            name,
+            sku,
+            upc,
+            status_labels.get(status, ""),
+            localtime(added).strftime("%Y-%m-%d %H:%M:%S"),
+            location or "",
+        ]
+
+
+class _Echo:
+    """File-like whose ``write`` hands the line back, for streaming ``csv``."""
+
+    def write(self, value):
+        return value
+
+
 class InventoryExportView(LoginRequiredMixin, View):
+    """Export the filtered search results as XLSX (default), CSV or NDJSON.
+
+    CSV and NDJSON stream row by row, so the first bytes leave immediately. XLSX
+    can't: the zip container is only valid once finished. It goes through a
+    write-only workbook (rows spill to disk, not memory) into a temp file that is
+    then streamed back in blocks.
+    """
+
     def get(self, request):
         # Rebuild the same filtered queryset the search page rendered, so the
         # export matches what the user is looking at (honours status/type/date/
         # preset, not just the legacy sku/upc/name/location subset).
         items, _ = _filtered_search_items(request.GET)
-
-        # Create Excel workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Inventory Export"
-
-        # Write headers
-        headers = [
-            "Serial",
-            "Product",
-            "SKU",
-            "UPC",
-            "Status",
-            "Date Added",
-            "Location",
-        ]
-        ws.append(headers)
-
-        # Write data rows
-        for item in items:
-            ws.append(
-                [
-                    item.serial_number,
-                    item.product.name,
-                    item.product.sku,
-                    item.product.upc,
-                    item.get_status_display(),
-                    localtime(item.date_added).strftime("%Y-%m-%d %H:%M:%S"),
-                    item.location.name if item.location else "",
-                ]
+        rows = _export_rows(items)
+        headers = [header for header, _ in EXPORT_COLUMNS]
+
+        fmt = request.GET.get("format", "xlsx")
+        if fmt == "csv":
+            writer = csv.writer(_Echo())
+            response = StreamingHttpResponse(
+                (writer.writerow(row) for row in chain([headers], rows)),
+                content_type="text/csv",
             )
-
-        # Return as downloadable file
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        filename = "inventory_export.xlsx"
-        response["Content-Disposition"] = f"attachment; filename={filename}"
-        wb.save(response)
+        elif fmt == "ndjson":
+            response = StreamingHttpResponse(
+                (
+                    json.dumps(dict(zip(headers, row, strict=True))) + "\n"
+                    for row in rows
+                ),
+                content_type="application/x-ndjson",
+            )
+        else:
+            fmt = "xlsx"
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet("Inventory Export")
+            ws.append(headers)
+            for row in rows:
+                ws.append(row)
+            # openpyxl's zip writer needs a seekable target — a response isn't.
+            buffer = tempfile.TemporaryFile()
+            wb.save(buffer)
+            buffer.seek(0)
+            response = FileResponse(buffer, content_type=XLSX_CONTENT_TYPE)
+
+        response["Content-Disposition"] = f"attachment; filename=inventory_export.{fmt}"
         return response
 
 
@@ -1889,32 +1964,47 @@ class ReceivingOverviewView(LoginRequiredMixin, TemplateView):
         return context
 
 
-def _slot_map_for_unit(container):
-    """Build an ordered slot-occupancy map for an AMS/dryer container.
+def _slot_maps_for_units(containers):
+    """Slot-occupancy maps for several AMS/dryer containers in two queries.
 
-    Returns a list of ``{"location": <leaf>, "item": <InventoryItem|None>}`` rows
-    ordered by ``slot_index`` (then name), one per assignable child slot. ``item``
-    is the single active occupant of that slot, or None when empty. Used to render
-    the visual slot grid (ideas.md wireframe C). Returns ``[]`` for a container
-    with no slots (so the template simply omits the grid).
+    Returns ``[{"unit": <container>, "rows": [...]}, ...]`` in the given order,
+    skipping containers without slots. Each row is
+    ``{"location": <leaf>, "item": <InventoryItem|None>}``, ordered by
+    ``slot_index`` (then name); ``item`` is the slot's single active occupant, or
+    None when empty. One query loads every slot, one (via
+    :mod:`inventory.occupancy`) loads every occupant, however many units a room
+    holds.
     """
-    slots = list(
-        container.children.filter(kind__in=Location.ASSIGNABLE_KINDS).order_by(
-            "slot_index", "name"
-        )
+    containers = list(containers)
+    slots_by_unit = {}
+    for slot in Location.objects.filter(
+        parent__in=containers, kind__in=Location.ASSIGNABLE_KINDS
+    ).order_by("slot_index", "name"):
+        slots_by_unit.setdefault(slot.parent_id, []).append(slot)
+    occupants = occupancy.current().load(
+        slot.id for slots in slots_by_unit.values() for slot in slots
     )
-    if not slots:
-        return []
-    slot_ids = [s.id for s in slots]
-    occupants = {}
-    for item in (
-        InventoryItem.objects.filter(location_id__in=slot_ids)
-        .exclude(status__in=items.TERMINAL_STATUSES)
-        .select_related("product", "location")
-    ):
-        # One active occupant per slot (capacity 1); first wins if data is dirty.
-        occupants.setdefault(item.location_id, item)
-    return [{"location": slot, "item": occupants.get(slot.id)} for slot in slots]
+    maps = []
+    for container in containers:
+        slots = slots_by_unit.get(container.id)
+        if slots:
+            # One active occupant per slot (capacity 1); first wins if data is dirty.
+            rows = [
+                {"location": slot, "item": occupants.occupant(slot.id)}
+                for slot in slots
+            ]
+            maps.append({"unit": container, "rows": rows})
+    return maps
+
+
+def _slot_map_for_unit(container):
+    """The slot rows of :func:`_slot_maps_for_units` for one container.
+
+    Used to render the visual slot grid (ideas.md wireframe C). Returns ``[]``
+    for a container with no slots (so the template simply omits the grid).
+    """
+    maps = _slot_maps_for_units([container])
+    return maps[0]["rows"] if maps else []
 
 
 class LocationDetailView(LoginRequiredMixin, View):
@@ -1934,6 +2024,11 @@ class LocationDetailView(LoginRequiredMixin, View):
 
     template_name = "inventory/location_detail.html"
 
+    def dispatch(self, request, *args, **kwargs):
+        # One occupancy map per request: slot maps and the capacity guard share it.
+        with occupancy.scope():
+            return super().dispatch(request, *args, **kwargs)
+
     def _get_location(self, location_id):
         return get_object_or_404(Location, pk=location_id)
 
@@ -1960,19 +2055,13 @@ class LocationDetailView(LoginRequiredMixin, View):
     def _slot_maps(self, location):
         """Slot maps to render: the location itself if it's an AMS/dryer, plus any
         AMS/dryer container children (so a rack page still draws its units)."""
-        maps = []
         if location.kind in (Location.Kind.AMS, Location.Kind.DRYER):
-            rows = _slot_map_for_unit(location)
-            if rows:
-                maps.append({"unit": location, "rows": rows})
-        else:
-            for child in location.children.filter(
+            return _slot_maps_for_units([location])
+        return _slot_maps_for_units(
+            location.children.filter(
                 kind__in=(Location.Kind.AMS, Location.Kind.DRYER)
-            ).order_by("name"):
-                rows = _slot_map_for_unit(child)
-                if rows:
-                    maps.append({"unit": child, "rows": rows})
-        return maps
+            ).order_by("name")
+        )
 
     def _context(self, request, location):
         grouped, total = self._grouped_items(location)
@@ -2049,6 +2138,18 @@ class QuickMoveView(LoginRequiredMixin, TemplateView):
         return ctx
 
 
+class RecentMovesView(LoginRequiredMixin, TemplateView):
+    """The latest location changes across every item (one indexed read)."""
+
+    template_name = "inventory/recent_moves.html"
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["moves"] = item_events.recent_moves()
+        ctx["limit"] = item_events.FEED_LIMIT
+        return ctx
+
+
 class QuickMoveScanView(LoginRequiredMixin, View):
     """Input-agnostic scan/action endpoint for the quick-move flow.
 
@@ -2058,6 +2159,12 @@ class QuickMoveScanView(LoginRequiredMixin, View):
     otherwise.
     """
 
+    def dispatch(self, request, *args, **kwargs):
+        # The capacity guard, the "who's in the way" lookup and a slot picker all
+        # read the same slots; one occupancy map per request serves them all.
+        with occupancy.scope():
+            return super().dispatch(request, *args, **kwargs)
+
     def post(self, request):
         action = request.POST.get("action", "")
         if action == "reset":
@@ -2316,69 +2423,91 @@ def _set_active_location(request, location):
         request.session[_AUDIT_ACTIVE_LOC_KEY] = location.pk
 
 
-def _audit_context(request, session, active_location, last_result=None):
-    """Build the context shared by the console page and its HTMX body partial."""
-    items_here = []
-    present_here = 0
-    if active_location is not None:
-        leaves = audit.focus_leaves(active_location)
-        leaf_ids = [leaf.id for leaf in leaves]
-        scanned_ids = set(
-            AuditEvent.objects.filter(
-                session=session,
-                location_id__in=leaf_ids,
-                action__in=audit.PRESENT_ACTIONS,
-            ).values_list("item_id", flat=True)
+def _audit_location_context(session, active_location):
+    """The focused location's item list, each flagged with ``audit_scanned``."""
+    if active_location is None:
+        return {
+            "active_location": None,
+            "active_is_unit": False,
+            "items_here": [],
+            "expected_count": 0,
+            "present_count": 0,
+            "pending_count": 0,
+        }
+    leaf_ids = [leaf.id for leaf in audit.focus_leaves(active_location)]
+    items_here = list(
+        InventoryItem.objects.filter(location_id__in=leaf_ids)
+        .annotate(
+            audit_scanned=Exists(
+                AuditEvent.objects.filter(
+                    session=session,
+                    item_id=OuterRef("pk"),
+                    location_id__in=leaf_ids,
+                    action__in=audit.PRESENT_ACTIONS,
+                )
+            )
         )
-        for item in (
-            InventoryItem.objects.filter(location_id__in=leaf_ids)
-            .select_related("product", "location")
-            .order_by("location__slot_index", "location__name", "id")
-        ):
-            item.audit_scanned = item.id in scanned_ids
-            if item.audit_scanned:
-                present_here += 1
-            items_here.append(item)
-
+        .select_related("product", "location")
+        .order_by("location__slot_index", "location__name", "id")
+    )
+    present_here = sum(1 for item in items_here if item.audit_scanned)
     return {
-        "session": session,
         "active_location": active_location,
-        "active_is_unit": active_location.is_container if active_location else False,
+        "active_is_unit": active_location.is_container,
         "items_here": items_here,
         "expected_count": len(items_here),
         "present_count": present_here,
         "pending_count": len(items_here) - present_here,
+    }
+
+
+def _recent_audit_events(session):
+    return (
+        AuditEvent.objects.filter(session=session)
+        .select_related("item__product", "location")
+        .order_by("-created_at")[:12]
+    )
+
+
+def _audit_context(request, session, active_location, last_result=None):
+    """Build the context shared by the console page and its HTMX body partial."""
+    return {
+        "session": session,
+        **_audit_location_context(session, active_location),
         "added_items": audit.session_added_items(session),
-        "unknown_items": audit.session_unknown_items(session),
         "unknown_count": AuditUnknownScan.objects.filter(
             resolved=False, dismissed=False
         ).count(),
-        "tally": {
-            "moved": AuditEvent.objects.filter(
-                session=session, action=AuditEvent.Action.MOVED_IN
-            ).count(),
-            "present": AuditEvent.objects.filter(
-                session=session, action=AuditEvent.Action.SCANNED_PRESENT
-            ).count(),
-            "revived": AuditEvent.objects.filter(
-                session=session, action=AuditEvent.Action.REVIVED
-            ).count(),
-            "closed": AuditEvent.objects.filter(
-                session=session, action=AuditEvent.Action.CLOSED
-            ).count(),
-            "added": AuditEvent.objects.filter(
-                session=session, action=AuditEvent.Action.ADDED
-            ).count(),
-        },
-        "recent_events": (
-            AuditEvent.objects.filter(session=session)
-            .select_related("item__product", "location")
-            .order_by("-created_at")[:12]
-        ),
+        "tally": audit.session_tally(session),
+        "recent_events": _recent_audit_events(session),
+        "last_result": last_result,
+    }
+
+
+def _audit_delta_context(session, active_location, last_result):
+    """Just the panels an item scan can change: tally, location card, recent list.
+
+    The added-items card and unknown-UPC link only change on UPC scans and undo,
+    which still re-render the whole body.
+    """
+    return {
+        "session": session,
+        **_audit_location_context(session, active_location),
+        "tally": audit.session_tally(session),
+        "recent_events": _recent_audit_events(session),
         "last_result": last_result,
     }
 
 
+def _print_audit_label(request, item):
+    """Print the INV label for an item added by an audit UPC scan (non-fatal)."""
+    try:
+        generate_and_print_barcode(item, mode="unique")
+    except Exception as e:  # label print is non-fatal
+        messages.warning(request, f"Label printing failed: {e}")
+        logger.error(f"Label printing failed: {e}")
+
+
 class AuditStartView(LoginRequiredMixin, View):
     def post(self, request):
         try:
@@ -2422,7 +2551,8 @@ class AuditConsoleView(LoginRequiredMixin, TemplateView):
 
 class AuditScanView(LoginRequiredMixin, View):
     """Input-agnostic scan endpoint: a wedge form-submit or a camera JS POST both
-    deliver a ``code`` string here and get back the refreshed console body."""
+    deliver a ``code`` string here and get back the refreshed console body (or, for
+    an item scan, just the panels that changed)."""
 
     def post(self, request):
         session = AuditSession.active()
@@ -2430,64 +2560,30 @@ class AuditScanView(LoginRequiredMixin, View):
             messages.error(request, "No audit in progress.")
             return redirect("audit_console")
 
-        active = _active_location(request)
-        last_result = None
-        raw_code = request.POST.get("code", "")
-        try:
-            try:
-                kind, value = audit.parse_code(raw_code)
-            except audit.AuditError:
-                # Fall back to a unit serial-number scan (e.g. an AMS/dryer/printer
-                # front-panel tag) before giving up on an unrecognized code.
-                value = audit.resolve_serial(raw_code.strip())
-                kind = "loc_obj"
-            if kind in ("loc", "loc_obj"):
-                if kind == "loc_obj":
-                    location = value  # already a resolved Location
-                else:
-                    location = Location.objects.filter(pk=value).first()
-                    if location is None:
-                        raise audit.AuditError(f"No location with id {value}.")
-                audit.visit_location(session, location, previous_location=active)
-                _set_active_location(request, location)
-                active = location
-                last_result = ("info", f"At {location.name}.")
-            elif kind == "upc":
-                outcome, obj = audit.add_or_queue_upc(session, active, value)
-                if outcome == "added":
-                    try:
-                        generate_and_print_barcode(obj, mode="unique")
-                    except Exception as e:  # label print is non-fatal
-                        messages.warning(request, f"Label printing failed: {e}")
-                        logger.error(f"Label printing failed: {e}")
-                    last_result = (
-                        "success",
-                        f"Added {obj.product.name} (INV-{obj.pk}).",
-                    )
-                else:  # queued
-                    last_result = (
-                        "warning",
-                        f"Unknown UPC {value} queued for review.",
-                    )
-            else:  # item
-                item = InventoryItem.objects.filter(pk=value).first()
-                if item is None:
-                    raise audit.AuditError(f"No item with id {value}.")
-                action = audit.scan_item(session, active, item)
-                labels = {
-                    AuditEvent.Action.SCANNED_PRESENT: ("success", "Present"),
-                    AuditEvent.Action.MOVED_IN: ("success", "Moved here"),
-                    AuditEvent.Action.REVIVED: ("warning", "Revived here"),
-                }
-                tag, verb = labels[action]
-                last_result = (tag, f"{verb}: {item.product.name} (INV-{item.pk}).")
-        except audit.AuditError as exc:
-            last_result = ("danger", str(exc))
+        previous = _active_location(request)
+        outcome = audit.apply_scan(session, previous, request.POST.get("code", ""))
+        active = outcome.location
+        if active != previous:
+            _set_active_location(request, active)
+        if outcome.added is not None:
+            _print_audit_label(request, outcome.added)
+        last_result = (outcome.tag, outcome.message)
 
+        if not request.headers.get("HX-Request"):
+            return redirect("audit_console")
+        if outcome.kind == "item":
+            # Item scans are the hot path on a long walk: send only the panels
+            # they can change, swapped out-of-band into the existing body.
+            response = render(
+                request,
+                "inventory/partials/audit_scan_delta.html",
+                _audit_delta_context(session, active, last_result),
+            )
+            response["HX-Retarget"] = "#audit-result"
+            response["HX-Reswap"] = "innerHTML"
+            return response
         context = _audit_context(request, session, active, last_result=last_result)
-        if request.headers.get("HX-Request"):
-            return render(request, "inventory/partials/audit_body.html", context)
-        return redirect("audit_console")
+        return render(request, "inventory/partials/audit_body.html", context)
 
 
 class AuditCloseLocationView(LoginRequiredMixin, View):
@@ -2605,6 +2701,43 @@ class AuditUndoAddView(LoginRequiredMixin, View):
         return redirect("audit_console")
 
 
+class ScanSyncView(LoginRequiredMixin, View):
+    """Bulk-ingest endpoint for the phone's offline scan journal.
+
+    Takes ``{"scans": [{"id", "flow", "code", "dest", "scanned_at"}, ...]}`` and
+    answers ``{"results": [...], "active_location": ...}`` with one result per
+    scan, in order (see :mod:`inventory.scan_sync`). The audit focus is carried
+    through the batch exactly as consecutive console scans would carry it.
+    """
+
+    raise_exception = True  # a JSON client wants a 403, not the login page
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse({"error": "Body must be JSON."}, status=400)
+        try:
+            results, active = scan_sync.ingest(
+                request.user,
+                payload.get("scans") if isinstance(payload, dict) else None,
+                active_location=_active_location(request),
+            )
+        except scan_sync.ScanSyncError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+        _set_active_location(request, active)
+        for result in results:
+            if result.added is not None:
+                _print_audit_label(request, result.added)
+        return JsonResponse(
+            {
+                "results": [result.as_dict() for result in results],
+                "active_location": active.name if active else None,
+            }
+        )
+
+
 class AuditUnknownsView(LoginRequiredMixin, TemplateView):
     """Post-walk review of UPCs that matched no catalog Product."""
 
@@ -2720,6 +2853,48 @@ class PrintJobDetailView(LoginRequiredMixin, TemplateView):
         return ctx
 
 
+# Preset windows for the utilization pages (?window=); "all" is the default.
+UTILIZATION_WINDOWS = {"7d": 7, "30d": 30, "365d": 365}
+PRINTER_JOBS_PAGE_SIZE = 50
+
+
+def _query_date(request, name):
+    """``?name=YYYY-MM-DD`` as a date, or None if absent or malformed."""
+    try:
+        return parse_date(request.GET.get(name) or "")
+    except ValueError:
+        return None
+
+
+def _utilization_window(request):
+    """{"since", "until", "window", "query"} from ``?window=`` or ``?since=/&until=``.
+
+    Custom dates (``YYYY-MM-DD``, either end optional) win over a preset;
+    anything unparseable is ignored. ``query`` re-creates the window in links.
+    """
+    since = _query_date(request, "since")
+    until = _query_date(request, "until")
+    window = request.GET.get("window", "all")
+    if since or until:
+        window = "custom"
+    elif window in UTILIZATION_WINDOWS:
+        days = UTILIZATION_WINDOWS[window]
+        since = localtime(timezone_now()).date() - timedelta(days=days - 1)
+    else:
+        window = "all"
+    params = {"window": window}
+    if window == "custom":
+        params = {
+            k: v.isoformat() for k, v in (("since", since), ("until", until)) if v
+        }
+    return {
+        "since": since,
+        "until": until,
+        "window": window,
+        "query": urlencode(params),
+    }
+
+
 class UtilizationView(LoginRequiredMixin, TemplateView):
     """Fleet-wide printer utilization: hours, job count, success %, kg by material."""
 
@@ -2727,8 +2902,12 @@ class UtilizationView(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["printers"] = printjobs.utilization_summary()
-        ctx["consumption"] = printjobs.consumption_by_material()
+        window = _utilization_window(self.request)
+        bounds = {"since": window["since"], "until": window["until"]}
+        ctx["window"] = window
+        ctx["windows"] = list(UTILIZATION_WINDOWS)
+        ctx["printers"] = printjobs.utilization_summary(**bounds)
+        ctx["consumption"] = printjobs.consumption_by_material(**bounds)
         ctx["total_jobs"] = sum(p["jobs"] for p in ctx["printers"])
         ctx["total_hours"] = round(sum(p["hours"] for p in ctx["printers"]), 1)
         ctx["total_kg"] = round(sum(p["kg"] for p in ctx["printers"]), 2)
@@ -2736,7 +2915,12 @@ class UtilizationView(LoginRequiredMixin, TemplateView):
 
 
 class PrinterUtilizationDetailView(LoginRequiredMixin, TemplateView):
-    """Per-printer utilization, reachable from the machine's item page."""
+    """Per-printer utilization, reachable from the machine's item page.
+
+    Stats honour the same window as the fleet page. The job list is keyset
+    paginated newest-first on id (``?before=<id>``), so deep pages cost the
+    same as the first.
+    """
 
     template_name = "inventory/printer_utilization_detail.html"
 
@@ -2747,10 +2931,32 @@ class PrinterUtilizationDetailView(LoginRequiredMixin, TemplateView):
         )
         ctx["printer"] = printer
         ctx["printer_name"] = str(printer.product.get_real_instance())
-        ctx["stats"] = printjobs.printer_utilization(printer)
-        ctx["jobs"] = (
-            PrintJob.objects.filter(printer=printer).prefetch_related("filaments").all()
+        window = _utilization_window(self.request)
+        bounds = {"since": window["since"], "until": window["until"]}
+        ctx["window"] = window
+        ctx["windows"] = list(UTILIZATION_WINDOWS)
+        ctx["stats"] = printjobs.printer_utilization(printer, **bounds)
+        ctx["consumption"] = printjobs.consumption_by_material(
+            printer=printer, **bounds
+        )
+
+        jobs = PrintJob.objects.filter(printer=printer).annotate(
+            spool_count=Count("filaments")
+        )
+        try:
+            before = int(self.request.GET.get("before", ""))
+        except ValueError:
+            before = None
+        if before is not None:
+            jobs = jobs.filter(pk__lt=before)
+        page = list(jobs.order_by("-pk")[: PRINTER_JOBS_PAGE_SIZE + 1])
+        ctx["jobs"] = page[:PRINTER_JOBS_PAGE_SIZE]
+        ctx["next_before"] = (
+            page[PRINTER_JOBS_PAGE_SIZE - 1].pk
+            if len(page) > PRINTER_JOBS_PAGE_SIZE
+            else None
         )
+        ctx["paged"] = before is not None
         return ctx
 
 
@@ -2829,7 +3035,8 @@ class ReceivingConsoleView(LoginRequiredMixin, TemplateView):
 class ReceivingScanView(LoginRequiredMixin, View):
     """Input-agnostic receiving scan: a wedge form-submit or a camera JS POST both
     deliver a ``code`` (UPC) + ``location`` here; mints/receives one unit and
-    prints an ``INV-`` label (soft-fail), mirroring AddInventoryView."""
+    prints an ``INV-`` label (soft-fail), mirroring AddInventoryView. An optional
+    ``qty`` receives a whole case at once and prints its labels as one batch."""
 
     def post(self, request, pk):
         order = get_object_or_404(PurchaseOrder, pk=pk)
@@ -2837,16 +3044,24 @@ class ReceivingScanView(LoginRequiredMixin, View):
 
         code = (request.POST.get("code") or "").strip()
         location = Location.objects.filter(pk=request.POST.get("location")).first()
+        try:
+            qty = int(request.POST.get("qty") or 1)
+        except ValueError:
+            messages.error(request, "Quantity must be a whole number.")
+            return redirect("receiving_console", pk=order.pk)
 
         try:
-            result = procurement.receive_scan(receipt, code, location)
+            result = procurement.receive_scan(receipt, code, location, qty=qty)
         except procurement.ProcurementError as exc:
             messages.error(request, str(exc))
             return redirect("receiving_console", pk=order.pk)
 
-        if result.item is not None:
+        if result.items:
             try:
-                generate_and_print_barcode(result.item, mode="unique")
+                if len(result.items) == 1:
+                    generate_and_print_barcode(result.item, mode="unique")
+                else:
+                    generate_and_print_barcodes(result.items, mode="unique")
             except Exception as e:  # label print is non-fatal, like AddInventoryView
                 messages.warning(request, f"Label printing failed: {e}")
                 logger.error(f"Label printing failed: {e}")
@@ -2864,4 +3079,5 @@ class SpendReportView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         context["summary"] = procurement.spend_summary()
         context["by_supplier"] = procurement.spend_by_supplier()
+        context["monthly"] = spend_ledger.monthly()
         return context
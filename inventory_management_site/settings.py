@@ -96,6 +96,18 @@ MIDDLEWARE = [
 if DEBUG:
     MIDDLEWARE.insert(0, "debug_toolbar.middleware.DebugToolbarMiddleware")
 
+# Opt-in request SQL profiling (inventory.sql_profile). Off by default; when on,
+# SQL_PROFILE_SAMPLE_RATE of requests log query count/time + the slowest
+# statements to SQL_PROFILE_LOG, summarized in the admin "SQL profile" page.
+SQL_PROFILE = config("SQL_PROFILE", default=False, cast=bool)
+SQL_PROFILE_SAMPLE_RATE = config("SQL_PROFILE_SAMPLE_RATE", default=0.1, cast=float)
+SQL_PROFILE_TOP_N = config("SQL_PROFILE_TOP_N", default=5, cast=int)
+SQL_PROFILE_LOG = config("SQL_PROFILE_LOG", default=str(BASE_DIR / "sql_profile.log"))
+
+if SQL_PROFILE:
+    # Outermost, so the timing covers every other middleware's queries too.
+    MIDDLEWARE.insert(0, "inventory.sql_profile.SQLProfileMiddleware")
+
 ROOT_URLCONF = "inventory_management_site.urls"
 
 TEMPLATES = [
@@ -134,6 +146,30 @@ DATABASES = {
     }
 }
 
+# Bearer token for scripts using the JSON API (inventory.api); blank = session
+# login only.
+API_TOKEN = config("API_TOKEN", default="")
+
+# Live spool reconciliation from AMS telemetry (inventory.spool_autosync). The
+# reconciler keeps one SpoolSyncFinding per tray (non-OK rows are the review
+# queue; OK rows stay to rate-limit writes); with APPLY_PERCENT it also writes falling AMS "remain" readings to percent_remaining, at most once per
+# tray every APPLY_INTERVAL_S seconds. Serials are never written automatically.
+SPOOL_AUTOSYNC = config("SPOOL_AUTOSYNC", default=True, cast=bool)
+SPOOL_AUTOSYNC_APPLY_PERCENT = config(
+    "SPOOL_AUTOSYNC_APPLY_PERCENT", default=False, cast=bool
+)
+SPOOL_AUTOSYNC_APPLY_INTERVAL_S = config(
+    "SPOOL_AUTOSYNC_APPLY_INTERVAL_S", default=900, cast=int
+)
+
+# Open/resolve FAULT MaintenanceEvents from each linked printer's active HMS list
+# (inventory.hms_faults).
+HMS_FAULT_SYNC = config("HMS_FAULT_SYNC", default=True, cast=bool)
+
+# Seconds a scan-resolution cache entry (UPC -> product, LOC/serial -> location;
+# inventory.scan_resolver) stays valid in each process. 0 disables the cache.
+SCAN_CACHE_TTL_S = config("SCAN_CACHE_TTL_S", default=300, cast=int)
+
 # Location of local barcode printer
 PRINTER_IP = config("PRINTER_IP", default=None)
 
@@ -250,6 +286,24 @@ LOGIN_URL = "login"
 
 LOW_QUANTITY = 3
 
+# Filament consumption forecast (inventory.forecast), recomputed once a day.
+# Burn rate is an EWMA of grams/day over LOOKBACK_DAYS with the given half-life;
+# the reorder point covers LEAD_TIME_DAYS of supplier lead time plus SAFETY_DAYS.
+FORECAST_LOOKBACK_DAYS = config("FORECAST_LOOKBACK_DAYS", default=90, cast=int)
+FORECAST_HALF_LIFE_DAYS = config("FORECAST_HALF_LIFE_DAYS", default=14, cast=int)
+FORECAST_LEAD_TIME_DAYS = config("FORECAST_LEAD_TIME_DAYS", default=7, cast=int)
+FORECAST_SAFETY_DAYS = config("FORECAST_SAFETY_DAYS", default=7, cast=int)
+
+# Machine reliability rollup (inventory.maintenance.model_reliability): seconds
+# a process reuses it (0 disables the cache) and how many months the MTBF trend
+# covers.
+RELIABILITY_CACHE_TTL_S = config("RELIABILITY_CACHE_TTL_S", default=300, cast=int)
+RELIABILITY_TREND_MONTHS = config("RELIABILITY_TREND_MONTHS", default=6, cast=int)
+
+# The search page's bulk edit posts one ``item_ids`` field per selected row and
+# accepts up to ``views.MAX_BULK_UPDATE`` (5000); leave room for the filter fields.
+DATA_UPLOAD_MAX_NUMBER_FIELDS = 5100
+
 MESSAGE_TAGS = {
     messages.ERROR: "danger",
 }
@@ -265,6 +319,16 @@ LOGGING = {
             "level": "DEBUG",
             "formatter": "verbose",
         },
+        # One JSON record per line; delay=True so no file appears until
+        # profiling is actually switched on.
+        "sql_profile": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": SQL_PROFILE_LOG,
+            "maxBytes": 5 * 1024 * 1024,
+            "backupCount": 3,
+            "delay": True,
+            "formatter": "raw",
+        },
     },
     "root": {
         "handlers": ["console"],
@@ -280,6 +344,11 @@ LOGGING = {
             "level": "DEBUG",
             "propagate": False,
         },
+        "inventory.sqlprofile": {
+            "handlers": ["sql_profile"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
     "formatters": {
         "verbose": {
@@ -290,5 +359,6 @@ LOGGING = {
             "format": "[{levelname}] {message}",
             "style": "{",
         },
+        "raw": {"format": "{message}", "style": "{"},
     },
 }